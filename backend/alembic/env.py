@@ -13,6 +13,7 @@ import app.models.preset
 import app.models.sample  # noqa: F401
 from alembic import context
 from app.database import Base
+from app.fts import INDEXES, rebuild_search_indexes
 
 config = context.config
 
@@ -22,11 +23,24 @@ if config.config_file_name is not None:
 target_metadata = Base.metadata
 
 
+# FTS5 tables and their shadow tables are managed by app/fts.py, not the ORM.
+FTS_TABLES = {
+    f"{index.name}{suffix}"
+    for index in INDEXES
+    for suffix in ("", "_data", "_idx", "_docsize", "_config")
+}
+
+
+def include_name(name, type_, parent_names):  # type: ignore[no-untyped-def]
+    return not (type_ == "table" and name in FTS_TABLES)
+
+
 def run_migrations_offline() -> None:
     url = config.get_main_option("sqlalchemy.url")
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_name=include_name,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
         render_as_batch=True,
@@ -37,15 +51,24 @@ def run_migrations_offline() -> None:
 
 
 def do_run_migrations(connection):  # type: ignore[no-untyped-def]
+    applied = []
     context.configure(
         connection=connection,
         target_metadata=target_metadata,
+        include_name=include_name,
         render_as_batch=True,
+        on_version_apply=lambda **kw: applied.append(kw["step"]),
     )
 
     with context.begin_transaction():
         context.run_migrations()
 
+    # Batch-mode table rebuilds may renumber the rowids the FTS indexes are
+    # keyed on (see app/fts.py); re-derive them after any change.
+    if applied:
+        rebuild_search_indexes(connection)
+        connection.commit()
+
 
 async def run_async_migrations() -> None:
     connectable = async_engine_from_config(
@@ -0,0 +1,27 @@
+"""add_fts_search
+
+Revision ID: 5b1f0c9d2e7a
+Revises: 0974444261ee
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+from app.fts import create_search_indexes, drop_search_indexes
+
+# revision identifiers, used by Alembic.
+revision: str = "5b1f0c9d2e7a"
+down_revision: str | None = "0974444261ee"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # FTS5 tables, sync triggers and a backfill of existing rows.
+    create_search_indexes(None, op.get_bind())
+
+
+def downgrade() -> None:
+    drop_search_indexes(None, op.get_bind())
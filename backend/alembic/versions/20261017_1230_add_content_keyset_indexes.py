@@ -0,0 +1,52 @@
+"""add_content_keyset_indexes
+
+Revision ID: 8c3d2a7f4b91
+Revises: 5b1f0c9d2e7a
+Create Date: 2026-10-17 12:30:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8c3d2a7f4b91"
+down_revision: str | None = "5b1f0c9d2e7a"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+_INDEXES = {
+    "ix_content_created_at_id": ["created_at", "id"],
+    "ix_content_clone_id_created_at_id": ["clone_id", "created_at", "id"],
+    "ix_content_status_created_at_id": ["status", "created_at", "id"],
+    "ix_content_platform_created_at_id": ["platform", "created_at", "id"],
+    "ix_content_clone_id_status_created_at_id": ["clone_id", "status", "created_at", "id"],
+    "ix_content_word_count_id": ["word_count", "id"],
+}
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("content", schema=None) as batch_op:
+        for name, columns in _INDEXES.items():
+            batch_op.create_index(name, columns, unique=False)
+        batch_op.create_index(
+            "ix_content_authenticity_score_id",
+            [sa.text("coalesce(authenticity_score, -1)"), "id"],
+            unique=False,
+        )
+
+    with op.batch_alter_table("voice_clones", schema=None) as batch_op:
+        batch_op.create_index("ix_voice_clones_created_at_id", ["created_at", "id"], unique=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("voice_clones", schema=None) as batch_op:
+        batch_op.drop_index("ix_voice_clones_created_at_id")
+
+    with op.batch_alter_table("content", schema=None) as batch_op:
+        batch_op.drop_index("ix_content_authenticity_score_id")
+        for name in reversed(list(_INDEXES)):
+            batch_op.drop_index(name)
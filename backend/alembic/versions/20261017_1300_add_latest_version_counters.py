@@ -0,0 +1,66 @@
+"""add_latest_version_counters
+
+Revision ID: 3e7b9f1c6a52
+Revises: 8c3d2a7f4b91
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+from app.fts import create_search_indexes, drop_search_indexes
+
+# revision identifiers, used by Alembic.
+revision: str = "3e7b9f1c6a52"
+down_revision: str | None = "8c3d2a7f4b91"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# parent table -> (version table, parent foreign key)
+_COUNTERS = {
+    "content": ("content_versions", "content_id"),
+    "voice_clones": ("voice_dna_versions", "clone_id"),
+    "methodology_settings": ("methodology_versions", "settings_id"),
+}
+
+
+def upgrade() -> None:
+    for parent, (versions, parent_id) in _COUNTERS.items():
+        with op.batch_alter_table(parent, schema=None) as batch_op:
+            batch_op.add_column(
+                sa.Column("latest_version", sa.Integer(), nullable=False, server_default="0")
+            )
+        op.execute(
+            f"UPDATE {parent} SET latest_version = coalesce("
+            f"(SELECT max(version_number) FROM {versions} "
+            f"WHERE {versions}.{parent_id} = {parent}.id), 0)"
+        )
+        with op.batch_alter_table(versions, schema=None) as batch_op:
+            batch_op.create_index(
+                f"ix_{versions}_{parent_id}_version_number",
+                [parent_id, "version_number"],
+                unique=True,
+            )
+
+
+def downgrade() -> None:
+    # Dropping a column rebuilds the table, which loses its FTS triggers and
+    # expression indexes (batch mode cannot reflect them) and may renumber
+    # rowids; recreate both and backfill the search indexes after.
+    drop_search_indexes(None, op.get_bind())
+    for parent, (versions, parent_id) in reversed(_COUNTERS.items()):
+        with op.batch_alter_table(versions, schema=None) as batch_op:
+            batch_op.drop_index(f"ix_{versions}_{parent_id}_version_number")
+        with op.batch_alter_table(parent, schema=None) as batch_op:
+            batch_op.drop_column("latest_version")
+    op.create_index(
+        "ix_content_authenticity_score_id",
+        "content",
+        [sa.text("coalesce(authenticity_score, -1)"), "id"],
+        unique=False,
+        if_not_exists=True,
+    )
+    create_search_indexes(None, op.get_bind())
@@ -0,0 +1,75 @@
+"""add_content_version_deltas
+
+Revision ID: 9a4c2e6b8d13
+Revises: 3e7b9f1c6a52
+Create Date: 2026-10-17 13:30:00.000000
+
+"""
+
+import json
+from collections.abc import Sequence
+from typing import Any
+
+import sqlalchemy as sa
+
+from alembic import op
+from app.text_delta import patch
+
+# revision identifiers, used by Alembic.
+revision: str = "9a4c2e6b8d13"
+down_revision: str | None = "3e7b9f1c6a52"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # Existing versions keep their full text and act as snapshots.
+    with op.batch_alter_table("content_versions", schema=None) as batch_op:
+        batch_op.add_column(sa.Column("base_version", sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column("delta", sa.JSON(), nullable=True))
+        batch_op.add_column(sa.Column("content_hash", sa.String(length=64), nullable=True))
+        batch_op.alter_column("content_text", existing_type=sa.Text(), nullable=True)
+
+
+def _full_texts(rows: Sequence[sa.Row[Any]]) -> dict[tuple[str, int], str]:
+    """Rebuild every version's text from its snapshot and deltas."""
+    by_key = {(row.content_id, row.version_number): row for row in rows}
+    texts: dict[tuple[str, int], str] = {}
+
+    def text_of(key: tuple[str, int]) -> str:
+        if key not in texts:
+            row = by_key[key]
+            if row.content_text is not None:
+                texts[key] = row.content_text
+            else:
+                base = text_of((row.content_id, row.base_version))
+                texts[key] = base if row.delta is None else patch(base, json.loads(row.delta))
+        return texts[key]
+
+    for key in sorted(by_key):
+        text_of(key)
+    return texts
+
+
+def downgrade() -> None:
+    # Without deltas every version needs its full text again.
+    bind = op.get_bind()
+    rows = bind.execute(
+        sa.text(
+            "SELECT id, content_id, version_number, content_text, base_version, delta "
+            "FROM content_versions"
+        )
+    ).all()
+    texts = _full_texts(rows)
+    for row in rows:
+        if row.content_text is None:
+            bind.execute(
+                sa.text("UPDATE content_versions SET content_text = :text WHERE id = :id"),
+                {"text": texts[(row.content_id, row.version_number)], "id": row.id},
+            )
+
+    with op.batch_alter_table("content_versions", schema=None) as batch_op:
+        batch_op.alter_column("content_text", existing_type=sa.Text(), nullable=False)
+        batch_op.drop_column("content_hash")
+        batch_op.drop_column("delta")
+        batch_op.drop_column("base_version")
@@ -2,7 +2,7 @@
 
 from typing import Annotated, Any, cast
 
-from fastapi import APIRouter, Depends, HTTPException, Response
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from pydantic import BaseModel, Field
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -110,12 +110,19 @@ async def list_clones(
     session: Session,
     type: str | None = None,
     search: str | None = None,
+    limit: Annotated[int | None, Query(ge=1, le=200)] = None,
+    cursor: str | None = None,
+    include_total: bool = True,
 ) -> CloneListResponse:
+    """List live clones, newest first. ``include_total=false`` skips the count."""
     service = CloneService(session)
-    items, total = await service.list(type_filter=type, search=search)
+    items, total = await service.list(
+        type_filter=type, search=search, limit=limit, cursor=cursor, count=include_total
+    )
     return CloneListResponse(
         items=[_to_response(c) for c in items],
         total=total,
+        next_cursor=CloneService.next_cursor(items, limit, search=search),
     )
 
 
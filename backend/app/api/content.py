@@ -2,27 +2,27 @@
 
 from __future__ import annotations
 
-from collections.abc import AsyncIterator
-from typing import Annotated, Any, cast
+from collections.abc import AsyncIterator, Callable
+from typing import Annotated, Any
 
 from fastapi import APIRouter, Depends, Form, Query, UploadFile
 from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel, Field
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_llm_provider, get_session
-from app.exceptions import CloneNotFoundError
-from app.llm.base import LLMProvider
-from app.llm.prompts import build_generation_prompt
-from app.models.clone import VoiceClone
-from app.models.dna import VoiceDNAVersion
-from app.models.methodology import MethodologySettings
+from app.api.sse import SSEEvent, sse_frames
+from app.config import settings
+from app.exceptions import SonaError
+from app.llm.base import LLMProvider, stream_with_retry
+from app.llm.multiplex import multiplex
+from app.llm.telemetry import llm_operation
 from app.schemas.content import (
     BulkDeleteRequest,
     BulkResponse,
     BulkStatusRequest,
     BulkTagRequest,
+    ContentFieldsListResponse,
     ContentImport,
     ContentListResponse,
     ContentResponse,
@@ -38,7 +38,7 @@ from app.schemas.content import (
 )
 from app.schemas.detection import DetectionResponse
 from app.schemas.scoring import AuthenticityScoreResponse
-from app.services.content_service import ContentService
+from app.services.content_service import ContentService, StreamPlan
 from app.services.detection_service import DetectionService
 from app.services.file_parser import parse_file
 from app.services.scoring_service import ScoringService
@@ -55,6 +55,7 @@ class MultiPlatformGenerateRequest(BaseModel):
     input_text: str = Field(min_length=1)
     properties: dict[str, Any] | None = None
     preset_id: str | None = None
+    single_call: bool = False
 
 
 class MultiPlatformGenerateResponse(BaseModel):
@@ -66,6 +67,15 @@ class StreamGenerateRequest(BaseModel):
     platform: str
     input_text: str = Field(min_length=1)
     properties: dict[str, Any] | None = None
+    persist: bool = False
+
+
+class MultiStreamGenerateRequest(BaseModel):
+    clone_id: str
+    platforms: list[str] = Field(min_length=1)
+    input_text: str = Field(min_length=1)
+    properties: dict[str, Any] | None = None
+    variants: bool = False
 
 
 @router.post("/generate", response_model=None, status_code=201)
@@ -83,6 +93,7 @@ async def generate_content(
             platforms=body.platforms,
             input_text=body.input_text,
             properties=body.properties,
+            single_call=body.single_call,
         )
     except ValueError as exc:
         return JSONResponse(
@@ -97,67 +108,115 @@ async def generate_content(
     )
 
 
+def _sse_response(events: AsyncIterator[SSEEvent]) -> StreamingResponse:
+    return StreamingResponse(
+        sse_frames(
+            events,
+            flush_seconds=settings.sse_flush_seconds,
+            flush_bytes=settings.sse_flush_bytes,
+            heartbeat_seconds=settings.sse_heartbeat_seconds,
+        ),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"},
+    )
+
+
 @router.post("/generate/stream")
 async def stream_generate_content(
     body: StreamGenerateRequest,
     session: SessionDep,
     provider: ProviderDep,
 ) -> StreamingResponse:
-    """Stream content generation via Server-Sent Events."""
-    # Validate clone exists
-    result = await session.execute(select(VoiceClone).where(VoiceClone.id == body.clone_id))
-    clone = result.scalar_one_or_none()
-    if clone is None:
-        raise CloneNotFoundError(body.clone_id)
-
-    # Get latest DNA
-    result = await session.execute(
-        select(VoiceDNAVersion)
-        .where(VoiceDNAVersion.clone_id == body.clone_id)
-        .order_by(VoiceDNAVersion.version_number.desc())
-        .limit(1)
-    )
-    dna = result.scalar_one_or_none()
-    if dna is None:
-        msg = "Analyze Voice DNA before generating content"
-        raise ValueError(msg)
-
-    # Get methodology
-    result = await session.execute(
-        select(MethodologySettings).where(
-            MethodologySettings.section_key == "voice_cloning_instructions"
-        )
+    """Stream content generation via Server-Sent Events.
+
+    Text arrives as plain ``data: <chunk>`` frames; a chunk containing
+    newlines spans several ``data:`` lines, which clients rejoin with
+    newlines. With ``persist``, the streamed text is saved as a draft with
+    its initial version once the stream completes, and a ``saved`` event
+    carrying the new ``content_id`` precedes ``[DONE]``. A stream that fails
+    or is abandoned saves nothing.
+    """
+    service = ContentService(session, provider)
+    [plan] = await service.plan_streams(
+        clone_id=body.clone_id,
+        platforms=[body.platform],
+        input_text=body.input_text,
+        properties=body.properties,
     )
-    methodology_settings = result.scalar_one_or_none()
-    methodology = methodology_settings.current_content if methodology_settings else None
 
-    raw_data = cast(dict[str, Any], dna.data)  # pyright: ignore[reportUnknownMemberType]
-    dna_data: dict[str, str] = {str(k): str(v) for k, v in raw_data.items()}
+    async def events() -> AsyncIterator[SSEEvent]:
+        chunks: list[str] = []
+        with llm_operation("generation_stream", clone_id=body.clone_id):
+            async for chunk in stream_with_retry(lambda: provider.stream(plan.messages)):
+                if body.persist:
+                    chunks.append(chunk)
+                yield SSEEvent({}, text=chunk, text_field=None)
+        if body.persist:
+            content = await service.save_generated(
+                clone_id=body.clone_id,
+                platform=body.platform,
+                input_text=body.input_text,
+                generated_text="".join(chunks),
+                properties=body.properties,
+            )
+            await session.commit()
+            yield SSEEvent({"content_id": content.id}, event="saved")
+
+    return _sse_response(events())
+
+
+@router.post("/generate/stream/multi", response_model=None)
+async def stream_generate_multi(
+    body: MultiStreamGenerateRequest,
+    session: SessionDep,
+    provider: ProviderDep,
+) -> StreamingResponse | JSONResponse:
+    """Stream several platforms or variants at once over one SSE channel.
+
+    Each event is tagged with ``platform`` and ``variant_index`` (null unless
+    ``variants`` is set): ``delta`` carries a text chunk, ``done`` ends one
+    stream and ``error`` reports a stream that failed. The channel closes with
+    ``data: [DONE]`` once every stream has ended.
+    """
+    service = ContentService(session, provider)
 
-    props_for_prompt: dict[str, str] | None = None
-    if body.properties:
-        props_for_prompt = {k: str(v) for k, v in body.properties.items()}
+    try:
+        plans = await service.plan_streams(
+            clone_id=body.clone_id,
+            platforms=body.platforms,
+            input_text=body.input_text,
+            properties=body.properties,
+            variants=body.variants,
+        )
+    except ValueError as exc:
+        return JSONResponse(
+            status_code=400,
+            content={"detail": str(exc), "code": "DNA_REQUIRED"},
+        )
 
-    messages = build_generation_prompt(
-        dna=dna_data,
-        platform=body.platform,
-        input_text=body.input_text,
-        properties=props_for_prompt,
-    )
+    def open_stream(plan: StreamPlan) -> Callable[[], AsyncIterator[str]]:
+        temperature = plan.temperature
+        if temperature is None:
+            return lambda: provider.stream(plan.messages)
+        return lambda: provider.stream(plan.messages, temperature=temperature)
 
-    if methodology:
-        system_msg = messages[0]["content"]
-        messages[0]["content"] = f"{system_msg}\n\nMethodology: {methodology}"
+    streams = {(plan.platform, plan.variant_index): open_stream(plan) for plan in plans}
 
-    async def event_generator() -> AsyncIterator[str]:
-        async for chunk in provider.stream(messages):  # pyright: ignore[reportGeneralTypeIssues,reportUnknownVariableType]
-            yield f"data: {chunk}\n\n"
-        yield "data: [DONE]\n\n"
+    async def events() -> AsyncIterator[SSEEvent]:
+        with llm_operation("generation_stream", clone_id=body.clone_id):
+            async for event in multiplex(streams):
+                platform, variant_index = event.key
+                data: dict[str, Any] = {"platform": platform, "variant_index": variant_index}
+                if event.kind == "delta":
+                    yield SSEEvent(data, event="delta", text=event.delta, text_field="delta")
+                    continue
+                if isinstance(event.error, SonaError):
+                    data |= {"detail": event.error.detail, "code": event.error.code}
+                elif event.error is not None:
+                    data |= {"detail": "Internal server error", "code": "INTERNAL_ERROR"}
+                yield SSEEvent(data, event=event.kind)
 
-    return StreamingResponse(
-        event_generator(),
-        media_type="text/event-stream",
-    )
+    return _sse_response(events())
 
 
 @router.post("/generate/variants", response_model=GenerateVariantsResponse)
@@ -232,7 +291,7 @@ async def score_preview(
     )
 
 
-@router.get("", response_model=ContentListResponse)
+@router.get("", response_model=None)
 async def list_content(
     session: SessionDep,
     clone_id: str | None = None,
@@ -243,22 +302,54 @@ async def list_content(
     order: str | None = None,
     offset: Annotated[int, Query(ge=0)] = 0,
     limit: Annotated[int, Query(ge=1, le=100)] = 20,
-) -> ContentListResponse:
-    """List content with optional filters, search, sort, and pagination."""
+    fields: str | None = None,
+    preview_chars: Annotated[int, Query(ge=1, le=2000)] = 200,
+    cursor: str | None = None,
+    include_total: bool = True,
+) -> ContentListResponse | ContentFieldsListResponse | JSONResponse:
+    """List content with optional filters, search, sort, and pagination.
+
+    ``fields`` is a comma-separated subset of the content columns plus
+    ``preview`` (the first ``preview_chars`` characters of the text) and
+    ``snippet``; items then carry only those keys, ``id`` and the sort column.
+
+    A full page carries ``next_cursor``; pass it back as ``cursor`` for the
+    next page instead of an offset. ``include_total=false`` skips the count.
+    """
     service = ContentService(session)
-    items, total = await service.list(
-        clone_id=clone_id,
-        platform=platform,
-        status=status,
-        search=search,
-        sort=sort,
-        order=order,
-        offset=offset,
-        limit=limit,
-    )
+    field_names = [f.strip() for f in fields.split(",") if f.strip()] if fields else None
+    try:
+        items, total = await service.list(
+            clone_id=clone_id,
+            platform=platform,
+            status=status,
+            search=search,
+            sort=sort,
+            order=order,
+            offset=offset,
+            limit=limit,
+            fields=field_names,
+            preview_chars=preview_chars,
+            cursor=cursor,
+            count=include_total,
+        )
+    except ValueError as exc:
+        return JSONResponse(
+            status_code=400,
+            content={"detail": str(exc), "code": "INVALID_FIELDS"},
+        )
+
+    next_cursor = ContentService.next_cursor(items, limit, search=search, sort=sort, order=order)
+    if field_names is not None:
+        return ContentFieldsListResponse(
+            items=[dict(row._mapping) for row in items],  # pyright: ignore[reportPrivateUsage]
+            total=total,
+            next_cursor=next_cursor,
+        )
     return ContentListResponse(
-        items=[ContentResponse.model_validate(c) for c in items],
+        items=[ContentResponse.model_validate(row) for row in items],
         total=total,
+        next_cursor=next_cursor,
     )
 
 
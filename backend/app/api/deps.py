@@ -2,13 +2,16 @@
 
 from typing import Any
 
+from app.config import settings
 from app.database import get_session as get_session
-from app.exceptions import ProviderNotConfiguredError
+from app.llm.registry import create_registry
+
+provider_registry = create_registry(settings)
 
 
 async def get_llm_provider() -> Any:
-    """Return the default LLM provider from the registry.
+    """Return the default LLM provider, failing over to other configured providers.
 
     Raises ProviderNotConfiguredError until an LLM provider is configured.
     """
-    raise ProviderNotConfiguredError()
+    return provider_registry.get_failover_provider()
@@ -0,0 +1,20 @@
+"""Operational metrics API routes."""
+
+from datetime import datetime
+
+from fastapi import APIRouter
+
+from app.api.providers import ServiceDep
+from app.schemas.provider import LLMCallSummaryResponse
+
+router = APIRouter(prefix="/metrics", tags=["metrics"])
+
+
+@router.get("/llm")
+async def llm_call_summary(
+    service: ServiceDep,
+    since: datetime | None = None,
+    clone_id: str | None = None,
+) -> list[LLMCallSummaryResponse]:
+    """Per-call LLM telemetry aggregated by operation, provider and model."""
+    return await service.llm_call_summary(since=since, clone_id=clone_id)
@@ -4,12 +4,15 @@ from typing import Annotated
 
 from fastapi import APIRouter, Depends
 
+from app.api.deps import provider_registry
 from app.config import PROJECT_ROOT, settings
 from app.schemas.provider import (
     DefaultProviderRequest,
+    PromptCacheStatsResponse,
     ProviderResponse,
     ProviderTestResponse,
     ProviderUpdate,
+    RateLimitStatsResponse,
 )
 from app.services.provider_service import ProviderService
 
@@ -17,7 +20,11 @@ router = APIRouter(prefix="/providers", tags=["providers"])
 
 
 def get_provider_service() -> ProviderService:
-    return ProviderService(settings=settings, env_path=PROJECT_ROOT / ".env")
+    return ProviderService(
+        settings=settings,
+        env_path=PROJECT_ROOT / ".env",
+        registry=provider_registry,
+    )
 
 
 ServiceDep = Annotated[ProviderService, Depends(get_provider_service)]
@@ -28,6 +35,16 @@ async def list_providers(service: ServiceDep) -> list[ProviderResponse]:
     return service.list_providers()
 
 
+@router.get("/limits")
+async def list_rate_limits(service: ServiceDep) -> list[RateLimitStatsResponse]:
+    return service.rate_limit_stats()
+
+
+@router.get("/prompt-cache")
+async def list_prompt_cache_stats(service: ServiceDep) -> list[PromptCacheStatsResponse]:
+    return service.prompt_cache_stats()
+
+
 @router.put("/default")
 async def set_default_provider(
     body: DefaultProviderRequest,
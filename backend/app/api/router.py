@@ -6,18 +6,22 @@ from app.api.clones import router as clones_router
 from app.api.content import router as content_router
 from app.api.data import router as data_router
 from app.api.methodology import router as methodology_router
+from app.api.metrics import router as metrics_router
 from app.api.presets import router as presets_router
 from app.api.providers import router as providers_router
 from app.api.samples import router as samples_router
+from app.api.search import router as search_router
 
 api_router = APIRouter(prefix="/api")
 api_router.include_router(clones_router)
 api_router.include_router(content_router)
 api_router.include_router(data_router)
 api_router.include_router(methodology_router)
+api_router.include_router(metrics_router)
 api_router.include_router(presets_router)
 api_router.include_router(providers_router)
 api_router.include_router(samples_router)
+api_router.include_router(search_router)
 
 
 @api_router.get("/health")
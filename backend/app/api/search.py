@@ -0,0 +1,28 @@
+"""API endpoint for full-text search."""
+
+from __future__ import annotations
+
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_session
+from app.schemas.search import SearchResponse
+from app.services.search_service import SearchService
+
+router = APIRouter(prefix="/search", tags=["search"])
+
+SessionDep = Annotated[AsyncSession, Depends(get_session)]
+
+
+@router.get("", response_model=SearchResponse)
+async def search(
+    session: SessionDep,
+    q: Annotated[str, Query(min_length=1)],
+    clone_id: str | None = None,
+    limit: Annotated[int, Query(ge=1, le=100)] = 20,
+) -> SearchResponse:
+    """Ranked matches with highlighted snippets across content, samples and clones."""
+    service = SearchService(session)
+    return await service.search(q, clone_id=clone_id, limit=limit)
@@ -0,0 +1,136 @@
+"""Server-Sent Events framing with delta coalescing and idle heartbeats."""
+
+import asyncio
+import json
+import re
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+from typing import Any
+
+# Events buffered between the source and the writer before the source waits.
+_QUEUE_SIZE = 256
+
+HEARTBEAT = ": heartbeat\n\n"
+DONE = "data: [DONE]\n\n"
+
+_LINE_BREAK = re.compile(r"\r\n|\r|\n")
+
+
+@dataclass(frozen=True)
+class SSEEvent:
+    """One event before framing: an optional event name and a JSON payload.
+
+    An event with ``text`` is a delta. Deltas that share ``event``, ``data``
+    and ``text_field`` are merged within a flush window and sent as one frame
+    whose payload is ``data`` plus the joined text under ``text_field``. With
+    ``text_field=None`` the frame carries the joined text itself, for
+    plain-text streams.
+    """
+
+    data: dict[str, Any]
+    event: str | None = None
+    text: str | None = None
+    text_field: str | None = "text"
+
+
+def frame(event: str | None, data: dict[str, Any]) -> str:
+    """Encode one SSE frame. JSON keeps newlines in the payload off the wire."""
+    name = f"event: {event}\n" if event else ""
+    return f"{name}data: {json.dumps(data)}\n\n"
+
+
+def text_frame(event: str | None, text: str) -> str:
+    """Encode plain text as one SSE frame, one ``data:`` line per line of text.
+
+    Clients rejoin the lines with newlines, so multi-line text survives.
+    """
+    name = f"event: {event}\n" if event else ""
+    lines = "".join(f"data: {line}\n" for line in _LINE_BREAK.split(text))
+    return f"{name}{lines}\n"
+
+
+def _delta_frame(first: SSEEvent, text: str) -> str:
+    if first.text_field is None:
+        return text_frame(first.event, text)
+    return frame(first.event, {**first.data, first.text_field: text})
+
+
+async def sse_frames(
+    events: AsyncIterator[SSEEvent],
+    *,
+    flush_seconds: float,
+    flush_bytes: int,
+    heartbeat_seconds: float,
+) -> AsyncIterator[str]:
+    """Frame ``events`` for the wire, ending with ``data: [DONE]``.
+
+    Deltas are held for up to ``flush_seconds`` after the first one arrives,
+    or until ``flush_bytes`` of text are pending, then sent as one frame per
+    tag set in arrival order. Any other event flushes pending deltas before it
+    so ordering is preserved. After ``heartbeat_seconds`` without output a
+    comment line is sent to keep proxies from closing the connection; 0
+    disables heartbeats. An error raised by ``events`` is re-raised after the
+    pending deltas are sent.
+
+    The source runs on its own task so waiting for the next event can time
+    out without interrupting it.
+    """
+    queue: asyncio.Queue[SSEEvent | Exception | None] = asyncio.Queue(maxsize=_QUEUE_SIZE)
+
+    async def pump() -> None:
+        try:
+            async for event in events:
+                await queue.put(event)
+        except Exception as exc:
+            await queue.put(exc)
+        else:
+            await queue.put(None)
+
+    loop = asyncio.get_running_loop()
+    pending: dict[str, tuple[SSEEvent, list[str]]] = {}
+    pending_bytes = 0
+    deadline = 0.0
+
+    def flush() -> str:
+        nonlocal pending_bytes
+        frames = "".join(_delta_frame(first, "".join(texts)) for first, texts in pending.values())
+        pending.clear()
+        pending_bytes = 0
+        return frames
+
+    task = asyncio.create_task(pump())
+    try:
+        while True:
+            if pending and loop.time() >= deadline:
+                yield flush()
+            if pending:
+                timeout: float | None = deadline - loop.time()
+            else:
+                timeout = heartbeat_seconds if heartbeat_seconds > 0 else None
+            try:
+                item = await asyncio.wait_for(queue.get(), timeout)
+            except TimeoutError:
+                yield flush() if pending else HEARTBEAT
+                continue
+
+            if isinstance(item, SSEEvent) and item.text is not None:
+                key = json.dumps([item.event, item.data, item.text_field], sort_keys=True)
+                if not pending:
+                    deadline = loop.time() + flush_seconds
+                pending.setdefault(key, (item, []))[1].append(item.text)
+                pending_bytes += len(item.text.encode())
+                if pending_bytes >= flush_bytes:
+                    yield flush()
+                continue
+
+            if pending:
+                yield flush()
+            if item is None:
+                yield DONE
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield frame(item.event, item.data)
+    finally:
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
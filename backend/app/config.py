@@ -23,5 +23,83 @@ class Settings(BaseSettings):
     default_anthropic_model: str = "claude-sonnet-4-5-20250929"
     default_google_model: str = "gemini-2.0-flash"
 
+    # Shared HTTP connection pool for pooled provider clients
+    llm_max_connections: int = 100
+    llm_max_keepalive_connections: int = 20
+    llm_keepalive_expiry: float = 60.0
+
+    # Completion cache (memory LRU in front of SQLite)
+    llm_cache_enabled: bool = True
+    llm_cache_path: str = str(PROJECT_ROOT / "data" / "llm_cache.db")
+    llm_cache_ttl_seconds: float = 7 * 24 * 3600
+    llm_cache_max_entries: int = 10_000
+    llm_cache_memory_entries: int = 256
+    llm_cache_max_temperature: float = 0.3
+
+    # Per-(provider, model) budgets; 0 disables a limit. Overrides are keyed
+    # "provider:model" or "provider", e.g. {"openai:gpt-4o": {"max_in_flight": 4}}
+    llm_requests_per_minute: int = 500
+    llm_tokens_per_minute: int = 200_000
+    llm_max_in_flight: int = 8
+    llm_rate_limit_overrides: dict[str, dict[str, int]] = {}
+
+    # Coalesce identical concurrent LLM calls into one upstream request
+    llm_single_flight_enabled: bool = True
+
+    # Opt-in: fail over to the next configured provider (and its default model)
+    # on network/rate-limit errors or when a call outlasts that provider's
+    # observed latency percentile. Hedging fires a duplicate at the next
+    # provider once the primary passes its p95.
+    llm_failover_enabled: bool = False
+    llm_failover_timeout_percentile: float = 0.99
+    llm_failover_min_timeout: float = 30.0
+    llm_hedge_enabled: bool = False
+    llm_hedge_percentile: float = 0.95
+
+    # Per-provider circuit breaker: open after N consecutive failures or when the
+    # error rate over the last `window` calls crosses the threshold, then admit
+    # probe calls after `reset_seconds`.
+    llm_breaker_enabled: bool = True
+    llm_breaker_failure_threshold: int = 5
+    llm_breaker_error_rate: float = 0.5
+    llm_breaker_window: int = 20
+    llm_breaker_min_calls: int = 10
+    llm_breaker_reset_seconds: float = 30.0
+    llm_breaker_half_open_probes: int = 1
+
+    # Vendored tiktoken BPE files (see app/llm/tokenizer.py) and the size of the
+    # per-process token-count memo
+    llm_tokenizer_dir: str = str(PROJECT_ROOT / "data" / "tokenizers")
+    llm_token_cache_entries: int = 4096
+
+    # Prometheus-style /metrics endpoint and the event-loop lag probe interval
+    metrics_enabled: bool = True
+    metrics_event_loop_interval: float = 0.5
+
+    # SSE streaming: deltas are coalesced into one frame per window (whichever
+    # of time or bytes is hit first) and idle streams send a heartbeat comment
+    sse_flush_seconds: float = 0.05
+    sse_flush_bytes: int = 4096
+    sse_heartbeat_seconds: float = 15.0
+
+    # Per-call LLM telemetry ledger (SQLite), written in batches off the request path
+    llm_telemetry_enabled: bool = True
+    llm_telemetry_path: str = str(PROJECT_ROOT / "data" / "llm_telemetry.db")
+    llm_telemetry_batch_size: int = 100
+    llm_telemetry_flush_seconds: float = 2.0
+
+    # Lifetime of explicit Gemini context caches for large voice/methodology
+    # prefixes; 0 disables them (Gemini bills cache storage per hour).
+    google_context_cache_ttl_seconds: float = 0.0
+
+    # Offline "simulated" provider for load tests: a named latency profile
+    # (instant, fast, realistic, degraded) with optional per-field overrides,
+    # e.g. {"rate_limit_rate": 0.2}. Select it with default_llm_provider.
+    llm_simulated_enabled: bool = False
+    llm_simulated_profile: str = "fast"
+    llm_simulated_overrides: dict[str, float] = {}
+    llm_simulated_seed: int = 0
+    llm_simulated_model: str = "simulated"
+
 
 settings = Settings()
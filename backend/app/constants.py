@@ -20,13 +20,34 @@ PLATFORMS: dict[str, dict[str, int | str]] = {
     "generic": {"char_limit": 100000, "label": "Generic"},
 }
 
-# Model pricing (per 1M tokens)
+# Model pricing (per 1M tokens); cached_input is the rate for prompt tokens
+# served from the provider's prompt cache
 MODEL_PRICING: dict[str, dict[str, float | int]] = {
-    "gpt-4o": {"input": 2.50, "output": 10.00, "context_window": 128_000},
-    "gpt-4o-mini": {"input": 0.15, "output": 0.60, "context_window": 128_000},
-    "claude-sonnet-4-5-20250929": {"input": 3.00, "output": 15.00, "context_window": 200_000},
-    "claude-haiku-4-5-20251001": {"input": 0.80, "output": 4.00, "context_window": 200_000},
-    "gemini-2.0-flash": {"input": 0.10, "output": 0.40, "context_window": 1_000_000},
+    "gpt-4o": {"input": 2.50, "cached_input": 1.25, "output": 10.00, "context_window": 128_000},
+    "gpt-4o-mini": {
+        "input": 0.15,
+        "cached_input": 0.075,
+        "output": 0.60,
+        "context_window": 128_000,
+    },
+    "claude-sonnet-4-5-20250929": {
+        "input": 3.00,
+        "cached_input": 0.30,
+        "output": 15.00,
+        "context_window": 200_000,
+    },
+    "claude-haiku-4-5-20251001": {
+        "input": 0.80,
+        "cached_input": 0.08,
+        "output": 4.00,
+        "context_window": 200_000,
+    },
+    "gemini-2.0-flash": {
+        "input": 0.10,
+        "cached_input": 0.025,
+        "output": 0.40,
+        "context_window": 1_000_000,
+    },
 }
 
 # Available models per provider
@@ -40,3 +61,10 @@ PROVIDER_MODELS: dict[str, list[str]] = {
 MAX_DNA_VERSIONS = 10
 MAX_METHODOLOGY_VERSIONS = 10
 MAX_SAMPLE_WORDS = 50_000
+
+# Content versions between full-text snapshots; the rest are stored as deltas
+CONTENT_SNAPSHOT_INTERVAL = 10
+
+# Output budget for a single-call multi-platform generation, which returns
+# every platform's draft in one reply
+SINGLE_CALL_MAX_TOKENS = 8192
@@ -1,10 +1,11 @@
 from collections.abc import AsyncGenerator
 
-from sqlalchemy import MetaData
+from sqlalchemy import MetaData, event
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase
 
 from app.config import settings
+from app.fts import create_search_indexes, drop_search_indexes
 
 convention = {
     "ix": "ix_%(table_name)s_%(column_0_N_name)s",
@@ -23,6 +24,11 @@ class Base(DeclarativeBase):
     metadata = MetaData(naming_convention=convention)
 
 
+# FTS5 search indexes live outside the ORM metadata (see app/fts.py).
+event.listen(Base.metadata, "after_create", create_search_indexes)
+event.listen(Base.metadata, "before_drop", drop_search_indexes)
+
+
 async def get_session() -> AsyncGenerator[AsyncSession]:
     async with async_session() as session:
         yield session
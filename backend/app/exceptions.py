@@ -56,10 +56,16 @@ class LLMAuthError(SonaError):
 
 class LLMRateLimitError(SonaError):
     def __init__(
-        self, *, provider: str = "", detail: str = "", code: str = "LLM_RATE_LIMIT"
+        self,
+        *,
+        provider: str = "",
+        detail: str = "",
+        code: str = "LLM_RATE_LIMIT",
+        retry_after: float | None = None,
     ) -> None:
         msg = detail or f"Rate limit exceeded for provider '{provider}'"
         super().__init__(detail=msg, code=code)
+        self.retry_after = retry_after
 
 
 class LLMNetworkError(SonaError):
@@ -116,3 +122,27 @@ class CloneSoftDeletedError(SonaError):
             detail=f"Voice clone '{clone_id}' has been deleted",
             code="CLONE_SOFT_DELETED",
         )
+
+
+class ProviderUnavailableError(SonaError):
+    def __init__(self, provider: str, retry_after: float) -> None:
+        super().__init__(
+            detail=(
+                f"Provider '{provider}' is temporarily unavailable after repeated failures."
+                f" Retrying in {retry_after:.0f}s."
+            ),
+            code="PROVIDER_UNAVAILABLE",
+        )
+        self.provider = provider
+        self.retry_after = retry_after
+
+
+class LLMResponseFormatError(SonaError):
+    def __init__(self, *, provider: str = "", detail: str = "") -> None:
+        msg = detail or f"Provider '{provider}' returned a response that does not match the schema"
+        super().__init__(detail=msg, code="LLM_INVALID_RESPONSE")
+
+
+class InvalidCursorError(SonaError):
+    def __init__(self, detail: str = "Invalid or expired pagination cursor") -> None:
+        super().__init__(detail=detail, code="INVALID_CURSOR")
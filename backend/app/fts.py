@@ -0,0 +1,144 @@
+"""SQLite FTS5 indexes over content, writing samples and voice clones.
+
+Each index is an external-content FTS5 table keyed by the source table's
+rowid, so the text is stored once and ``snippet()`` reads it back from the
+source row. Triggers keep the index in step with every insert, update and
+delete, whichever code path writes the row. The indexes are created after
+``create_all`` (and dropped before ``drop_all``) through metadata events, and
+an index created over existing rows is backfilled with FTS5 ``rebuild``.
+
+The source tables have string primary keys, so their rowids are not stable:
+VACUUM and table rebuilds (Alembic batch mode on SQLite) may renumber them,
+leaving the index pointing at the wrong rows. ``alembic/env.py`` runs
+``rebuild_search_indexes`` after every migration run that applied a revision;
+run it after a VACUUM too.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Any
+
+from sqlalchemy import (
+    ColumnElement,
+    Connection,
+    FromClause,
+    Join,
+    TableClause,
+    column,
+    func,
+    literal_column,
+    table,
+)
+from sqlalchemy import text as sql
+
+
+@dataclass(frozen=True)
+class FtsIndex:
+    """One FTS5 table mirroring ``columns`` of ``source``."""
+
+    name: str
+    source: str
+    columns: tuple[str, ...]
+
+    @cached_property
+    def table(self) -> TableClause:
+        """The FTS table as a Core selectable, for joins on ``rowid``."""
+        return table(self.name, column("rowid"), column(self.name))
+
+    def match(self, query: str) -> ColumnElement[bool]:
+        """``<name> MATCH query`` for use in a WHERE clause."""
+        return self.table.c[self.name].op("MATCH")(query)
+
+    def joined_to(self, source: FromClause) -> Join:
+        """``source`` inner-joined to this index on rowid."""
+        fts = self.table
+        return source.join(fts, fts.c.rowid == literal_column(f"{self.source}.rowid"))
+
+    def rank(self) -> ColumnElement[float]:
+        """bm25 relevance of the current match; lower is more relevant."""
+        return func.bm25(literal_column(self.name))
+
+    def snippet(self, *, tokens: int = 16) -> ColumnElement[str]:
+        """Highlighted excerpt of the best-matching column, with ``<mark>`` tags."""
+        return func.snippet(literal_column(self.name), -1, "<mark>", "</mark>", "…", tokens)
+
+    def create_statements(self) -> list[str]:
+        names = ", ".join(self.columns)
+        new = ", ".join(f"new.{c}" for c in self.columns)
+        old = ", ".join(f"old.{c}" for c in self.columns)
+        insert = f"INSERT INTO {self.name}(rowid, {names}) VALUES (new.rowid, {new});"
+        delete = (
+            f"INSERT INTO {self.name}({self.name}, rowid, {names}) "
+            f"VALUES ('delete', old.rowid, {old});"
+        )
+        return [
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {self.name} USING fts5({names}, "
+            f"content='{self.source}', content_rowid='rowid', tokenize='porter unicode61')",
+            f"CREATE TRIGGER IF NOT EXISTS {self.name}_ai AFTER INSERT ON {self.source} "
+            f"BEGIN {insert} END",
+            f"CREATE TRIGGER IF NOT EXISTS {self.name}_ad AFTER DELETE ON {self.source} "
+            f"BEGIN {delete} END",
+            f"CREATE TRIGGER IF NOT EXISTS {self.name}_au AFTER UPDATE OF {names} "
+            f"ON {self.source} BEGIN {delete} {insert} END",
+        ]
+
+
+CONTENT_FTS = FtsIndex("content_fts", "content", ("content_current", "topic", "campaign"))
+SAMPLES_FTS = FtsIndex("writing_samples_fts", "writing_samples", ("content",))
+CLONES_FTS = FtsIndex("voice_clones_fts", "voice_clones", ("name", "description"))
+
+INDEXES = (CONTENT_FTS, SAMPLES_FTS, CLONES_FTS)
+
+
+def match_query(search: str) -> str | None:
+    """Turn free text into an FTS5 query that prefix-matches every word.
+
+    Words are quoted so FTS5 operators and punctuation in user input are
+    matched literally. Returns None when ``search`` has no words.
+    """
+    words = [word.replace('"', '""') for word in search.split()]
+    if not words:
+        return None
+    return " ".join(f'"{word}"*' for word in words)
+
+
+def _exists(connection: Connection, name: str) -> bool:
+    found = connection.execute(
+        sql("SELECT 1 FROM sqlite_master WHERE name = :name"), {"name": name}
+    ).first()
+    return found is not None
+
+
+def create_search_indexes(_target: Any, connection: Connection, **_kw: Any) -> None:
+    """Create missing FTS tables and triggers, backfilling any new index."""
+    if connection.dialect.name != "sqlite":
+        return
+    for index in INDEXES:
+        if not _exists(connection, index.source):
+            continue
+        created = not _exists(connection, index.name)
+        for statement in index.create_statements():
+            connection.execute(sql(statement))
+        if created:
+            connection.execute(sql(f"INSERT INTO {index.name}({index.name}) VALUES ('rebuild')"))
+
+
+def drop_search_indexes(_target: Any, connection: Connection, **_kw: Any) -> None:
+    """Drop the FTS tables and their triggers."""
+    if connection.dialect.name != "sqlite":
+        return
+    for index in INDEXES:
+        for suffix in ("ai", "ad", "au"):
+            connection.execute(sql(f"DROP TRIGGER IF EXISTS {index.name}_{suffix}"))
+        connection.execute(sql(f"DROP TABLE IF EXISTS {index.name}"))
+
+
+def rebuild_search_indexes(connection: Connection) -> None:
+    """Re-derive every existing index from its source table, renumbered rowids included."""
+    if connection.dialect.name != "sqlite":
+        return
+    for index in INDEXES:
+        if _exists(connection, index.name):
+            connection.execute(sql(f"INSERT INTO {index.name}({index.name}) VALUES ('rebuild')"))
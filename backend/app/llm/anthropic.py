@@ -1,20 +1,53 @@
 """Anthropic LLM provider implementation."""
 
+import json
 from collections.abc import AsyncIterator
 from typing import cast
 
 import anthropic
-from anthropic.types import MessageParam, TextBlock, TextDelta
+import httpx
+from anthropic import Omit, omit
+from anthropic.types import (
+    Message,
+    MessageParam,
+    TextBlock,
+    TextBlockParam,
+    TextDelta,
+    ToolChoiceParam,
+    ToolParam,
+    ToolUseBlock,
+    Usage,
+)
+from pydantic import BaseModel
 
-from app.exceptions import LLMAuthError, LLMRateLimitError
+from app.exceptions import LLMAuthError, LLMNetworkError, LLMRateLimitError
+from app.llm.base import CACHE_CONTROL, retry_after_from_headers
+from app.llm.structured import complete_structured
+from app.llm.tokenizer import count_tokens
+from app.llm.usage import PromptCacheUsage, as_count, report_usage
+
+# Name of the single tool complete_json forces the model to call.
+_JSON_TOOL = "respond"
 
 
 class AnthropicProvider:
     """LLM provider backed by the Anthropic Messages API."""
 
-    def __init__(self, api_key: str, default_model: str = "claude-sonnet-4-5-20250929") -> None:
-        self._client = anthropic.AsyncAnthropic(api_key=api_key)
+    def __init__(
+        self,
+        api_key: str,
+        default_model: str = "claude-sonnet-4-5-20250929",
+        *,
+        limits: httpx.Limits | None = None,
+        usage: PromptCacheUsage | None = None,
+    ) -> None:
+        http_client = anthropic.DefaultAsyncHttpxClient(limits=limits) if limits else None
+        # Retries are owned by app.llm.base.RetryPolicy, not the SDK.
+        self._client = anthropic.AsyncAnthropic(
+            api_key=api_key, http_client=http_client, max_retries=0
+        )
         self._default_model = default_model
+        self._usage = usage
 
     async def complete(
         self,
@@ -25,19 +58,12 @@ class AnthropicProvider:
         max_tokens: int = 4096,
     ) -> str:
         """Send a non-streaming request and return the text response."""
-        system_msg, user_messages = self._split_system(messages)
-        try:
-            response = await self._client.messages.create(
-                model=model or self._default_model,
-                system=system_msg,
-                messages=user_messages,
-                temperature=temperature,
-                max_tokens=max_tokens,
-            )
-        except anthropic.AuthenticationError as exc:
-            raise LLMAuthError(provider="anthropic", detail=str(exc)) from exc
-        except anthropic.RateLimitError as exc:
-            raise LLMRateLimitError(provider="anthropic", detail=str(exc)) from exc
+        response = await self._create(
+            messages,
+            model=model or self._default_model,
+            temperature=temperature,
+            max_tokens=max_tokens,
+        )
 
         # Extract text from the first TextBlock in the response.
         for block in response.content:
@@ -45,6 +71,43 @@ class AnthropicProvider:
                 return block.text
         return ""
 
+    async def complete_json[T: BaseModel](
+        self,
+        messages: list[dict[str, str]],
+        *,
+        schema: type[T],
+        model: str | None = None,
+        temperature: float = 0.7,
+        max_tokens: int = 4096,
+    ) -> T:
+        """Force a single tool call whose input schema is ``schema`` and validate its input.
+
+        Anthropic has no bare JSON mode; a forced tool call is its
+        structured-output mechanism.
+        """
+        tool: ToolParam = {
+            "name": _JSON_TOOL,
+            "description": f"Record the {schema.__name__} result.",
+            "input_schema": schema.model_json_schema(),
+        }
+
+        async def send(attempt: list[dict[str, str]]) -> str:
+            response = await self._create(
+                attempt,
+                model=model or self._default_model,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                tools=[tool],
+                tool_choice={"type": "tool", "name": _JSON_TOOL},
+            )
+            for block in response.content:
+                if isinstance(block, ToolUseBlock):
+                    return json.dumps(block.input)
+            # No tool call (e.g. truncated); let the text go through repair.
+            return "".join(block.text for block in response.content if isinstance(block, TextBlock))
+
+        return await complete_structured(send, messages, schema, provider="anthropic")
+
     async def stream(
         self,
         messages: list[dict[str, str]],
@@ -55,20 +118,46 @@ class AnthropicProvider:
     ) -> AsyncIterator[str]:
         """Yield text chunks from a streaming response."""
         system_msg, user_messages = self._split_system(messages)
-        async with self._client.messages.stream(
-            model=model or self._default_model,
-            system=system_msg,
-            messages=user_messages,
-            temperature=temperature,
-            max_tokens=max_tokens,
-        ) as stream:
-            async for event in stream:
-                if event.type == "content_block_delta" and isinstance(event.delta, TextDelta):
-                    yield event.delta.text
+        target = model or self._default_model
+        try:
+            async with self._client.messages.stream(
+                model=target,
+                system=system_msg,
+                messages=user_messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+            ) as stream:
+                initial_output = 0
+                async for event in stream:
+                    if event.type == "message_start":
+                        self._record_usage(target, event.message.usage)
+                        initial_output = as_count(event.message.usage.output_tokens)
+                    elif event.type == "message_delta":
+                        # Cumulative output count; message_start reported the first part.
+                        report_usage(
+                            output_tokens=as_count(event.usage.output_tokens) - initial_output
+                        )
+                    elif event.type == "content_block_delta" and isinstance(event.delta, TextDelta):
+                        yield event.delta.text
+        except anthropic.AuthenticationError as exc:
+            raise LLMAuthError(provider="anthropic", detail=str(exc)) from exc
+        except anthropic.RateLimitError as exc:
+            raise LLMRateLimitError(
+                provider="anthropic",
+                detail=str(exc),
+                retry_after=retry_after_from_headers(exc.response.headers),
+            ) from exc
+        except anthropic.APIConnectionError as exc:
+            raise LLMNetworkError(provider="anthropic", detail=str(exc)) from exc
+        except anthropic.APIStatusError as exc:
+            # 5xx and 529 overloaded are transient; other statuses are not.
+            if exc.status_code < 500:
+                raise
+            raise LLMNetworkError(provider="anthropic", detail=str(exc)) from exc
 
     async def count_tokens(self, text: str) -> int:
-        """Approximate token count (1 token ~ 4 chars)."""
-        return len(text) // 4
+        """Count tokens offline with the default model's tokenizer."""
+        return count_tokens(text, self._default_model)
 
     async def test_connection(self) -> bool:
         """Test connectivity by sending a minimal API call."""
@@ -82,20 +171,89 @@ class AnthropicProvider:
             return False
         return True
 
+    async def aclose(self) -> None:
+        """Close the underlying HTTP connection pool."""
+        await self._client.close()
+
+    async def _create(
+        self,
+        messages: list[dict[str, str]],
+        *,
+        model: str,
+        temperature: float,
+        max_tokens: int,
+        tools: list[ToolParam] | Omit = omit,
+        tool_choice: ToolChoiceParam | Omit = omit,
+    ) -> Message:
+        system_msg, user_messages = self._split_system(messages)
+        try:
+            response = await self._client.messages.create(
+                model=model,
+                system=system_msg,
+                messages=user_messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                tools=tools,
+                tool_choice=tool_choice,
+            )
+        except anthropic.AuthenticationError as exc:
+            raise LLMAuthError(provider="anthropic", detail=str(exc)) from exc
+        except anthropic.RateLimitError as exc:
+            raise LLMRateLimitError(
+                provider="anthropic",
+                detail=str(exc),
+                retry_after=retry_after_from_headers(exc.response.headers),
+            ) from exc
+        except anthropic.APIConnectionError as exc:
+            raise LLMNetworkError(provider="anthropic", detail=str(exc)) from exc
+        except anthropic.APIStatusError as exc:
+            # 5xx and 529 overloaded are transient; other statuses are not.
+            if exc.status_code < 500:
+                raise
+            raise LLMNetworkError(provider="anthropic", detail=str(exc)) from exc
+
+        self._record_usage(model, response.usage)
+        return response
+
+    def _record_usage(self, model: str, usage: Usage) -> None:
+        """Report uncached, cache-read, cache-write input and output token counts."""
+        cached = as_count(usage.cache_read_input_tokens)
+        written = as_count(usage.cache_creation_input_tokens)
+        input_tokens = as_count(usage.input_tokens) + cached + written
+        report_usage(
+            input_tokens=input_tokens,
+            output_tokens=as_count(usage.output_tokens),
+            cached_input_tokens=cached,
+            cache_write_tokens=written,
+        )
+        if self._usage is not None:
+            self._usage.record(
+                "anthropic",
+                model,
+                input_tokens=input_tokens,
+                cached_input_tokens=cached,
+                cache_write_tokens=written,
+            )
+
     @staticmethod
     def _split_system(
         messages: list[dict[str, str]],
-    ) -> tuple[str, list[MessageParam]]:
-        """Extract the system message from the message list.
+    ) -> tuple[list[TextBlockParam] | Omit, list[MessageParam]]:
+        """Extract the system messages from the message list.
 
         Anthropic Messages API takes system as a top-level parameter,
-        not as a message in the list.
+        not as a message in the list. Each system message becomes a text
+        block; cache-marked ones end with an ephemeral cache breakpoint so
+        the stable prefix is read from Anthropic's prompt cache.
         """
-        system = ""
+        system: list[TextBlockParam] = []
         user_messages: list[MessageParam] = []
         for msg in messages:
             if msg["role"] == "system":
-                system = msg["content"]
+                block: TextBlockParam = {"type": "text", "text": msg["content"]}
+                if CACHE_CONTROL in msg:
+                    block["cache_control"] = {"type": "ephemeral"}
+                system.append(block)
             else:
                 user_messages.append(cast(MessageParam, msg))
-        return system, user_messages
+        return system or omit, user_messages
@@ -1,17 +1,29 @@
-"""LLM provider protocol and retry decorator."""
+"""LLM provider protocol and retry policy."""
 
 import asyncio
 import functools
-from collections.abc import AsyncIterator, Awaitable, Callable
+import random
+import re
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable, Mapping
+from contextvars import ContextVar
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from email.utils import parsedate_to_datetime
 from typing import Protocol, runtime_checkable
 
+from pydantic import BaseModel
+
 from app.exceptions import LLMAuthError, LLMNetworkError, LLMQuotaError, LLMRateLimitError
 
-_MAX_RETRIES = 2
-_BACKOFF_DELAYS = (1.0, 3.0)
 _RETRYABLE = (LLMRateLimitError, LLMNetworkError)
 _NON_RETRYABLE = (LLMAuthError, LLMQuotaError)
 
+# Optional message key marking the end of a stable, cacheable prompt prefix.
+# Providers with explicit prompt caching turn it into a cache breakpoint; the
+# others drop it before sending so the prefix stays byte-identical.
+CACHE_CONTROL = "cache_control"
+
 
 @runtime_checkable
 class LLMProvider(Protocol):
@@ -26,7 +38,17 @@ class LLMProvider(Protocol):
         max_tokens: int = 4096,
     ) -> str: ...
 
-    async def stream(
+    async def complete_json[T: BaseModel](
+        self,
+        messages: list[dict[str, str]],
+        *,
+        schema: type[T],
+        model: str | None = None,
+        temperature: float = 0.7,
+        max_tokens: int = 4096,
+    ) -> T: ...
+
+    def stream(
         self,
         messages: list[dict[str, str]],
         *,
@@ -40,27 +62,195 @@ class LLMProvider(Protocol):
     async def test_connection(self) -> bool: ...
 
 
+@runtime_checkable
+class SupportsAclose(Protocol):
+    """Provider that owns a client (HTTP pool, DB handle) needing explicit close."""
+
+    async def aclose(self) -> None: ...
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """How often and how long to retry transient LLM errors.
+
+    Backoff uses full jitter — a uniform draw from ``[0, min(max_delay,
+    base_delay * 2**attempt)]`` — so callers that failed together do not
+    retry together. A server ``retry_after`` hint on LLMRateLimitError is
+    treated as a floor and the jitter is added on top. Retrying stops early
+    when the next sleep would end past ``deadline`` seconds from the first
+    attempt (None means unbounded).
+    """
+
+    max_retries: int = 2
+    base_delay: float = 1.0
+    max_delay: float = 10.0
+    deadline: float | None = 30.0
+
+    def backoff(self, attempt: int, error: Exception) -> float:
+        """Return the sleep before retry number ``attempt + 1``."""
+        delay = random.uniform(0.0, min(self.max_delay, self.base_delay * 2**attempt))
+        retry_after = getattr(error, "retry_after", None)
+        if isinstance(retry_after, int | float):
+            delay += float(retry_after)
+        return delay
+
+
+_RETRY_ATTEMPT: ContextVar[int] = ContextVar("llm_retry_attempt", default=0)
+
+
+def retry_attempt() -> int:
+    """Return how many retries preceded the current provider call (0 on the first try)."""
+    return _RETRY_ATTEMPT.get()
+
+
+# Interactive streams surface errors quickly; a user is watching the spinner.
+INTERACTIVE_RETRY = RetryPolicy(max_retries=1, base_delay=0.5, max_delay=2.0, deadline=5.0)
+DEFAULT_RETRY = RetryPolicy()
+
+
 def with_retry[T, **P](
     fn: Callable[P, Awaitable[T]],
+    policy: RetryPolicy = DEFAULT_RETRY,
 ) -> Callable[P, Awaitable[T]]:
     """Wrap an async callable with retry logic for transient LLM errors.
 
-    Retries up to 2 times (3 total attempts) on LLMRateLimitError and LLMNetworkError.
-    Raises immediately on LLMAuthError and LLMQuotaError.
+    Retries up to ``policy.max_retries`` times on LLMRateLimitError and
+    LLMNetworkError, giving up early if the backoff would cross the policy
+    deadline. Raises immediately on LLMAuthError and LLMQuotaError.
     """
 
     @functools.wraps(fn)
     async def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
-        last_error: Exception | None = None
-        for attempt in range(_MAX_RETRIES + 1):
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            token = _RETRY_ATTEMPT.set(attempt)
             try:
                 return await fn(*args, **kwargs)
             except _NON_RETRYABLE:
                 raise
             except _RETRYABLE as exc:
-                last_error = exc
-                if attempt < _MAX_RETRIES:
-                    await asyncio.sleep(_BACKOFF_DELAYS[attempt])
-        raise last_error  # type: ignore[misc]
+                delay = _next_delay(policy, attempt, exc, started)
+                if delay is None:
+                    raise
+            finally:
+                _RETRY_ATTEMPT.reset(token)
+            await asyncio.sleep(delay)
+            attempt += 1
 
     return wrapper
+
+
+async def stream_with_retry(
+    open_stream: Callable[[], AsyncIterator[str]],
+    policy: RetryPolicy = INTERACTIVE_RETRY,
+) -> AsyncIterator[str]:
+    """Yield from ``open_stream()``, retrying transient errors until the first chunk.
+
+    Once a chunk has been yielded the error propagates — replaying a partial
+    stream would duplicate text the caller has already shown.
+    """
+    started = time.monotonic()
+    attempt = 0
+    while True:
+        received = False
+        # Restored by value: the generator may be closed from another context.
+        previous = _RETRY_ATTEMPT.get()
+        _RETRY_ATTEMPT.set(attempt)
+        try:
+            async for chunk in open_stream():
+                received = True
+                yield chunk
+            return
+        except _NON_RETRYABLE:
+            raise
+        except _RETRYABLE as exc:
+            delay = None if received else _next_delay(policy, attempt, exc, started)
+            if delay is None:
+                raise
+        finally:
+            _RETRY_ATTEMPT.set(previous)
+        await asyncio.sleep(delay)
+        attempt += 1
+
+
+def _next_delay(
+    policy: RetryPolicy, attempt: int, error: Exception, started: float
+) -> float | None:
+    """Return the backoff for the next retry, or None when retries are exhausted."""
+    if attempt >= policy.max_retries:
+        return None
+    delay = policy.backoff(attempt, error)
+    if policy.deadline is not None and time.monotonic() - started + delay > policy.deadline:
+        return None
+    return delay
+
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+_RESET_HEADERS = (
+    "x-ratelimit-reset-requests",
+    "x-ratelimit-reset-tokens",
+    "anthropic-ratelimit-requests-reset",
+    "anthropic-ratelimit-tokens-reset",
+    "anthropic-ratelimit-input-tokens-reset",
+    "anthropic-ratelimit-output-tokens-reset",
+)
+
+
+def retry_after_from_headers(headers: Mapping[str, str]) -> float | None:
+    """Return seconds to wait according to rate-limit response headers, if any.
+
+    Understands ``retry-after-ms``, ``retry-after`` (seconds or HTTP date),
+    OpenAI's ``x-ratelimit-reset-*`` durations (``"6m0s"``) and Anthropic's
+    ``anthropic-ratelimit-*-reset`` timestamps. Explicit retry-after wins;
+    otherwise the latest reset is used.
+    """
+    retry_after_ms = _header(headers, "retry-after-ms")
+    if retry_after_ms is not None:
+        try:
+            return max(0.0, float(retry_after_ms) / 1000)
+        except ValueError:
+            pass
+
+    retry_after = _header(headers, "retry-after")
+    if retry_after is not None:
+        seconds = _parse_seconds(retry_after)
+        if seconds is not None:
+            return seconds
+
+    resets = [
+        seconds
+        for name in _RESET_HEADERS
+        if (value := _header(headers, name)) is not None
+        and (seconds := _parse_seconds(value)) is not None
+    ]
+    return max(resets) if resets else None
+
+
+def _header(headers: Mapping[str, str], name: str) -> str | None:
+    value = headers.get(name)
+    return value.strip() if isinstance(value, str) and value.strip() else None
+
+
+def _parse_seconds(value: str) -> float | None:
+    """Parse a delay in seconds, a Go-style duration, or an absolute date/timestamp."""
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    parts = _DURATION_PART.findall(value)
+    if parts and "".join(num + unit for num, unit in parts) == value:
+        return sum(float(num) * _DURATION_UNITS[unit] for num, unit in parts)
+
+    try:
+        when = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        try:
+            when = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=UTC)
+    return max(0.0, (when - datetime.now(UTC)).total_seconds())
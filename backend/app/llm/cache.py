@@ -0,0 +1,316 @@
+"""Two-tier completion cache — in-memory LRU in front of a SQLite store."""
+
+import asyncio
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Generator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from pathlib import Path
+
+import aiosqlite
+from pydantic import BaseModel, ValidationError
+
+from app.llm.base import LLMProvider, SupportsAclose
+
+_BYPASS: ContextVar[bool] = ContextVar("llm_cache_bypass", default=False)
+
+
+@contextmanager
+def bypass_cache() -> Generator[None]:
+    """Send the completions made inside the block upstream, skipping the cache.
+
+    Scoped by context rather than passed per call, so it reaches the
+    CachedProvider through any wrappers stacked above it. Tasks started
+    inside the block inherit it.
+    """
+    previous = _BYPASS.get()
+    _BYPASS.set(True)
+    try:
+        yield
+    finally:
+        _BYPASS.set(previous)
+
+
+def cache_key(
+    *,
+    provider: str,
+    model: str,
+    temperature: float,
+    max_tokens: int,
+    messages: list[dict[str, str]],
+    schema: str | None = None,
+) -> str:
+    """Return a stable hash of a completion request.
+
+    Messages are normalized to their role/content pair with surrounding
+    whitespace stripped, so cosmetic differences do not split the cache.
+    Structured (``complete_json``) requests are keyed by their schema name too.
+    """
+    normalized = [
+        {"role": msg.get("role", "user"), "content": msg.get("content", "").strip()}
+        for msg in messages
+    ]
+    request: dict[str, object] = {
+        "provider": provider,
+        "model": model,
+        "temperature": round(temperature, 3),
+        "max_tokens": max_tokens,
+        "messages": normalized,
+    }
+    if schema is not None:
+        request["schema"] = schema
+    payload = json.dumps(
+        request,
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    """Snapshot of completion cache counters."""
+
+    hits: int
+    memory_hits: int
+    misses: int
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class CompletionCache:
+    """Completion cache with an LRU memory tier and a TTL/size-bounded SQLite tier."""
+
+    def __init__(
+        self,
+        db_path: Path,
+        *,
+        ttl_seconds: float,
+        max_entries: int,
+        memory_entries: int = 256,
+    ) -> None:
+        self._db_path = db_path
+        self._ttl = ttl_seconds
+        self._max_entries = max_entries
+        self._memory_entries = memory_entries
+        self._memory: OrderedDict[str, tuple[str, float]] = OrderedDict()
+        self._conn: aiosqlite.Connection | None = None
+        self._open_lock = asyncio.Lock()
+        self.hits = 0
+        self.memory_hits = 0
+        self.misses = 0
+
+    def stats(self) -> CacheStats:
+        return CacheStats(hits=self.hits, memory_hits=self.memory_hits, misses=self.misses)
+
+    async def get(self, key: str) -> str | None:
+        """Return the cached completion for key, or None on miss/expiry."""
+        now = time.time()
+        cached = self._memory.get(key)
+        if cached is not None:
+            value, created_at = cached
+            if now - created_at < self._ttl:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                self.memory_hits += 1
+                return value
+            del self._memory[key]
+
+        conn = await self._connect()
+        async with conn.execute(
+            "SELECT value, created_at FROM completions WHERE key = ? AND created_at >= ?",
+            (key, now - self._ttl),
+        ) as cursor:
+            row = await cursor.fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+
+        value, created_at = str(row[0]), float(row[1])
+        await conn.execute("UPDATE completions SET accessed_at = ? WHERE key = ?", (now, key))
+        await conn.commit()
+        self._remember(key, value, created_at)
+        self.hits += 1
+        return value
+
+    async def set(self, key: str, value: str) -> None:
+        """Store a completion in both tiers, evicting expired and least-recent rows."""
+        now = time.time()
+        self._remember(key, value, now)
+
+        conn = await self._connect()
+        await conn.execute(
+            "INSERT OR REPLACE INTO completions (key, value, created_at, accessed_at)"
+            " VALUES (?, ?, ?, ?)",
+            (key, value, now, now),
+        )
+        await conn.execute("DELETE FROM completions WHERE created_at < ?", (now - self._ttl,))
+        await conn.execute(
+            "DELETE FROM completions WHERE key IN ("
+            " SELECT key FROM completions ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+            (self._max_entries,),
+        )
+        await conn.commit()
+
+    async def clear(self) -> None:
+        """Remove every cached completion."""
+        self._memory.clear()
+        conn = await self._connect()
+        await conn.execute("DELETE FROM completions")
+        await conn.commit()
+
+    async def aclose(self) -> None:
+        if self._conn is not None:
+            await self._conn.close()
+            self._conn = None
+
+    def _remember(self, key: str, value: str, created_at: float) -> None:
+        self._memory[key] = (value, created_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self._memory_entries:
+            self._memory.popitem(last=False)
+
+    async def _connect(self) -> aiosqlite.Connection:
+        async with self._open_lock:
+            if self._conn is None:
+                self._db_path.parent.mkdir(parents=True, exist_ok=True)
+                conn = await aiosqlite.connect(self._db_path)
+                await conn.execute("PRAGMA journal_mode=WAL")
+                await conn.execute(
+                    "CREATE TABLE IF NOT EXISTS completions ("
+                    " key TEXT PRIMARY KEY,"
+                    " value TEXT NOT NULL,"
+                    " created_at REAL NOT NULL,"
+                    " accessed_at REAL NOT NULL)"
+                )
+                await conn.execute(
+                    "CREATE INDEX IF NOT EXISTS ix_completions_accessed_at"
+                    " ON completions (accessed_at)"
+                )
+                await conn.commit()
+                self._conn = conn
+            return self._conn
+
+
+class CachedProvider:
+    """LLMProvider wrapper that serves repeated low-temperature completions from cache.
+
+    Only calls at or below ``max_temperature`` are cached — higher temperatures
+    are deliberately sampled (generation, A/B variants) and always go upstream,
+    as do calls made inside ``bypass_cache()``.
+    """
+
+    def __init__(
+        self,
+        inner: LLMProvider,
+        cache: CompletionCache,
+        *,
+        provider_name: str,
+        default_model: str,
+        max_temperature: float = 0.3,
+    ) -> None:
+        self._inner = inner
+        self._cache = cache
+        self._provider_name = provider_name
+        self._default_model = default_model
+        self._max_temperature = max_temperature
+
+    async def complete(
+        self,
+        messages: list[dict[str, str]],
+        *,
+        model: str | None = None,
+        temperature: float = 0.7,
+        max_tokens: int = 4096,
+    ) -> str:
+        """Return a cached completion when available, otherwise call upstream and store it."""
+        if not self._cacheable(temperature):
+            return await self._inner.complete(
+                messages, model=model, temperature=temperature, max_tokens=max_tokens
+            )
+
+        key = cache_key(
+            provider=self._provider_name,
+            model=model or self._default_model,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            messages=messages,
+        )
+        cached = await self._cache.get(key)
+        if cached is not None:
+            return cached
+
+        result = await self._inner.complete(
+            messages, model=model, temperature=temperature, max_tokens=max_tokens
+        )
+        await self._cache.set(key, result)
+        return result
+
+    async def complete_json[T: BaseModel](
+        self,
+        messages: list[dict[str, str]],
+        *,
+        schema: type[T],
+        model: str | None = None,
+        temperature: float = 0.7,
+        max_tokens: int = 4096,
+    ) -> T:
+        """Like ``complete``, caching the validated result as its JSON."""
+        if not self._cacheable(temperature):
+            return await self._inner.complete_json(
+                messages, schema=schema, model=model, temperature=temperature, max_tokens=max_tokens
+            )
+
+        key = cache_key(
+            provider=self._provider_name,
+            model=model or self._default_model,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            messages=messages,
+            schema=schema.__name__,
+        )
+        cached = await self._cache.get(key)
+        if cached is not None:
+            try:
+                return schema.model_validate_json(cached)
+            except ValidationError:
+                pass  # Stored under an older schema version — refetch.
+
+        result = await self._inner.complete_json(
+            messages, schema=schema, model=model, temperature=temperature, max_tokens=max_tokens
+        )
+        await self._cache.set(key, result.model_dump_json())
+        return result
+
+    def stream(
+        self,
+        messages: list[dict[str, str]],
+        *,
+        model: str | None = None,
+        temperature: float = 0.7,
+        max_tokens: int = 4096,
+    ) -> AsyncIterator[str]:
+        return self._inner.stream(
+            messages, model=model, temperature=temperature, max_tokens=max_tokens
+        )
+
+    async def count_tokens(self, text: str) -> int:
+        return await self._inner.count_tokens(text)
+
+    async def test_connection(self) -> bool:
+        return await self._inner.test_connection()
+
+    async def aclose(self) -> None:
+        if isinstance(self._inner, SupportsAclose):
+            await self._inner.aclose()
+
+    def _cacheable(self, temperature: float) -> bool:
+        return temperature <= self._max_temperature and not _BYPASS.get()
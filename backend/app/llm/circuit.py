@@ -0,0 +1,227 @@
+"""Per-provider circuit breaker — fail fast while a vendor is down."""
+
+import time
+from collections import deque
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+from enum import StrEnum
+
+from pydantic import BaseModel
+
+from app.exceptions import LLMNetworkError, LLMRateLimitError, ProviderUnavailableError
+from app.llm.base import LLMProvider, SupportsAclose
+
+# Only transient upstream failures say anything about vendor health.
+_BREAKER_ERRORS = (LLMNetworkError, LLMRateLimitError)
+
+
+class CircuitState(StrEnum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+@dataclass(frozen=True)
+class CircuitSnapshot:
+    """Point-in-time view of a breaker for health reporting."""
+
+    state: CircuitState
+    consecutive_failures: int
+    error_rate: float
+    retry_after: float | None
+
+
+class CircuitBreaker:
+    """Closed → open → half-open state machine for one provider.
+
+    Opens after ``failure_threshold`` consecutive failures, or when at least
+    ``min_calls`` of the last ``window`` calls have an error rate of
+    ``error_rate`` or more. While open every call is refused with
+    ProviderUnavailableError. After ``reset_seconds`` up to ``half_open_probes``
+    calls are let through; a probe success closes the breaker, a probe failure
+    re-opens it.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        failure_threshold: int = 5,
+        error_rate: float = 0.5,
+        window: int = 20,
+        min_calls: int = 10,
+        reset_seconds: float = 30.0,
+        half_open_probes: int = 1,
+    ) -> None:
+        self.name = name
+        self._failure_threshold = failure_threshold
+        self._error_rate = error_rate
+        self._min_calls = min_calls
+        self._reset_seconds = reset_seconds
+        self._half_open_probes = half_open_probes
+        self._outcomes: deque[bool] = deque(maxlen=window)
+        self._consecutive_failures = 0
+        self._state = CircuitState.CLOSED
+        self._opened_at = 0.0
+        self._probes = 0
+
+    @property
+    def state(self) -> CircuitState:
+        if self._state is CircuitState.OPEN and self._remaining() <= 0:
+            return CircuitState.HALF_OPEN
+        return self._state
+
+    def snapshot(self) -> CircuitSnapshot:
+        state = self.state
+        return CircuitSnapshot(
+            state=state,
+            consecutive_failures=self._consecutive_failures,
+            error_rate=self._current_error_rate(),
+            retry_after=self._remaining() if state is CircuitState.OPEN else None,
+        )
+
+    def acquire(self) -> bool:
+        """Admit a call or raise ProviderUnavailableError. Returns True for a probe."""
+        if self._state is CircuitState.OPEN:
+            remaining = self._remaining()
+            if remaining > 0:
+                raise ProviderUnavailableError(self.name, remaining)
+            self._state = CircuitState.HALF_OPEN
+            self._probes = 0
+        if self._state is CircuitState.HALF_OPEN:
+            if self._probes >= self._half_open_probes:
+                raise ProviderUnavailableError(self.name, self._reset_seconds)
+            self._probes += 1
+            return True
+        return False
+
+    def record_success(self, *, probe: bool = False) -> None:
+        self._consecutive_failures = 0
+        self._outcomes.append(True)
+        if probe and self._state is CircuitState.HALF_OPEN:
+            self._state = CircuitState.CLOSED
+            self._outcomes.clear()
+
+    def record_failure(self, *, probe: bool = False) -> None:
+        self._consecutive_failures += 1
+        self._outcomes.append(False)
+        if (
+            (probe and self._state is CircuitState.HALF_OPEN)
+            or self._consecutive_failures >= self._failure_threshold
+            or (
+                len(self._outcomes) >= self._min_calls
+                and self._current_error_rate() >= self._error_rate
+            )
+        ):
+            self._open()
+
+    def release(self, *, probe: bool = False) -> None:
+        """Give back a probe slot for a call that ended without a health verdict."""
+        if probe and self._state is CircuitState.HALF_OPEN and self._probes > 0:
+            self._probes -= 1
+
+    def _open(self) -> None:
+        self._state = CircuitState.OPEN
+        self._opened_at = time.monotonic()
+        self._probes = 0
+
+    def _remaining(self) -> float:
+        return self._reset_seconds - (time.monotonic() - self._opened_at)
+
+    def _current_error_rate(self) -> float:
+        if not self._outcomes:
+            return 0.0
+        return self._outcomes.count(False) / len(self._outcomes)
+
+
+class CircuitBreakerProvider:
+    """LLMProvider wrapper that routes calls through a provider's CircuitBreaker.
+
+    ``test_connection`` bypasses the breaker so a manual check still reaches
+    the vendor while the circuit is open.
+    """
+
+    def __init__(self, inner: LLMProvider, breaker: CircuitBreaker) -> None:
+        self._inner = inner
+        self._breaker = breaker
+
+    async def complete(
+        self,
+        messages: list[dict[str, str]],
+        *,
+        model: str | None = None,
+        temperature: float = 0.7,
+        max_tokens: int = 4096,
+    ) -> str:
+        probe = self._breaker.acquire()
+        try:
+            result = await self._inner.complete(
+                messages, model=model, temperature=temperature, max_tokens=max_tokens
+            )
+        except _BREAKER_ERRORS:
+            self._breaker.record_failure(probe=probe)
+            raise
+        except BaseException:
+            self._breaker.release(probe=probe)
+            raise
+        self._breaker.record_success(probe=probe)
+        return result
+
+    async def complete_json[T: BaseModel](
+        self,
+        messages: list[dict[str, str]],
+        *,
+        schema: type[T],
+        model: str | None = None,
+        temperature: float = 0.7,
+        max_tokens: int = 4096,
+    ) -> T:
+        probe = self._breaker.acquire()
+        try:
+            result = await self._inner.complete_json(
+                messages,
+                schema=schema,
+                model=model,
+                temperature=temperature,
+                max_tokens=max_tokens,
+            )
+        except _BREAKER_ERRORS:
+            self._breaker.record_failure(probe=probe)
+            raise
+        except BaseException:
+            self._breaker.release(probe=probe)
+            raise
+        self._breaker.record_success(probe=probe)
+        return result
+
+    async def stream(
+        self,
+        messages: list[dict[str, str]],
+        *,
+        model: str | None = None,
+        temperature: float = 0.7,
+        max_tokens: int = 4096,
+    ) -> AsyncIterator[str]:
+        probe = self._breaker.acquire()
+        try:
+            async for chunk in self._inner.stream(
+                messages, model=model, temperature=temperature, max_tokens=max_tokens
+            ):
+                yield chunk
+        except _BREAKER_ERRORS:
+            self._breaker.record_failure(probe=probe)
+            raise
+        except BaseException:
+            self._breaker.release(probe=probe)
+            raise
+        self._breaker.record_success(probe=probe)
+
+    async def count_tokens(self, text: str) -> int:
+        return await self._inner.count_tokens(text)
+
+    async def test_connection(self) -> bool:
+        return await self._inner.test_connection()
+
+    async def aclose(self) -> None:
+        if isinstance(self._inner, SupportsAclose):
+            await self._inner.aclose()
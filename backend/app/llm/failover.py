@@ -0,0 +1,220 @@
+"""Ordered multi-provider failover with latency-percentile timeouts and hedging."""
+
+import asyncio
+import math
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Awaitable, Callable
+from dataclasses import dataclass
+
+from pydantic import BaseModel
+
+from app.exceptions import LLMNetworkError, LLMRateLimitError, ProviderUnavailableError
+from app.llm.base import LLMProvider
+
+_FAILOVER_ERRORS = (LLMNetworkError, LLMRateLimitError, ProviderUnavailableError)
+
+
+class LatencyTracker:
+    """Rolling window of successful call latencies for one provider."""
+
+    def __init__(self, window: int = 200, min_samples: int = 20) -> None:
+        self._samples: deque[float] = deque(maxlen=window)
+        self._min_samples = min_samples
+
+    def record(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def percentile(self, q: float) -> float | None:
+        """Return the q-quantile (0 to 1) latency, or None until enough samples exist."""
+        if len(self._samples) < self._min_samples:
+            return None
+        ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, max(0, math.ceil(q * len(ordered)) - 1))
+        return ordered[index]
+
+
+@dataclass(frozen=True)
+class FailoverTarget:
+    """One provider in a failover chain."""
+
+    name: str
+    provider: LLMProvider
+    latency: LatencyTracker
+
+
+class FailoverProvider:
+    """LLMProvider that tries providers in order until one answers.
+
+    A target is skipped on LLMNetworkError, LLMRateLimitError, an open circuit
+    (ProviderUnavailableError), or when a call runs past the target's
+    ``timeout_percentile`` latency (floored at ``min_timeout``; no timeout
+    until the tracker has enough samples). An explicit ``model`` only applies
+    to the first target — fallbacks use their own default model.
+
+    With ``hedge`` enabled, once a call has run past the target's
+    ``hedge_percentile`` latency a duplicate is sent to the next target and
+    whichever answers first wins; the loser is cancelled. Streams fail over
+    only before their first chunk and are never hedged.
+    """
+
+    def __init__(
+        self,
+        targets: list[FailoverTarget],
+        *,
+        timeout_percentile: float = 0.99,
+        min_timeout: float = 30.0,
+        hedge: bool = False,
+        hedge_percentile: float = 0.95,
+    ) -> None:
+        if not targets:
+            msg = "FailoverProvider needs at least one target"
+            raise ValueError(msg)
+        self._targets = targets
+        self._timeout_percentile = timeout_percentile
+        self._min_timeout = min_timeout
+        self._hedge = hedge
+        self._hedge_percentile = hedge_percentile
+
+    @property
+    def targets(self) -> list[FailoverTarget]:
+        return list(self._targets)
+
+    async def complete(
+        self,
+        messages: list[dict[str, str]],
+        *,
+        model: str | None = None,
+        temperature: float = 0.7,
+        max_tokens: int = 4096,
+    ) -> str:
+        def call(index: int) -> Awaitable[str]:
+            target = self._targets[index]
+            return self._timed(
+                target,
+                target.provider.complete(
+                    messages,
+                    model=model if index == 0 else None,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                ),
+            )
+
+        return await self._failover(call)
+
+    async def complete_json[T: BaseModel](
+        self,
+        messages: list[dict[str, str]],
+        *,
+        schema: type[T],
+        model: str | None = None,
+        temperature: float = 0.7,
+        max_tokens: int = 4096,
+    ) -> T:
+        def call(index: int) -> Awaitable[T]:
+            target = self._targets[index]
+            return self._timed(
+                target,
+                target.provider.complete_json(
+                    messages,
+                    schema=schema,
+                    model=model if index == 0 else None,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                ),
+            )
+
+        return await self._failover(call)
+
+    async def stream(
+        self,
+        messages: list[dict[str, str]],
+        *,
+        model: str | None = None,
+        temperature: float = 0.7,
+        max_tokens: int = 4096,
+    ) -> AsyncIterator[str]:
+        for index, target in enumerate(self._targets):
+            received = False
+            try:
+                async for chunk in target.provider.stream(
+                    messages,
+                    model=model if index == 0 else None,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                ):
+                    received = True
+                    yield chunk
+                return
+            except _FAILOVER_ERRORS:
+                if received or index + 1 == len(self._targets):
+                    raise
+
+    async def count_tokens(self, text: str) -> int:
+        return await self._targets[0].provider.count_tokens(text)
+
+    async def test_connection(self) -> bool:
+        return await self._targets[0].provider.test_connection()
+
+    async def _failover[T](self, call: Callable[[int], Awaitable[T]]) -> T:
+        """Try targets in order (racing pairs when hedging) until one succeeds."""
+        index = 0
+        while True:
+            hedged = self._hedge and index + 1 < len(self._targets)
+            try:
+                if hedged:
+                    return await self._hedged(index, call)
+                return await call(index)
+            except _FAILOVER_ERRORS:
+                index += 2 if hedged else 1
+                if index >= len(self._targets):
+                    raise
+
+    async def _timed[T](self, target: FailoverTarget, call: Awaitable[T]) -> T:
+        """Await a call under the target's percentile timeout, recording its latency."""
+        timeout = target.latency.percentile(self._timeout_percentile)
+        if timeout is not None:
+            timeout = max(timeout, self._min_timeout)
+        started = time.monotonic()
+        try:
+            result = await asyncio.wait_for(call, timeout)
+        except TimeoutError as exc:
+            raise LLMNetworkError(
+                provider=target.name,
+                detail=f"Provider '{target.name}' timed out after {timeout:.1f}s",
+            ) from exc
+        target.latency.record(time.monotonic() - started)
+        return result
+
+    async def _hedged[T](self, index: int, call: Callable[[int], Awaitable[T]]) -> T:
+        """Race target ``index`` against ``index + 1`` once the first is slow."""
+        delay = self._targets[index].latency.percentile(self._hedge_percentile)
+        first = asyncio.ensure_future(call(index))
+        try:
+            await asyncio.wait({first}, timeout=delay)
+        except asyncio.CancelledError:
+            first.cancel()
+            raise
+        if first.done():
+            error = first.exception()
+            if error is None:
+                return first.result()
+            if not isinstance(error, _FAILOVER_ERRORS):
+                raise error
+            # Primary failed before the hedge fired — plain failover to the backup.
+            return await call(index + 1)
+
+        second = asyncio.ensure_future(call(index + 1))
+        try:
+            done, _ = await asyncio.wait({first, second}, return_when=asyncio.FIRST_COMPLETED)
+            winner = next(iter(done))
+            error = winner.exception()
+            if error is None:
+                return winner.result()
+            if not isinstance(error, _FAILOVER_ERRORS):
+                raise error
+            # The first to finish failed over; the other one is the last chance.
+            return await (second if winner is first else first)
+        finally:
+            first.cancel()
+            second.cancel()
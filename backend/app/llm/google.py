@@ -2,39 +2,89 @@
 
 # pyright: reportPrivateImportUsage=false, reportUnknownMemberType=false
 
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
 from collections.abc import AsyncIterator
+from datetime import timedelta
 from typing import Any
 
 import google.generativeai as genai  # type: ignore[import-untyped]
 from google.api_core import exceptions as google_exceptions
+from google.generativeai import caching
+from google.generativeai.types import ContentDict, GenerationConfigDict
+from pydantic import BaseModel
 
 from app.exceptions import LLMAuthError, LLMNetworkError, LLMRateLimitError
+from app.llm.base import CACHE_CONTROL
+from app.llm.structured import complete_structured
+from app.llm.tokenizer import count_tokens
+from app.llm.usage import PromptCacheUsage, as_count, report_usage
 
 _AUTH_ERRORS = (google_exceptions.PermissionDenied, google_exceptions.Unauthenticated)
 _RATE_ERRORS = (google_exceptions.ResourceExhausted,)
 _NETWORK_ERRORS = (google_exceptions.ServiceUnavailable,)
 
+# GenerativeModel instances are keyed by (model, system instruction); the
+# per-platform instructions vary, so the cache is bounded.
+_MODEL_CACHE_SIZE = 64
 
-def _to_contents(messages: list[dict[str, str]]) -> list[str]:
-    """Convert role/content message dicts to a flat list of strings for Gemini."""
-    parts: list[str] = []
+# Gemini rejects explicit context caches smaller than this.
+_CONTEXT_CACHE_MIN_TOKENS = 4096
+# Stop using a context cache this many seconds before its TTL runs out.
+_CONTEXT_CACHE_MARGIN = 60.0
+
+
+def _split_prompt(
+    messages: list[dict[str, str]],
+) -> tuple[str | None, str | None, list[ContentDict]]:
+    """Split messages into (cacheable prefix, other system text, conversation turns).
+
+    The prefix is the system text marked with ``CACHE_CONTROL``; Gemini takes
+    system text as a ``system_instruction`` rather than as a conversation turn.
+    """
+    prefix: list[str] = []
+    system: list[str] = []
+    contents: list[ContentDict] = []
     for msg in messages:
         role = msg.get("role", "user")
-        content = msg["content"]
         if role == "system":
-            parts.append(f"[System instruction]: {content}")
+            (prefix if CACHE_CONTROL in msg else system).append(msg["content"])
         else:
-            parts.append(content)
-    return parts
+            contents.append(
+                {"role": "model" if role == "assistant" else "user", "parts": [msg["content"]]}
+            )
+    return "\n\n".join(prefix) or None, "\n\n".join(system) or None, contents
 
 
 class GoogleProvider:
     """LLM provider backed by Google's Generative AI (Gemini) API."""
 
-    def __init__(self, api_key: str, default_model: str = "gemini-2.0-flash") -> None:
+    def __init__(
+        self,
+        api_key: str,
+        default_model: str = "gemini-2.0-flash",
+        *,
+        usage: PromptCacheUsage | None = None,
+        context_cache_ttl: float = 0.0,
+    ) -> None:
+        """Create the provider.
+
+        Args:
+            context_cache_ttl: Lifetime in seconds of the explicit Gemini
+                context caches created for large cache-marked prompt prefixes;
+                0 disables them.
+        """
         genai.configure(api_key=api_key)
         self._model: Any = genai.GenerativeModel(default_model)
         self._default_model = default_model
+        self._usage = usage
+        self._models: OrderedDict[tuple[str, str | None], Any] = OrderedDict()
+        self._context_cache_ttl = context_cache_ttl
+        # (model, prefix hash) -> (cached-content model or None, usable until)
+        self._context_caches: dict[tuple[str, str], tuple[Any, float]] = {}
+        self._context_cache_lock = asyncio.Lock()
 
     async def complete(
         self,
@@ -44,14 +94,57 @@ class GoogleProvider:
         temperature: float = 0.7,
         max_tokens: int = 4096,
     ) -> str:
-        target = self._model if model is None else genai.GenerativeModel(model)
-        contents = _to_contents(messages)
+        return await self._generate(
+            messages,
+            model=model,
+            generation_config={"temperature": temperature, "max_output_tokens": max_tokens},
+        )
+
+    async def complete_json[T: BaseModel](
+        self,
+        messages: list[dict[str, str]],
+        *,
+        schema: type[T],
+        model: str | None = None,
+        temperature: float = 0.7,
+        max_tokens: int = 4096,
+    ) -> T:
+        """Complete in JSON mode and validate against ``schema``.
+
+        Gemini's ``response_schema`` cannot express open-ended objects such as
+        the DNA profile, so only the JSON MIME type is enforced upstream.
+        """
+        generation_config: GenerationConfigDict = {
+            "temperature": temperature,
+            "max_output_tokens": max_tokens,
+            "response_mime_type": "application/json",
+        }
 
+        async def send(attempt: list[dict[str, str]]) -> str:
+            return await self._generate(attempt, model=model, generation_config=generation_config)
+
+        return await complete_structured(send, messages, schema, provider="google")
+
+    async def stream(
+        self,
+        messages: list[dict[str, str]],
+        *,
+        model: str | None = None,
+        temperature: float = 0.7,
+        max_tokens: int = 4096,
+    ) -> AsyncIterator[str]:
+        target, contents = await self._resolve(messages, model)
+
+        last_chunk: Any = None
         try:
             response = await target.generate_content_async(
                 contents,
                 generation_config={"temperature": temperature, "max_output_tokens": max_tokens},
+                stream=True,
             )
+            async for chunk in response:
+                last_chunk = chunk
+                yield str(chunk.text)
         except _AUTH_ERRORS as exc:
             raise LLMAuthError(provider="google", detail=str(exc)) from exc
         except _RATE_ERRORS as exc:
@@ -59,24 +152,26 @@ class GoogleProvider:
         except _NETWORK_ERRORS as exc:
             raise LLMNetworkError(provider="google", detail=str(exc)) from exc
 
-        return str(response.text)
+        # Usage metadata is cumulative; the final chunk carries the totals.
+        if last_chunk is not None:
+            self._record_usage(model or self._default_model, last_chunk)
 
-    async def stream(
+    async def count_tokens(self, text: str) -> int:
+        """Count tokens offline with the default model's tokenizer."""
+        return count_tokens(text, self._default_model)
+
+    async def _generate(
         self,
         messages: list[dict[str, str]],
         *,
-        model: str | None = None,
-        temperature: float = 0.7,
-        max_tokens: int = 4096,
-    ) -> AsyncIterator[str]:
-        target = self._model if model is None else genai.GenerativeModel(model)
-        contents = _to_contents(messages)
+        model: str | None,
+        generation_config: GenerationConfigDict,
+    ) -> str:
+        target, contents = await self._resolve(messages, model)
 
         try:
             response = await target.generate_content_async(
-                contents,
-                generation_config={"temperature": temperature, "max_output_tokens": max_tokens},
-                stream=True,
+                contents, generation_config=generation_config
             )
         except _AUTH_ERRORS as exc:
             raise LLMAuthError(provider="google", detail=str(exc)) from exc
@@ -85,11 +180,96 @@ class GoogleProvider:
         except _NETWORK_ERRORS as exc:
             raise LLMNetworkError(provider="google", detail=str(exc)) from exc
 
-        async for chunk in response:
-            yield str(chunk.text)
+        self._record_usage(model or self._default_model, response)
+        return str(response.text)
 
-    async def count_tokens(self, text: str) -> int:
-        return max(1, len(text) // 4)
+    async def _resolve(
+        self, messages: list[dict[str, str]], model: str | None
+    ) -> tuple[Any, list[ContentDict]]:
+        """Pick the GenerativeModel for a call and the contents to send it."""
+        model_name = model or self._default_model
+        prefix, system, contents = _split_prompt(messages)
+        if prefix is not None and self._context_cache_ttl > 0:
+            cached = await self._context_cached_model(model_name, prefix)
+            if cached is not None:
+                # A cached-content model carries the prefix as its system
+                # instruction and cannot take another, so the rest leads the turns.
+                if system is not None:
+                    lead: ContentDict = {"role": "user", "parts": [system]}
+                    contents = [lead, *contents]
+                return cached, contents
+        instruction = "\n\n".join(part for part in (prefix, system) if part) or None
+        return self._model_for(model_name, instruction), contents
+
+    def _model_for(self, model: str, system_instruction: str | None) -> Any:
+        """Return a cached GenerativeModel for (model, system instruction)."""
+        if model == self._default_model and system_instruction is None:
+            return self._model
+        key = (model, system_instruction)
+        instance = self._models.get(key)
+        if instance is not None:
+            self._models.move_to_end(key)
+            return instance
+        instance = genai.GenerativeModel(model, system_instruction=system_instruction)
+        self._models[key] = instance
+        if len(self._models) > _MODEL_CACHE_SIZE:
+            self._models.popitem(last=False)
+        return instance
+
+    async def _context_cached_model(self, model: str, prefix: str) -> Any:
+        """Return a model bound to an explicit context cache of ``prefix``, or None.
+
+        Prefixes below Gemini's minimum cache size are never cached, nor
+        recorded: the memoized token count makes the check cheap, and entries
+        for them would never expire. A failed cache creation falls back to the
+        uncached path until the TTL elapses.
+        """
+        if count_tokens(prefix, model) < _CONTEXT_CACHE_MIN_TOKENS:
+            return None
+        key = (model, hashlib.blake2b(prefix.encode(), digest_size=16).hexdigest())
+        entry = self._context_caches.get(key)
+        if entry is not None and entry[1] > time.monotonic():
+            return entry[0]
+
+        async with self._context_cache_lock:
+            entry = self._context_caches.get(key)
+            now = time.monotonic()
+            if entry is not None and entry[1] > now:
+                return entry[0]
+            try:
+                # The SDK only offers a blocking create.
+                cached = await asyncio.to_thread(
+                    lambda: caching.CachedContent.create(
+                        model=model,
+                        system_instruction=prefix,
+                        ttl=timedelta(seconds=self._context_cache_ttl),
+                    )
+                )
+            except google_exceptions.GoogleAPIError:
+                instance = None
+            else:
+                instance = genai.GenerativeModel.from_cached_content(cached)
+            expires = now + self._context_cache_ttl
+            if instance is not None:
+                expires -= _CONTEXT_CACHE_MARGIN
+            self._context_caches = {k: v for k, v in self._context_caches.items() if v[1] > now}
+            self._context_caches[key] = (instance, expires)
+            return instance
+
+    def _record_usage(self, model: str, response: Any) -> None:
+        """Report prompt, cached-content and candidate token counts."""
+        metadata = response.usage_metadata
+        input_tokens = as_count(metadata.prompt_token_count)
+        cached = as_count(metadata.cached_content_token_count)
+        report_usage(
+            input_tokens=input_tokens,
+            output_tokens=as_count(metadata.candidates_token_count),
+            cached_input_tokens=cached,
+        )
+        if self._usage is not None:
+            self._usage.record(
+                "google", model, input_tokens=input_tokens, cached_input_tokens=cached
+            )
 
     async def test_connection(self) -> bool:
         try:
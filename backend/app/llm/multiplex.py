@@ -0,0 +1,66 @@
+"""Interleave several LLM streams into one tagged event stream."""
+
+import asyncio
+from collections.abc import AsyncIterator, Callable, Mapping
+from dataclasses import dataclass
+from typing import Literal
+
+from app.llm.base import stream_with_retry
+
+# Events buffered per stream before its producer waits for the consumer.
+_BUFFER_PER_STREAM = 32
+
+
+@dataclass(frozen=True)
+class StreamEvent[K]:
+    """One event from a multiplexed stream, tagged with the stream's key.
+
+    ``delta`` events carry a chunk of text, ``done`` marks a stream that
+    finished normally and ``error`` one that failed; ``error`` is set only on
+    the latter. Every key ends with exactly one ``done`` or ``error``.
+    """
+
+    key: K
+    kind: Literal["delta", "done", "error"]
+    delta: str = ""
+    error: Exception | None = None
+
+
+async def multiplex[K](
+    streams: Mapping[K, Callable[[], AsyncIterator[str]]],
+) -> AsyncIterator[StreamEvent[K]]:
+    """Run every stream concurrently and yield their events as they arrive.
+
+    Each factory is opened through ``stream_with_retry`` on its own task, so
+    the first chunk of every stream arrives after roughly one time-to-first-
+    token rather than after the slower streams finish. A failing stream
+    yields an ``error`` event without disturbing the others. Closing the
+    generator cancels any stream still running.
+    """
+    queue: asyncio.Queue[StreamEvent[K]] = asyncio.Queue(
+        maxsize=_BUFFER_PER_STREAM * max(len(streams), 1)
+    )
+
+    async def pump(key: K, open_stream: Callable[[], AsyncIterator[str]]) -> None:
+        try:
+            async for chunk in stream_with_retry(open_stream):
+                await queue.put(StreamEvent(key, "delta", delta=chunk))
+        except Exception as exc:
+            # Reported to the consumer rather than raised, so siblings keep going.
+            await queue.put(StreamEvent(key, "error", error=exc))
+        else:
+            await queue.put(StreamEvent(key, "done"))
+
+    # Tasks copy the current context, so llm_operation labels carry over.
+    tasks = [asyncio.create_task(pump(key, factory)) for key, factory in streams.items()]
+    try:
+        remaining = len(tasks)
+        while remaining:
+            event = await queue.get()
+            if event.kind != "delta":
+                remaining -= 1
+            yield event
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
@@ -1,27 +1,66 @@
 """OpenAI LLM provider implementation."""
 
+import hashlib
 from collections.abc import AsyncIterator
 from typing import cast
 
+import httpx
 import openai
+from openai import Omit, omit
+from openai.types import CompletionUsage
 from openai.types.chat import ChatCompletionMessageParam
+from openai.types.chat.completion_create_params import ResponseFormat
+from pydantic import BaseModel
 
 from app.exceptions import LLMAuthError, LLMNetworkError, LLMRateLimitError
+from app.llm.base import CACHE_CONTROL, retry_after_from_headers
+from app.llm.structured import complete_structured
+from app.llm.tokenizer import count_tokens
+from app.llm.usage import PromptCacheUsage, as_count, report_usage
 
 
 def _cast_messages(
     messages: list[dict[str, str]],
 ) -> list[ChatCompletionMessageParam]:
-    """Cast plain dicts to OpenAI message params (structural match)."""
-    return cast(list[ChatCompletionMessageParam], messages)
+    """Cast plain dicts to OpenAI message params, dropping non-API keys.
+
+    Only role and content are sent, so a cache-marked prefix serializes
+    byte-identically on every call and hits OpenAI's automatic prefix cache.
+    """
+    return cast(
+        list[ChatCompletionMessageParam],
+        [{"role": msg["role"], "content": msg["content"]} for msg in messages],
+    )
+
+
+def _prompt_cache_key(messages: list[dict[str, str]]) -> str | Omit:
+    """Derive a ``prompt_cache_key`` from the cache-marked prefix, if any.
+
+    Requests sharing a prefix are routed to the same cache shard, which keeps
+    the hit rate up when many clones are generating at once.
+    """
+    prefix = "".join(msg["content"] for msg in messages if CACHE_CONTROL in msg)
+    if not prefix:
+        return omit
+    return hashlib.blake2b(prefix.encode(), digest_size=16).hexdigest()
 
 
 class OpenAIProvider:
     """LLM provider backed by OpenAI's chat completions API."""
 
-    def __init__(self, api_key: str, default_model: str = "gpt-4o") -> None:
-        self._client = openai.AsyncOpenAI(api_key=api_key)
+    def __init__(
+        self,
+        api_key: str,
+        default_model: str = "gpt-4o",
+        *,
+        limits: httpx.Limits | None = None,
+        usage: PromptCacheUsage | None = None,
+    ) -> None:
+        http_client = openai.DefaultAsyncHttpxClient(limits=limits) if limits else None
+        # Retries are owned by app.llm.base.RetryPolicy, not the SDK.
+        self._client = openai.AsyncOpenAI(api_key=api_key, http_client=http_client, max_retries=0)
         self._default_model = default_model
+        self._usage = usage
 
     async def complete(
         self,
@@ -31,21 +70,44 @@ class OpenAIProvider:
         temperature: float = 0.7,
         max_tokens: int = 4096,
     ) -> str:
-        try:
-            response = await self._client.chat.completions.create(
+        return await self._create(
+            messages,
+            model=model or self._default_model,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            response_format=omit,
+        )
+
+    async def complete_json[T: BaseModel](
+        self,
+        messages: list[dict[str, str]],
+        *,
+        schema: type[T],
+        model: str | None = None,
+        temperature: float = 0.7,
+        max_tokens: int = 4096,
+    ) -> T:
+        """Complete in structured-output mode, constrained to ``schema``'s JSON schema."""
+        response_format: ResponseFormat = {
+            "type": "json_schema",
+            "json_schema": {
+                "name": schema.__name__,
+                "schema": schema.model_json_schema(),
+                # Strict mode rejects open-ended objects such as the DNA profile.
+                "strict": False,
+            },
+        }
+
+        async def send(attempt: list[dict[str, str]]) -> str:
+            return await self._create(
+                attempt,
                 model=model or self._default_model,
-                messages=_cast_messages(messages),
                 temperature=temperature,
                 max_tokens=max_tokens,
+                response_format=response_format,
             )
-        except openai.AuthenticationError as exc:
-            raise LLMAuthError(provider="openai", detail=str(exc)) from exc
-        except openai.RateLimitError as exc:
-            raise LLMRateLimitError(provider="openai", detail=str(exc)) from exc
-        except openai.APIConnectionError as exc:
-            raise LLMNetworkError(provider="openai", detail=str(exc)) from exc
 
-        return response.choices[0].message.content or ""
+        return await complete_structured(send, messages, schema, provider="openai")
 
     async def stream(
         self,
@@ -55,28 +117,81 @@ class OpenAIProvider:
         temperature: float = 0.7,
         max_tokens: int = 4096,
     ) -> AsyncIterator[str]:
+        target = model or self._default_model
         try:
             response_stream = await self._client.chat.completions.create(
-                model=model or self._default_model,
+                model=target,
                 messages=_cast_messages(messages),
                 temperature=temperature,
                 max_tokens=max_tokens,
                 stream=True,
+                stream_options={"include_usage": True},
+                prompt_cache_key=_prompt_cache_key(messages),
             )
+            async for chunk in response_stream:
+                if chunk.usage is not None:
+                    self._record_usage(target, chunk.usage)
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta
+                if delta.content is not None:
+                    yield delta.content
         except openai.AuthenticationError as exc:
             raise LLMAuthError(provider="openai", detail=str(exc)) from exc
         except openai.RateLimitError as exc:
-            raise LLMRateLimitError(provider="openai", detail=str(exc)) from exc
+            raise LLMRateLimitError(
+                provider="openai",
+                detail=str(exc),
+                retry_after=retry_after_from_headers(exc.response.headers),
+            ) from exc
         except openai.APIConnectionError as exc:
             raise LLMNetworkError(provider="openai", detail=str(exc)) from exc
+        except openai.APIStatusError as exc:
+            # Server-side failures are transient; other statuses are not.
+            if exc.status_code < 500:
+                raise
+            raise LLMNetworkError(provider="openai", detail=str(exc)) from exc
 
-        async for chunk in response_stream:
-            delta = chunk.choices[0].delta
-            if delta.content is not None:
-                yield delta.content
+    async def _create(
+        self,
+        messages: list[dict[str, str]],
+        *,
+        model: str,
+        temperature: float,
+        max_tokens: int,
+        response_format: ResponseFormat | Omit,
+    ) -> str:
+        try:
+            response = await self._client.chat.completions.create(
+                model=model,
+                messages=_cast_messages(messages),
+                temperature=temperature,
+                max_tokens=max_tokens,
+                response_format=response_format,
+                prompt_cache_key=_prompt_cache_key(messages),
+            )
+        except openai.AuthenticationError as exc:
+            raise LLMAuthError(provider="openai", detail=str(exc)) from exc
+        except openai.RateLimitError as exc:
+            raise LLMRateLimitError(
+                provider="openai",
+                detail=str(exc),
+                retry_after=retry_after_from_headers(exc.response.headers),
+            ) from exc
+        except openai.APIConnectionError as exc:
+            raise LLMNetworkError(provider="openai", detail=str(exc)) from exc
+        except openai.APIStatusError as exc:
+            # Server-side failures are transient; other statuses are not.
+            if exc.status_code < 500:
+                raise
+            raise LLMNetworkError(provider="openai", detail=str(exc)) from exc
+
+        self._record_usage(model, response.usage)
+        return response.choices[0].message.content or ""
 
     async def count_tokens(self, text: str) -> int:
-        return max(1, len(text) // 4)
+        """Count tokens offline with the default model's tokenizer."""
+        return count_tokens(text, self._default_model)
 
     async def test_connection(self) -> bool:
         try:
@@ -88,3 +203,24 @@ class OpenAIProvider:
         except Exception:
             return False
         return True
+
+    async def aclose(self) -> None:
+        """Close the underlying HTTP connection pool."""
+        await self._client.close()
+
+    def _record_usage(self, model: str, usage: CompletionUsage | None) -> None:
+        """Report prompt, cached-prompt and completion token counts."""
+        if usage is None:
+            return
+        details = usage.prompt_tokens_details
+        input_tokens = as_count(usage.prompt_tokens)
+        cached = as_count(details.cached_tokens) if details else 0
+        report_usage(
+            input_tokens=input_tokens,
+            output_tokens=as_count(usage.completion_tokens),
+            cached_input_tokens=cached,
+        )
+        if self._usage is not None:
+            self._usage.record(
+                "openai", model, input_tokens=input_tokens, cached_input_tokens=cached
+            )
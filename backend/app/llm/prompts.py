@@ -1,5 +1,24 @@
 """Prompt template functions for LLM interactions."""
 
+from app.llm.base import CACHE_CONTROL
+
+
+def _voice_prefix(dna: dict[str, str], methodology: str | None) -> dict[str, str]:
+    """Build the clone-stable system message shared by every generation prompt.
+
+    It holds only what is fixed per clone (persona, Voice DNA, methodology) and
+    always comes first, so providers can serve it from their prompt cache;
+    per-request details go in a following system message.
+    """
+    dna_summary = "\n".join(f"- {key}: {value}" for key, value in dna.items())
+    parts = [
+        "You are a ghostwriter that matches the user's unique voice.",
+        f"Voice DNA profile:\n{dna_summary}",
+    ]
+    if methodology:
+        parts.append(f"Methodology: {methodology}")
+    return {"role": "system", "content": "\n\n".join(parts), CACHE_CONTROL: "ephemeral"}
+
 
 def build_dna_analysis_prompt(
     samples: list[str],
@@ -42,6 +61,7 @@ def build_generation_prompt(
     platform: str,
     input_text: str,
     properties: dict[str, str] | None = None,
+    methodology: str | None = None,
 ) -> list[dict[str, str]]:
     """Build a message list for content generation using Voice DNA.
 
@@ -50,15 +70,13 @@ def build_generation_prompt(
         platform: Target platform (e.g. "twitter", "linkedin", "email").
         input_text: The user's input/instructions for generation.
         properties: Optional extra generation properties.
+        methodology: Optional voice cloning instructions.
 
     Returns:
-        A list of message dicts with role/content keys.
+        A list of message dicts with role/content keys. The first is the
+        cacheable voice prefix.
     """
-    dna_summary = "\n".join(f"- {key}: {value}" for key, value in dna.items())
-
     system_parts = [
-        "You are a ghostwriter that matches the user's unique voice.",
-        f"Voice DNA profile:\n{dna_summary}",
         f"Target platform: {platform}.",
         "Write content that authentically matches this voice for the given platform.",
     ]
@@ -67,6 +85,48 @@ def build_generation_prompt(
         system_parts.append(f"Additional properties: {props_text}.")
 
     return [
+        _voice_prefix(dna, methodology),
+        {"role": "system", "content": "\n\n".join(system_parts)},
+        {"role": "user", "content": input_text},
+    ]
+
+
+def build_multi_platform_prompt(
+    dna: dict[str, str],
+    platforms: list[str],
+    input_text: str,
+    properties: dict[str, str] | None = None,
+    methodology: str | None = None,
+) -> list[dict[str, str]]:
+    """Build a message list that generates content for several platforms at once.
+
+    Args:
+        dna: Voice DNA profile dict with trait dimensions.
+        platforms: Target platforms, each becoming one key of the JSON reply.
+        input_text: The user's input/instructions for generation.
+        properties: Optional extra generation properties.
+        methodology: Optional voice cloning instructions.
+
+    Returns:
+        A list of message dicts with role/content keys. The first is the
+        cacheable voice prefix shared with build_generation_prompt.
+    """
+    platform_list = ", ".join(platforms)
+    system_parts = [
+        f"Target platforms: {platform_list}.",
+        "Write one piece of content per platform from the same input. Each must"
+        " authentically match this voice and follow its platform's format and length.",
+    ]
+    if properties:
+        props_text = ", ".join(f"{k}={v}" for k, v in properties.items())
+        system_parts.append(f"Additional properties: {props_text}.")
+    system_parts.append(
+        "Return ONLY a JSON object in this exact format, with one key per target platform:\n"
+        '{"posts": {"<platform>": "<content>"}}'
+    )
+
+    return [
+        _voice_prefix(dna, methodology),
         {"role": "system", "content": "\n\n".join(system_parts)},
         {"role": "user", "content": input_text},
     ]
@@ -78,6 +138,7 @@ def build_feedback_regen_prompt(
     current_text: str,
     feedback: str,
     properties: dict[str, str] | None = None,
+    methodology: str | None = None,
 ) -> list[dict[str, str]]:
     """Build a message list for feedback-driven content regeneration.
 
@@ -87,15 +148,13 @@ def build_feedback_regen_prompt(
         current_text: The current content text to improve.
         feedback: User feedback/guidance for the rewrite.
         properties: Optional extra generation properties.
+        methodology: Optional voice cloning instructions.
 
     Returns:
-        A list of message dicts with role/content keys.
+        A list of message dicts with role/content keys. The first is the
+        cacheable voice prefix.
     """
-    dna_summary = "\n".join(f"- {key}: {value}" for key, value in dna.items())
-
     system_parts = [
-        "You are a ghostwriter that matches the user's unique voice.",
-        f"Voice DNA profile:\n{dna_summary}",
         f"Target platform: {platform}.",
         "Rewrite the content incorporating the feedback while maintaining the voice.",
     ]
@@ -106,6 +165,7 @@ def build_feedback_regen_prompt(
     user_content = f"Current content:\n\n{current_text}\n\nFeedback: {feedback}"
 
     return [
+        _voice_prefix(dna, methodology),
         {"role": "system", "content": "\n\n".join(system_parts)},
         {"role": "user", "content": user_content},
     ]
@@ -119,6 +179,7 @@ def build_partial_regen_prompt(
     text_after: str,
     feedback: str | None = None,
     properties: dict[str, str] | None = None,
+    methodology: str | None = None,
 ) -> list[dict[str, str]]:
     """Build a message list for partial content regeneration.
 
@@ -130,15 +191,13 @@ def build_partial_regen_prompt(
         text_after: Text after the selected portion.
         feedback: Optional user guidance for the rewrite.
         properties: Optional extra generation properties.
+        methodology: Optional voice cloning instructions.
 
     Returns:
-        A list of message dicts with role/content keys.
+        A list of message dicts with role/content keys. The first is the
+        cacheable voice prefix.
     """
-    dna_summary = "\n".join(f"- {key}: {value}" for key, value in dna.items())
-
     system_parts = [
-        "You are a ghostwriter that matches the user's unique voice.",
-        f"Voice DNA profile:\n{dna_summary}",
         f"Target platform: {platform}.",
         "Rewrite ONLY the selected portion. Return ONLY the replacement text.",
     ]
@@ -155,6 +214,7 @@ def build_partial_regen_prompt(
         user_parts.append(f"\nGuidance: {feedback}")
 
     return [
+        _voice_prefix(dna, methodology),
         {"role": "system", "content": "\n\n".join(system_parts)},
         {"role": "user", "content": "\n".join(user_parts)},
     ]
@@ -0,0 +1,262 @@
+"""Per-(provider, model) request/token budgets and concurrency governor."""
+
+import asyncio
+import time
+from collections.abc import AsyncGenerator, AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+
+from pydantic import BaseModel
+
+from app.config import Settings
+from app.llm.base import LLMProvider, SupportsAclose
+
+
+class TokenBucket:
+    """Continuously refilling budget of ``per_minute`` units.
+
+    Waiters are served in FIFO order. A single request larger than the whole
+    budget is clamped to it so it can still proceed once the bucket is full.
+    """
+
+    def __init__(self, per_minute: int) -> None:
+        self._capacity = float(per_minute)
+        self._rate = per_minute / 60.0
+        self._tokens = float(per_minute)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, amount: float) -> None:
+        amount = min(amount, self._capacity)
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._tokens >= amount:
+                    self._tokens -= amount
+                    return
+                await asyncio.sleep((amount - self._tokens) / self._rate)
+
+    def debit(self, amount: float) -> None:
+        """Charge usage after the fact (e.g. output tokens); may go negative."""
+        self._refill()
+        self._tokens -= amount
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self._rate)
+        self._updated = now
+
+
+@dataclass(frozen=True)
+class LimiterStats:
+    """Snapshot of one (provider, model) limiter's queue and wait times."""
+
+    provider: str
+    model: str
+    queued: int
+    in_flight: int
+    total_requests: int
+    avg_wait_seconds: float
+    max_wait_seconds: float
+
+
+class ModelLimiter:
+    """RPM and TPM token buckets plus a max-in-flight semaphore for one model.
+
+    A limit of 0 disables that budget.
+    """
+
+    def __init__(
+        self,
+        *,
+        requests_per_minute: int,
+        tokens_per_minute: int,
+        max_in_flight: int,
+    ) -> None:
+        self._requests = TokenBucket(requests_per_minute) if requests_per_minute > 0 else None
+        self._tokens = TokenBucket(tokens_per_minute) if tokens_per_minute > 0 else None
+        self._semaphore = asyncio.Semaphore(max_in_flight) if max_in_flight > 0 else None
+        self.queued = 0
+        self.in_flight = 0
+        self.total_requests = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    @asynccontextmanager
+    async def slot(self, prompt_tokens: int) -> AsyncGenerator[None]:
+        """Wait for an in-flight slot and request/token budget, then hold the slot."""
+        started = time.monotonic()
+        self.queued += 1
+        try:
+            if self._semaphore is not None:
+                await self._semaphore.acquire()
+            try:
+                if self._requests is not None:
+                    await self._requests.acquire(1)
+                if self._tokens is not None:
+                    await self._tokens.acquire(prompt_tokens)
+            except BaseException:
+                if self._semaphore is not None:
+                    self._semaphore.release()
+                raise
+        finally:
+            self.queued -= 1
+
+        waited = time.monotonic() - started
+        self.total_requests += 1
+        self.total_wait_seconds += waited
+        self.max_wait_seconds = max(self.max_wait_seconds, waited)
+
+        self.in_flight += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            if self._semaphore is not None:
+                self._semaphore.release()
+
+    def record_output(self, output_tokens: int) -> None:
+        if self._tokens is not None:
+            self._tokens.debit(output_tokens)
+
+
+class RateLimiter:
+    """Lazily creates one ModelLimiter per (provider, model) from Settings.
+
+    ``llm_rate_limit_overrides`` entries keyed ``"provider:model"`` or
+    ``"provider"`` replace the global defaults for matching models.
+    """
+
+    def __init__(self, settings: Settings) -> None:
+        self._settings = settings
+        self._limiters: dict[tuple[str, str], ModelLimiter] = {}
+
+    def limiter(self, provider: str, model: str) -> ModelLimiter:
+        key = (provider, model)
+        limiter = self._limiters.get(key)
+        if limiter is None:
+            overrides = self._settings.llm_rate_limit_overrides
+            limits = overrides.get(f"{provider}:{model}") or overrides.get(provider) or {}
+            limiter = ModelLimiter(
+                requests_per_minute=limits.get(
+                    "requests_per_minute", self._settings.llm_requests_per_minute
+                ),
+                tokens_per_minute=limits.get(
+                    "tokens_per_minute", self._settings.llm_tokens_per_minute
+                ),
+                max_in_flight=limits.get("max_in_flight", self._settings.llm_max_in_flight),
+            )
+            self._limiters[key] = limiter
+        return limiter
+
+    def stats(self) -> list[LimiterStats]:
+        return [
+            LimiterStats(
+                provider=provider,
+                model=model,
+                queued=limiter.queued,
+                in_flight=limiter.in_flight,
+                total_requests=limiter.total_requests,
+                avg_wait_seconds=(
+                    limiter.total_wait_seconds / limiter.total_requests
+                    if limiter.total_requests
+                    else 0.0
+                ),
+                max_wait_seconds=limiter.max_wait_seconds,
+            )
+            for (provider, model), limiter in self._limiters.items()
+        ]
+
+
+def _prompt_text(messages: list[dict[str, str]]) -> str:
+    return "\n".join(msg.get("content", "") for msg in messages)
+
+
+class RateLimitedProvider:
+    """LLMProvider wrapper that queues calls against the (provider, model) budgets.
+
+    Prompt tokens are reserved before the call; output tokens are charged
+    once the response is known. Streams hold their in-flight slot until the
+    stream finishes.
+    """
+
+    def __init__(
+        self,
+        inner: LLMProvider,
+        rate_limiter: RateLimiter,
+        *,
+        provider_name: str,
+        default_model: str,
+    ) -> None:
+        self._inner = inner
+        self._rate_limiter = rate_limiter
+        self._provider_name = provider_name
+        self._default_model = default_model
+
+    async def complete(
+        self,
+        messages: list[dict[str, str]],
+        *,
+        model: str | None = None,
+        temperature: float = 0.7,
+        max_tokens: int = 4096,
+    ) -> str:
+        limiter = self._rate_limiter.limiter(self._provider_name, model or self._default_model)
+        prompt_tokens = await self._inner.count_tokens(_prompt_text(messages))
+        async with limiter.slot(prompt_tokens):
+            result = await self._inner.complete(
+                messages, model=model, temperature=temperature, max_tokens=max_tokens
+            )
+        limiter.record_output(await self._inner.count_tokens(result))
+        return result
+
+    async def complete_json[T: BaseModel](
+        self,
+        messages: list[dict[str, str]],
+        *,
+        schema: type[T],
+        model: str | None = None,
+        temperature: float = 0.7,
+        max_tokens: int = 4096,
+    ) -> T:
+        limiter = self._rate_limiter.limiter(self._provider_name, model or self._default_model)
+        prompt_tokens = await self._inner.count_tokens(_prompt_text(messages))
+        async with limiter.slot(prompt_tokens):
+            result = await self._inner.complete_json(
+                messages,
+                schema=schema,
+                model=model,
+                temperature=temperature,
+                max_tokens=max_tokens,
+            )
+        limiter.record_output(await self._inner.count_tokens(result.model_dump_json()))
+        return result
+
+    async def stream(
+        self,
+        messages: list[dict[str, str]],
+        *,
+        model: str | None = None,
+        temperature: float = 0.7,
+        max_tokens: int = 4096,
+    ) -> AsyncIterator[str]:
+        limiter = self._rate_limiter.limiter(self._provider_name, model or self._default_model)
+        prompt_tokens = await self._inner.count_tokens(_prompt_text(messages))
+        chunks: list[str] = []
+        async with limiter.slot(prompt_tokens):
+            async for chunk in self._inner.stream(
+                messages, model=model, temperature=temperature, max_tokens=max_tokens
+            ):
+                chunks.append(chunk)
+                yield chunk
+        limiter.record_output(await self._inner.count_tokens("".join(chunks)))
+
+    async def count_tokens(self, text: str) -> int:
+        return await self._inner.count_tokens(text)
+
+    async def test_connection(self) -> bool:
+        return await self._inner.test_connection()
+
+    async def aclose(self) -> None:
+        if isinstance(self._inner, SupportsAclose):
+            await self._inner.aclose()
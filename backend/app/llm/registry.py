@@ -1,11 +1,22 @@
 """LLM provider registry — looks up providers by name and checks configuration."""
 
 from collections.abc import Callable
+from dataclasses import replace
+from pathlib import Path
 from typing import ClassVar
 
+import httpx
+
 from app.config import Settings
 from app.exceptions import ProviderNotConfiguredError
-from app.llm.base import LLMProvider
+from app.llm.base import LLMProvider, SupportsAclose
+from app.llm.cache import CachedProvider, CompletionCache
+from app.llm.circuit import CircuitBreaker, CircuitBreakerProvider
+from app.llm.failover import FailoverProvider, FailoverTarget, LatencyTracker
+from app.llm.ratelimit import RateLimitedProvider, RateLimiter
+from app.llm.singleflight import SingleFlightProvider
+from app.llm.telemetry import CallLedger, TelemetryProvider
+from app.llm.usage import PromptCacheUsage
 
 
 class ProviderRegistry:
@@ -13,6 +24,22 @@ class ProviderRegistry:
 
     Requires a Settings instance (injected for testability) to check
     which API keys are configured.
+
+    Provider instances are pooled: each name holds one long-lived instance
+    (and therefore one warm SDK client) per (api_key, default model). When
+    either setting changes, the next lookup builds a fresh instance and the
+    old one is retired until ``aclose()``, so in-flight calls can finish.
+
+    Wrappers are layered around each pooled instance, innermost first: a
+    TelemetryProvider when a CallLedger is supplied (so every upstream call,
+    retry and failover attempt is recorded), then a RateLimitedProvider when a
+    RateLimiter is supplied (so only real upstream calls spend budget), then a
+    CircuitBreakerProvider when ``circuit_breaker`` is enabled (so an open
+    circuit refuses calls before they queue), then a CachedProvider when a
+    CompletionCache is supplied so repeated low-temperature calls are served
+    locally even during an outage. With ``single_flight`` enabled, an outer
+    SingleFlightProvider coalesces identical concurrent low-temperature calls
+    (including cache misses) into one upstream request.
     """
 
     _KEY_MAP: ClassVar[dict[str, str]] = {
@@ -21,16 +48,44 @@ class ProviderRegistry:
         "google": "google_ai_api_key",
     }
 
-    def __init__(self, settings: Settings) -> None:
+    _MODEL_MAP: ClassVar[dict[str, str]] = {
+        "openai": "default_openai_model",
+        "anthropic": "default_anthropic_model",
+        "google": "default_google_model",
+        "simulated": "llm_simulated_model",
+    }
+
+    def __init__(
+        self,
+        settings: Settings,
+        cache: CompletionCache | None = None,
+        *,
+        rate_limiter: RateLimiter | None = None,
+        single_flight: bool = False,
+        circuit_breaker: bool = False,
+        prompt_cache_usage: PromptCacheUsage | None = None,
+        ledger: CallLedger | None = None,
+    ) -> None:
         self._settings = settings
+        self._cache = cache
+        self._rate_limiter = rate_limiter
+        self._single_flight = single_flight
+        self._circuit_breaker = circuit_breaker
+        self._prompt_cache_usage = prompt_cache_usage
+        self._ledger = ledger
+        self._breakers: dict[str, CircuitBreaker] = {}
         self._factories: dict[str, Callable[[], LLMProvider]] = {}
+        self._pool: dict[str, tuple[tuple[str, str], LLMProvider]] = {}
+        self._retired: list[LLMProvider] = []
+        self._latency: dict[str, LatencyTracker] = {}
 
     def register(self, name: str, factory: Callable[[], LLMProvider]) -> None:
         """Register a provider factory by name."""
         self._factories[name] = factory
+        self.invalidate(name)
 
     def get_provider(self, name: str) -> LLMProvider:
-        """Return a provider instance, raising if the API key is not configured."""
+        """Return the pooled provider instance, raising if the API key is not configured."""
         key_attr = self._KEY_MAP.get(name)
         if key_attr and not getattr(self._settings, key_attr, ""):
             raise ProviderNotConfiguredError(name)
@@ -39,12 +94,244 @@ class ProviderRegistry:
         if factory is None:
             raise ProviderNotConfiguredError(name)
 
-        return factory()
+        pool_key = self._pool_key(name)
+        pooled = self._pool.get(name)
+        if pooled is not None and pooled[0] == pool_key:
+            return pooled[1]
+
+        self.invalidate(name)
+        provider = self._wrap(name, factory(), default_model=pool_key[1])
+        self._pool[name] = (pool_key, provider)
+        return provider
 
     def get_default_provider(self) -> LLMProvider:
         """Return the provider matching settings.default_llm_provider."""
         return self.get_provider(self._settings.default_llm_provider)
 
+    def get_failover_provider(self) -> LLMProvider:
+        """Return the default provider, backed by the other configured ones.
+
+        The default provider comes first, then the rest in ``list_configured()``
+        order. With failover disabled or only one provider configured this is
+        just ``get_default_provider()``, as it is for the simulated provider,
+        whose injected errors must never spill over onto a paid vendor.
+        Latency history is kept per provider name across calls so the
+        percentile timeouts stay warm.
+        """
+        primary = self._settings.default_llm_provider
+        default = self.get_default_provider()
+        if primary == "simulated":
+            return default
+        backups = [name for name in self.list_configured() if name != primary]
+        if not self._settings.llm_failover_enabled or not backups:
+            return default
+
+        targets = [
+            FailoverTarget(name=name, provider=provider, latency=self.latency_tracker(name))
+            for name, provider in [
+                (primary, default),
+                *((name, self.get_provider(name)) for name in backups),
+            ]
+        ]
+        return FailoverProvider(
+            targets,
+            timeout_percentile=self._settings.llm_failover_timeout_percentile,
+            min_timeout=self._settings.llm_failover_min_timeout,
+            hedge=self._settings.llm_hedge_enabled,
+            hedge_percentile=self._settings.llm_hedge_percentile,
+        )
+
+    def latency_tracker(self, name: str) -> LatencyTracker:
+        """Return the shared latency history for a provider name."""
+        return self._latency.setdefault(name, LatencyTracker())
+
+    def circuit_breaker(self, name: str) -> CircuitBreaker | None:
+        """Return the provider's breaker (kept across rebuilds), or None if disabled."""
+        if not self._circuit_breaker:
+            return None
+        breaker = self._breakers.get(name)
+        if breaker is None:
+            breaker = CircuitBreaker(
+                name,
+                failure_threshold=self._settings.llm_breaker_failure_threshold,
+                error_rate=self._settings.llm_breaker_error_rate,
+                window=self._settings.llm_breaker_window,
+                min_calls=self._settings.llm_breaker_min_calls,
+                reset_seconds=self._settings.llm_breaker_reset_seconds,
+                half_open_probes=self._settings.llm_breaker_half_open_probes,
+            )
+            self._breakers[name] = breaker
+        return breaker
+
     def list_configured(self) -> list[str]:
         """Return names of providers whose API keys are set."""
         return [name for name, attr in self._KEY_MAP.items() if getattr(self._settings, attr, "")]
+
+    def invalidate(self, name: str | None = None) -> None:
+        """Drop pooled instances (all, or one by name) so the next lookup rebuilds them."""
+        names = [name] if name is not None else list(self._pool)
+        for pooled_name in names:
+            pooled = self._pool.pop(pooled_name, None)
+            if pooled is not None:
+                self._retired.append(pooled[1])
+
+    @property
+    def cache(self) -> CompletionCache | None:
+        return self._cache
+
+    @property
+    def rate_limiter(self) -> RateLimiter | None:
+        return self._rate_limiter
+
+    @property
+    def prompt_cache_usage(self) -> PromptCacheUsage | None:
+        return self._prompt_cache_usage
+
+    @property
+    def ledger(self) -> CallLedger | None:
+        return self._ledger
+
+    async def aclose(self) -> None:
+        """Close every pooled and retired provider client, the completion cache and ledger."""
+        self.invalidate()
+        retired, self._retired = self._retired, []
+        for provider in retired:
+            if isinstance(provider, SupportsAclose):
+                await provider.aclose()
+        if self._cache is not None:
+            await self._cache.aclose()
+        if self._ledger is not None:
+            await self._ledger.aclose()
+
+    def _wrap(self, name: str, provider: LLMProvider, *, default_model: str) -> LLMProvider:
+        """Layer the telemetry, rate-limit, breaker, cache and single-flight wrappers."""
+        if self._ledger is not None:
+            provider = TelemetryProvider(
+                provider, self._ledger, provider_name=name, default_model=default_model
+            )
+        if self._rate_limiter is not None:
+            provider = RateLimitedProvider(
+                provider,
+                self._rate_limiter,
+                provider_name=name,
+                default_model=default_model,
+            )
+        breaker = self.circuit_breaker(name)
+        if breaker is not None:
+            provider = CircuitBreakerProvider(provider, breaker)
+        if self._cache is not None:
+            provider = CachedProvider(
+                provider,
+                self._cache,
+                provider_name=name,
+                default_model=default_model,
+                max_temperature=self._settings.llm_cache_max_temperature,
+            )
+        if self._single_flight:
+            provider = SingleFlightProvider(
+                provider,
+                provider_name=name,
+                default_model=default_model,
+                max_temperature=self._settings.llm_cache_max_temperature,
+            )
+        return provider
+
+    def _pool_key(self, name: str) -> tuple[str, str]:
+        key_attr = self._KEY_MAP.get(name, "")
+        model_attr = self._MODEL_MAP.get(name, "")
+        return (
+            str(getattr(self._settings, key_attr, "")),
+            str(getattr(self._settings, model_attr, "")),
+        )
+
+
+def _http_limits(settings: Settings) -> httpx.Limits:
+    """Build connection-pool limits for provider HTTP clients from settings."""
+    return httpx.Limits(
+        max_connections=settings.llm_max_connections,
+        max_keepalive_connections=settings.llm_max_keepalive_connections,
+        keepalive_expiry=settings.llm_keepalive_expiry,
+    )
+
+
+def create_registry(settings: Settings) -> ProviderRegistry:
+    """Build a registry wired to the built-in OpenAI, Anthropic and Google providers.
+
+    The offline simulated provider is registered too when ``llm_simulated_enabled``.
+    """
+    cache: CompletionCache | None = None
+    if settings.llm_cache_enabled:
+        cache = CompletionCache(
+            Path(settings.llm_cache_path),
+            ttl_seconds=settings.llm_cache_ttl_seconds,
+            max_entries=settings.llm_cache_max_entries,
+            memory_entries=settings.llm_cache_memory_entries,
+        )
+    ledger: CallLedger | None = None
+    if settings.llm_telemetry_enabled:
+        ledger = CallLedger(
+            Path(settings.llm_telemetry_path),
+            batch_size=settings.llm_telemetry_batch_size,
+            flush_interval=settings.llm_telemetry_flush_seconds,
+        )
+    usage = PromptCacheUsage()
+    registry = ProviderRegistry(
+        settings,
+        cache=cache,
+        rate_limiter=RateLimiter(settings),
+        single_flight=settings.llm_single_flight_enabled,
+        circuit_breaker=settings.llm_breaker_enabled,
+        prompt_cache_usage=usage,
+        ledger=ledger,
+    )
+
+    def openai_factory() -> LLMProvider:
+        from app.llm.openai import OpenAIProvider
+
+        return OpenAIProvider(
+            api_key=settings.openai_api_key,
+            default_model=settings.default_openai_model,
+            limits=_http_limits(settings),
+            usage=usage,
+        )
+
+    def anthropic_factory() -> LLMProvider:
+        from app.llm.anthropic import AnthropicProvider
+
+        return AnthropicProvider(
+            api_key=settings.anthropic_api_key,
+            default_model=settings.default_anthropic_model,
+            limits=_http_limits(settings),
+            usage=usage,
+        )
+
+    def google_factory() -> LLMProvider:
+        from app.llm.google import GoogleProvider
+
+        return GoogleProvider(
+            api_key=settings.google_ai_api_key,
+            default_model=settings.default_google_model,
+            usage=usage,
+            context_cache_ttl=settings.google_context_cache_ttl_seconds,
+        )
+
+    registry.register("openai", openai_factory)
+    registry.register("anthropic", anthropic_factory)
+    registry.register("google", google_factory)
+
+    if settings.llm_simulated_enabled:
+
+        def simulated_factory() -> LLMProvider:
+            from app.llm.simulated import PROFILES, SimulatedProvider
+
+            profile = replace(
+                PROFILES[settings.llm_simulated_profile], **settings.llm_simulated_overrides
+            )
+            return SimulatedProvider(
+                profile,
+                default_model=settings.llm_simulated_model,
+                seed=settings.llm_simulated_seed,
+            )
+
+        registry.register("simulated", simulated_factory)
+    return registry
@@ -0,0 +1,300 @@
+"""Offline simulated LLM provider for load tests and benchmarks.
+
+Replies are derived from a hash of the request, so the same prompt always
+gets the same text or JSON; latency and injected failures are drawn from a
+seeded RNG following a named LatencyProfile.
+"""
+
+import asyncio
+import hashlib
+import json
+import math
+import random
+from collections.abc import AsyncIterator, Callable
+from dataclasses import dataclass
+from typing import Any
+
+from pydantic import BaseModel
+
+from app.constants import PLATFORMS
+from app.exceptions import LLMNetworkError, LLMRateLimitError, LLMResponseFormatError
+from app.llm.structured import complete_structured
+from app.llm.tokenizer import count_tokens, get_token_counter
+from app.llm.usage import report_usage
+from app.schemas.content import MultiPlatformDraft
+from app.schemas.detection import DetectionResponse
+from app.schemas.dna import DNAAnalysisResult
+from app.schemas.scoring import ScoringResult
+
+
+@dataclass(frozen=True)
+class LatencyProfile:
+    """Timing and failure behaviour of the simulated upstream.
+
+    Completion latency is log-normal around ``median_seconds`` with spread
+    ``sigma``; streams wait a log-normal time to first token, then emit
+    ``tokens_per_second`` (0 means unthrottled). The error rates are per-call
+    probabilities of a 429 or a network error.
+    """
+
+    median_seconds: float
+    sigma: float = 0.0
+    ttft_seconds: float = 0.0
+    tokens_per_second: float = 0.0
+    rate_limit_rate: float = 0.0
+    network_error_rate: float = 0.0
+
+
+PROFILES: dict[str, LatencyProfile] = {
+    "instant": LatencyProfile(median_seconds=0.0),
+    "fast": LatencyProfile(
+        median_seconds=0.05, sigma=0.3, ttft_seconds=0.02, tokens_per_second=2000
+    ),
+    "realistic": LatencyProfile(
+        median_seconds=2.5, sigma=0.5, ttft_seconds=0.6, tokens_per_second=60
+    ),
+    "degraded": LatencyProfile(
+        median_seconds=8.0,
+        sigma=0.8,
+        ttft_seconds=3.0,
+        tokens_per_second=15,
+        rate_limit_rate=0.1,
+        network_error_rate=0.05,
+    ),
+}
+
+_DNA_CATEGORIES = {
+    "vocabulary": {"complexity_level": "moderate", "jargon_usage": "light"},
+    "sentence_structure": {"average_length": "medium", "fragment_usage": "occasional"},
+    "paragraph_structure": {"average_length": "short", "transition_style": "smooth"},
+    "tone": {"formality_level": "semi-formal", "primary_tone": "conversational"},
+    "rhetorical_devices": {"rhetorical_questions": "occasional", "metaphor_usage": "light"},
+    "punctuation": {"em_dash_frequency": "moderate", "exclamation_points": "rare"},
+    "openings_and_closings": {"hook_style": "question", "closing_patterns": "call to action"},
+    "humor": {"frequency": "rare", "types": "dry wit"},
+    "signatures": {"catchphrases": ["Here's the thing"], "recurring_themes": ["craft"]},
+}
+
+_SCORING_DIMENSIONS = (
+    "vocabulary_match",
+    "sentence_flow",
+    "structural_rhythm",
+    "tone_fidelity",
+    "rhetorical_fingerprint",
+    "punctuation_signature",
+    "hook_and_close",
+    "voice_personality",
+)
+
+_WORDS = (
+    "voice",
+    "clarity",
+    "rhythm",
+    "story",
+    "idea",
+    "draft",
+    "audience",
+    "signal",
+    "craft",
+    "simple",
+    "honest",
+    "sharp",
+    "lesson",
+    "habit",
+    "detail",
+    "moment",
+    "reader",
+    "writing",
+    "question",
+    "practice",
+    "build",
+    "ship",
+    "learn",
+    "notice",
+    "small",
+    "steady",
+    "work",
+    "team",
+    "plan",
+    "change",
+    "focus",
+    "trust",
+)
+
+
+def _dna_reply(rng: random.Random) -> dict[str, Any]:
+    return {
+        "dna": _DNA_CATEGORIES,
+        "prominence_scores": {name: rng.randint(40, 95) for name in _DNA_CATEGORIES},
+        "consistency_score": rng.randint(60, 95),
+    }
+
+
+def _scoring_reply(rng: random.Random) -> dict[str, Any]:
+    return {
+        "dimensions": [
+            {"name": name, "score": rng.randint(55, 98), "feedback": f"Simulated {name} note."}
+            for name in _SCORING_DIMENSIONS
+        ]
+    }
+
+
+def _detection_reply(rng: random.Random) -> dict[str, Any]:
+    return {
+        "risk_level": rng.choice(("low", "medium", "high")),
+        "confidence": rng.randint(50, 95),
+        "flagged_passages": [
+            {
+                "text": "simulated passage",
+                "reason": "Simulated uniform sentence rhythm.",
+                "suggestion": "Vary sentence length.",
+            }
+        ],
+        "summary": "Simulated detection summary.",
+    }
+
+
+def _multi_platform_reply(rng: random.Random) -> dict[str, Any]:
+    # Drafts for every platform; callers pick out the ones they asked for.
+    return {
+        "posts": {
+            platform: " ".join(rng.choice(_WORDS) for _ in range(rng.randint(20, 120))) + "."
+            for platform in PLATFORMS
+        }
+    }
+
+
+# DNA analysis and merges share DNAAnalysisResult.
+_CANNED_JSON: dict[type[BaseModel], Callable[[random.Random], dict[str, Any]]] = {
+    DNAAnalysisResult: _dna_reply,
+    ScoringResult: _scoring_reply,
+    DetectionResponse: _detection_reply,
+    MultiPlatformDraft: _multi_platform_reply,
+}
+
+
+class SimulatedProvider:
+    """LLMProvider that answers offline with deterministic synthetic replies."""
+
+    def __init__(
+        self,
+        profile: LatencyProfile | None = None,
+        *,
+        default_model: str = "simulated",
+        seed: int = 0,
+    ) -> None:
+        self._profile = profile or PROFILES["instant"]
+        self._default_model = default_model
+        self._seed = seed
+        self._rng = random.Random(seed)
+
+    async def complete(
+        self,
+        messages: list[dict[str, str]],
+        *,
+        model: str | None = None,
+        temperature: float = 0.7,
+        max_tokens: int = 4096,
+    ) -> str:
+        target = model or self._default_model
+        await self._upstream()
+        text = self._synthetic_text(messages, temperature, max_tokens)
+        self._report(messages, text, target)
+        return text
+
+    async def complete_json[T: BaseModel](
+        self,
+        messages: list[dict[str, str]],
+        *,
+        schema: type[T],
+        model: str | None = None,
+        temperature: float = 0.7,
+        max_tokens: int = 4096,
+    ) -> T:
+        canned = _CANNED_JSON.get(schema)
+        if canned is None:
+            raise LLMResponseFormatError(
+                provider="simulated",
+                detail=f"Simulated provider has no canned reply for {schema.__name__}",
+            )
+        target = model or self._default_model
+
+        async def send(attempt: list[dict[str, str]]) -> str:
+            await self._upstream()
+            raw = json.dumps(canned(self._request_rng(attempt, temperature)))
+            self._report(attempt, raw, target)
+            return raw
+
+        return await complete_structured(send, messages, schema, provider="simulated")
+
+    async def stream(
+        self,
+        messages: list[dict[str, str]],
+        *,
+        model: str | None = None,
+        temperature: float = 0.7,
+        max_tokens: int = 4096,
+    ) -> AsyncIterator[str]:
+        target = model or self._default_model
+        self._maybe_fail()
+        await asyncio.sleep(self._lognormal(self._profile.ttft_seconds))
+        text = self._synthetic_text(messages, temperature, max_tokens)
+        words = text.split(" ")
+        for index, word in enumerate(words):
+            if index and self._profile.tokens_per_second > 0:
+                await asyncio.sleep(1 / self._profile.tokens_per_second)
+            yield word if index == len(words) - 1 else f"{word} "
+        self._report(messages, text, target)
+
+    async def count_tokens(self, text: str) -> int:
+        return count_tokens(text, self._default_model)
+
+    async def test_connection(self) -> bool:
+        return True
+
+    async def _upstream(self) -> None:
+        """Fail or wait like one non-streamed upstream request."""
+        self._maybe_fail()
+        await asyncio.sleep(self._lognormal(self._profile.median_seconds))
+
+    def _maybe_fail(self) -> None:
+        draw = self._rng.random()
+        if draw < self._profile.rate_limit_rate:
+            raise LLMRateLimitError(
+                provider="simulated", detail="Simulated rate limit", retry_after=1.0
+            )
+        if draw < self._profile.rate_limit_rate + self._profile.network_error_rate:
+            raise LLMNetworkError(provider="simulated", detail="Simulated network error")
+
+    def _lognormal(self, median: float) -> float:
+        if median <= 0:
+            return 0.0
+        return median * math.exp(self._rng.gauss(0.0, self._profile.sigma))
+
+    def _request_rng(self, messages: list[dict[str, str]], temperature: float) -> random.Random:
+        """Return an RNG seeded by the request, so equal requests get equal replies."""
+        payload = json.dumps([self._seed, round(temperature, 3), messages], sort_keys=True)
+        digest = hashlib.blake2b(payload.encode(), digest_size=8).digest()
+        return random.Random(int.from_bytes(digest))
+
+    def _synthetic_text(
+        self, messages: list[dict[str, str]], temperature: float, max_tokens: int
+    ) -> str:
+        rng = self._request_rng(messages, temperature)
+        prompt_words = [w for w in messages[-1]["content"].split() if w.isalpha()][:50]
+        vocabulary = [*_WORDS, *prompt_words]
+        length = min(max_tokens, rng.randint(40, 180))
+        sentences: list[str] = []
+        remaining = length
+        while remaining > 0:
+            size = min(remaining, rng.randint(6, 18))
+            words = [rng.choice(vocabulary) for _ in range(size)]
+            sentences.append(" ".join(words).capitalize() + ".")
+            remaining -= size
+        return " ".join(sentences)
+
+    def _report(self, messages: list[dict[str, str]], reply: str, model: str) -> None:
+        report_usage(
+            input_tokens=get_token_counter().count_messages(messages, model),
+            output_tokens=count_tokens(reply, model),
+        )
@@ -0,0 +1,221 @@
+"""Single-flight coalescing of identical in-flight LLM calls."""
+
+import asyncio
+from collections.abc import AsyncIterator, Callable
+from typing import cast
+
+from pydantic import BaseModel
+
+from app.llm.base import LLMProvider, SupportsAclose
+from app.llm.cache import cache_key
+
+
+class _StreamFanout:
+    """One upstream stream shared by many subscribers.
+
+    Chunks are buffered so a subscriber that joins mid-stream replays what it
+    missed before following the live tail. The upstream task is cancelled once
+    the last subscriber leaves.
+    """
+
+    def __init__(self, upstream: AsyncIterator[str], on_done: Callable[[], None]) -> None:
+        self._upstream = upstream
+        self._on_done = on_done
+        self._chunks: list[str] = []
+        self._done = False
+        self._error: BaseException | None = None
+        self._changed = asyncio.Condition()
+        self._subscribers = 0
+        self._task: asyncio.Task[None] | None = None
+
+    @property
+    def done(self) -> bool:
+        return self._done
+
+    async def _pump(self) -> None:
+        try:
+            async for chunk in self._upstream:
+                async with self._changed:
+                    self._chunks.append(chunk)
+                    self._changed.notify_all()
+        except BaseException as exc:
+            self._error = exc
+            if isinstance(exc, asyncio.CancelledError):
+                raise
+        finally:
+            async with self._changed:
+                self._done = True
+                self._changed.notify_all()
+            self._on_done()
+
+    async def subscribe(self) -> AsyncIterator[str]:
+        self._subscribers += 1
+        if self._task is None:
+            self._task = asyncio.create_task(self._pump())
+        index = 0
+        try:
+            while True:
+                async with self._changed:
+                    while index >= len(self._chunks) and not self._done:
+                        await self._changed.wait()
+                    pending = self._chunks[index:]
+                    finished = self._done
+                for chunk in pending:
+                    yield chunk
+                index += len(pending)
+                if finished and index >= len(self._chunks):
+                    if self._error is not None:
+                        raise self._error
+                    return
+        finally:
+            self._subscribers -= 1
+            if self._subscribers == 0 and not self._done:
+                self._task.cancel()
+
+
+class SingleFlightProvider:
+    """LLMProvider wrapper that runs at most one upstream call per identical payload.
+
+    Concurrent ``complete()`` callers with the same request share one upstream
+    task; concurrent ``stream()`` callers share one upstream stream. Nothing is
+    retained after the call finishes — that is the completion cache's job.
+
+    Like the cache, only calls at or below ``max_temperature`` are coalesced.
+    Higher temperatures are deliberately sampled, so concurrent callers asking
+    for variants each get their own upstream call.
+    """
+
+    def __init__(
+        self,
+        inner: LLMProvider,
+        *,
+        provider_name: str,
+        default_model: str,
+        max_temperature: float = 0.3,
+    ) -> None:
+        self._inner = inner
+        self._provider_name = provider_name
+        self._default_model = default_model
+        self._max_temperature = max_temperature
+        self._inflight: dict[str, asyncio.Task[str]] = {}
+        self._json_inflight: dict[str, asyncio.Task[BaseModel]] = {}
+        self._streams: dict[str, _StreamFanout] = {}
+
+    @property
+    def inflight_count(self) -> int:
+        return len(self._inflight) + len(self._json_inflight) + len(self._streams)
+
+    async def complete(
+        self,
+        messages: list[dict[str, str]],
+        *,
+        model: str | None = None,
+        temperature: float = 0.7,
+        max_tokens: int = 4096,
+    ) -> str:
+        """Join an identical in-flight call if one exists, otherwise start it."""
+        if temperature > self._max_temperature:
+            return await self._inner.complete(
+                messages, model=model, temperature=temperature, max_tokens=max_tokens
+            )
+        key = self._key(messages, model, temperature, max_tokens)
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(
+                self._inner.complete(
+                    messages, model=model, temperature=temperature, max_tokens=max_tokens
+                )
+            )
+            self._inflight[key] = task
+            task.add_done_callback(lambda _t: self._inflight.pop(key, None))
+        # Shield so one caller's cancellation does not abort the call for the others.
+        return await asyncio.shield(task)
+
+    async def complete_json[T: BaseModel](
+        self,
+        messages: list[dict[str, str]],
+        *,
+        schema: type[T],
+        model: str | None = None,
+        temperature: float = 0.7,
+        max_tokens: int = 4096,
+    ) -> T:
+        """Join an identical in-flight structured call; each caller gets its own copy."""
+        if temperature > self._max_temperature:
+            return await self._inner.complete_json(
+                messages, schema=schema, model=model, temperature=temperature, max_tokens=max_tokens
+            )
+        key = self._key(messages, model, temperature, max_tokens, schema=schema.__name__)
+        if key not in self._json_inflight:
+            task = asyncio.create_task(
+                self._inner.complete_json(
+                    messages,
+                    schema=schema,
+                    model=model,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                )
+            )
+            self._json_inflight[key] = task
+            task.add_done_callback(lambda _t: self._json_inflight.pop(key, None))
+        result = await asyncio.shield(self._json_inflight[key])
+        return cast(T, result.model_copy(deep=True))
+
+    async def stream(
+        self,
+        messages: list[dict[str, str]],
+        *,
+        model: str | None = None,
+        temperature: float = 0.7,
+        max_tokens: int = 4096,
+    ) -> AsyncIterator[str]:
+        """Subscribe to an identical in-flight stream if one exists, otherwise start it."""
+        if temperature > self._max_temperature:
+            async for chunk in self._inner.stream(
+                messages, model=model, temperature=temperature, max_tokens=max_tokens
+            ):
+                yield chunk
+            return
+        key = self._key(messages, model, temperature, max_tokens)
+        fanout = self._streams.get(key)
+        if fanout is None or fanout.done:
+            upstream = self._inner.stream(
+                messages, model=model, temperature=temperature, max_tokens=max_tokens
+            )
+            fanout = _StreamFanout(upstream, on_done=lambda: self._discard_stream(key))
+            self._streams[key] = fanout
+        async for chunk in fanout.subscribe():
+            yield chunk
+
+    async def count_tokens(self, text: str) -> int:
+        return await self._inner.count_tokens(text)
+
+    async def test_connection(self) -> bool:
+        return await self._inner.test_connection()
+
+    async def aclose(self) -> None:
+        if isinstance(self._inner, SupportsAclose):
+            await self._inner.aclose()
+
+    def _discard_stream(self, key: str) -> None:
+        fanout = self._streams.get(key)
+        if fanout is not None and fanout.done:
+            del self._streams[key]
+
+    def _key(
+        self,
+        messages: list[dict[str, str]],
+        model: str | None,
+        temperature: float,
+        max_tokens: int,
+        *,
+        schema: str | None = None,
+    ) -> str:
+        return cache_key(
+            provider=self._provider_name,
+            model=model or self._default_model,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            messages=messages,
+            schema=schema,
+        )
@@ -0,0 +1,152 @@
+"""Schema-validated JSON completions: local repair first, then a bounded re-ask."""
+
+import re
+from collections.abc import Awaitable, Callable
+
+from pydantic import BaseModel, ValidationError
+
+from app.exceptions import LLMResponseFormatError
+
+# Re-asks after the first reply; each one pays for the full prompt again.
+MAX_REASKS = 1
+
+_FENCE = re.compile(r"```(?:json)?\s*(.*?)\s*```", re.DOTALL | re.IGNORECASE)
+_TRAILING_COMMA = re.compile(r",\s*([}\]])")
+
+
+def _strip_fences(text: str) -> str:
+    match = _FENCE.search(text)
+    return match.group(1) if match else text
+
+
+def _extract_object(text: str) -> str:
+    """Drop prose around the outermost JSON object (keeping a truncated tail)."""
+    start = text.find("{")
+    if start == -1:
+        return text
+    end = text.rfind("}")
+    return text[start : end + 1] if end > start else text[start:]
+
+
+def _drop_trailing_commas(text: str) -> str:
+    return _TRAILING_COMMA.sub(r"\1", text)
+
+
+def _close_truncated(text: str) -> str:
+    """Close an unterminated string and any open brackets, e.g. after max_tokens."""
+    closers: list[str] = []
+    in_string = False
+    escaped = False
+    for char in text:
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in "{[":
+            closers.append("}" if char == "{" else "]")
+        elif char in "}]" and closers:
+            closers.pop()
+    if in_string:
+        text += '"'
+    elif not closers:
+        return text
+    text = text.rstrip().rstrip(",")
+    if text.endswith(":"):
+        text += " null"
+    return text + "".join(reversed(closers))
+
+
+# Applied cumulatively, cheapest first.
+_REPAIRS: tuple[Callable[[str], str], ...] = (
+    _strip_fences,
+    _extract_object,
+    _drop_trailing_commas,
+    _close_truncated,
+)
+
+
+def parse_json_response[T: BaseModel](raw: str, schema: type[T]) -> T:
+    """Validate ``raw`` against ``schema``, repairing common JSON damage locally.
+
+    Repairs only address syntax (code fences, surrounding prose, trailing
+    commas, truncation); a well-formed reply that fails validation is
+    re-raised as-is.
+
+    Raises:
+        ValidationError: If no repair yields a valid instance.
+    """
+    try:
+        return schema.model_validate_json(raw)
+    except ValidationError as exc:
+        error = exc
+    candidate = raw
+    for repair in _REPAIRS:
+        if all(err["type"] != "json_invalid" for err in error.errors()):
+            break
+        candidate = repair(candidate)
+        try:
+            return schema.model_validate_json(candidate)
+        except ValidationError as exc:
+            error = exc
+    raise error
+
+
+def _reask_messages(
+    messages: list[dict[str, str]], reply: str, error: ValidationError
+) -> list[dict[str, str]]:
+    problems = "; ".join(
+        f"{'.'.join(str(part) for part in err['loc']) or 'response'}: {err['msg']}"
+        for err in error.errors()[:5]
+    )
+    return [
+        *messages,
+        {"role": "assistant", "content": reply},
+        {
+            "role": "user",
+            "content": (
+                f"That reply was not valid for the required JSON schema ({problems})."
+                " Reply again with only the corrected JSON object."
+            ),
+        },
+    ]
+
+
+async def complete_structured[T: BaseModel](
+    send: Callable[[list[dict[str, str]]], Awaitable[str]],
+    messages: list[dict[str, str]],
+    schema: type[T],
+    *,
+    provider: str,
+    max_reasks: int = MAX_REASKS,
+) -> T:
+    """Run ``send`` (a vendor JSON-mode call) until its reply validates against ``schema``.
+
+    Each reply goes through ``parse_json_response`` first; only a reply that
+    cannot be repaired locally is sent back to the model, with the validation
+    errors, up to ``max_reasks`` times.
+
+    Raises:
+        LLMResponseFormatError: If no reply validates.
+    """
+    attempt = messages
+    reasks = 0
+    while True:
+        reply = await send(attempt)
+        try:
+            return parse_json_response(reply, schema)
+        except ValidationError as exc:
+            if reasks >= max_reasks:
+                raise LLMResponseFormatError(
+                    provider=provider,
+                    detail=(
+                        f"Provider '{provider}' returned an invalid {schema.__name__}"
+                        f" ({exc.error_count()} validation errors)"
+                    ),
+                ) from exc
+            reasks += 1
+            attempt = _reask_messages(messages, reply, exc)
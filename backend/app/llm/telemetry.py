@@ -0,0 +1,399 @@
+"""Per-call LLM telemetry — a recording wrapper and a batched SQLite ledger."""
+
+import asyncio
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Generator
+from contextlib import contextmanager, suppress
+from contextvars import ContextVar
+from dataclasses import astuple, dataclass, fields
+from pathlib import Path
+
+import aiosqlite
+from pydantic import BaseModel
+
+from app.constants import MODEL_PRICING
+from app.exceptions import SonaError
+from app.llm.base import LLMProvider, SupportsAclose, retry_attempt
+from app.llm.usage import capture_usage
+from app.metrics import LLM_LATENCY, LLM_STREAMS_IN_FLIGHT, LLM_TTFT
+
+_OPERATION: ContextVar[tuple[str, str | None] | None] = ContextVar("llm_operation", default=None)
+
+
+@contextmanager
+def llm_operation(operation: str, *, clone_id: str | None = None) -> Generator[None]:
+    """Tag the provider calls made inside the block with an operation and clone.
+
+    Tasks started inside the block (e.g. ``asyncio.gather`` over platforms)
+    inherit the tag. The previous tag is restored by value, so the block may
+    span the yields of a streaming response body.
+    """
+    previous = _OPERATION.get()
+    _OPERATION.set((operation, clone_id))
+    try:
+        yield
+    finally:
+        _OPERATION.set(previous)
+
+
+def call_cost(
+    model: str, *, input_tokens: int, output_tokens: int, cached_input_tokens: int = 0
+) -> float:
+    """Return the USD cost of one call from MODEL_PRICING (0 for unpriced models).
+
+    ``input_tokens`` includes the cached tokens, which are billed at the
+    model's ``cached_input`` rate when it has one.
+    """
+    pricing = MODEL_PRICING.get(model)
+    if not pricing:
+        return 0.0
+    input_price = float(pricing["input"])
+    cached_price = float(pricing.get("cached_input", input_price))
+    uncached = max(0, input_tokens - cached_input_tokens)
+    return (
+        uncached * input_price
+        + cached_input_tokens * cached_price
+        + output_tokens * float(pricing["output"])
+    ) / 1_000_000
+
+
+@dataclass(frozen=True)
+class LLMCallRecord:
+    """One upstream provider call as written to the ledger.
+
+    ``ttft_seconds`` is only set for streams; ``error`` holds the SonaError
+    code (or exception class name) when the call failed.
+    """
+
+    created_at: float
+    operation: str | None
+    clone_id: str | None
+    provider: str
+    model: str
+    method: str
+    input_tokens: int
+    output_tokens: int
+    cached_input_tokens: int
+    ttft_seconds: float | None
+    latency_seconds: float
+    retries: int
+    cost_usd: float
+    error: str | None
+
+
+@dataclass(frozen=True)
+class LLMCallSummary:
+    """Aggregated ledger rows for one (operation, provider, model)."""
+
+    operation: str | None
+    provider: str
+    model: str
+    calls: int
+    errors: int
+    retries: int
+    input_tokens: int
+    output_tokens: int
+    cached_input_tokens: int
+    avg_latency_seconds: float
+    max_latency_seconds: float
+    avg_ttft_seconds: float | None
+    cost_usd: float
+
+
+_COLUMNS = tuple(field.name for field in fields(LLMCallRecord))
+
+
+class CallLedger:
+    """Buffers LLMCallRecords in memory and writes them to SQLite in batches.
+
+    ``record()`` never blocks the calling request: a background task flushes
+    every ``flush_interval`` seconds, or as soon as ``batch_size`` records are
+    pending, with one ``executemany`` per batch. At most ``max_pending``
+    records are buffered; beyond that the oldest are dropped, as are batches
+    that fail to write — telemetry must not take the app down with it.
+    """
+
+    def __init__(
+        self,
+        db_path: Path,
+        *,
+        batch_size: int = 100,
+        flush_interval: float = 2.0,
+        max_pending: int = 10_000,
+    ) -> None:
+        self._db_path = db_path
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._pending: deque[LLMCallRecord] = deque(maxlen=max_pending)
+        self._conn: aiosqlite.Connection | None = None
+        self._open_lock = asyncio.Lock()
+        self._flush_lock = asyncio.Lock()
+        self._wakeup = asyncio.Event()
+        self._flusher: asyncio.Task[None] | None = None
+
+    def record(self, record: LLMCallRecord) -> None:
+        """Queue a record for the next batch write."""
+        self._pending.append(record)
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.create_task(self._run())
+        if len(self._pending) >= self._batch_size:
+            self._wakeup.set()
+
+    async def flush(self) -> None:
+        """Write every pending record now."""
+        async with self._flush_lock:
+            if not self._pending:
+                return
+            batch = list(self._pending)
+            self._pending.clear()
+            try:
+                conn = await self._connect()
+                await conn.executemany(
+                    f"INSERT INTO llm_calls ({', '.join(_COLUMNS)})"
+                    f" VALUES ({', '.join('?' for _ in _COLUMNS)})",
+                    [astuple(record) for record in batch],
+                )
+                await conn.commit()
+            except (aiosqlite.Error, OSError):
+                pass  # Dropped; the ledger is best-effort.
+
+    async def summary(
+        self, *, since: float | None = None, clone_id: str | None = None
+    ) -> list[LLMCallSummary]:
+        """Aggregate recorded calls per (operation, provider, model), costliest first."""
+        await self.flush()
+        conditions: list[str] = []
+        params: list[object] = []
+        if since is not None:
+            conditions.append("created_at >= ?")
+            params.append(since)
+        if clone_id is not None:
+            conditions.append("clone_id = ?")
+            params.append(clone_id)
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        conn = await self._connect()
+        async with conn.execute(
+            "SELECT operation, provider, model, COUNT(*), COUNT(error), SUM(retries),"
+            " SUM(input_tokens), SUM(output_tokens), SUM(cached_input_tokens),"
+            " AVG(latency_seconds), MAX(latency_seconds), AVG(ttft_seconds), SUM(cost_usd)"
+            f" FROM llm_calls{where}"
+            " GROUP BY operation, provider, model"
+            " ORDER BY SUM(cost_usd) DESC, operation, provider, model",
+            params,
+        ) as cursor:
+            rows = await cursor.fetchall()
+        return [
+            LLMCallSummary(
+                operation=row[0],
+                provider=row[1],
+                model=row[2],
+                calls=row[3],
+                errors=row[4],
+                retries=row[5],
+                input_tokens=row[6],
+                output_tokens=row[7],
+                cached_input_tokens=row[8],
+                avg_latency_seconds=row[9],
+                max_latency_seconds=row[10],
+                avg_ttft_seconds=row[11],
+                cost_usd=row[12],
+            )
+            for row in rows
+        ]
+
+    async def aclose(self) -> None:
+        """Stop the background flusher, write what is pending and close the database."""
+        if self._flusher is not None:
+            self._flusher.cancel()
+            await asyncio.gather(self._flusher, return_exceptions=True)
+            self._flusher = None
+        await self.flush()
+        if self._conn is not None:
+            await self._conn.close()
+            self._conn = None
+
+    async def _run(self) -> None:
+        while True:
+            with suppress(TimeoutError):
+                await asyncio.wait_for(self._wakeup.wait(), self._flush_interval)
+            self._wakeup.clear()
+            await self.flush()
+
+    async def _connect(self) -> aiosqlite.Connection:
+        async with self._open_lock:
+            if self._conn is None:
+                self._db_path.parent.mkdir(parents=True, exist_ok=True)
+                conn = await aiosqlite.connect(self._db_path)
+                await conn.execute("PRAGMA journal_mode=WAL")
+                await conn.execute(
+                    "CREATE TABLE IF NOT EXISTS llm_calls ("
+                    " id INTEGER PRIMARY KEY,"
+                    " created_at REAL NOT NULL,"
+                    " operation TEXT,"
+                    " clone_id TEXT,"
+                    " provider TEXT NOT NULL,"
+                    " model TEXT NOT NULL,"
+                    " method TEXT NOT NULL,"
+                    " input_tokens INTEGER NOT NULL,"
+                    " output_tokens INTEGER NOT NULL,"
+                    " cached_input_tokens INTEGER NOT NULL,"
+                    " ttft_seconds REAL,"
+                    " latency_seconds REAL NOT NULL,"
+                    " retries INTEGER NOT NULL,"
+                    " cost_usd REAL NOT NULL,"
+                    " error TEXT)"
+                )
+                await conn.execute(
+                    "CREATE INDEX IF NOT EXISTS ix_llm_calls_created_at ON llm_calls (created_at)"
+                )
+                await conn.execute(
+                    "CREATE INDEX IF NOT EXISTS ix_llm_calls_clone_id ON llm_calls (clone_id)"
+                )
+                await conn.commit()
+                self._conn = conn
+            return self._conn
+
+
+class _CallTimer:
+    """Mutable timing state for one in-progress call."""
+
+    def __init__(self) -> None:
+        self.started = time.monotonic()
+        self.ttft: float | None = None
+
+    def first_token(self) -> None:
+        if self.ttft is None:
+            self.ttft = time.monotonic() - self.started
+
+
+class TelemetryProvider:
+    """LLMProvider wrapper that writes one LLMCallRecord per upstream call.
+
+    Latency, time to first token and open streams also feed the Prometheus
+    histograms in ``app.metrics``.
+
+    Sits innermost in the wrapper chain, so latency excludes rate-limit
+    queueing and cache hits are not recorded. The operation and clone come
+    from ``llm_operation()``; the retry count from ``with_retry``.
+    """
+
+    def __init__(
+        self,
+        inner: LLMProvider,
+        ledger: CallLedger,
+        *,
+        provider_name: str,
+        default_model: str,
+    ) -> None:
+        self._inner = inner
+        self._ledger = ledger
+        self._provider_name = provider_name
+        self._default_model = default_model
+
+    async def complete(
+        self,
+        messages: list[dict[str, str]],
+        *,
+        model: str | None = None,
+        temperature: float = 0.7,
+        max_tokens: int = 4096,
+    ) -> str:
+        with self._observe("complete", model):
+            return await self._inner.complete(
+                messages, model=model, temperature=temperature, max_tokens=max_tokens
+            )
+
+    async def complete_json[T: BaseModel](
+        self,
+        messages: list[dict[str, str]],
+        *,
+        schema: type[T],
+        model: str | None = None,
+        temperature: float = 0.7,
+        max_tokens: int = 4096,
+    ) -> T:
+        with self._observe("complete_json", model):
+            return await self._inner.complete_json(
+                messages, schema=schema, model=model, temperature=temperature, max_tokens=max_tokens
+            )
+
+    async def stream(
+        self,
+        messages: list[dict[str, str]],
+        *,
+        model: str | None = None,
+        temperature: float = 0.7,
+        max_tokens: int = 4096,
+    ) -> AsyncIterator[str]:
+        LLM_STREAMS_IN_FLIGHT.inc(self._provider_name)
+        try:
+            with self._observe("stream", model) as timer:
+                async for chunk in self._inner.stream(
+                    messages, model=model, temperature=temperature, max_tokens=max_tokens
+                ):
+                    timer.first_token()
+                    yield chunk
+        finally:
+            LLM_STREAMS_IN_FLIGHT.dec(self._provider_name)
+
+    async def count_tokens(self, text: str) -> int:
+        return await self._inner.count_tokens(text)
+
+    async def test_connection(self) -> bool:
+        return await self._inner.test_connection()
+
+    async def aclose(self) -> None:
+        if isinstance(self._inner, SupportsAclose):
+            await self._inner.aclose()
+
+    @contextmanager
+    def _observe(self, method: str, model: str | None) -> Generator[_CallTimer]:
+        timer = _CallTimer()
+        retries = retry_attempt()
+        operation, clone_id = _OPERATION.get() or (None, None)
+        error: str | None = None
+        with capture_usage() as usage:
+            try:
+                yield timer
+            except SonaError as exc:
+                error = exc.code
+                raise
+            except (asyncio.CancelledError, GeneratorExit):
+                error = "CANCELLED"
+                raise
+            except Exception as exc:
+                error = type(exc).__name__
+                raise
+            finally:
+                target = model or self._default_model
+                latency = time.monotonic() - timer.started
+                LLM_LATENCY.observe(
+                    latency, self._provider_name, target, method, "error" if error else "ok"
+                )
+                if timer.ttft is not None:
+                    LLM_TTFT.observe(timer.ttft, self._provider_name, target)
+                self._ledger.record(
+                    LLMCallRecord(
+                        created_at=time.time(),
+                        operation=operation,
+                        clone_id=clone_id,
+                        provider=self._provider_name,
+                        model=target,
+                        method=method,
+                        input_tokens=usage.input_tokens,
+                        output_tokens=usage.output_tokens,
+                        cached_input_tokens=usage.cached_input_tokens,
+                        ttft_seconds=timer.ttft if method == "stream" else None,
+                        latency_seconds=latency,
+                        retries=retries,
+                        cost_usd=call_cost(
+                            target,
+                            input_tokens=usage.input_tokens,
+                            output_tokens=usage.output_tokens,
+                            cached_input_tokens=usage.cached_input_tokens,
+                        ),
+                        error=error,
+                    )
+                )
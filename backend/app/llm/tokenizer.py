@@ -0,0 +1,234 @@
+"""Offline token counting per model family, memoized by text hash.
+
+OpenAI models are counted exactly with tiktoken BPE files vendored under
+``settings.llm_tokenizer_dir`` (populate it once with
+``python -m app.llm.tokenizer``). Anthropic and Google publish no offline
+tokenizer for their current models, so they are counted with the o200k BPE as
+a proxy, scaled to the vendor's observed density. Without tiktoken or the
+vendored files every family falls back to a characters-per-token estimate,
+with a warning logged once per encoding — no network call is ever made at
+count time.
+"""
+
+import base64
+import functools
+import hashlib
+import logging
+import math
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from app.config import settings
+from app.constants import MODEL_PRICING
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class _EncodingSpec:
+    """Everything tiktoken needs to build an encoding from its BPE file."""
+
+    url: str
+    sha256: str
+    pat_str: str
+    special_tokens: dict[str, int]
+
+
+# Mirrors tiktoken_ext.openai_public, which only builds encodings by download.
+_ENCODINGS: dict[str, _EncodingSpec] = {
+    "o200k_base": _EncodingSpec(
+        url="https://openaipublic.blob.core.windows.net/encodings/o200k_base.tiktoken",
+        sha256="446a9538cb6c348e3516120d7c08b09f57c36495e2acfffe59a5bf8b0cfb1a2d",
+        pat_str="|".join(
+            [
+                r"""[^\r\n\p{L}\p{N}]?[\p{Lu}\p{Lt}\p{Lm}\p{Lo}\p{M}]*[\p{Ll}\p{Lm}\p{Lo}\p{M}]+(?i:'s|'t|'re|'ve|'m|'ll|'d)?""",
+                r"""[^\r\n\p{L}\p{N}]?[\p{Lu}\p{Lt}\p{Lm}\p{Lo}\p{M}]+[\p{Ll}\p{Lm}\p{Lo}\p{M}]*(?i:'s|'t|'re|'ve|'m|'ll|'d)?""",
+                r"""\p{N}{1,3}""",
+                r""" ?[^\s\p{L}\p{N}]+[\r\n/]*""",
+                r"""\s*[\r\n]+""",
+                r"""\s+(?!\S)""",
+                r"""\s+""",
+            ]
+        ),
+        special_tokens={"<|endoftext|>": 199999, "<|endofprompt|>": 200018},
+    ),
+    "cl100k_base": _EncodingSpec(
+        url="https://openaipublic.blob.core.windows.net/encodings/cl100k_base.tiktoken",
+        sha256="223921b76ee99bde995b7ff738513eef100fb51d18c93597a113bcffe865b2a7",
+        pat_str="|".join(
+            [
+                r"""'(?i:[sdmt]|ll|ve|re)""",
+                r"""[^\r\n\p{L}\p{N}]?+\p{L}++""",
+                r"""\p{N}{1,3}+""",
+                r""" ?[^\s\p{L}\p{N}]++[\r\n]*+""",
+                r"""\s++$""",
+                r"""\s*[\r\n]""",
+                r"""\s+(?!\S)""",
+                r"""\s""",
+            ]
+        ),
+        special_tokens={
+            "<|endoftext|>": 100257,
+            "<|fim_prefix|>": 100258,
+            "<|fim_middle|>": 100259,
+            "<|fim_suffix|>": 100260,
+            "<|endofprompt|>": 100276,
+        },
+    ),
+}
+
+
+def _parse_bpe(contents: bytes) -> dict[bytes, int]:
+    """Parse a ``.tiktoken`` file: one base64 token and its rank per line."""
+    ranks: dict[bytes, int] = {}
+    for line in contents.splitlines():
+        if line:
+            token, rank = line.split()
+            ranks[base64.b64decode(token)] = int(rank)
+    return ranks
+
+
+# Model-name prefix → (family, encoding). First match wins.
+_MODEL_ENCODINGS: tuple[tuple[str, str, str], ...] = (
+    ("gpt-4o", "openai", "o200k_base"),
+    ("gpt-4.1", "openai", "o200k_base"),
+    ("gpt-5", "openai", "o200k_base"),
+    ("o1", "openai", "o200k_base"),
+    ("o3", "openai", "o200k_base"),
+    ("o4", "openai", "o200k_base"),
+    ("gpt-4", "openai", "cl100k_base"),
+    ("gpt-3.5", "openai", "cl100k_base"),
+    ("claude", "anthropic", "o200k_base"),
+    ("gemini", "google", "o200k_base"),
+)
+
+# Proxy-count multipliers for families counted with another vendor's BPE.
+_PROXY_SCALE: dict[str, float] = {"openai": 1.0, "anthropic": 1.1, "google": 1.0}
+
+# Fallback density when no tokenizer is available.
+_CHARS_PER_TOKEN: dict[str, float] = {"openai": 4.0, "anthropic": 3.5, "google": 4.0}
+
+
+def model_family(model: str) -> tuple[str, str]:
+    """Return ``(family, encoding)`` for a model name; unknown models count as OpenAI."""
+    for prefix, family, encoding in _MODEL_ENCODINGS:
+        if model.startswith(prefix):
+            return family, encoding
+    return "openai", "o200k_base"
+
+
+def context_window(model: str) -> int | None:
+    """Return the model's context window from MODEL_PRICING, if known."""
+    pricing = MODEL_PRICING.get(model)
+    if pricing is None or "context_window" not in pricing:
+        return None
+    return int(pricing["context_window"])
+
+
+def fits_context_window(prompt_tokens: int, model: str, *, max_output_tokens: int) -> bool:
+    """Return whether a prompt plus its output budget fits the model's context window.
+
+    Models missing from MODEL_PRICING are assumed to fit.
+    """
+    window = context_window(model)
+    return window is None or prompt_tokens + max_output_tokens <= window
+
+
+class TokenCounter:
+    """Counts tokens per model family with an LRU cache keyed on a hash of the text."""
+
+    def __init__(self, tokenizer_dir: Path, *, cache_entries: int = 4096) -> None:
+        self._tokenizer_dir = tokenizer_dir
+        self._cache_entries = cache_entries
+        self._cache: OrderedDict[tuple[str, bytes], int] = OrderedDict()
+        self._encodings: dict[str, Any | None] = {}
+
+    def count(self, text: str, model: str) -> int:
+        """Return the token count of ``text`` for ``model`` (at least 1 for non-empty text)."""
+        if not text:
+            return 0
+        family, encoding_name = model_family(model)
+        key = (f"{family}:{encoding_name}", hashlib.blake2b(text.encode()).digest())
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            return cached
+
+        encoding = self._encoding(encoding_name)
+        if encoding is not None:
+            tokens = math.ceil(len(encoding.encode_ordinary(text)) * _PROXY_SCALE[family])
+        else:
+            tokens = math.ceil(len(text) / _CHARS_PER_TOKEN[family])
+        tokens = max(tokens, 1)
+
+        self._cache[key] = tokens
+        if len(self._cache) > self._cache_entries:
+            self._cache.popitem(last=False)
+        return tokens
+
+    def count_messages(self, messages: list[dict[str, str]], model: str) -> int:
+        """Return the token count of a chat prompt, including per-message framing."""
+        return sum(self.count(msg.get("content", ""), model) + 4 for msg in messages)
+
+    def _encoding(self, name: str) -> Any | None:
+        if name not in self._encodings:
+            self._encodings[name] = self._load_encoding(name)
+        return self._encodings[name]
+
+    def _load_encoding(self, name: str) -> Any | None:
+        """Build a tiktoken encoding from its vendored BPE file, or None if unavailable."""
+        path = self._tokenizer_dir / f"{name}.tiktoken"
+        if not path.is_file():
+            logger.warning(
+                "No vendored %s tokenizer at %s; token counts are estimated from character "
+                "counts. Run 'python -m app.llm.tokenizer' to vendor it.",
+                name,
+                path,
+            )
+            return None
+        try:
+            import tiktoken  # pyright: ignore[reportMissingImports]
+        except ImportError:
+            logger.warning(
+                "tiktoken is not installed; token counts are estimated from character "
+                "counts. Install the 'tokenizers' extra for exact counts."
+            )
+            return None
+        spec = _ENCODINGS[name]
+        return tiktoken.Encoding(  # pyright: ignore[reportUnknownMemberType]
+            name,
+            pat_str=spec.pat_str,
+            mergeable_ranks=_parse_bpe(path.read_bytes()),
+            special_tokens=spec.special_tokens,
+        )
+
+
+@functools.cache
+def get_token_counter() -> TokenCounter:
+    """Return the process-wide TokenCounter configured from settings."""
+    return TokenCounter(
+        Path(settings.llm_tokenizer_dir),
+        cache_entries=settings.llm_token_cache_entries,
+    )
+
+
+def count_tokens(text: str, model: str) -> int:
+    """Count tokens for ``model`` with the shared, memoized counter."""
+    return get_token_counter().count(text, model)
+
+
+if __name__ == "__main__":
+    # One-time vendoring: download the BPE files into the tokenizer directory.
+    import urllib.request
+
+    target = Path(settings.llm_tokenizer_dir)
+    target.mkdir(parents=True, exist_ok=True)
+    for encoding_name, encoding_spec in _ENCODINGS.items():
+        with urllib.request.urlopen(encoding_spec.url) as response:
+            data: bytes = response.read()
+        if hashlib.sha256(data).hexdigest() != encoding_spec.sha256:
+            raise SystemExit(f"Checksum mismatch for {encoding_name}; not vendored")
+        (target / f"{encoding_name}.tiktoken").write_bytes(data)
+        print(f"Vendored {encoding_name} into {target}")
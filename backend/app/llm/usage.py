@@ -0,0 +1,122 @@
+"""Provider-reported token usage: per-call capture and prompt-cache aggregates."""
+
+from collections.abc import Generator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+
+def as_count(value: object) -> int:
+    """Coerce an SDK usage field to a token count; missing or non-int values count as 0."""
+    return value if isinstance(value, int) and not isinstance(value, bool) else 0
+
+
+@dataclass
+class CallUsage:
+    """Token counts reported by the upstream requests made inside ``capture_usage()``."""
+
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cached_input_tokens: int = 0
+    cache_write_tokens: int = 0
+
+
+_CALL_USAGE: ContextVar[CallUsage | None] = ContextVar("llm_call_usage", default=None)
+
+
+@contextmanager
+def capture_usage() -> Generator[CallUsage]:
+    """Collect the usage that providers report while the block runs.
+
+    The previous collector is restored by value rather than by token, so the
+    block may span the yields of an async generator (a streamed call).
+    """
+    usage = CallUsage()
+    previous = _CALL_USAGE.get()
+    _CALL_USAGE.set(usage)
+    try:
+        yield usage
+    finally:
+        _CALL_USAGE.set(previous)
+
+
+def report_usage(
+    *,
+    input_tokens: int = 0,
+    output_tokens: int = 0,
+    cached_input_tokens: int = 0,
+    cache_write_tokens: int = 0,
+) -> None:
+    """Add one upstream response's token counts to the active ``capture_usage()``.
+
+    ``input_tokens`` follows the ``PromptCacheUsage`` convention (cached tokens
+    included). Counts accumulate, so JSON re-asks and streams that report
+    input and output in separate events add up to the call's total.
+    """
+    usage = _CALL_USAGE.get()
+    if usage is None:
+        return
+    usage.input_tokens += input_tokens
+    usage.output_tokens += output_tokens
+    usage.cached_input_tokens += cached_input_tokens
+    usage.cache_write_tokens += cache_write_tokens
+
+
+@dataclass(frozen=True)
+class PromptCacheStats:
+    """Snapshot of one (provider, model)'s prompt-cache counters."""
+
+    provider: str
+    model: str
+    requests: int
+    input_tokens: int
+    cached_input_tokens: int
+    cache_write_tokens: int
+
+    @property
+    def hit_rate(self) -> float:
+        """Share of input tokens served from the provider's prompt cache."""
+        return self.cached_input_tokens / self.input_tokens if self.input_tokens else 0.0
+
+
+class PromptCacheUsage:
+    """Accumulates the input/cached token counts that providers report per call.
+
+    ``input_tokens`` is the full prompt size including cached tokens, so the
+    hit rate is comparable across vendors: OpenAI reports cached tokens as a
+    subset of ``prompt_tokens``, while Anthropic reports cache reads and writes
+    separately from the uncached ``input_tokens``.
+    """
+
+    def __init__(self) -> None:
+        self._totals: dict[tuple[str, str], list[int]] = {}
+
+    def record(
+        self,
+        provider: str,
+        model: str,
+        *,
+        input_tokens: int,
+        cached_input_tokens: int = 0,
+        cache_write_tokens: int = 0,
+    ) -> None:
+        totals = self._totals.setdefault((provider, model), [0, 0, 0, 0])
+        totals[0] += 1
+        totals[1] += input_tokens
+        totals[2] += cached_input_tokens
+        totals[3] += cache_write_tokens
+
+    def stats(self) -> list[PromptCacheStats]:
+        return [
+            PromptCacheStats(
+                provider=provider,
+                model=model,
+                requests=requests,
+                input_tokens=input_tokens,
+                cached_input_tokens=cached,
+                cache_write_tokens=writes,
+            )
+            for (provider, model), (requests, input_tokens, cached, writes) in sorted(
+                self._totals.items()
+            )
+        ]
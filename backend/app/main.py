@@ -1,14 +1,23 @@
+import asyncio
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 
+from app.api.deps import provider_registry
 from app.api.router import api_router
-from app.config import PROJECT_ROOT
+from app.config import PROJECT_ROOT, settings
 from app.database import Base, async_session, engine
 from app.exceptions import SonaError
+from app.metrics import (
+    CONTENT_TYPE,
+    REGISTRY,
+    MetricsMiddleware,
+    instrument_engine,
+    monitor_event_loop,
+)
 from app.seed import seed_demo_clones, seed_methodology_defaults
 from app.services.clone_service import CloneService
 
@@ -26,6 +35,9 @@ STATUS_MAP: dict[str, int] = {
     "VALIDATION_ERROR": 422,
     "DEMO_CLONE_READONLY": 400,
     "CLONE_SOFT_DELETED": 410,
+    "PROVIDER_UNAVAILABLE": 503,
+    "LLM_INVALID_RESPONSE": 502,
+    "INVALID_CURSOR": 400,
 }
 
 
@@ -47,8 +59,16 @@ async def lifespan(_app: FastAPI) -> AsyncGenerator[None]:
         await service.purge_expired()
         await session.commit()
 
+    lag_monitor: asyncio.Task[None] | None = None
+    if settings.metrics_enabled:
+        lag_monitor = asyncio.create_task(monitor_event_loop(settings.metrics_event_loop_interval))
+
     yield
 
+    if lag_monitor is not None:
+        lag_monitor.cancel()
+        await asyncio.gather(lag_monitor, return_exceptions=True)
+    await provider_registry.aclose()
     await engine.dispose()
 
 
@@ -63,6 +83,15 @@ app.add_middleware(
 
 app.include_router(api_router)
 
+if settings.metrics_enabled:
+    # Added last so it is outermost and times the whole middleware stack.
+    app.add_middleware(MetricsMiddleware)
+    instrument_engine(engine)
+
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics() -> Response:
+        return Response(REGISTRY.render(), media_type=CONTENT_TYPE)
+
 
 @app.exception_handler(SonaError)
 async def sona_error_handler(_request: Request, exc: SonaError) -> JSONResponse:
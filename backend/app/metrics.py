@@ -0,0 +1,364 @@
+"""Prometheus-style instrumentation: route, SQL, LLM and event-loop metrics.
+
+A small in-process registry rendering the Prometheus text exposition format
+(version 0.0.4), so ``/metrics`` can be scraped without extra dependencies.
+"""
+
+import asyncio
+import bisect
+import math
+import time
+from collections.abc import Iterable, Sequence
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+SQL_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+LOOP_LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+# Label for requests that matched no route, so unknown paths cannot explode cardinality.
+UNMATCHED_ROUTE = "unmatched"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values, strict=True)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def _key(self, labels: Sequence[str]) -> tuple[str, ...]:
+        if len(labels) != len(self.labelnames):
+            msg = f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}"
+            raise ValueError(msg)
+        return tuple(str(label) for label in labels)
+
+    def samples(self) -> Iterable[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        header = f"# HELP {self.name} {self.documentation}\n# TYPE {self.name} {self.kind}\n"
+        return header + "".join(f"{line}\n" for line in self.samples())
+
+
+class Counter(_Metric):
+    """Monotonically increasing count per label set."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> Iterable[str]:
+        for key, value in sorted(self._values.items()):
+            yield f"{self.name}{_labels(self.labelnames, key)} {_format_value(value)}"
+
+
+class Gauge(_Metric):
+    """Value that can go up and down per label set."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def set(self, value: float, *labels: str) -> None:
+        self._values[self._key(labels)] = value
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, *labels: str, amount: float = 1.0) -> None:
+        self.inc(*labels, amount=-amount)
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> Iterable[str]:
+        for key, value in sorted(self._values.items()):
+            yield f"{self.name}{_labels(self.labelnames, key)} {_format_value(value)}"
+
+
+@dataclass
+class _HistogramSeries:
+    counts: list[int]
+    total: float = 0.0
+    count: int = 0
+
+
+class Histogram(_Metric):
+    """Cumulative-bucket histogram per label set."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        *,
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series: dict[tuple[str, ...], _HistogramSeries] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        key = self._key(labels)
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = _HistogramSeries(counts=[0] * len(self.buckets))
+        index = bisect.bisect_left(self.buckets, value)
+        if index < len(self.buckets):
+            series.counts[index] += 1
+        series.total += value
+        series.count += 1
+
+    def count(self, *labels: str) -> int:
+        series = self._series.get(self._key(labels))
+        return series.count if series else 0
+
+    def sum(self, *labels: str) -> float:
+        series = self._series.get(self._key(labels))
+        return series.total if series else 0.0
+
+    def samples(self) -> Iterable[str]:
+        for key, series in sorted(self._series.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, series.counts, strict=True):
+                cumulative += bucket_count
+                le = f'le="{_format_value(bound)}"'
+                yield f"{self.name}_bucket{_labels(self.labelnames, key, le)} {cumulative}"
+            inf = _labels(self.labelnames, key, 'le="+Inf"')
+            yield f"{self.name}_bucket{inf} {series.count}"
+            labels = _labels(self.labelnames, key)
+            yield f"{self.name}_sum{labels} {_format_value(series.total)}"
+            yield f"{self.name}_count{labels} {series.count}"
+
+
+class MetricsRegistry:
+    """Ordered collection of metrics rendered together for a scrape."""
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+
+    def register[M: _Metric](self, metric: M) -> M:
+        if metric.name in self._metrics:
+            msg = f"Metric '{metric.name}' is already registered"
+            raise ValueError(msg)
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        return "".join(metric.render() for metric in self._metrics.values())
+
+
+REGISTRY = MetricsRegistry()
+
+HTTP_REQUESTS = REGISTRY.register(
+    Counter(
+        "sona_http_requests_total",
+        "HTTP requests by method, route template and status code.",
+        ("method", "route", "status"),
+    )
+)
+HTTP_LATENCY = REGISTRY.register(
+    Histogram(
+        "sona_http_request_duration_seconds",
+        "HTTP request latency by route template, including streamed bodies.",
+        ("method", "route"),
+    )
+)
+HTTP_IN_FLIGHT = REGISTRY.register(
+    Gauge("sona_http_requests_in_flight", "HTTP requests currently being served.")
+)
+DB_QUERY_LATENCY = REGISTRY.register(
+    Histogram(
+        "sona_db_query_duration_seconds",
+        "SQL statement execution time by statement verb.",
+        ("statement",),
+        buckets=SQL_BUCKETS,
+    )
+)
+DB_QUERIES_PER_REQUEST = REGISTRY.register(
+    Histogram(
+        "sona_db_queries_per_request",
+        "SQL statements executed while serving one request, by route template.",
+        ("method", "route"),
+        buckets=COUNT_BUCKETS,
+    )
+)
+DB_TIME_PER_REQUEST = REGISTRY.register(
+    Histogram(
+        "sona_db_seconds_per_request",
+        "Total SQL execution time while serving one request, by route template.",
+        ("method", "route"),
+        buckets=(*SQL_BUCKETS, 2.5, 5.0),
+    )
+)
+LLM_LATENCY = REGISTRY.register(
+    Histogram(
+        "sona_llm_call_duration_seconds",
+        "Upstream LLM call latency by provider, model, method and outcome.",
+        ("provider", "model", "method", "outcome"),
+    )
+)
+LLM_TTFT = REGISTRY.register(
+    Histogram(
+        "sona_llm_time_to_first_token_seconds",
+        "Time to the first streamed chunk by provider and model.",
+        ("provider", "model"),
+    )
+)
+LLM_STREAMS_IN_FLIGHT = REGISTRY.register(
+    Gauge(
+        "sona_llm_streams_in_flight",
+        "Upstream LLM streams currently open, by provider.",
+        ("provider",),
+    )
+)
+EVENT_LOOP_LAG = REGISTRY.register(
+    Histogram(
+        "sona_event_loop_lag_seconds",
+        "How late the event loop ran a timer scheduled by the lag monitor.",
+        buckets=LOOP_LAG_BUCKETS,
+    )
+)
+
+
+@dataclass
+class _RequestQueries:
+    count: int = 0
+    seconds: float = 0.0
+
+
+_REQUEST_QUERIES: ContextVar[_RequestQueries | None] = ContextVar("request_queries", default=None)
+
+
+def _route_template(scope: Scope) -> str:
+    """Return the path template of the route that handled ``scope``.
+
+    FastAPI records the matched route in the scope while routing.
+    """
+    path = getattr(scope.get("route"), "path", None)
+    return path if isinstance(path, str) else UNMATCHED_ROUTE
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording request rate, latency and SQL usage per route.
+
+    Latency runs until the response body is complete, so streamed responses
+    count their full duration.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+        queries = _RequestQueries()
+        token = _REQUEST_QUERIES.set(queries)
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = int(message["status"])
+            await send(message)
+
+        HTTP_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_IN_FLIGHT.dec()
+            _REQUEST_QUERIES.reset(token)
+            method = str(scope["method"])
+            route = _route_template(scope)
+            HTTP_REQUESTS.inc(method, route, str(status))
+            HTTP_LATENCY.observe(time.perf_counter() - started, method, route)
+            DB_QUERIES_PER_REQUEST.observe(queries.count, method, route)
+            DB_TIME_PER_REQUEST.observe(queries.seconds, method, route)
+
+
+def _statement_verb(statement: str) -> str:
+    verb = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else ""
+    return verb if verb in {"SELECT", "INSERT", "UPDATE", "DELETE"} else "OTHER"
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """Time every SQL statement on ``engine`` and attribute it to the current request."""
+    sync_engine = engine.sync_engine
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before(  # pyright: ignore[reportUnusedFunction]
+        conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool
+    ) -> None:
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after(  # pyright: ignore[reportUnusedFunction]
+        conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool
+    ) -> None:
+        elapsed = time.perf_counter() - conn.info["query_started"].pop()
+        DB_QUERY_LATENCY.observe(elapsed, _statement_verb(statement))
+        queries = _REQUEST_QUERIES.get()
+        if queries is not None:
+            queries.count += 1
+            queries.seconds += elapsed
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _failed(context: Any) -> None:  # pyright: ignore[reportUnusedFunction]
+        # after_cursor_execute does not fire for a failed statement; drop its
+        # start time so it is not left on the pooled connection.
+        conn = context.connection
+        if context.execution_context is not None and conn.info.get("query_started"):
+            conn.info["query_started"].pop()
+
+
+async def monitor_event_loop(interval: float) -> None:
+    """Record how late each ``interval``-second sleep wakes up, until cancelled."""
+    loop = asyncio.get_running_loop()
+    while True:
+        scheduled = loop.time() + interval
+        await asyncio.sleep(interval)
+        EVENT_LOOP_LAG.observe(max(0.0, loop.time() - scheduled))
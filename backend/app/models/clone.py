@@ -6,7 +6,7 @@ from datetime import UTC, datetime
 from typing import TYPE_CHECKING
 
 import nanoid
-from sqlalchemy import JSON, Boolean, DateTime, ForeignKey, String, Text
+from sqlalchemy import JSON, Boolean, DateTime, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
@@ -19,6 +19,7 @@ if TYPE_CHECKING:
 
 class VoiceClone(Base):
     __tablename__ = "voice_clones"
+    __table_args__ = (Index(None, "created_at", "id"),)
 
     id: Mapped[str] = mapped_column(String(21), primary_key=True, default=nanoid.generate)
     name: Mapped[str] = mapped_column(String(200))
@@ -28,6 +29,8 @@ class VoiceClone(Base):
     is_demo: Mapped[bool] = mapped_column(Boolean, default=False)
     is_hidden: Mapped[bool] = mapped_column(Boolean, default=False)
     avatar_path: Mapped[str | None] = mapped_column(String(500), default=None)
+    # Number of the newest DNA version; see app/versioning.py.
+    latest_version: Mapped[int] = mapped_column(Integer, default=0)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=lambda: datetime.now(UTC))
     updated_at: Mapped[datetime] = mapped_column(
         DateTime,
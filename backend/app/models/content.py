@@ -6,7 +6,7 @@ from datetime import UTC, datetime
 from typing import TYPE_CHECKING
 
 import nanoid
-from sqlalchemy import JSON, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import JSON, DateTime, ForeignKey, Index, Integer, String, Text, func, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
@@ -17,6 +17,21 @@ if TYPE_CHECKING:
 
 class Content(Base):
     __tablename__ = "content"
+    # Keyset pagination seeks on (sort column, id); one index per list filter
+    # with the default created_at sort, plus the other sortable columns.
+    __table_args__ = (
+        Index(None, "created_at", "id"),
+        Index(None, "clone_id", "created_at", "id"),
+        Index(None, "status", "created_at", "id"),
+        Index(None, "platform", "created_at", "id"),
+        Index(None, "clone_id", "status", "created_at", "id"),
+        Index(None, "word_count", "id"),
+        Index(
+            "ix_content_authenticity_score_id",
+            func.coalesce(text("authenticity_score"), text("-1")),
+            "id",
+        ),
+    )
 
     id: Mapped[str] = mapped_column(String(21), primary_key=True, default=nanoid.generate)
     clone_id: Mapped[str] = mapped_column(String(21), ForeignKey("voice_clones.id"), index=True)
@@ -36,6 +51,7 @@ class Content(Base):
     preset_id: Mapped[str | None] = mapped_column(
         String(21), ForeignKey("generation_presets.id"), default=None
     )
+    latest_version: Mapped[int] = mapped_column(Integer, default=0)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=lambda: datetime.now(UTC))
     updated_at: Mapped[datetime] = mapped_column(
         DateTime,
@@ -54,11 +70,18 @@ class Content(Base):
 
 class ContentVersion(Base):
     __tablename__ = "content_versions"
+    __table_args__ = (Index(None, "content_id", "version_number", unique=True),)
 
     id: Mapped[str] = mapped_column(String(21), primary_key=True, default=nanoid.generate)
     content_id: Mapped[str] = mapped_column(String(21), ForeignKey("content.id"), index=True)
     version_number: Mapped[int] = mapped_column(Integer)
-    content_text: Mapped[str] = mapped_column(Text)
+    # Snapshots store the full text. Other versions store a delta from
+    # ``base_version`` (app/text_delta.py), or nothing when identical to it;
+    # ContentService rebuilds their text on read.
+    content_text: Mapped[str | None] = mapped_column(Text, default=None)
+    base_version: Mapped[int | None] = mapped_column(Integer, default=None)
+    delta: Mapped[list[int | str] | None] = mapped_column(JSON, default=None)
+    content_hash: Mapped[str | None] = mapped_column(String(64), default=None)
     trigger: Mapped[str] = mapped_column(String(50))
     word_count: Mapped[int] = mapped_column(Integer)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=lambda: datetime.now(UTC))
@@ -6,7 +6,7 @@ from datetime import UTC, datetime
 from typing import TYPE_CHECKING
 
 import nanoid
-from sqlalchemy import JSON, DateTime, ForeignKey, Integer, String
+from sqlalchemy import JSON, DateTime, ForeignKey, Index, Integer, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
@@ -17,6 +17,7 @@ if TYPE_CHECKING:
 
 class VoiceDNAVersion(Base):
     __tablename__ = "voice_dna_versions"
+    __table_args__ = (Index(None, "clone_id", "version_number", unique=True),)
 
     id: Mapped[str] = mapped_column(String(21), primary_key=True, default=nanoid.generate)
     clone_id: Mapped[str] = mapped_column(String(21), ForeignKey("voice_clones.id"), index=True)
@@ -5,7 +5,7 @@ from __future__ import annotations
 from datetime import UTC, datetime
 
 import nanoid
-from sqlalchemy import DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
@@ -17,6 +17,7 @@ class MethodologySettings(Base):
     id: Mapped[str] = mapped_column(String(21), primary_key=True, default=nanoid.generate)
     section_key: Mapped[str] = mapped_column(String(100), unique=True)
     current_content: Mapped[str] = mapped_column(Text)
+    latest_version: Mapped[int] = mapped_column(Integer, default=0)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=lambda: datetime.now(UTC))
     updated_at: Mapped[datetime] = mapped_column(
         DateTime,
@@ -34,6 +35,7 @@ class MethodologySettings(Base):
 
 class MethodologyVersion(Base):
     __tablename__ = "methodology_versions"
+    __table_args__ = (Index(None, "settings_id", "version_number", unique=True),)
 
     id: Mapped[str] = mapped_column(String(21), primary_key=True, default=nanoid.generate)
     settings_id: Mapped[str] = mapped_column(
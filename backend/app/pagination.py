@@ -0,0 +1,71 @@
+"""Opaque cursors for keyset (seek) pagination.
+
+A cursor records the sort key of the last row on a page plus its id as a
+tiebreaker, so the next page is a range seek on an index rather than an
+OFFSET that re-reads every skipped row. Cursors are bound to the sort they
+were issued for and rejected under any other.
+"""
+
+import base64
+import binascii
+import json
+from collections.abc import Sequence
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import ColumnElement, and_, tuple_
+
+from app.exceptions import InvalidCursorError
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        return datetime.fromisoformat(str(value["dt"]))  # pyright: ignore[reportUnknownArgumentType]
+    return value
+
+
+def encode_cursor(sort: str, values: Sequence[Any]) -> str:
+    """Encode the last row's sort ``values`` for a listing ordered by ``sort``."""
+    payload = json.dumps([sort, [_encode_value(v) for v in values]], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str) -> list[Any]:
+    """Return the sort values in ``cursor``, which must have been issued for ``sort``.
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed or was issued for another sort.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        issued_for, values = json.loads(raw)
+        decoded = [_decode_value(v) for v in values]
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError, KeyError) as exc:
+        raise InvalidCursorError from exc
+    if issued_for != sort:
+        raise InvalidCursorError
+    return decoded
+
+
+def seek_after(
+    columns: Sequence[ColumnElement[Any]], values: Sequence[Any], *, descending: bool
+) -> ColumnElement[bool]:
+    """Rows strictly after ``values`` in ``columns`` order.
+
+    The row-value comparison is exact; the redundant bound on the leading
+    column lets SQLite range-seek an expression index, which it will not do
+    for a row value alone.
+    """
+    if len(values) != len(columns):
+        raise InvalidCursorError
+    row = tuple_(*columns)
+    bound = tuple_(*values, types=[column.type for column in columns])
+    if descending:
+        return and_(columns[0] <= values[0], row < bound)
+    return and_(columns[0] >= values[0], row > bound)
@@ -38,4 +38,5 @@ class CloneResponse(BaseModel):
 
 class CloneListResponse(BaseModel):
     items: list[CloneResponse]
-    total: int
+    total: int | None
+    next_cursor: str | None = None
@@ -26,6 +26,12 @@ class ContentCreate(BaseModel):
     preset_id: str | None = None
 
 
+class MultiPlatformDraft(BaseModel):
+    """Structured reply of a single-call multi-platform generation."""
+
+    posts: dict[str, str]
+
+
 class ContentUpdate(BaseModel):
     content_current: str | None = None
     status: str | None = None
@@ -59,7 +65,16 @@ class ContentResponse(BaseModel):
 
 class ContentListResponse(BaseModel):
     items: list[ContentResponse]
-    total: int
+    total: int | None
+    next_cursor: str | None = None
+
+
+class ContentFieldsListResponse(BaseModel):
+    """A content page projected to the requested ``fields``."""
+
+    items: list[dict[str, Any]]
+    total: int | None
+    next_cursor: str | None = None
 
 
 class ContentVersionResponse(BaseModel):
@@ -1,9 +1,9 @@
 """Voice DNA response schemas."""
 
 from datetime import datetime
-from typing import Any
+from typing import Any, cast
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, model_validator
 
 
 class DNAResponse(BaseModel):
@@ -38,3 +38,26 @@ class DNAVersionListResponse(BaseModel):
 
 class DNAPromptResponse(BaseModel):
     prompt: str
+
+
+class DNAAnalysisResult(BaseModel):
+    """LLM output for DNA analysis and merges."""
+
+    dna: dict[str, Any]
+    prominence_scores: dict[str, Any] | None = None
+    consistency_score: int | float | None = None
+
+    @model_validator(mode="before")
+    @classmethod
+    def _wrap_bare_profile(cls, data: Any) -> Any:
+        """Accept a bare profile (no ``dna`` key) as the DNA itself."""
+        if not isinstance(data, dict):
+            return data
+        profile = cast(dict[str, Any], data)
+        if "dna" in profile:
+            return profile
+        return {
+            "dna": profile,
+            "prominence_scores": profile.get("prominence_scores"),
+            "consistency_score": profile.get("consistency_score"),
+        }
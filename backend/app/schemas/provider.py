@@ -19,7 +19,46 @@ class ProviderResponse(BaseModel):
 class ProviderTestResponse(BaseModel):
     success: bool
     message: str
+    circuit_state: str | None = None
+    circuit_consecutive_failures: int | None = None
+    circuit_retry_after_seconds: float | None = None
 
 
 class DefaultProviderRequest(BaseModel):
     name: str
+
+
+class RateLimitStatsResponse(BaseModel):
+    provider: str
+    model: str
+    queued: int
+    in_flight: int
+    total_requests: int
+    avg_wait_seconds: float
+    max_wait_seconds: float
+
+
+class PromptCacheStatsResponse(BaseModel):
+    provider: str
+    model: str
+    requests: int
+    input_tokens: int
+    cached_input_tokens: int
+    cache_write_tokens: int
+    hit_rate: float
+
+
+class LLMCallSummaryResponse(BaseModel):
+    operation: str | None
+    provider: str
+    model: str
+    calls: int
+    errors: int
+    retries: int
+    input_tokens: int
+    output_tokens: int
+    cached_input_tokens: int
+    avg_latency_seconds: float
+    max_latency_seconds: float
+    avg_ttft_seconds: float | None
+    cost_usd: float
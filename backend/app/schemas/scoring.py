@@ -1,6 +1,6 @@
 """Authenticity scoring schemas."""
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class DimensionScore(BaseModel):
@@ -12,3 +12,9 @@ class DimensionScore(BaseModel):
 class AuthenticityScoreResponse(BaseModel):
     overall_score: int
     dimensions: list[DimensionScore]
+
+
+class ScoringResult(BaseModel):
+    """LLM output for authenticity scoring."""
+
+    dimensions: list[DimensionScore] = Field(min_length=1)
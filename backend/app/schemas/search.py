@@ -0,0 +1,16 @@
+"""Full-text search response schemas."""
+
+from pydantic import BaseModel
+
+
+class SearchHit(BaseModel):
+    id: str
+    clone_id: str
+    snippet: str
+    rank: float
+
+
+class SearchResponse(BaseModel):
+    content: list[SearchHit]
+    samples: list[SearchHit]
+    clones: list[SearchHit]
@@ -304,6 +304,7 @@ async def seed_methodology_defaults(session: AsyncSession) -> None:
         settings = MethodologySettings(
             section_key=section_key,
             current_content=content,
+            latest_version=1,
         )
         session.add(settings)
         await session.flush()
@@ -731,6 +732,7 @@ async def seed_demo_clones(session: AsyncSession) -> None:
             description=clone_data["description"],
             tags=clone_data["tags"],
             is_demo=True,
+            latest_version=1,
         )
         session.add(clone)
         await session.flush()
@@ -2,18 +2,34 @@
 
 from __future__ import annotations
 
+from collections.abc import Sequence
 from datetime import UTC, datetime, timedelta
+from typing import Any
 
-from sqlalchemy import func, select
+from sqlalchemy import ColumnElement, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.exceptions import CloneNotFoundError, CloneSoftDeletedError, DemoCloneReadonlyError
+from app.exceptions import (
+    CloneNotFoundError,
+    CloneSoftDeletedError,
+    DemoCloneReadonlyError,
+    InvalidCursorError,
+)
+from app.fts import CLONES_FTS, match_query
 from app.models.clone import VoiceClone
+from app.pagination import decode_cursor, encode_cursor, seek_after
 from app.schemas.clone import CloneCreate, CloneUpdate
 
 SOFT_DELETE_RETENTION_DAYS = 30
 
 
+_CURSOR_SORT = "clones:created_at:desc"
+_CURSOR_KEYS: list[ColumnElement[Any]] = [
+    VoiceClone.__table__.c.created_at,
+    VoiceClone.__table__.c.id,
+]
+
+
 class CloneService:
     def __init__(self, session: AsyncSession) -> None:
         self._session = session
@@ -45,26 +61,63 @@ class CloneService:
         *,
         type_filter: str | None = None,
         search: str | None = None,
-    ) -> tuple[list[VoiceClone], int]:
+        limit: int | None = None,
+        cursor: str | None = None,
+        count: bool = True,
+    ) -> tuple[list[VoiceClone], int | None]:
+        """Return live clones, newest first, and the total matching count.
+
+        With ``limit`` the list is paginated: pass ``next_cursor`` of a full
+        page as ``cursor`` to seek to the next one. Searches are ranked by
+        relevance and return only their first ``limit`` matches. With
+        ``count=False`` the total is skipped and returned as None.
+
+        Raises:
+            InvalidCursorError: If ``cursor`` is malformed or used with a search.
+        """
         query = select(VoiceClone).where(VoiceClone.deleted_at.is_(None))
 
         if type_filter:
             query = query.where(VoiceClone.type == type_filter)
-        if search:
-            query = query.where(VoiceClone.name.ilike(f"%{search}%"))
+        fts_query = match_query(search) if search else None
+        if fts_query is not None:
+            query = query.select_from(CLONES_FTS.joined_to(VoiceClone.__table__)).where(
+                CLONES_FTS.match(fts_query)
+            )
 
         # Count query
-        count_query = select(func.count()).select_from(query.subquery())
-        total_result = await self._session.execute(count_query)
-        total = total_result.scalar_one()
-
-        # Fetch results
-        query = query.order_by(VoiceClone.created_at.desc())
+        total: int | None = None
+        if count:
+            count_query = select(func.count()).select_from(query.subquery())
+            total = (await self._session.execute(count_query)).scalar_one()
+
+        # Fetch results, best name/description matches first when searching
+        if fts_query is not None:
+            query = query.order_by(CLONES_FTS.rank())
+        query = query.order_by(VoiceClone.created_at.desc(), VoiceClone.id.desc())
+        if cursor is not None:
+            if fts_query is not None:
+                msg = "Cursors are not supported for relevance-ranked searches"
+                raise InvalidCursorError(msg)
+            values = decode_cursor(cursor, _CURSOR_SORT)
+            query = query.where(seek_after(_CURSOR_KEYS, values, descending=True))
+        if limit is not None:
+            query = query.limit(limit)
         result = await self._session.execute(query)
         items = list(result.scalars().all())
 
         return items, total
 
+    @staticmethod
+    def next_cursor(
+        clones: Sequence[VoiceClone], limit: int | None, *, search: str | None = None
+    ) -> str | None:
+        """Cursor for the page after ``clones``, or None after a short, unpaged or ranked page."""
+        if limit is None or len(clones) < limit or (search and match_query(search)):
+            return None
+        last = clones[-1]
+        return encode_cursor(_CURSOR_SORT, [last.created_at, last.id])
+
     async def update(self, clone_id: str, data: CloneUpdate) -> VoiceClone:
         clone = await self.get_by_id(clone_id)
 
@@ -3,34 +3,117 @@
 from __future__ import annotations
 
 import asyncio
+import json
+from collections.abc import Sequence
+from dataclasses import dataclass
 from typing import Any, cast
 
-from sqlalchemy import func, select, update
+from sqlalchemy import ColumnElement, Row, func, literal_column, null, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
-
-from app.exceptions import CloneNotFoundError, ContentNotFoundError
-from app.llm.base import LLMProvider
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.constants import CONTENT_SNAPSHOT_INTERVAL, SINGLE_CALL_MAX_TOKENS
+from app.exceptions import (
+    CloneNotFoundError,
+    ContentNotFoundError,
+    InvalidCursorError,
+    LLMResponseFormatError,
+)
+from app.fts import CONTENT_FTS, match_query
+from app.llm.base import LLMProvider, with_retry
 from app.llm.prompts import (
     build_feedback_regen_prompt,
     build_generation_prompt,
+    build_multi_platform_prompt,
     build_partial_regen_prompt,
 )
+from app.llm.telemetry import llm_operation
 from app.models.clone import VoiceClone
 from app.models.content import Content, ContentVersion
 from app.models.dna import VoiceDNAVersion
 from app.models.methodology import MethodologySettings
-from app.schemas.content import ContentUpdate
+from app.pagination import decode_cursor, encode_cursor, seek_after
+from app.schemas.content import ContentResponse, ContentUpdate, MultiPlatformDraft
+from app.text_delta import diff, patch, text_hash
+from app.versioning import claim_version_number
 
 _VARIANT_TEMPERATURES = (0.5, 0.7, 0.9)
 
-_SORTABLE_COLUMNS = {
-    "created_at": Content.created_at,
-    "authenticity_score": Content.authenticity_score,
-    "word_count": Content.word_count,
-    "platform": Content.platform,
-    "status": Content.status,
+# Columns a content list can project, mirroring ContentResponse.
+_LIST_COLUMNS: dict[str, ColumnElement[Any]] = {
+    name: Content.__table__.c[name] for name in ContentResponse.model_fields
 }
 
+# Unscored content sorts as -1, where SQLite already places NULLs, so a cursor
+# can seek past it with a plain comparison.
+_UNSCORED = -1
+
+_SORTABLE_COLUMNS: dict[str, ColumnElement[Any]] = {
+    "created_at": _LIST_COLUMNS["created_at"],
+    # A literal, not a bound parameter, so the query matches the expression index.
+    "authenticity_score": func.coalesce(
+        _LIST_COLUMNS["authenticity_score"], literal_column(str(_UNSCORED))
+    ),
+    "word_count": _LIST_COLUMNS["word_count"],
+    "platform": _LIST_COLUMNS["platform"],
+    "status": _LIST_COLUMNS["status"],
+}
+
+
+def _cursor_sort(sort_key: str, descending: bool) -> str:
+    return f"content:{sort_key}:{'desc' if descending else 'asc'}"
+
+
+def _version_texts(versions: Sequence[ContentVersion]) -> dict[int, str]:
+    """Rebuild the full text of every version, keyed by version number.
+
+    Each version's ``content_text`` is filled in place, without marking it
+    for update, so a later call or serialisation reads it directly.
+    """
+    by_number = {v.version_number: v for v in versions}
+    texts: dict[int, str] = {}
+    for version in versions:
+        chain: list[ContentVersion] = []
+        current = version
+        while current.version_number not in texts:
+            if current.content_text is not None:
+                texts[current.version_number] = current.content_text
+                break
+            chain.append(current)
+            current = by_number[cast(int, current.base_version)]
+        for pending in reversed(chain):
+            base = texts[cast(int, pending.base_version)]
+            text = base if pending.delta is None else patch(base, pending.delta)
+            texts[pending.version_number] = text
+            set_committed_value(pending, "content_text", text)
+    return texts
+
+
+def _hash_of(version: ContentVersion, texts: dict[int, str]) -> str:
+    """Stored hash of ``version``, or its text's hash for rows written before hashing."""
+    return version.content_hash or text_hash(texts[version.version_number])
+
+
+def _delta_depth(version: ContentVersion, versions: Sequence[ContentVersion]) -> int:
+    """Number of deltas applied to rebuild ``version`` from its snapshot."""
+    by_number = {v.version_number: v for v in versions}
+    depth = 0
+    while version.base_version is not None:
+        if version.delta is not None:
+            depth += 1
+        version = by_number[version.base_version]
+    return depth
+
+
+@dataclass(frozen=True)
+class StreamPlan:
+    """Prompt and sampling settings for one stream of a multiplexed generation."""
+
+    platform: str
+    variant_index: int | None
+    temperature: float | None
+    messages: list[dict[str, str]]
+
 
 class ContentService:
     def __init__(self, session: AsyncSession, provider: LLMProvider | None = None) -> None:
@@ -84,31 +167,32 @@ class ContentService:
         if properties:
             props_for_prompt = {k: str(v) for k, v in properties.items()}
 
-        messages = build_generation_prompt(
+        return build_generation_prompt(
             dna=dna_data,
             platform=platform,
             input_text=input_text,
             properties=props_for_prompt,
+            methodology=methodology,
         )
 
-        if methodology:
-            system_msg = messages[0]["content"]
-            messages[0]["content"] = f"{system_msg}\n\nMethodology: {methodology}"
-
-        return messages
-
     async def generate(
         self,
         clone_id: str,
         platforms: list[str],
         input_text: str,
         properties: dict[str, Any] | None = None,
+        *,
+        single_call: bool = False,
     ) -> list[Content]:
         """Generate content for one or more platforms using the clone's Voice DNA.
 
         LLM calls run in parallel via asyncio.gather. DB writes are sequential
         to avoid concurrent session access.
 
+        With ``single_call``, several distinct platforms are requested in one
+        structured completion so the voice prefix and input go out once; any
+        platform missing from (or blank in) the reply falls back to its own call.
+
         Raises:
             CloneNotFoundError: If clone doesn't exist.
             ValueError: If clone has no DNA or no provider configured.
@@ -124,9 +208,17 @@ class ContentService:
         raw_data = cast(dict[str, Any], dna.data)  # pyright: ignore[reportUnknownMemberType]
         dna_data: dict[str, str] = {str(k): str(v) for k, v in raw_data.items()}
 
-        # Build prompts and run LLM calls in parallel
+        drafts: dict[str, str] = {}
+        if single_call and 1 < len(platforms) == len(set(platforms)):
+            with llm_operation("generation_single_call", clone_id=clone_id):
+                drafts = await self._generate_single_call(
+                    self._provider, platforms, input_text, dna_data, methodology, properties
+                )
+
+        # Build prompts and run the remaining LLM calls in parallel
+        pending = [platform for platform in platforms if platform not in drafts]
         llm_tasks = [
-            self._provider.complete(
+            with_retry(self._provider.complete)(
                 self._build_messages(
                     platform=platform,
                     input_text=input_text,
@@ -135,31 +227,95 @@ class ContentService:
                     properties=properties,
                 )
             )
-            for platform in platforms
+            for platform in pending
         ]
 
-        generated_texts: list[str] = await asyncio.gather(*llm_tasks)
+        with llm_operation("generation", clone_id=clone_id):
+            pending_texts: list[str] = await asyncio.gather(*llm_tasks)
+        drafts.update(zip(pending, pending_texts, strict=True))
+        generated_texts = [drafts[platform] for platform in platforms]
 
-        # Save results to DB sequentially
-        results: list[Content] = []
-        for platform, generated_text in zip(platforms, generated_texts, strict=True):
-            content = Content(
-                clone_id=clone_id,
-                platform=platform,
-                status="draft",
-                content_current=generated_text,
-                content_original=generated_text,
-                input_text=input_text,
-                generation_properties=properties,
-                word_count=len(generated_text.split()),
-                char_count=len(generated_text),
-            )
-            self._session.add(content)
-            await self._session.flush()
-            await self._create_version(content, trigger="generation")
-            results.append(content)
+        # Save every draft with its first version in one flush
+        contents = [
+            self._add_draft(clone_id, platform, input_text, generated_text, properties)
+            for platform, generated_text in zip(platforms, generated_texts, strict=True)
+        ]
+        await self._session.flush()
+        return contents
+
+    async def save_generated(
+        self,
+        clone_id: str,
+        platform: str,
+        input_text: str,
+        generated_text: str,
+        properties: dict[str, Any] | None = None,
+    ) -> Content:
+        """Save a generated draft with its initial version. The caller commits."""
+        content = self._add_draft(clone_id, platform, input_text, generated_text, properties)
+        await self._session.flush()
+        return content
+
+    def _add_draft(
+        self,
+        clone_id: str,
+        platform: str,
+        input_text: str,
+        generated_text: str,
+        properties: dict[str, Any] | None,
+    ) -> Content:
+        """Add a generated draft and its initial version to the session, unflushed."""
+        content = Content(
+            clone_id=clone_id,
+            platform=platform,
+            status="draft",
+            content_current=generated_text,
+            content_original=generated_text,
+            input_text=input_text,
+            generation_properties=properties,
+            word_count=len(generated_text.split()),
+            char_count=len(generated_text),
+        )
+        self._session.add(content)
+        self._add_initial_version(content, trigger="generation")
+        return content
 
-        return results
+    async def _generate_single_call(
+        self,
+        provider: LLMProvider,
+        platforms: list[str],
+        input_text: str,
+        dna_data: dict[str, str],
+        methodology: str | None,
+        properties: dict[str, Any] | None,
+    ) -> dict[str, str]:
+        """Request every platform in one structured completion.
+
+        Returns the non-blank drafts for requested platforms; an unusable reply
+        yields an empty map so every platform falls back to its own call.
+        """
+        props_for_prompt: dict[str, str] | None = None
+        if properties:
+            props_for_prompt = {k: str(v) for k, v in properties.items()}
+
+        messages = build_multi_platform_prompt(
+            dna=dna_data,
+            platforms=platforms,
+            input_text=input_text,
+            properties=props_for_prompt,
+            methodology=methodology,
+        )
+        try:
+            result = await with_retry(provider.complete_json)(
+                messages, schema=MultiPlatformDraft, max_tokens=SINGLE_CALL_MAX_TOKENS
+            )
+        except LLMResponseFormatError:
+            return {}
+        return {
+            platform: result.posts[platform]
+            for platform in platforms
+            if result.posts.get(platform, "").strip()
+        }
 
     # ── Variant A/B Comparison ─────────────────────────────────────
 
@@ -198,9 +354,11 @@ class ContentService:
         )
 
         llm_tasks = [
-            self._provider.complete(messages, temperature=temp) for temp in _VARIANT_TEMPERATURES
+            with_retry(self._provider.complete)(messages, temperature=temp)
+            for temp in _VARIANT_TEMPERATURES
         ]
-        generated_texts: list[str] = await asyncio.gather(*llm_tasks)
+        with llm_operation("variants", clone_id=clone_id):
+            generated_texts: list[str] = await asyncio.gather(*llm_tasks)
 
         return [
             {
@@ -215,6 +373,49 @@ class ContentService:
             )
         ]
 
+    async def plan_streams(
+        self,
+        clone_id: str,
+        platforms: list[str],
+        input_text: str,
+        properties: dict[str, Any] | None = None,
+        *,
+        variants: bool = False,
+    ) -> list[StreamPlan]:
+        """Build one stream per platform, or per platform and variant temperature.
+
+        The clone's DNA and methodology are loaded once and shared by every
+        prompt. Nothing is generated or saved here.
+
+        Raises:
+            CloneNotFoundError: If clone doesn't exist.
+            ValueError: If clone has no DNA.
+        """
+        await self._get_clone(clone_id)
+        dna = await self._get_latest_dna(clone_id)
+        methodology = await self._get_methodology()
+
+        raw_data = cast(dict[str, Any], dna.data)  # pyright: ignore[reportUnknownMemberType]
+        dna_data: dict[str, str] = {str(k): str(v) for k, v in raw_data.items()}
+
+        plans: list[StreamPlan] = []
+        for platform in platforms:
+            messages = self._build_messages(
+                platform=platform,
+                input_text=input_text,
+                dna_data=dna_data,
+                methodology=methodology,
+                properties=properties,
+            )
+            if variants:
+                plans.extend(
+                    StreamPlan(platform, i, temp, messages)
+                    for i, temp in enumerate(_VARIANT_TEMPERATURES)
+                )
+            else:
+                plans.append(StreamPlan(platform, None, None, messages))
+        return plans
+
     async def save_variant(
         self,
         clone_id: str,
@@ -245,8 +446,8 @@ class ContentService:
             char_count=len(content_text),
         )
         self._session.add(content)
+        self._add_initial_version(content, trigger="variant_selection")
         await self._session.flush()
-        await self._create_version(content, trigger="variant_selection")
         return content
 
     # ── Import ────────────────────────────────────────────────────
@@ -285,8 +486,8 @@ class ContentService:
             char_count=len(content_text),
         )
         self._session.add(content)
+        self._add_initial_version(content, trigger="import")
         await self._session.flush()
-        await self._create_version(content, trigger="import")
         return content
 
     # ── List / Filter ────────────────────────────────────────────
@@ -302,9 +503,46 @@ class ContentService:
         order: str | None = None,
         offset: int = 0,
         limit: int = 50,
-    ) -> tuple[list[Content], int]:
-        """Return filtered, sorted, paginated content list with total count."""
-        query = select(Content)
+        fields: Sequence[str] | None = None,
+        preview_chars: int = 200,
+        cursor: str | None = None,
+        count: bool = True,
+    ) -> tuple[list[Row[Any]], int | None]:
+        """Return filtered, sorted, paginated content rows with total count.
+
+        Rows are projected through Core, so only the listed columns are read
+        and version history is never loaded. ``fields`` narrows the projection
+        to a subset of the response columns plus ``preview``, the first
+        ``preview_chars`` characters of ``content_current``, and ``snippet``,
+        the highlighted match when searching; ``id`` and the sort column are
+        always included. Without ``fields`` every response column is returned.
+
+        ``search`` prefix-matches every word against the text, topic and
+        campaign through the FTS5 index and, unless ``sort`` is given, orders
+        by bm25 relevance.
+
+        Every sort breaks ties on ``id``. Passing the ``cursor`` from
+        ``next_cursor`` seeks straight past the previous page instead of
+        using ``offset``, so deep pages cost the same as the first; relevance
+        ordering supports offsets only. With ``count=False`` the total is
+        skipped and returned as None.
+
+        Raises:
+            ValueError: If ``fields`` names an unknown column.
+            InvalidCursorError: If ``cursor`` is malformed, from another sort,
+                or used with relevance ordering.
+        """
+        fts_query = match_query(search) if search else None
+        ranked = fts_query is not None and sort is None
+        sort_key = sort if sort in _SORTABLE_COLUMNS else "created_at"
+        columns = self._list_columns(
+            fields, preview_chars, searching=fts_query is not None, sort_key=sort_key
+        )
+        query = select(*columns)
+        if fts_query is not None:
+            query = query.select_from(CONTENT_FTS.joined_to(Content.__table__)).where(
+                CONTENT_FTS.match(fts_query)
+            )
 
         if clone_id:
             query = query.where(Content.clone_id == clone_id)
@@ -312,25 +550,82 @@ class ContentService:
             query = query.where(Content.platform == platform)
         if status:
             query = query.where(Content.status == status)
-        if search:
-            query = query.where(Content.content_current.ilike(f"%{search}%"))
 
         # Count
-        count_query = select(func.count()).select_from(query.subquery())
-        total = (await self._session.execute(count_query)).scalar_one()
-
-        # Sort
-        sort_col = _SORTABLE_COLUMNS.get(sort or "created_at", Content.created_at)
-        if order == "asc":
-            query = query.order_by(sort_col.asc())
+        total: int | None = None
+        if count:
+            count_query = select(func.count()).select_from(query.subquery())
+            total = (await self._session.execute(count_query)).scalar_one()
+
+        # Sort: searches rank by relevance unless a sort is requested
+        descending = order != "asc"
+        keys = [_SORTABLE_COLUMNS[sort_key], _LIST_COLUMNS["id"]]
+        if ranked:
+            query = query.order_by(CONTENT_FTS.rank(), _LIST_COLUMNS["id"])
         else:
-            query = query.order_by(sort_col.desc())
+            query = query.order_by(*(k.desc() if descending else k.asc() for k in keys))
 
         # Paginate
-        query = query.offset(offset).limit(limit)
+        if cursor is not None:
+            if ranked:
+                msg = "Cursors are not supported for relevance-ranked searches"
+                raise InvalidCursorError(msg)
+            values = decode_cursor(cursor, _cursor_sort(sort_key, descending))
+            query = query.where(seek_after(keys, values, descending=descending))
+        else:
+            query = query.offset(offset)
+        query = query.limit(limit)
 
         result = await self._session.execute(query)
-        return list(result.scalars().all()), total
+        return list(result.all()), total
+
+    @staticmethod
+    def next_cursor(
+        rows: Sequence[Row[Any]],
+        limit: int,
+        *,
+        search: str | None = None,
+        sort: str | None = None,
+        order: str | None = None,
+    ) -> str | None:
+        """Cursor for the page after ``rows``, or None after a short or ranked page.
+
+        Takes the same ``limit``, ``search``, ``sort`` and ``order`` as the
+        ``list`` call that returned ``rows``.
+        """
+        ranked = search is not None and match_query(search) is not None and sort is None
+        if ranked or not rows or len(rows) < limit:
+            return None
+        sort_key = sort if sort in _SORTABLE_COLUMNS else "created_at"
+        last = rows[-1]
+        value = getattr(last, sort_key)
+        if value is None:
+            value = _UNSCORED
+        return encode_cursor(_cursor_sort(sort_key, order != "asc"), [value, last.id])
+
+    @staticmethod
+    def _list_columns(
+        fields: Sequence[str] | None, preview_chars: int, *, searching: bool, sort_key: str
+    ) -> list[ColumnElement[Any]]:
+        """Resolve requested list fields to columns, rejecting unknown names."""
+        if fields is None:
+            return list(_LIST_COLUMNS.values())
+        unknown = sorted(set(fields) - _LIST_COLUMNS.keys() - {"preview", "snippet"})
+        if unknown:
+            msg = f"Unknown content fields: {', '.join(unknown)}"
+            raise ValueError(msg)
+        columns: list[ColumnElement[Any]] = [_LIST_COLUMNS["id"]]
+        for name in dict.fromkeys([*fields, sort_key]):
+            if name == "preview":
+                columns.append(
+                    func.substr(Content.content_current, 1, preview_chars).label("preview")
+                )
+            elif name == "snippet":
+                snippet = CONTENT_FTS.snippet() if searching else null()
+                columns.append(snippet.label("snippet"))
+            elif name != "id":
+                columns.append(_LIST_COLUMNS[name])
+        return columns
 
     # ── Bulk Operations ────────────────────────────────────────
 
@@ -405,32 +700,32 @@ class ContentService:
     # ── Versioning ────────────────────────────────────────────────
 
     async def list_versions(self, content_id: str) -> list[ContentVersion]:
-        """Return all versions for a content item, newest first."""
+        """Return all versions for a content item, newest first, with their full text."""
         stmt = (
             select(ContentVersion)
             .where(ContentVersion.content_id == content_id)
             .order_by(ContentVersion.version_number.desc())
         )
         result = await self._session.execute(stmt)
-        return list(result.scalars().all())
+        versions = list(result.scalars().all())
+        _version_texts(versions)
+        return versions
 
     async def restore_version(self, content_id: str, version_number: int) -> Content:
         """Restore content to a previous version (non-destructive, creates new version)."""
         content = await self.get_by_id(content_id)
 
-        stmt = select(ContentVersion).where(
-            ContentVersion.content_id == content_id,
-            ContentVersion.version_number == version_number,
+        texts = _version_texts(content.versions)
+        old_version = next(
+            (v for v in content.versions if v.version_number == version_number), None
         )
-        result = await self._session.execute(stmt)
-        old_version = result.scalar_one_or_none()
         if old_version is None:
             msg = f"Version {version_number} not found for content '{content_id}'"
             raise ValueError(msg)
 
-        content.content_current = old_version.content_text
+        content.content_current = texts[version_number]
         content.word_count = old_version.word_count
-        content.char_count = len(old_version.content_text)
+        content.char_count = len(content.content_current)
         await self._create_version(content, trigger="restore")
         await self._session.flush()
         return content
@@ -462,13 +757,11 @@ class ContentService:
             platform=content.platform,
             current_text=content.content_current,
             feedback=feedback,
+            methodology=methodology,
         )
 
-        if methodology:
-            system_msg = messages[0]["content"]
-            messages[0]["content"] = f"{system_msg}\n\nMethodology: {methodology}"
-
-        new_text = await self._provider.complete(messages)
+        with llm_operation("feedback_regen", clone_id=content.clone_id):
+            new_text = await with_retry(self._provider.complete)(messages)
 
         content.content_current = new_text
         content.word_count = len(new_text.split())
@@ -521,13 +814,11 @@ class ContentService:
             selected_text=selected_text,
             text_after=text_after,
             feedback=feedback,
+            methodology=methodology,
         )
 
-        if methodology:
-            system_msg = messages[0]["content"]
-            messages[0]["content"] = f"{system_msg}\n\nMethodology: {methodology}"
-
-        replacement = await self._provider.complete(messages)
+        with llm_operation("partial_regen", clone_id=content.clone_id):
+            replacement = await with_retry(self._provider.complete)(messages)
 
         content.content_current = text_before + replacement + text_after
         content.word_count = len(content.content_current.split())
@@ -538,27 +829,56 @@ class ContentService:
 
     # ── Helpers ────────────────────────────────────────────────────
 
-    async def _next_version_number(self, content_id: str) -> int:
-        """Return the next version number for a content item."""
-        stmt = (
-            select(ContentVersion.version_number)
-            .where(ContentVersion.content_id == content_id)
-            .order_by(ContentVersion.version_number.desc())
-            .limit(1)
+    def _add_initial_version(self, content: Content, trigger: str) -> ContentVersion:
+        """Add version 1 of a new, unflushed content item; both insert on the next flush."""
+        content.latest_version = 1
+        version = ContentVersion(
+            content=content,
+            version_number=1,
+            content_text=content.content_current,
+            content_hash=text_hash(content.content_current),
+            trigger=trigger,
+            word_count=content.word_count,
         )
-        result = await self._session.execute(stmt)
-        current = result.scalar_one_or_none()
-        return (current or 0) + 1
+        self._session.add(version)
+        return version
 
     async def _create_version(self, content: Content, trigger: str) -> ContentVersion:
-        """Create a new ContentVersion snapshot."""
+        """Record ``content_current`` as the next version of ``content``.
+
+        The text is stored by reference when an earlier version has the same
+        hash, as a delta from the latest version, or in full every
+        CONTENT_SNAPSHOT_INTERVAL versions and whenever the delta would be no
+        smaller than the text.
+        """
+        previous = list(content.versions)
+        texts = _version_texts(previous)
+        text = content.content_current
+        digest = text_hash(text)
+        number = await claim_version_number(self._session, Content, content.id)
+        # Appended to content.versions, so later edits in this session see it.
         version = ContentVersion(
-            content_id=content.id,
-            version_number=await self._next_version_number(content.id),
-            content_text=content.content_current,
+            content=content,
+            version_number=number,
+            content_hash=digest,
             trigger=trigger,
             word_count=content.word_count,
         )
+
+        same = [v.version_number for v in previous if _hash_of(v, texts) == digest]
+        latest = max(previous, key=lambda v: v.version_number, default=None)
+        if same:
+            version.base_version = max(same)
+        elif latest is not None and _delta_depth(latest, previous) + 1 < CONTENT_SNAPSHOT_INTERVAL:
+            delta = diff(texts[latest.version_number], text)
+            if len(json.dumps(delta)) < len(text):
+                version.base_version = latest.version_number
+                version.delta = delta
+        if version.base_version is None:
+            version.content_text = text
+
         self._session.add(version)
         await self._session.flush()
+        # Set after the INSERT so only snapshots store their text.
+        set_committed_value(version, "content_text", text)
         return version
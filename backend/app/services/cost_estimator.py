@@ -1,29 +1,25 @@
 """Token cost estimator for LLM operations.
 
 Provides approximate cost estimates for DNA analysis and content generation.
-Uses chars/4 approximation for token counting (same as provider implementations).
+Counts tokens with the same offline tokenizer the providers use (app.llm.tokenizer).
 """
 
 from __future__ import annotations
 
 from dataclasses import dataclass
 
-from app.constants import MODEL_PRICING
+from app.constants import MODEL_PRICING, SINGLE_CALL_MAX_TOKENS
+from app.llm.tokenizer import count_tokens, fits_context_window
 
-# Approximate overhead for system prompts (in characters).
-_DNA_SYSTEM_PROMPT_CHARS = 800
-_GENERATION_SYSTEM_PROMPT_CHARS = 600
+# Approximate overhead for system prompts (in tokens).
+_DNA_SYSTEM_PROMPT_TOKENS = 200
+_GENERATION_SYSTEM_PROMPT_TOKENS = 150
 
 # Default output token estimate per operation.
 _DNA_OUTPUT_TOKENS = 2000
 _GENERATION_OUTPUT_TOKENS_PER_PLATFORM = 1000
 
 
-def _chars_to_tokens(chars: int) -> int:
-    """Approximate token count from character count (1 token ≈ 4 chars)."""
-    return max(chars // 4, 1)
-
-
 def _calculate_cost(input_tokens: int, output_tokens: int, model: str) -> float:
     """Calculate USD cost from token counts and model pricing."""
     pricing = MODEL_PRICING.get(model)
@@ -42,6 +38,7 @@ class CostEstimate:
     output_tokens: int
     cost_usd: float
     model: str
+    fits_context_window: bool = True
 
     @property
     def total_tokens(self) -> int:
@@ -66,11 +63,11 @@ def estimate_dna_analysis(
     methodology: str | None = None,
 ) -> CostEstimate:
     """Estimate tokens and cost for a DNA analysis operation."""
-    sample_chars = sum(len(t) for t in sample_texts)
-    methodology_chars = len(methodology) if methodology else 0
-    total_input_chars = _DNA_SYSTEM_PROMPT_CHARS + sample_chars + methodology_chars
-
-    input_tokens = _chars_to_tokens(total_input_chars)
+    input_tokens = (
+        _DNA_SYSTEM_PROMPT_TOKENS
+        + sum(count_tokens(t, model) for t in sample_texts)
+        + (count_tokens(methodology, model) if methodology else 0)
+    )
     output_tokens = _DNA_OUTPUT_TOKENS
     cost = _calculate_cost(input_tokens, output_tokens, model)
 
@@ -79,6 +76,9 @@ def estimate_dna_analysis(
         output_tokens=output_tokens,
         cost_usd=cost,
         model=model,
+        fits_context_window=fits_context_window(
+            input_tokens, model, max_output_tokens=output_tokens
+        ),
     )
 
 
@@ -88,12 +88,32 @@ def estimate_generation(
     dna_summary: str,
     platforms: list[str],
     model: str,
+    single_call: bool = False,
 ) -> CostEstimate:
-    """Estimate tokens and cost for content generation across platforms."""
+    """Estimate tokens and cost for content generation across platforms.
+
+    With ``single_call``, several distinct platforms share one request (as in
+    ``ContentService.generate``): the prompt is sent once and every draft must
+    fit that request's ``SINGLE_CALL_MAX_TOKENS`` output budget.
+    """
     platform_count = max(len(platforms), 1)
-    base_input_chars = _GENERATION_SYSTEM_PROMPT_CHARS + len(input_text) + len(dna_summary)
-    input_tokens = _chars_to_tokens(base_input_chars) * platform_count
-    output_tokens = _GENERATION_OUTPUT_TOKENS_PER_PLATFORM * platform_count
+    prompt_tokens = (
+        _GENERATION_SYSTEM_PROMPT_TOKENS
+        + count_tokens(input_text, model)
+        + count_tokens(dna_summary, model)
+    )
+
+    if single_call and 1 < len(platforms) == len(set(platforms)):
+        # One request whose reply carries every draft within a single budget.
+        request_count = 1
+        output_budget = SINGLE_CALL_MAX_TOKENS
+        output_tokens = min(_GENERATION_OUTPUT_TOKENS_PER_PLATFORM * platform_count, output_budget)
+    else:
+        # Each platform is a separate call, so each must fit on its own.
+        request_count = platform_count
+        output_budget = _GENERATION_OUTPUT_TOKENS_PER_PLATFORM
+        output_tokens = _GENERATION_OUTPUT_TOKENS_PER_PLATFORM * platform_count
+    input_tokens = prompt_tokens * request_count
     cost = _calculate_cost(input_tokens, output_tokens, model)
 
     return CostEstimate(
@@ -101,4 +121,7 @@ def estimate_generation(
         output_tokens=output_tokens,
         cost_usd=cost,
         model=model,
+        fits_context_window=fits_context_window(
+            prompt_tokens, model, max_output_tokens=output_budget
+        ),
     )
@@ -1,15 +1,14 @@
 """AI detection analysis service."""
 
-import json
-
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.exceptions import ContentNotFoundError
-from app.llm.base import LLMProvider
+from app.llm.base import LLMProvider, with_retry
 from app.llm.prompts import build_detection_prompt
+from app.llm.telemetry import llm_operation
 from app.models.content import Content
-from app.schemas.detection import DetectionResponse, FlaggedPassage
+from app.schemas.detection import DetectionResponse
 
 
 class DetectionService:
@@ -26,16 +25,10 @@ class DetectionService:
         content = await self._get_content(content_id)
 
         messages = build_detection_prompt(content.content_current)
-        response = await self._provider.complete(messages, temperature=0.3)
-
-        parsed = json.loads(response)
-
-        return DetectionResponse(
-            risk_level=parsed["risk_level"],
-            confidence=parsed["confidence"],
-            flagged_passages=[FlaggedPassage(**p) for p in parsed["flagged_passages"]],
-            summary=parsed["summary"],
-        )
+        with llm_operation("detection", clone_id=content.clone_id):
+            return await with_retry(self._provider.complete_json)(
+                messages, schema=DetectionResponse, temperature=0.3
+            )
 
     async def _get_content(self, content_id: str) -> Content:
         result = await self._session.execute(select(Content).where(Content.id == content_id))
@@ -1,6 +1,6 @@
 """Voice DNA analysis service — orchestrates LLM analysis and version management."""
 
-import json
+import logging
 from typing import Any, cast
 
 from sqlalchemy import select
@@ -8,11 +8,19 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.constants import MAX_DNA_VERSIONS
 from app.exceptions import AnalysisFailedError, CloneNotFoundError
-from app.llm.base import LLMProvider
+from app.llm.base import LLMProvider, with_retry
 from app.llm.prompts import build_dna_analysis_prompt
+from app.llm.telemetry import llm_operation
+from app.llm.tokenizer import fits_context_window, get_token_counter
 from app.models.clone import VoiceClone
 from app.models.dna import VoiceDNAVersion
 from app.models.methodology import MethodologySettings
+from app.schemas.dna import DNAAnalysisResult
+from app.versioning import claim_version_number
+
+logger = logging.getLogger(__name__)
+
+_ANALYSIS_MAX_TOKENS = 4096
 
 _CATEGORY_TEMPLATES: dict[str, tuple[str, dict[str, str]]] = {
     "vocabulary": (
@@ -97,6 +105,26 @@ _CATEGORY_TEMPLATES: dict[str, tuple[str, dict[str, str]]] = {
 }
 
 
+def _samples_within_context(
+    sample_texts: list[str], methodology: str | None, model: str
+) -> list[str]:
+    """Keep the leading samples whose prompt fits the model's context window.
+
+    Always keeps at least one sample so an oversized clone still gets a
+    provider error rather than a silent empty analysis.
+    """
+    counter = get_token_counter()
+    used = counter.count_messages(build_dna_analysis_prompt([], methodology=methodology), model)
+    kept: list[str] = []
+    for index, text in enumerate(sample_texts):
+        # Matches the per-sample header and separator added by the prompt builder.
+        used += counter.count(f"--- Sample {index + 1} ---\n{text}\n\n", model)
+        if kept and not fits_context_window(used, model, max_output_tokens=_ANALYSIS_MAX_TOKENS):
+            break
+        kept.append(text)
+    return kept
+
+
 class DNAService:
     def __init__(self, session: AsyncSession) -> None:
         self._session = session
@@ -136,33 +164,43 @@ class DNAService:
         methodology_content = methodology.current_content if methodology else None
 
         # Build prompt and call LLM
-        messages = build_dna_analysis_prompt(sample_texts, methodology=methodology_content)
+        analyzed = _samples_within_context(sample_texts, methodology_content, model)
+        skipped = len(sample_texts) - len(analyzed)
+        if skipped:
+            logger.warning(
+                "Clone %s: %d of %d samples do not fit the %s context window and were "
+                "left out of the analysis",
+                clone_id,
+                skipped,
+                len(sample_texts),
+                model,
+            )
+        messages = build_dna_analysis_prompt(analyzed, methodology=methodology_content)
 
         try:
-            raw_response = await provider.complete(messages, model=model)
+            with llm_operation("dna_analysis", clone_id=clone_id):
+                result = await with_retry(provider.complete_json)(
+                    messages,
+                    schema=DNAAnalysisResult,
+                    model=model,
+                    max_tokens=_ANALYSIS_MAX_TOKENS,
+                )
         except Exception as exc:
             raise AnalysisFailedError(
                 provider=type(provider).__name__,
                 reason=str(exc),
             ) from exc
 
-        # Parse response
-        try:
-            parsed = json.loads(raw_response)
-        except json.JSONDecodeError as exc:
-            raise AnalysisFailedError(
-                provider=type(provider).__name__,
-                reason=f"Invalid JSON response: {exc}",
-            ) from exc
-
-        dna_data = parsed.get("dna", parsed)
-        prominence_scores = parsed.get("prominence_scores")
-        consistency_score = parsed.get("consistency_score")
-        if consistency_score is not None:
-            dna_data["consistency_score"] = consistency_score
+        dna_data = result.dna
+        prominence_scores = result.prominence_scores
+        if result.consistency_score is not None:
+            dna_data["consistency_score"] = result.consistency_score
+        if skipped:
+            # Recorded on the version so the profile shows it was built from a subset.
+            dna_data["skipped_samples"] = skipped
 
         # Determine version number and trigger
-        version_number = await self._next_version_number(clone_id)
+        version_number = await claim_version_number(self._session, VoiceClone, clone_id)
         trigger = "initial_analysis" if version_number == 1 else "regeneration"
 
         dna_version = VoiceDNAVersion(
@@ -192,7 +230,7 @@ class DNAService:
             msg = f"Clone '{clone_id}' has no existing DNA to edit"
             raise ValueError(msg)
 
-        version_number = await self._next_version_number(clone_id)
+        version_number = await claim_version_number(self._session, VoiceClone, clone_id)
         dna_version = VoiceDNAVersion(
             clone_id=clone_id,
             version_number=version_number,
@@ -219,7 +257,7 @@ class DNAService:
             msg = f"Version {target_version} not found for clone '{clone_id}'"
             raise ValueError(msg)
 
-        version_number = await self._next_version_number(clone_id)
+        version_number = await claim_version_number(self._session, VoiceClone, clone_id)
         old_data = cast(dict[str, Any], old_version.data)  # pyright: ignore[reportUnknownMemberType]
         old_scores = cast(dict[str, Any] | None, old_version.prominence_scores)  # pyright: ignore[reportUnknownMemberType]
         dna_version = VoiceDNAVersion(
@@ -288,18 +326,6 @@ class DNAService:
 
     # ── Helpers ────────────────────────────────────────────────────
 
-    async def _next_version_number(self, clone_id: str) -> int:
-        """Return the next version number for a clone's DNA."""
-        stmt = (
-            select(VoiceDNAVersion.version_number)
-            .where(VoiceDNAVersion.clone_id == clone_id)
-            .order_by(VoiceDNAVersion.version_number.desc())
-            .limit(1)
-        )
-        result = await self._session.execute(stmt)
-        current = result.scalar_one_or_none()
-        return (current or 0) + 1
-
     async def _prune_versions(self, clone_id: str) -> None:
         """Delete oldest versions if count exceeds MAX_DNA_VERSIONS."""
         stmt = (
@@ -1,15 +1,16 @@
 """Merge service — orchestrates LLM-based voice DNA merging."""
 
-import json
 from typing import Any, cast
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.exceptions import MergeFailedError
-from app.llm.base import LLMProvider
+from app.llm.base import LLMProvider, with_retry
 from app.llm.prompts import build_merge_prompt
+from app.llm.telemetry import llm_operation
 from app.models.clone import MergedCloneSource, VoiceClone
 from app.models.dna import VoiceDNAVersion
+from app.schemas.dna import DNAAnalysisResult
 from app.services.dna_service import DNAService
 
 
@@ -74,21 +75,18 @@ class MergeService:
         messages = build_merge_prompt(source_dnas)
 
         try:
-            raw_response = await provider.complete(messages, model=model)
+            with llm_operation("merge"):
+                result = await with_retry(provider.complete_json)(
+                    messages, schema=DNAAnalysisResult, model=model
+                )
         except Exception as exc:
             raise MergeFailedError(reason=str(exc)) from exc
 
-        # 3. Parse response
-        try:
-            parsed = json.loads(raw_response)
-        except json.JSONDecodeError as exc:
-            raise MergeFailedError(reason=f"Invalid JSON response: {exc}") from exc
-
-        dna_data_result = parsed.get("dna", parsed)
-        prominence_scores = parsed.get("prominence_scores")
+        dna_data_result = result.dna
+        prominence_scores = result.prominence_scores
 
         # 4. Create merged clone
-        merged_clone = VoiceClone(name=name, type="merged")
+        merged_clone = VoiceClone(name=name, type="merged", latest_version=1)
         self._session.add(merged_clone)
         await self._session.flush()
 
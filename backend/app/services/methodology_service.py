@@ -5,6 +5,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.constants import MAX_METHODOLOGY_VERSIONS
 from app.models.methodology import MethodologySettings, MethodologyVersion
+from app.versioning import claim_version_number
 
 
 class MethodologyService:
@@ -29,7 +30,7 @@ class MethodologyService:
 
         settings.current_content = content
 
-        next_version = await self._next_version_number(settings.id)
+        next_version = await claim_version_number(self._session, MethodologySettings, settings.id)
         version = MethodologyVersion(
             settings_id=settings.id,
             version_number=next_version,
@@ -76,7 +77,7 @@ class MethodologyService:
 
         settings.current_content = old_version.content
 
-        next_version = await self._next_version_number(settings.id)
+        next_version = await claim_version_number(self._session, MethodologySettings, settings.id)
         version = MethodologyVersion(
             settings_id=settings.id,
             version_number=next_version,
@@ -91,18 +92,6 @@ class MethodologyService:
 
     # ── Helpers ────────────────────────────────────────────────────
 
-    async def _next_version_number(self, settings_id: str) -> int:
-        """Return the next version number for a settings record."""
-        stmt = (
-            select(MethodologyVersion.version_number)
-            .where(MethodologyVersion.settings_id == settings_id)
-            .order_by(MethodologyVersion.version_number.desc())
-            .limit(1)
-        )
-        result = await self._session.execute(stmt)
-        current = result.scalar_one_or_none()
-        return (current or 0) + 1
-
     async def _prune_versions(self, settings_id: str) -> None:
         """Delete oldest versions if count exceeds MAX_METHODOLOGY_VERSIONS."""
         stmt = (
@@ -1,5 +1,7 @@
 """Provider configuration service — manages API keys, models, and connection testing."""
 
+from dataclasses import asdict
+from datetime import datetime
 from pathlib import Path
 from typing import Any
 
@@ -11,7 +13,15 @@ from app.exceptions import (
     LLMRateLimitError,
     ProviderNotConfiguredError,
 )
-from app.schemas.provider import ProviderResponse, ProviderTestResponse, ProviderUpdate
+from app.llm.registry import ProviderRegistry
+from app.schemas.provider import (
+    LLMCallSummaryResponse,
+    PromptCacheStatsResponse,
+    ProviderResponse,
+    ProviderTestResponse,
+    ProviderUpdate,
+    RateLimitStatsResponse,
+)
 
 # Map provider name → Settings field for API key
 _KEY_ATTRS: dict[str, str] = {
@@ -62,9 +72,15 @@ def update_env_file(env_path: Path, key: str, value: str) -> None:
 class ProviderService:
     """Service for managing LLM provider configuration."""
 
-    def __init__(self, settings: Settings, env_path: Path) -> None:
+    def __init__(
+        self,
+        settings: Settings,
+        env_path: Path,
+        registry: ProviderRegistry | None = None,
+    ) -> None:
         self._settings = settings
         self._env_path = env_path
+        self._registry = registry
 
     def list_providers(self) -> list[ProviderResponse]:
         """Return status of all providers."""
@@ -87,10 +103,33 @@ class ProviderService:
             update_env_file(self._env_path, model_env, update.default_model)
             setattr(self._settings, model_attr, update.default_model)
 
+        if self._registry is not None:
+            self._registry.invalidate(name)
+
         return self._build_response(name)
 
     async def test_connection(self, name: str) -> ProviderTestResponse:
-        """Test provider connection by making a minimal API call."""
+        """Test provider connection by making a minimal API call.
+
+        When the injected registry has circuit breakers, the response also
+        reports the provider's breaker state.
+        """
+        result = await self._probe_connection(name)
+        if self._registry is None or name not in _KEY_ATTRS:
+            return result
+        breaker = self._registry.circuit_breaker(name)
+        if breaker is None:
+            return result
+        snapshot = breaker.snapshot()
+        return result.model_copy(
+            update={
+                "circuit_state": snapshot.state.value,
+                "circuit_consecutive_failures": snapshot.consecutive_failures,
+                "circuit_retry_after_seconds": snapshot.retry_after,
+            }
+        )
+
+    async def _probe_connection(self, name: str) -> ProviderTestResponse:
         if name not in _KEY_ATTRS:
             return ProviderTestResponse(success=False, message=f"Unknown provider: {name}")
 
@@ -124,6 +163,51 @@ class ProviderService:
         self._settings.default_llm_provider = name
         return self._build_response(name)
 
+    def rate_limit_stats(self) -> list[RateLimitStatsResponse]:
+        """Return queue depth and wait times for every active (provider, model) limiter."""
+        if self._registry is None or self._registry.rate_limiter is None:
+            return []
+        return [
+            RateLimitStatsResponse(
+                provider=s.provider,
+                model=s.model,
+                queued=s.queued,
+                in_flight=s.in_flight,
+                total_requests=s.total_requests,
+                avg_wait_seconds=s.avg_wait_seconds,
+                max_wait_seconds=s.max_wait_seconds,
+            )
+            for s in self._registry.rate_limiter.stats()
+        ]
+
+    def prompt_cache_stats(self) -> list[PromptCacheStatsResponse]:
+        """Return provider-reported prompt-cache token counts per (provider, model)."""
+        if self._registry is None or self._registry.prompt_cache_usage is None:
+            return []
+        return [
+            PromptCacheStatsResponse(
+                provider=s.provider,
+                model=s.model,
+                requests=s.requests,
+                input_tokens=s.input_tokens,
+                cached_input_tokens=s.cached_input_tokens,
+                cache_write_tokens=s.cache_write_tokens,
+                hit_rate=s.hit_rate,
+            )
+            for s in self._registry.prompt_cache_usage.stats()
+        ]
+
+    async def llm_call_summary(
+        self, *, since: datetime | None = None, clone_id: str | None = None
+    ) -> list[LLMCallSummaryResponse]:
+        """Return per-(operation, provider, model) totals from the LLM call ledger."""
+        if self._registry is None or self._registry.ledger is None:
+            return []
+        summaries = await self._registry.ledger.summary(
+            since=since.timestamp() if since is not None else None, clone_id=clone_id
+        )
+        return [LLMCallSummaryResponse(**asdict(s)) for s in summaries]
+
     def _build_response(self, name: str) -> ProviderResponse:
         api_key = getattr(self._settings, _KEY_ATTRS[name], "")
         return ProviderResponse(
@@ -135,7 +219,14 @@ class ProviderService:
         )
 
     def _create_provider(self, name: str, api_key: str) -> Any:
-        """Create a provider instance for connection testing."""
+        """Return a provider instance for connection testing.
+
+        Uses the pooled registry instance when a registry is injected, so the
+        test exercises the same warm client that generation calls use.
+        """
+        if self._registry is not None:
+            return self._registry.get_provider(name)
+
         model = getattr(self._settings, _MODEL_ATTRS[name])
 
         if name == "openai":
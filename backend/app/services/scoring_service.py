@@ -16,10 +16,12 @@ from app.constants import (
     CONFIDENCE_MAX_WORD_COUNT,
 )
 from app.exceptions import ContentNotFoundError
-from app.llm.base import LLMProvider
+from app.llm.base import INTERACTIVE_RETRY, LLMProvider, with_retry
 from app.llm.prompts import build_scoring_prompt
+from app.llm.telemetry import llm_operation
 from app.models.content import Content
 from app.models.dna import VoiceDNAVersion
+from app.schemas.scoring import ScoringResult
 
 if TYPE_CHECKING:
     from app.models.clone import VoiceClone
@@ -145,12 +147,13 @@ class ScoringService:
         dna_json = json.dumps(raw_data)
 
         messages = build_scoring_prompt(dna_json=dna_json, content_text=content.content_current)
-        response = await self._provider.complete(messages, temperature=0.3)
+        with llm_operation("scoring", clone_id=content.clone_id):
+            result = await with_retry(self._provider.complete_json)(
+                messages, schema=ScoringResult, temperature=0.3
+            )
+        dimensions = [d.model_dump() for d in result.dimensions]
 
-        parsed = json.loads(response)
-        dimensions: list[dict[str, Any]] = parsed["dimensions"]
-
-        scores = [d["score"] for d in dimensions]
+        scores = [d.score for d in result.dimensions]
         overall = round(sum(scores) / len(scores))
 
         content.authenticity_score = overall
@@ -174,12 +177,13 @@ class ScoringService:
         dna_json = json.dumps(raw_data)
 
         messages = build_scoring_prompt(dna_json=dna_json, content_text=content_text)
-        response = await self._provider.complete(messages, temperature=0.3)
-
-        parsed = json.loads(response)
-        dimensions: list[dict[str, Any]] = parsed["dimensions"]
+        with llm_operation("scoring_preview", clone_id=clone_id):
+            result = await with_retry(self._provider.complete_json, INTERACTIVE_RETRY)(
+                messages, schema=ScoringResult, temperature=0.3
+            )
+        dimensions = [d.model_dump() for d in result.dimensions]
 
-        scores = [d["score"] for d in dimensions]
+        scores = [d.score for d in result.dimensions]
         overall = round(sum(scores) / len(scores))
 
         return {"overall_score": overall, "dimensions": dimensions}
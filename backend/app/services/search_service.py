@@ -0,0 +1,74 @@
+"""Service for ranked full-text search across content, samples and clones."""
+
+from __future__ import annotations
+
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.fts import CLONES_FTS, CONTENT_FTS, SAMPLES_FTS, FtsIndex, match_query
+from app.models.clone import VoiceClone
+from app.models.content import Content
+from app.models.sample import WritingSample
+from app.schemas.search import SearchHit, SearchResponse
+
+
+class SearchService:
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+
+    async def search(
+        self, query: str, *, clone_id: str | None = None, limit: int = 20
+    ) -> SearchResponse:
+        """Return the best ``limit`` matches of each kind, most relevant first.
+
+        Every word of ``query`` is prefix-matched. Hits carry a bm25 ``rank``
+        (lower is better, comparable only within one kind) and a snippet with
+        the matched words wrapped in ``<mark>``. Soft-deleted clones and their
+        content and samples are excluded.
+        """
+        fts_query = match_query(query)
+        if fts_query is None:
+            return SearchResponse(content=[], samples=[], clones=[])
+
+        content = select(Content.id, Content.clone_id).select_from(
+            CONTENT_FTS.joined_to(Content.__table__).join(
+                VoiceClone, VoiceClone.id == Content.clone_id
+            )
+        )
+        samples = select(WritingSample.id, WritingSample.clone_id).select_from(
+            SAMPLES_FTS.joined_to(WritingSample.__table__).join(
+                VoiceClone, VoiceClone.id == WritingSample.clone_id
+            )
+        )
+        clones = select(VoiceClone.id, VoiceClone.id.label("clone_id")).select_from(
+            CLONES_FTS.joined_to(VoiceClone.__table__)
+        )
+        return SearchResponse(
+            content=await self._search(CONTENT_FTS, content, fts_query, clone_id, limit),
+            samples=await self._search(SAMPLES_FTS, samples, fts_query, clone_id, limit),
+            clones=await self._search(CLONES_FTS, clones, fts_query, clone_id, limit),
+        )
+
+    async def _search(
+        self,
+        index: FtsIndex,
+        rows: Select[tuple[str, str]],
+        fts_query: str,
+        clone_id: str | None,
+        limit: int,
+    ) -> list[SearchHit]:
+        """Run one index's match over ``rows`` (id, clone_id), ranked by bm25."""
+        rank = index.rank()
+        statement = (
+            rows.add_columns(index.snippet().label("snippet"), rank.label("rank"))
+            .where(index.match(fts_query), VoiceClone.deleted_at.is_(None))
+            .order_by(rank)
+            .limit(limit)
+        )
+        if clone_id:
+            statement = statement.where(VoiceClone.id == clone_id)
+        result = await self.session.execute(statement)
+        return [
+            SearchHit(id=row.id, clone_id=row.clone_id, snippet=row.snippet, rank=row.rank)
+            for row in result
+        ]
@@ -0,0 +1,401 @@
+"""Generate synthetic clones, samples and content at production scale.
+
+Used to reproduce a real database's size locally for profiling and benchmarks.
+Rows are built from the ORM models' tables and written with Core executemany
+inserts, one transaction per chunk, so millions of rows load in minutes::
+
+    python -m app.synthetic --clones 200 --samples 25 --content 1000000
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import time
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+import nanoid
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+# Registers the table for create_all.
+import app.models.preset  # noqa: F401  # pyright: ignore[reportUnusedImport]
+from app.constants import CONTENT_SNAPSHOT_INTERVAL, MAX_SAMPLE_WORDS, PLATFORMS
+from app.database import Base
+from app.models.clone import VoiceClone
+from app.models.content import Content, ContentVersion
+from app.models.dna import VoiceDNAVersion
+from app.models.sample import WritingSample
+from app.seed import DEMO_CLONES
+from app.text_delta import diff, text_hash
+
+_VOCABULARY = (
+    "the a of to and in that is for it with as on be at this by from or have an but not are "
+    "we you they our your their what when how why which who more most some any every each "
+    "voice write writing writer reader readers story stories idea ideas draft drafts post "
+    "team teams product customer customers launch release ship build learn lesson lessons "
+    "simple clear honest sharp quick slow small big better best first last next new old "
+    "work working plan plans change changes focus habit habits practice process growth "
+    "market audience brand message signal noise data insight question answer problem fix "
+    "today week month year morning time moment detail details craft quality value trust"
+)
+_WORDS = _VOCABULARY.split()
+_SENTENCE_LENGTHS = range(6, 23)
+
+# Median words per platform; lengths are log-normal around these.
+_CONTENT_WORDS = {"twitter": 35, "linkedin": 180, "email": 250, "blog": 900, "generic": 150}
+_STATUSES = ("draft", "review", "approved", "published", "archived")
+_STATUS_WEIGHTS = (40, 10, 10, 35, 5)
+_SAMPLE_TYPES = ("blog_post", "linkedin_post", "email", "newsletter", "tweet", "other")
+_EDIT_TRIGGERS = ("inline_edit", "feedback_regen", "partial_regen", "restore")
+_EDIT_WEIGHTS = (60, 20, 15, 5)
+
+# Flush a chunk early once it holds this many words, so huge samples stay bounded.
+_CHUNK_WORDS = 2_000_000
+
+
+@dataclass(frozen=True)
+class SyntheticSpec:
+    """Shape of the generated data set."""
+
+    clones: int = 10
+    samples_per_clone: int = 20
+    median_sample_words: int = 800
+    content_rows: int = 10_000
+    mean_versions: float = 3.0
+    seed: int = 0
+    chunk_size: int = 2_000
+
+
+@dataclass
+class SyntheticCounts:
+    """Rows written per table."""
+
+    clones: int = 0
+    samples: int = 0
+    dna_versions: int = 0
+    content: int = 0
+    content_versions: int = 0
+
+
+def _prose(rng: random.Random, words: int) -> str:
+    """Return ``words`` words of filler prose split into sentences."""
+    tokens = rng.choices(_WORDS, k=words)
+    sentences: list[str] = []
+    start = 0
+    for length in rng.choices(_SENTENCE_LENGTHS, k=words // _SENTENCE_LENGTHS[0] + 1):
+        if start >= words:
+            break
+        sentences.append(" ".join(tokens[start : start + length]).capitalize() + ".")
+        start += length
+    return " ".join(sentences)
+
+
+def _lognormal_words(rng: random.Random, median: int, sigma: float, ceiling: int) -> int:
+    return max(1, min(ceiling, round(median * math.exp(rng.gauss(0.0, sigma)))))
+
+
+def _length_category(word_count: int) -> str:
+    if word_count < 300:
+        return "short"
+    if word_count <= 1000:
+        return "medium"
+    return "long"
+
+
+def _edit(rng: random.Random, text: str, fraction: float) -> str:
+    """Return ``text`` with roughly ``fraction`` of its words replaced."""
+    words = text.split()
+    changes = max(1, int(len(words) * fraction))
+    positions = rng.sample(range(len(words)), min(changes, len(words)))
+    for position, word in zip(positions, rng.choices(_WORDS, k=changes), strict=False):
+        words[position] = word
+    return " ".join(words)
+
+
+async def _write(engine: AsyncEngine, batches: list[tuple[Any, list[dict[str, Any]]]]) -> None:
+    """Insert each (model, rows) batch in order within one transaction."""
+    async with engine.begin() as conn:
+        for model, rows in batches:
+            if rows:
+                await conn.execute(insert(model), rows)
+
+
+async def generate_clones(
+    engine: AsyncEngine,
+    count: int,
+    *,
+    samples_per_clone: int,
+    median_sample_words: int = 800,
+    seed: int = 0,
+    chunk_size: int = 2_000,
+    counts: SyntheticCounts | None = None,
+) -> list[str]:
+    """Insert ``count`` clones with writing samples and a Voice DNA history.
+
+    Sample lengths are log-normal around ``median_sample_words``, capped at
+    MAX_SAMPLE_WORDS. Returns the new clone ids.
+    """
+    rng = random.Random(seed)
+    counts = counts if counts is not None else SyntheticCounts()
+    now = datetime.now(UTC)
+    clone_ids: list[str] = []
+    clones: list[dict[str, Any]] = []
+    samples: list[dict[str, Any]] = []
+    dna: list[dict[str, Any]] = []
+    pending_words = 0
+
+    async def flush() -> None:
+        nonlocal pending_words
+        await _write(
+            engine, [(VoiceClone, clones), (WritingSample, samples), (VoiceDNAVersion, dna)]
+        )
+        counts.clones += len(clones)
+        counts.samples += len(samples)
+        counts.dna_versions += len(dna)
+        clones.clear()
+        samples.clear()
+        dna.clear()
+        pending_words = 0
+
+    for index in range(count):
+        clone_id = nanoid.generate()
+        created = now - timedelta(days=rng.uniform(30, 730))
+        clone_ids.append(clone_id)
+        clones.append(
+            {
+                "id": clone_id,
+                "name": f"Synthetic voice {seed}-{index}",
+                "description": _prose(rng, rng.randint(10, 40)),
+                "tags": rng.sample(["founder", "marketing", "technical", "casual", "formal"], 2),
+                "type": "original",
+                "is_demo": False,
+                "is_hidden": False,
+                "created_at": created,
+                "updated_at": created,
+            }
+        )
+        for _ in range(samples_per_clone):
+            words = _lognormal_words(rng, median_sample_words, 1.0, MAX_SAMPLE_WORDS)
+            samples.append(
+                {
+                    "id": nanoid.generate(),
+                    "clone_id": clone_id,
+                    "content": _prose(rng, words),
+                    "content_type": rng.choice(_SAMPLE_TYPES),
+                    "word_count": words,
+                    "length_category": _length_category(words),
+                    "source_type": "paste",
+                    "created_at": created,
+                }
+            )
+            pending_words += words
+        demo = rng.choice(DEMO_CLONES)
+        dna_versions = rng.randint(1, 3)
+        clones[-1]["latest_version"] = dna_versions
+        for version in range(1, dna_versions + 1):
+            dna.append(
+                {
+                    "id": nanoid.generate(),
+                    "clone_id": clone_id,
+                    "version_number": version,
+                    "data": demo["dna"],
+                    "prominence_scores": demo["prominence_scores"],
+                    "trigger": "initial_analysis" if version == 1 else "regeneration",
+                    "model_used": "synthetic",
+                    "created_at": created + timedelta(days=version),
+                }
+            )
+        if len(clones) + len(samples) >= chunk_size or pending_words >= _CHUNK_WORDS:
+            await flush()
+    await flush()
+    return clone_ids
+
+
+def _version_storage(texts: list[str]) -> list[dict[str, Any]]:
+    """Storage columns for a version chain, laid out as ContentService writes them.
+
+    A repeated text references the latest identical version, other versions
+    are deltas from the one before, and the full text is stored every
+    CONTENT_SNAPSHOT_INTERVAL versions and whenever a delta would be no
+    smaller than the text. Only versions stored as a delta get a ``delta`` key.
+    """
+    rows: list[dict[str, Any]] = []
+    latest_by_hash: dict[str, int] = {}
+    depths: list[int] = []  # Deltas applied to rebuild each version.
+    for number, text in enumerate(texts, 1):
+        digest = text_hash(text)
+        row: dict[str, Any] = {"content_text": None, "base_version": None, "content_hash": digest}
+        depth = 0
+        if digest in latest_by_hash:
+            row["base_version"] = latest_by_hash[digest]
+            depth = depths[row["base_version"] - 1]
+        elif depths and depths[-1] + 1 < CONTENT_SNAPSHOT_INTERVAL:
+            delta = diff(texts[number - 2], text)
+            if len(json.dumps(delta)) < len(text):
+                row["base_version"] = number - 1
+                row["delta"] = delta
+                depth = depths[-1] + 1
+        if row["base_version"] is None:
+            row["content_text"] = text
+        latest_by_hash[digest] = number
+        depths.append(depth)
+        rows.append(row)
+    return rows
+
+
+async def generate_content(
+    engine: AsyncEngine,
+    clone_ids: list[str],
+    count: int,
+    *,
+    mean_versions: float = 3.0,
+    seed: int = 0,
+    chunk_size: int = 2_000,
+    counts: SyntheticCounts | None = None,
+) -> list[str]:
+    """Insert ``count`` content rows spread over ``clone_ids``, each with a version chain.
+
+    Chains start with a generation (or import) and continue with edits,
+    regenerations and restores; their lengths average ``mean_versions``.
+    Returns the new content ids.
+    """
+    rng = random.Random(seed)
+    counts = counts if counts is not None else SyntheticCounts()
+    start = datetime.now(UTC) - timedelta(days=730)
+    step = timedelta(days=730) / max(count, 1)
+    platforms = list(PLATFORMS)
+    content_ids: list[str] = []
+
+    for offset in range(0, count, chunk_size):
+        content: list[dict[str, Any]] = []
+        versions: list[dict[str, Any]] = []
+        # Inserted apart so the other rows leave ``delta`` SQL NULL, as the ORM
+        # does; a None in an executemany batch is stored as JSON null.
+        delta_versions: list[dict[str, Any]] = []
+        for index in range(offset, min(offset + chunk_size, count)):
+            content_id = nanoid.generate()
+            platform = rng.choice(platforms)
+            created = start + step * index
+            words = _lognormal_words(rng, _CONTENT_WORDS[platform], 0.5, MAX_SAMPLE_WORDS)
+            texts = [_prose(rng, words)]
+            triggers = ["import" if rng.random() < 0.1 else "generation"]
+            extra = int(rng.expovariate(1 / (mean_versions - 1))) if mean_versions > 1 else 0
+            for _ in range(extra):
+                trigger = rng.choices(_EDIT_TRIGGERS, _EDIT_WEIGHTS)[0]
+                if trigger == "restore":
+                    texts.append(rng.choice(texts))
+                else:
+                    texts.append(_edit(rng, texts[-1], 0.05 if trigger == "inline_edit" else 0.3))
+                triggers.append(trigger)
+            storage = _version_storage(texts)
+            for number, (text, trigger, stored) in enumerate(
+                zip(texts, triggers, storage, strict=True), 1
+            ):
+                (delta_versions if "delta" in stored else versions).append(
+                    {
+                        "id": nanoid.generate(),
+                        "content_id": content_id,
+                        "version_number": number,
+                        **stored,
+                        "trigger": trigger,
+                        "word_count": len(text.split()),
+                        "created_at": created + timedelta(minutes=number),
+                    }
+                )
+            current = texts[-1]
+            content.append(
+                {
+                    "id": content_id,
+                    "clone_id": clone_ids[index % len(clone_ids)],
+                    "platform": platform,
+                    "status": rng.choices(_STATUSES, _STATUS_WEIGHTS)[0],
+                    "content_current": current,
+                    "content_original": texts[0],
+                    "input_text": _prose(rng, rng.randint(8, 40)),
+                    "authenticity_score": rng.randint(40, 100),
+                    "topic": f"Topic {rng.randint(1, 200)}",
+                    "campaign": f"Campaign {rng.randint(1, 30)}" if rng.random() < 0.3 else None,
+                    "tags": [],
+                    "word_count": len(current.split()),
+                    "char_count": len(current),
+                    "latest_version": len(texts),
+                    "created_at": created,
+                    "updated_at": created + timedelta(minutes=len(texts)),
+                }
+            )
+            content_ids.append(content_id)
+        await _write(
+            engine,
+            [(Content, content), (ContentVersion, versions), (ContentVersion, delta_versions)],
+        )
+        counts.content += len(content)
+        counts.content_versions += len(versions) + len(delta_versions)
+    return content_ids
+
+
+async def generate(engine: AsyncEngine, spec: SyntheticSpec) -> SyntheticCounts:
+    """Generate a whole data set: clones, their samples and DNA, then content."""
+    counts = SyntheticCounts()
+    clone_ids = await generate_clones(
+        engine,
+        spec.clones,
+        samples_per_clone=spec.samples_per_clone,
+        median_sample_words=spec.median_sample_words,
+        seed=spec.seed,
+        chunk_size=spec.chunk_size,
+        counts=counts,
+    )
+    if clone_ids and spec.content_rows:
+        await generate_content(
+            engine,
+            clone_ids,
+            spec.content_rows,
+            mean_versions=spec.mean_versions,
+            seed=spec.seed,
+            chunk_size=spec.chunk_size,
+            counts=counts,
+        )
+    return counts
+
+
+async def _main(spec: SyntheticSpec) -> None:
+    from app.database import engine
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    started = time.perf_counter()
+    counts = await generate(engine, spec)
+    await engine.dispose()
+    print(f"{counts} in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        prog="python -m app.synthetic",
+        description="Bulk-insert synthetic data into the configured database.",
+    )
+    parser.add_argument("--clones", type=int, default=SyntheticSpec.clones)
+    parser.add_argument("--samples", type=int, default=SyntheticSpec.samples_per_clone)
+    parser.add_argument("--sample-words", type=int, default=SyntheticSpec.median_sample_words)
+    parser.add_argument("--content", type=int, default=SyntheticSpec.content_rows)
+    parser.add_argument("--versions", type=float, default=SyntheticSpec.mean_versions)
+    parser.add_argument("--seed", type=int, default=SyntheticSpec.seed)
+    parser.add_argument("--chunk-size", type=int, default=SyntheticSpec.chunk_size)
+    args = parser.parse_args()
+    asyncio.run(
+        _main(
+            SyntheticSpec(
+                clones=args.clones,
+                samples_per_clone=args.samples,
+                median_sample_words=args.sample_words,
+                content_rows=args.content,
+                mean_versions=args.versions,
+                seed=args.seed,
+                chunk_size=args.chunk_size,
+            )
+        )
+    )
@@ -0,0 +1,93 @@
+"""Compact word-level deltas between two versions of a text.
+
+A delta is a list of operations applied to the base text's tokens in order:
+a positive int copies that many tokens, a negative int skips that many, and
+a string is inserted as-is. Tokens are words with their trailing whitespace,
+so ``"".join`` of the tokens is the text and an inline edit costs roughly the
+edited words plus a few integers, whatever the length of the text.
+
+Matching runs over sentences first and over words only inside the sentences
+that changed, since a word-level match of a whole long post is quadratic in
+practice and too slow for the request path.
+"""
+
+import hashlib
+import re
+from difflib import SequenceMatcher
+
+type Delta = list[int | str]
+
+_TOKENS = re.compile(r"\s+|\S+\s*")
+_SENTENCE_END = re.compile(r"[.!?]\s*$|\n")
+
+# Changed runs longer than this, in tokens, are replaced whole: a rewrite
+# that large rarely shares enough words to be worth a word-level match.
+_WORD_DIFF_LIMIT = 1_000
+
+
+def _tokens(text: str) -> list[str]:
+    return _TOKENS.findall(text)
+
+
+def _sentences(tokens: list[str]) -> list[str]:
+    """Group ``tokens`` into sentences and lines, each the join of its tokens."""
+    sentences: list[str] = []
+    start = 0
+    for end, token in enumerate(tokens, 1):
+        if _SENTENCE_END.search(token):
+            sentences.append("".join(tokens[start:end]))
+            start = end
+    if start < len(tokens):
+        sentences.append("".join(tokens[start:]))
+    return sentences
+
+
+def text_hash(text: str) -> str:
+    """SHA-256 hex digest of ``text``, for spotting identical versions."""
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def _diff_words(old: list[str], new: list[str], delta: Delta) -> None:
+    if max(len(old), len(new)) > _WORD_DIFF_LIMIT:
+        if old:
+            delta.append(-len(old))
+        if new:
+            delta.append("".join(new))
+        return
+    for tag, i1, i2, j1, j2 in SequenceMatcher(None, old, new).get_opcodes():
+        if tag == "equal":
+            delta.append(i2 - i1)
+            continue
+        if i2 > i1:
+            delta.append(i1 - i2)
+        if j2 > j1:
+            delta.append("".join(new[j1:j2]))
+
+
+def diff(base: str, text: str) -> Delta:
+    """Return the delta that turns ``base`` into ``text``."""
+    old, new = _sentences(_tokens(base)), _sentences(_tokens(text))
+    delta: Delta = []
+    for tag, i1, i2, j1, j2 in SequenceMatcher(None, old, new).get_opcodes():
+        old_tokens = _tokens("".join(old[i1:i2]))
+        if tag == "equal":
+            delta.append(len(old_tokens))
+        else:
+            _diff_words(old_tokens, _tokens("".join(new[j1:j2])), delta)
+    return delta
+
+
+def patch(base: str, delta: Delta) -> str:
+    """Apply ``delta`` to ``base``; the inverse of ``diff``."""
+    tokens = _tokens(base)
+    parts: list[str] = []
+    position = 0
+    for op in delta:
+        if isinstance(op, str):
+            parts.append(op)
+        elif op > 0:
+            parts.extend(tokens[position : position + op])
+            position += op
+        else:
+            position -= op
+    return "".join(parts)
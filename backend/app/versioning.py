@@ -0,0 +1,39 @@
+"""Per-parent version counters.
+
+Content items, voice clones (for their DNA) and methodology sections record
+the number of their newest version in ``latest_version``. The next number is
+claimed with a single ``UPDATE ... RETURNING``, so writing a version needs no
+``MAX(version_number)`` lookup, and two writers can never claim the same
+number: the increment is atomic and (parent, version_number) is unique.
+
+Rows that have not been flushed yet have no counter in the database; callers
+creating a parent together with its first version set ``latest_version=1``
+on it directly.
+"""
+
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.clone import VoiceClone
+from app.models.content import Content
+from app.models.methodology import MethodologySettings
+
+type Versioned = Content | VoiceClone | MethodologySettings
+
+
+async def claim_version_number(
+    session: AsyncSession, model: type[Versioned], parent_id: str
+) -> int:
+    """Increment the parent's counter and return the new version number.
+
+    A loaded instance of the parent picks up the new value without being
+    marked dirty, so a later flush does not write the counter back.
+    """
+    stmt = (
+        update(model)
+        .where(model.id == parent_id)
+        .values(latest_version=model.latest_version + 1)
+        .returning(model.latest_version)
+        .execution_options(synchronize_session="fetch")
+    )
+    return (await session.execute(stmt)).scalar_one()
@@ -0,0 +1,9 @@
+"""End-to-end benchmarks for the backend hot paths.
+
+Runs the real FastAPI app in-process against a scratch SQLite database, with
+the offline simulated LLM provider standing in for the vendors, and reports
+throughput and p50/p95/p99 latency per scenario as JSON::
+
+    python -m benchmarks --quick --output bench.json
+    python -m benchmarks --baseline bench.json   # exit 1 on regressions
+"""
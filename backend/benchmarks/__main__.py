@@ -0,0 +1,156 @@
+"""Command-line runner: ``python -m benchmarks --help``."""
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from dataclasses import replace
+from pathlib import Path
+
+from benchmarks.harness import (
+    Measurement,
+    compare,
+    format_table,
+    load_results,
+    write_results,
+)
+
+
+def configure_environment(workdir: Path, *, profile: str) -> None:
+    """Point the app at a scratch database and the simulated provider.
+
+    Must run before ``app`` is imported, since settings are read at import.
+    Vendor keys are blanked so nothing can reach a real provider (the
+    registry already never fails the simulated provider over), and the
+    completion cache and client-side rate limits are lifted so every call
+    exercises the full request path.
+    """
+    unlimited = {"requests_per_minute": 10**9, "tokens_per_minute": 10**12, "max_in_flight": 10**6}
+    os.environ.update(
+        {
+            "DATABASE_URL": f"sqlite+aiosqlite:///{workdir / 'bench.db'}",
+            "OPENAI_API_KEY": "",
+            "ANTHROPIC_API_KEY": "",
+            "GOOGLE_AI_API_KEY": "",
+            "DEFAULT_LLM_PROVIDER": "simulated",
+            "LLM_SIMULATED_ENABLED": "true",
+            "LLM_SIMULATED_PROFILE": profile,
+            "LLM_CACHE_ENABLED": "false",
+            "LLM_TELEMETRY_PATH": str(workdir / "llm_telemetry.db"),
+            "LLM_RATE_LIMIT_OVERRIDES": json.dumps({"simulated": unlimited}),
+        }
+    )
+
+
+def _git_commit() -> str | None:
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
+async def run(args: argparse.Namespace) -> list[Measurement]:
+    """Serve the app on an ephemeral local port and run the selected scenarios."""
+    import uvicorn
+    from httpx import AsyncClient, Timeout
+
+    from app.database import engine
+    from app.main import app
+    from benchmarks.scenarios import SCALES, SCENARIOS, BenchContext
+
+    scale = SCALES[args.scale]
+    if args.iterations:
+        scale = replace(scale, iterations=args.iterations)
+    if args.concurrency:
+        scale = replace(scale, concurrency=args.concurrency)
+
+    # A real socket (not ASGITransport, which buffers bodies) so stream
+    # time-to-first-byte is observable.
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=0, log_level="warning"))
+    serving = asyncio.create_task(server.serve())
+    while not server.started:
+        if serving.done():
+            serving.result()
+        await asyncio.sleep(0.01)
+    port = server.servers[0].sockets[0].getsockname()[1]
+
+    measurements: list[Measurement] = []
+    try:
+        async with AsyncClient(base_url=f"http://127.0.0.1:{port}", timeout=Timeout(300)) as client:
+            ctx = BenchContext(client=client, engine=engine, scale=scale)
+            for name in args.scenario or list(SCENARIOS):
+                print(f"running {name}...", file=sys.stderr)
+                measurements += await SCENARIOS[name](ctx)
+    finally:
+        server.should_exit = True
+        await serving
+    return measurements
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__)
+    parser.add_argument(
+        "--scenario",
+        action="append",
+        choices=[
+            "generate",
+            "generate_stream",
+            "content_list",
+            "clone_list",
+            "dna_analyze",
+            "bulk",
+        ],
+        help="scenario to run (repeatable; default: all)",
+    )
+    parser.add_argument("--scale", choices=["quick", "full"], default="full")
+    parser.add_argument("--quick", action="store_const", const="quick", dest="scale")
+    parser.add_argument("--iterations", type=int, help="timed calls per measurement")
+    parser.add_argument("--concurrency", type=int, help="concurrent callers per measurement")
+    parser.add_argument(
+        "--profile",
+        default="instant",
+        help="simulated provider latency profile (instant, fast, realistic, degraded)",
+    )
+    parser.add_argument("--output", type=Path, help="write results JSON here")
+    parser.add_argument("--baseline", type=Path, help="compare against a stored results JSON")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="fractional change that counts as a regression (default 0.2)",
+    )
+    parser.add_argument("--workdir", type=Path, help="scratch directory (default: a new tempdir)")
+    args = parser.parse_args(argv)
+
+    workdir = args.workdir or Path(tempfile.mkdtemp(prefix="sona-bench-"))
+    workdir.mkdir(parents=True, exist_ok=True)
+    if (workdir / "bench.db").exists():
+        parser.error(f"{workdir / 'bench.db'} already exists; use an empty --workdir")
+    configure_environment(workdir, profile=args.profile)
+
+    measurements = asyncio.run(run(args))
+    baseline = load_results(args.baseline) if args.baseline else {}
+    print(format_table(measurements, baseline))
+
+    if args.output:
+        meta = {"scale": args.scale, "profile": args.profile, "commit": _git_commit()}
+        write_results(args.output, measurements, meta)
+
+    regressions = compare(measurements, baseline, threshold=args.threshold)
+    for r in regressions:
+        print(
+            f"REGRESSION {r.name} {r.metric}: {r.baseline:.2f} -> {r.current:.2f} "
+            f"({r.change:+.0%})",
+            file=sys.stderr,
+        )
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,183 @@
+"""Timing, percentile and baseline-comparison helpers for the benchmark runner."""
+
+import asyncio
+import json
+import platform
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass, field
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+# A benchmark call returns its own sample in seconds (e.g. time to first
+# byte), or None to be timed end to end.
+BenchCall = Callable[[], Awaitable[float | None]]
+
+
+@dataclass(frozen=True)
+class Measurement:
+    """Latency distribution and throughput of one benchmark scenario."""
+
+    name: str
+    iterations: int
+    concurrency: int
+    errors: int
+    throughput_rps: float
+    mean_ms: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    max_ms: float
+    params: dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class Regression:
+    """A metric that got worse than the baseline by more than the threshold."""
+
+    name: str
+    metric: str
+    baseline: float
+    current: float
+
+    @property
+    def change(self) -> float:
+        return (self.current - self.baseline) / self.baseline if self.baseline else 0.0
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    """Return the ``pct`` (0-100) percentile of ``samples`` by linear interpolation."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = (len(ordered) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def summarize(
+    name: str,
+    samples: list[float],
+    *,
+    wall_seconds: float,
+    concurrency: int,
+    errors: int = 0,
+    params: dict[str, Any] | None = None,
+) -> Measurement:
+    """Build a Measurement from per-call latencies (in seconds)."""
+    calls = len(samples) + errors
+    return Measurement(
+        name=name,
+        iterations=calls,
+        concurrency=concurrency,
+        errors=errors,
+        throughput_rps=calls / wall_seconds if wall_seconds > 0 else 0.0,
+        mean_ms=sum(samples) / len(samples) * 1000 if samples else 0.0,
+        p50_ms=percentile(samples, 50) * 1000,
+        p95_ms=percentile(samples, 95) * 1000,
+        p99_ms=percentile(samples, 99) * 1000,
+        max_ms=max(samples, default=0.0) * 1000,
+        params=params or {},
+    )
+
+
+async def measure(
+    name: str,
+    call: BenchCall,
+    *,
+    iterations: int,
+    concurrency: int = 1,
+    warmup: int = 1,
+    params: dict[str, Any] | None = None,
+) -> Measurement:
+    """Run ``call`` ``iterations`` times across ``concurrency`` workers.
+
+    Warm-up calls run first and are discarded. A call that raises counts as
+    an error and contributes no latency sample.
+    """
+    for _ in range(warmup):
+        await call()
+
+    samples: list[float] = []
+    errors = 0
+    remaining = iterations
+
+    async def worker() -> None:
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            started = time.perf_counter()
+            try:
+                sample = await call()
+            except Exception:
+                errors += 1
+                continue
+            samples.append(sample if sample is not None else time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(max(1, min(concurrency, iterations)))))
+    wall = time.perf_counter() - started
+    return summarize(
+        name, samples, wall_seconds=wall, concurrency=concurrency, errors=errors, params=params
+    )
+
+
+def write_results(path: Path, measurements: list[Measurement], meta: dict[str, Any]) -> None:
+    """Write measurements and run metadata to ``path`` as JSON."""
+    document = {
+        "meta": {
+            "created_at": datetime.now(UTC).isoformat(),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            **meta,
+        },
+        "results": [asdict(m) for m in measurements],
+    }
+    path.write_text(json.dumps(document, indent=2) + "\n")
+
+
+def load_results(path: Path) -> dict[str, Measurement]:
+    """Load a results file written by ``write_results``, keyed by scenario name."""
+    document = json.loads(path.read_text())
+    return {row["name"]: Measurement(**row) for row in document["results"]}
+
+
+def compare(
+    current: list[Measurement], baseline: dict[str, Measurement], *, threshold: float
+) -> list[Regression]:
+    """Return metrics that regressed by more than ``threshold`` (a fraction).
+
+    Latency percentiles regress when they grow and throughput when it drops;
+    scenarios missing from the baseline are skipped.
+    """
+    regressions: list[Regression] = []
+    for measurement in current:
+        before = baseline.get(measurement.name)
+        if before is None:
+            continue
+        for metric in ("p50_ms", "p95_ms", "p99_ms"):
+            old, new = getattr(before, metric), getattr(measurement, metric)
+            if old > 0 and new > old * (1 + threshold):
+                regressions.append(Regression(measurement.name, metric, old, new))
+        old_rps, new_rps = before.throughput_rps, measurement.throughput_rps
+        if old_rps > 0 and new_rps < old_rps * (1 - threshold):
+            regressions.append(Regression(measurement.name, "throughput_rps", old_rps, new_rps))
+    return regressions
+
+
+def format_table(measurements: list[Measurement], baseline: dict[str, Measurement]) -> str:
+    """Render measurements (with p95 change against the baseline, if any) as text."""
+    header = f"{'scenario':<44} {'rps':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'err':>4}"
+    lines = [header, "-" * len(header)]
+    for m in measurements:
+        line = (
+            f"{m.name:<44} {m.throughput_rps:>9.1f} {m.p50_ms:>9.2f} "
+            f"{m.p95_ms:>9.2f} {m.p99_ms:>9.2f} {m.errors:>4}"
+        )
+        before = baseline.get(m.name)
+        if before is not None and before.p95_ms > 0:
+            line += f"  p95 {(m.p95_ms - before.p95_ms) / before.p95_ms:+.0%}"
+        lines.append(line)
+    return "\n".join(lines)
@@ -0,0 +1,308 @@
+"""Benchmark scenarios for the backend hot paths.
+
+Each scenario drives the in-process app over HTTP and returns one or more
+Measurements. Scenarios share a BenchContext, which seeds fixtures lazily so
+a run that selects only some scenarios only pays for the data they need.
+"""
+
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.config import settings
+from app.synthetic import generate_clones, generate_content
+from benchmarks.harness import Measurement, measure
+
+_PLATFORMS = ["twitter", "linkedin", "email", "blog", "generic"]
+_INPUT = "Write about why small, frequent releases beat big quarterly launches."
+
+
+@dataclass(frozen=True)
+class Scale:
+    """Data sizes and call counts for one benchmark run."""
+
+    iterations: int
+    concurrency: int
+    content_rows: tuple[int, ...]
+    list_clones: int
+    list_clone_samples: int
+    sample_words: int
+    bulk_sizes: tuple[int, ...]
+
+
+SCALES: dict[str, Scale] = {
+    "quick": Scale(
+        iterations=20,
+        concurrency=4,
+        content_rows=(1_000, 10_000),
+        list_clones=10,
+        list_clone_samples=5,
+        sample_words=500,
+        bulk_sizes=(50,),
+    ),
+    "full": Scale(
+        iterations=200,
+        concurrency=8,
+        content_rows=(10_000, 100_000, 1_000_000),
+        list_clones=50,
+        list_clone_samples=20,
+        sample_words=2_000,
+        bulk_sizes=(100, 1_000),
+    ),
+}
+
+
+@dataclass
+class BenchContext:
+    """Shared client, engine and lazily seeded fixtures for one run."""
+
+    client: AsyncClient
+    engine: AsyncEngine
+    scale: Scale
+    _clone_id: str | None = None
+    _content_ids: list[str] = field(default_factory=list[str])
+
+    async def clone_id(self) -> str:
+        """Return a clone with samples and Voice DNA, seeding it on first use."""
+        if self._clone_id is None:
+            [self._clone_id] = await generate_clones(
+                self.engine, 1, samples_per_clone=10, median_sample_words=self.scale.sample_words
+            )
+        return self._clone_id
+
+    async def content_ids(self, rows: int) -> list[str]:
+        """Grow the content table to at least ``rows`` rows and return all seeded ids."""
+        missing = rows - len(self._content_ids)
+        if missing > 0:
+            clone_ids = [await self.clone_id()]
+            self._content_ids += await generate_content(
+                self.engine, clone_ids, missing, seed=len(self._content_ids)
+            )
+        return self._content_ids
+
+
+async def _post(client: AsyncClient, url: str, payload: object) -> None:
+    response = await client.post(url, json=payload)
+    response.raise_for_status()
+
+
+async def _get(client: AsyncClient, url: str, params: dict[str, str | int] | None = None) -> None:
+    response = await client.get(url, params=params)
+    response.raise_for_status()
+
+
+async def bench_generate(ctx: BenchContext) -> list[Measurement]:
+    """POST /content/generate with one to five platforms, per-platform and single-call."""
+    clone_id = await ctx.clone_id()
+    results: list[Measurement] = []
+    for single_call in (False, True):
+        for count in range(2 if single_call else 1, len(_PLATFORMS) + 1):
+            payload = {
+                "clone_id": clone_id,
+                "platforms": _PLATFORMS[:count],
+                "input_text": _INPUT,
+                "single_call": single_call,
+            }
+
+            async def call(payload: object = payload) -> None:
+                await _post(ctx.client, "/api/content/generate", payload)
+
+            mode = "content_generate_single_call" if single_call else "content_generate"
+            results.append(
+                await measure(
+                    f"{mode}[platforms={count}]",
+                    call,
+                    iterations=ctx.scale.iterations,
+                    concurrency=ctx.scale.concurrency,
+                    params={"platforms": count, "single_call": single_call},
+                )
+            )
+    return results
+
+
+async def bench_generate_stream(ctx: BenchContext) -> list[Measurement]:
+    """POST /content/generate/stream{,/multi}: time to first byte and to the final event."""
+    clone_id = await ctx.clone_id()
+    cases: dict[str, tuple[str, dict[str, object]]] = {
+        "content_stream": (
+            "/api/content/generate/stream",
+            {"clone_id": clone_id, "platform": "linkedin", "input_text": _INPUT},
+        ),
+        "content_stream_multi": (
+            "/api/content/generate/stream/multi",
+            {
+                "clone_id": clone_id,
+                "platforms": ["linkedin"],
+                "input_text": _INPUT,
+                "variants": True,
+            },
+        ),
+    }
+
+    results: list[Measurement] = []
+    for case, (url, payload) in cases.items():
+
+        async def first_byte(url: str = url, payload: object = payload) -> float:
+            started = time.perf_counter()
+            async with ctx.client.stream("POST", url, json=payload) as response:
+                response.raise_for_status()
+                chunks = response.aiter_raw()
+                await anext(chunks)
+                ttfb = time.perf_counter() - started
+                async for _ in chunks:
+                    pass
+            return ttfb
+
+        async def full(url: str = url, payload: object = payload) -> None:
+            async with ctx.client.stream("POST", url, json=payload) as response:
+                response.raise_for_status()
+                async for _ in response.aiter_raw():
+                    pass
+
+        for metric, call in (("ttfb", first_byte), ("total", full)):
+            results.append(
+                await measure(
+                    f"{case}_{metric}",
+                    call,
+                    iterations=ctx.scale.iterations,
+                    concurrency=ctx.scale.concurrency,
+                )
+            )
+    return results
+
+
+async def bench_content_list(ctx: BenchContext) -> list[Measurement]:
+    """GET /content: first page, sparse fields, a deep page and a search, per table size."""
+    results: list[Measurement] = []
+    for rows in ctx.scale.content_rows:
+        await ctx.content_ids(rows)
+        cases: dict[str, dict[str, str | int]] = {
+            "first_page": {"limit": 20},
+            "sparse": {"limit": 20, "fields": "platform,status,authenticity_score,preview"},
+            "deep_page": {"limit": 20, "offset": max(0, rows - 40)},
+            "filtered": {"limit": 20, "status": "draft", "platform": "blog"},
+            "search": {"limit": 20, "search": "launch"},
+        }
+        for case, params in cases.items():
+
+            async def call(params: dict[str, str | int] = params) -> None:
+                await _get(ctx.client, "/api/content", params)
+
+            results.append(
+                await measure(
+                    f"content_list[{case},rows={rows}]",
+                    call,
+                    iterations=ctx.scale.iterations,
+                    concurrency=ctx.scale.concurrency,
+                    params={"rows": rows, **params},
+                )
+            )
+    return results
+
+
+async def bench_clone_list(ctx: BenchContext) -> list[Measurement]:
+    """GET /clones with many clones that each carry large writing samples."""
+    scale = ctx.scale
+    await generate_clones(
+        ctx.engine,
+        scale.list_clones,
+        samples_per_clone=scale.list_clone_samples,
+        median_sample_words=scale.sample_words,
+        seed=1,
+    )
+
+    async def call() -> None:
+        await _get(ctx.client, "/api/clones")
+
+    return [
+        await measure(
+            f"clone_list[clones={scale.list_clones},samples={scale.list_clone_samples}]",
+            call,
+            iterations=scale.iterations,
+            concurrency=scale.concurrency,
+            params={
+                "clones": scale.list_clones,
+                "samples": scale.list_clone_samples,
+                "sample_words": scale.sample_words,
+            },
+        )
+    ]
+
+
+async def bench_dna_analyze(ctx: BenchContext) -> list[Measurement]:
+    """POST /clones/{id}/analyze against a clone with ten samples."""
+    clone_id = await ctx.clone_id()
+
+    async def call() -> None:
+        await _post(
+            ctx.client,
+            f"/api/clones/{clone_id}/analyze",
+            {"model": settings.llm_simulated_model},
+        )
+
+    return [
+        await measure(
+            "dna_analyze",
+            call,
+            iterations=ctx.scale.iterations,
+            concurrency=ctx.scale.concurrency,
+        )
+    ]
+
+
+async def bench_bulk(ctx: BenchContext) -> list[Measurement]:
+    """POST /content/bulk/{status,tag,delete} over batches of existing ids."""
+    scale = ctx.scale
+    results: list[Measurement] = []
+    for size in scale.bulk_sizes:
+        ids = (await ctx.content_ids(size))[:size]
+        for op, payload in (
+            ("status", {"ids": ids, "status": "review"}),
+            ("tag", {"ids": ids, "tags": ["bench"]}),
+        ):
+
+            async def call(op: str = op, payload: object = payload) -> None:
+                await _post(ctx.client, f"/api/content/bulk/{op}", payload)
+
+            results.append(
+                await measure(
+                    f"content_bulk_{op}[ids={size}]",
+                    call,
+                    iterations=scale.iterations,
+                    concurrency=1,
+                    params={"ids": size},
+                )
+            )
+
+        # Deletes need fresh rows per call, so seed them outside the timing.
+        batches = [
+            await generate_content(ctx.engine, [await ctx.clone_id()], size, seed=i)
+            for i in range(scale.iterations + 1)
+        ]
+
+        async def delete(batches: list[list[str]] = batches) -> None:
+            await _post(ctx.client, "/api/content/bulk/delete", {"ids": batches.pop()})
+
+        results.append(
+            await measure(
+                f"content_bulk_delete[ids={size}]",
+                delete,
+                iterations=scale.iterations,
+                concurrency=1,
+                params={"ids": size},
+            )
+        )
+    return results
+
+
+SCENARIOS: dict[str, Callable[[BenchContext], Awaitable[list[Measurement]]]] = {
+    "generate": bench_generate,
+    "generate_stream": bench_generate_stream,
+    "content_list": bench_content_list,
+    "clone_list": bench_clone_list,
+    "dna_analyze": bench_dna_analyze,
+    "bulk": bench_bulk,
+}
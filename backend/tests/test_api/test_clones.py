@@ -77,6 +77,40 @@ async def test_list_clones_searches_by_name(client: AsyncClient, session: AsyncS
     assert data["total"] == 1
 
 
+async def test_list_clones_pages_with_limit_and_cursor(
+    client: AsyncClient, session: AsyncSession
+) -> None:
+    """GET /api/clones?limit=1 should return a next_cursor for the following page."""
+    await _create_clone(session, name="Clone A")
+    await _create_clone(session, name="Clone B")
+
+    first = (await client.get("/api/clones?limit=1")).json()
+    second = (await client.get(f"/api/clones?limit=1&cursor={first['next_cursor']}")).json()
+
+    assert first["total"] == 2
+    assert {first["items"][0]["name"], second["items"][0]["name"]} == {"Clone A", "Clone B"}
+
+
+async def test_list_clones_without_total(client: AsyncClient, session: AsyncSession) -> None:
+    """GET /api/clones?include_total=false should skip the count but still page."""
+    await _create_clone(session, name="Clone A")
+    await _create_clone(session, name="Clone B")
+
+    data = (await client.get("/api/clones?limit=1&include_total=false")).json()
+
+    assert data["total"] is None
+    assert len(data["items"]) == 1
+    assert data["next_cursor"] is not None
+
+
+async def test_list_clones_invalid_cursor_returns_400(client: AsyncClient) -> None:
+    """GET /api/clones with a malformed cursor should return INVALID_CURSOR."""
+    response = await client.get("/api/clones?limit=1&cursor=bogus")
+
+    assert response.status_code == 400
+    assert response.json()["code"] == "INVALID_CURSOR"
+
+
 async def test_get_clone_endpoint(client: AsyncClient, session: AsyncSession) -> None:
     """GET /api/clones/{id} should return clone detail."""
     clone = await _create_clone(session, name="My Clone")
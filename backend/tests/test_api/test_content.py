@@ -8,15 +8,30 @@ from unittest.mock import AsyncMock
 import nanoid
 import pytest
 from httpx import AsyncClient
+from pydantic import BaseModel
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_llm_provider
+from app.exceptions import LLMAuthError
+from app.llm.structured import parse_json_response
 from app.main import app
 from app.models.clone import VoiceClone
 from app.models.content import Content
 from app.models.dna import VoiceDNAVersion
 
 
+def _json_reply(raw: str) -> Any:
+    """side_effect for a mocked complete_json that validates ``raw`` like a real provider."""
+
+    async def complete_json(
+        messages: list[dict[str, str]], *, schema: type[BaseModel], **kwargs: Any
+    ) -> BaseModel:
+        return parse_json_response(raw, schema)
+
+    return complete_json
+
+
 async def _create_clone_with_dna(
     session: AsyncSession,
 ) -> VoiceClone:
@@ -112,6 +127,36 @@ class TestGenerateEndpoint:
         platforms = {item["platform"] for item in data["items"]}
         assert platforms == {"twitter", "linkedin"}
 
+    async def test_generate_single_call(
+        self,
+        client: AsyncClient,
+        session: AsyncSession,
+        mock_provider: AsyncMock,
+    ) -> None:
+        """single_call=true should split one JSON reply into per-platform items."""
+        clone = await _create_clone_with_dna(session)
+        mock_provider.complete_json = AsyncMock(
+            side_effect=_json_reply('{"posts": {"twitter": "Tweet.", "linkedin": "Post."}}')
+        )
+
+        response = await client.post(
+            "/api/content/generate",
+            json={
+                "clone_id": clone.id,
+                "platforms": ["twitter", "linkedin"],
+                "input_text": "Write about AI.",
+                "single_call": True,
+            },
+        )
+
+        assert response.status_code == 201
+        items = response.json()["items"]
+        assert [(i["platform"], i["content_current"]) for i in items] == [
+            ("twitter", "Tweet."),
+            ("linkedin", "Post."),
+        ]
+        mock_provider.complete.assert_not_called()
+
     async def test_generate_without_dna_returns_400(
         self, client: AsyncClient, session: AsyncSession
     ) -> None:
@@ -201,6 +246,195 @@ class TestStreamEndpoint:
         assert "Hello " in body
         assert "streaming." in body
 
+    async def test_stream_sends_plain_text_data_lines(
+        self,
+        client: AsyncClient,
+        session: AsyncSession,
+        mock_provider: AsyncMock,
+    ) -> None:
+        """Chunks go out as raw ``data:`` lines, one per line of text."""
+        clone = await _create_clone_with_dna(session)
+
+        async def mock_stream(messages: list[dict[str, str]], **kwargs: Any) -> Any:
+            yield "First line.\nSecond line."
+
+        mock_provider.stream = mock_stream
+
+        response = await client.post(
+            "/api/content/generate/stream",
+            json={
+                "clone_id": clone.id,
+                "platform": "blog",
+                "input_text": "Write a blog post.",
+            },
+        )
+
+        assert response.text == "data: First line.\ndata: Second line.\n\ndata: [DONE]\n\n"
+
+    async def test_stream_persist_saves_content_and_emits_id(
+        self,
+        client: AsyncClient,
+        session: AsyncSession,
+        mock_provider: AsyncMock,
+    ) -> None:
+        """POST /api/content/generate/stream with persist should save the streamed draft."""
+        clone = await _create_clone_with_dna(session)
+
+        async def mock_stream(messages: list[dict[str, str]], **kwargs: Any) -> Any:
+            for chunk in ["Hello ", "world ", "streaming."]:
+                yield chunk
+
+        mock_provider.stream = mock_stream
+
+        response = await client.post(
+            "/api/content/generate/stream",
+            json={
+                "clone_id": clone.id,
+                "platform": "blog",
+                "input_text": "Write a blog post.",
+                "properties": {"tone": "warm"},
+                "persist": True,
+            },
+        )
+
+        events = _parse_sse(response.text)
+        assert events[-1] == ("message", "[DONE]")
+        name, data = events[-2]
+        assert name == "saved"
+        content_id = json.loads(data)["content_id"]
+
+        content = await session.get(Content, content_id)
+        assert content is not None
+        assert content.content_current == "Hello world streaming."
+        assert content.generation_properties == {"tone": "warm"}
+        assert [(v.version_number, v.trigger) for v in content.versions] == [(1, "generation")]
+
+    async def test_stream_without_persist_saves_nothing(
+        self,
+        client: AsyncClient,
+        session: AsyncSession,
+        mock_provider: AsyncMock,
+    ) -> None:
+        """POST /api/content/generate/stream should not save by default."""
+        clone = await _create_clone_with_dna(session)
+
+        async def mock_stream(messages: list[dict[str, str]], **kwargs: Any) -> Any:
+            yield "Draft."
+
+        mock_provider.stream = mock_stream
+
+        response = await client.post(
+            "/api/content/generate/stream",
+            json={"clone_id": clone.id, "platform": "blog", "input_text": "Write."},
+        )
+
+        assert "saved" not in {name for name, _ in _parse_sse(response.text)}
+        assert (await session.execute(select(Content))).scalars().all() == []
+
+    async def test_multi_stream_interleaves_tagged_variants(
+        self,
+        client: AsyncClient,
+        session: AsyncSession,
+        mock_provider: AsyncMock,
+    ) -> None:
+        """POST /api/content/generate/stream/multi should tag each variant's events."""
+        clone = await _create_clone_with_dna(session)
+
+        async def mock_stream(messages: list[dict[str, str]], **kwargs: Any) -> Any:
+            yield f"t={kwargs['temperature']} "
+            yield "done."
+
+        mock_provider.stream = mock_stream
+
+        response = await client.post(
+            "/api/content/generate/stream/multi",
+            json={
+                "clone_id": clone.id,
+                "platforms": ["linkedin"],
+                "input_text": "Write a post.",
+                "variants": True,
+            },
+        )
+
+        assert response.status_code == 200
+        events = _parse_sse(response.text)
+        assert events[-1] == ("message", "[DONE]")
+        texts: dict[int, str] = {}
+        for name, data in events[:-1]:
+            payload = json.loads(data)
+            assert payload["platform"] == "linkedin"
+            if name == "delta":
+                index = payload["variant_index"]
+                texts[index] = texts.get(index, "") + payload["delta"]
+        assert texts == {0: "t=0.5 done.", 1: "t=0.7 done.", 2: "t=0.9 done."}
+        assert sum(name == "done" for name, _ in events) == 3
+
+    async def test_multi_stream_reports_failed_platform_as_error_event(
+        self,
+        client: AsyncClient,
+        session: AsyncSession,
+        mock_provider: AsyncMock,
+    ) -> None:
+        """A failing platform should emit an error event while the others finish."""
+        clone = await _create_clone_with_dna(session)
+
+        async def mock_stream(messages: list[dict[str, str]], **kwargs: Any) -> Any:
+            if any("Target platform: email." in m["content"] for m in messages):
+                raise LLMAuthError(provider="openai")
+            yield "Blog text."
+
+        mock_provider.stream = mock_stream
+
+        response = await client.post(
+            "/api/content/generate/stream/multi",
+            json={
+                "clone_id": clone.id,
+                "platforms": ["email", "blog"],
+                "input_text": "Write something.",
+            },
+        )
+
+        events = {
+            (name, json.loads(data)["platform"]): json.loads(data)
+            for name, data in _parse_sse(response.text)
+            if data != "[DONE]"
+        }
+        assert events[("error", "email")]["code"] == "LLM_AUTH_ERROR"
+        assert events[("delta", "blog")]["delta"] == "Blog text."
+        assert ("done", "blog") in events
+
+    async def test_multi_stream_without_dna_returns_400(
+        self,
+        client: AsyncClient,
+        session: AsyncSession,
+    ) -> None:
+        """POST /api/content/generate/stream/multi without DNA should return DNA_REQUIRED."""
+        clone = VoiceClone(id=nanoid.generate(), name="No DNA")
+        session.add(clone)
+        await session.commit()
+
+        response = await client.post(
+            "/api/content/generate/stream/multi",
+            json={"clone_id": clone.id, "platforms": ["blog"], "input_text": "Hi."},
+        )
+
+        assert response.status_code == 400
+        assert response.json()["code"] == "DNA_REQUIRED"
+
+
+def _parse_sse(body: str) -> list[tuple[str, str]]:
+    """Split an SSE body into (event name, data) pairs."""
+    events: list[tuple[str, str]] = []
+    for block in body.strip().split("\n\n"):
+        name, data = "message", ""
+        for line in block.splitlines():
+            if line.startswith("event: "):
+                name = line.removeprefix("event: ")
+            elif line.startswith("data: "):
+                data = line.removeprefix("data: ")
+        events.append((name, data))
+    return events
+
 
 async def _generate_one(
     client: AsyncClient, session: AsyncSession, mock_provider: AsyncMock
@@ -502,6 +736,71 @@ class TestListEndpoint:
         data = response.json()
         assert data["total"] == 1
 
+    async def test_list_sparse_fields_with_preview(
+        self,
+        client: AsyncClient,
+        session: AsyncSession,
+    ) -> None:
+        """GET /api/content?fields=... should return only those keys, id and the sort column."""
+        clone = await _create_clone_with_dna(session)
+        row = await _create_content_row(
+            session, clone, content_text="A long draft about launches.", authenticity_score=80
+        )
+
+        response = await client.get(
+            "/api/content?fields=platform,preview&preview_chars=6&sort=authenticity_score"
+        )
+
+        assert response.status_code == 200
+        assert response.json() == {
+            "items": [
+                {"id": row.id, "platform": "blog", "preview": "A long", "authenticity_score": 80}
+            ],
+            "total": 1,
+            "next_cursor": None,
+        }
+
+    async def test_list_unknown_field_returns_400(
+        self,
+        client: AsyncClient,
+    ) -> None:
+        """GET /api/content?fields=... with an unknown field should return INVALID_FIELDS."""
+        response = await client.get("/api/content?fields=platform,versions")
+
+        assert response.status_code == 400
+        assert response.json()["code"] == "INVALID_FIELDS"
+
+    async def test_list_follows_next_cursor(
+        self,
+        client: AsyncClient,
+        session: AsyncSession,
+    ) -> None:
+        """GET /api/content should hand out next_cursor until the last page."""
+        clone = await _create_clone_with_dna(session)
+        for _ in range(3):
+            await _create_content_row(session, clone)
+
+        first = (await client.get("/api/content?limit=2&include_total=false")).json()
+        assert first["total"] is None
+        assert first["next_cursor"] is not None
+
+        response = await client.get(f"/api/content?limit=2&cursor={first['next_cursor']}")
+        second = response.json()
+        assert response.status_code == 200
+        assert second["next_cursor"] is None
+        ids = [item["id"] for item in first["items"] + second["items"]]
+        assert len(set(ids)) == 3
+
+    async def test_list_invalid_cursor_returns_400(
+        self,
+        client: AsyncClient,
+    ) -> None:
+        """GET /api/content with a malformed cursor should return INVALID_CURSOR."""
+        response = await client.get("/api/content?cursor=not-a-cursor")
+
+        assert response.status_code == 400
+        assert response.json()["code"] == "INVALID_CURSOR"
+
 
 class TestBulkEndpoints:
     async def test_bulk_status_update(
@@ -587,7 +886,7 @@ class TestScorePreviewEndpoint:
     ) -> None:
         """POST /api/content/score-preview should return 200 with scores."""
         clone = await _create_clone_with_dna(session)
-        mock_provider.complete = AsyncMock(return_value=_make_score_response())
+        mock_provider.complete_json = AsyncMock(side_effect=_json_reply(_make_score_response()))
 
         response = await client.post(
             "/api/content/score-preview",
@@ -639,7 +938,7 @@ class TestScoreEndpoint:
         item = await _generate_one(client, session, mock_provider)
 
         # Now mock the scoring LLM call
-        mock_provider.complete = AsyncMock(return_value=_make_score_response())
+        mock_provider.complete_json = AsyncMock(side_effect=_json_reply(_make_score_response()))
 
         response = await client.post(f"/api/content/{item['id']}/score")
 
@@ -844,7 +1143,7 @@ class TestDetectEndpoint:
         """POST /api/content/{id}/detect should return 200 with detection results."""
         item = await _generate_one(client, session, mock_provider)
 
-        mock_provider.complete = AsyncMock(return_value=_make_detection_response())
+        mock_provider.complete_json = AsyncMock(side_effect=_json_reply(_make_detection_response()))
 
         response = await client.post(f"/api/content/{item['id']}/detect")
 
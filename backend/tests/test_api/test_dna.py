@@ -1,9 +1,25 @@
 """Tests for DNA analysis API endpoints."""
 
 import json
+from typing import Any
 from unittest.mock import AsyncMock, patch
 
 from httpx import AsyncClient
+from pydantic import BaseModel
+
+from app.llm.structured import parse_json_response
+
+
+def _json_reply(raw: str) -> Any:
+    """side_effect for a mocked complete_json that validates ``raw`` like a real provider."""
+
+    async def complete_json(
+        messages: list[dict[str, str]], *, schema: type[BaseModel], **kwargs: Any
+    ) -> BaseModel:
+        return parse_json_response(raw, schema)
+
+    return complete_json
+
 
 MOCK_DNA_RESPONSE = json.dumps(
     {
@@ -82,7 +98,7 @@ class TestAnalyzeEndpoint:
         clone_id = await _create_clone_with_samples(client)
 
         mock_provider = AsyncMock()
-        mock_provider.complete = AsyncMock(return_value=MOCK_DNA_RESPONSE)
+        mock_provider.complete_json = AsyncMock(side_effect=_json_reply(MOCK_DNA_RESPONSE))
 
         with patch("app.api.clones.get_llm_provider", return_value=mock_provider):
             resp = await client.post(
@@ -129,7 +145,7 @@ class TestAnalyzeEndpoint:
         clone_id = await _create_clone_with_samples(client)
 
         mock_provider = AsyncMock()
-        mock_provider.complete = AsyncMock(side_effect=Exception("LLM down"))
+        mock_provider.complete_json = AsyncMock(side_effect=Exception("LLM down"))
 
         with patch("app.api.clones.get_llm_provider", return_value=mock_provider):
             resp = await client.post(
@@ -146,7 +162,7 @@ class TestGetDNAEndpoint:
         clone_id = await _create_clone_with_samples(client)
 
         mock_provider = AsyncMock()
-        mock_provider.complete = AsyncMock(return_value=MOCK_DNA_RESPONSE)
+        mock_provider.complete_json = AsyncMock(side_effect=_json_reply(MOCK_DNA_RESPONSE))
 
         with patch("app.api.clones.get_llm_provider", return_value=mock_provider):
             await client.post(
@@ -173,7 +189,7 @@ class TestListDNAVersionsEndpoint:
         clone_id = await _create_clone_with_samples(client)
 
         mock_provider = AsyncMock()
-        mock_provider.complete = AsyncMock(return_value=MOCK_DNA_RESPONSE)
+        mock_provider.complete_json = AsyncMock(side_effect=_json_reply(MOCK_DNA_RESPONSE))
 
         with patch("app.api.clones.get_llm_provider", return_value=mock_provider):
             await client.post(
@@ -208,7 +224,7 @@ class TestDNAPromptEndpoint:
         clone_id = await _create_clone_with_samples(client)
 
         mock_provider = AsyncMock()
-        mock_provider.complete = AsyncMock(return_value=MOCK_DNA_RESPONSE)
+        mock_provider.complete_json = AsyncMock(side_effect=_json_reply(MOCK_DNA_RESPONSE))
 
         with patch("app.api.clones.get_llm_provider", return_value=mock_provider):
             await client.post(
@@ -239,7 +255,7 @@ class TestManualEditEndpoint:
 
         # First, create initial DNA via analyze
         mock_provider = AsyncMock()
-        mock_provider.complete = AsyncMock(return_value=MOCK_DNA_RESPONSE)
+        mock_provider.complete_json = AsyncMock(side_effect=_json_reply(MOCK_DNA_RESPONSE))
         with patch("app.api.clones.get_llm_provider", return_value=mock_provider):
             await client.post(
                 f"/api/clones/{clone_id}/analyze",
@@ -280,7 +296,7 @@ class TestRevertEndpoint:
         clone_id = await _create_clone_with_samples(client)
 
         mock_provider = AsyncMock()
-        mock_provider.complete = AsyncMock(return_value=MOCK_DNA_RESPONSE)
+        mock_provider.complete_json = AsyncMock(side_effect=_json_reply(MOCK_DNA_RESPONSE))
         with patch("app.api.clones.get_llm_provider", return_value=mock_provider):
             await client.post(
                 f"/api/clones/{clone_id}/analyze",
@@ -303,7 +319,7 @@ class TestRevertEndpoint:
         clone_id = await _create_clone_with_samples(client)
 
         mock_provider = AsyncMock()
-        mock_provider.complete = AsyncMock(return_value=MOCK_DNA_RESPONSE)
+        mock_provider.complete_json = AsyncMock(side_effect=_json_reply(MOCK_DNA_RESPONSE))
         with patch("app.api.clones.get_llm_provider", return_value=mock_provider):
             await client.post(
                 f"/api/clones/{clone_id}/analyze",
@@ -1,15 +1,30 @@
 """Integration tests for merge endpoint via HTTP client."""
 
 import json
+from typing import Any
 from unittest.mock import AsyncMock, patch
 
 from httpx import AsyncClient
+from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.llm.structured import parse_json_response
 from app.models.clone import VoiceClone
 from app.models.dna import VoiceDNAVersion
 from app.models.sample import WritingSample
 
+
+def _json_reply(raw: str) -> Any:
+    """side_effect for a mocked complete_json that validates ``raw`` like a real provider."""
+
+    async def complete_json(
+        messages: list[dict[str, str]], *, schema: type[BaseModel], **kwargs: Any
+    ) -> BaseModel:
+        return parse_json_response(raw, schema)
+
+    return complete_json
+
+
 MOCK_MERGE_RESPONSE = json.dumps(
     {
         "dna": {
@@ -57,7 +72,7 @@ async def test_merge_endpoint_creates_merged_clone(
     clone_b = await _create_source_clone(session, name="Clone B")
 
     mock_provider = AsyncMock()
-    mock_provider.complete = AsyncMock(return_value=MOCK_MERGE_RESPONSE)
+    mock_provider.complete_json = AsyncMock(side_effect=_json_reply(MOCK_MERGE_RESPONSE))
 
     with patch("app.api.clones.get_llm_provider", return_value=mock_provider):
         response = await client.post(
@@ -105,7 +120,7 @@ async def test_merge_endpoint_missing_dna_returns_400(
     await session.commit()
 
     mock_provider = AsyncMock()
-    mock_provider.complete = AsyncMock(return_value=MOCK_MERGE_RESPONSE)
+    mock_provider.complete_json = AsyncMock(side_effect=_json_reply(MOCK_MERGE_RESPONSE))
 
     with patch("app.api.clones.get_llm_provider", return_value=mock_provider):
         response = await client.post(
@@ -113,6 +113,7 @@ class TestRevert:
         )
         session.add(v2)
         seed.current_content = "Version 2 content"
+        seed.latest_version = 2
         await session.commit()
 
         resp = await client.post("/api/methodology/voice_cloning/revert/1")
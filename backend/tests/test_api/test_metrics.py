@@ -0,0 +1,90 @@
+"""Tests for operational metrics API routes."""
+
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+
+from httpx import AsyncClient
+
+from app.config import Settings
+from app.main import app
+from app.schemas.provider import LLMCallSummaryResponse
+from app.services.provider_service import ProviderService
+
+
+def _override_service(tmp_path: Path) -> ProviderService:
+    from app.api.providers import get_provider_service
+
+    service = ProviderService(
+        settings=Settings(database_url="sqlite+aiosqlite://"), env_path=tmp_path / ".env"
+    )
+    app.dependency_overrides[get_provider_service] = lambda: service
+    return service
+
+
+async def test_get_llm_metrics_returns_summaries(client: AsyncClient, tmp_path: Path) -> None:
+    service = _override_service(tmp_path)
+    summary = LLMCallSummaryResponse(
+        operation="generation",
+        provider="openai",
+        model="gpt-4o",
+        calls=3,
+        errors=0,
+        retries=1,
+        input_tokens=3000,
+        output_tokens=900,
+        cached_input_tokens=1024,
+        avg_latency_seconds=2.5,
+        max_latency_seconds=4.0,
+        avg_ttft_seconds=None,
+        cost_usd=0.0152,
+    )
+
+    with patch.object(
+        service, "llm_call_summary", new_callable=AsyncMock, return_value=[summary]
+    ) as mock_summary:
+        response = await client.get(
+            "/api/metrics/llm", params={"since": "2026-01-01T00:00:00Z", "clone_id": "c1"}
+        )
+
+    assert response.status_code == 200
+    assert response.json() == [summary.model_dump()]
+    kwargs = mock_summary.call_args.kwargs
+    assert kwargs["clone_id"] == "c1"
+    assert kwargs["since"].year == 2026
+
+
+async def test_get_llm_metrics_without_ledger_is_empty(client: AsyncClient, tmp_path: Path) -> None:
+    _override_service(tmp_path)
+
+    response = await client.get("/api/metrics/llm")
+
+    assert response.status_code == 200
+    assert response.json() == []
+
+
+# --- GET /metrics ---
+
+
+async def test_prometheus_metrics_record_route_templates(client: AsyncClient) -> None:
+    from app.metrics import HTTP_LATENCY, HTTP_REQUESTS
+
+    before = HTTP_REQUESTS.value("GET", "/api/clones/{clone_id}", "404")
+    await client.get("/api/clones/does-not-exist")
+
+    response = await client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert HTTP_REQUESTS.value("GET", "/api/clones/{clone_id}", "404") == before + 1
+    assert HTTP_LATENCY.count("GET", "/api/clones/{clone_id}") >= 1
+    assert "# TYPE sona_http_request_duration_seconds histogram" in response.text
+    assert 'route="/api/clones/{clone_id}"' in response.text
+
+
+async def test_prometheus_metrics_collapse_unknown_paths(client: AsyncClient) -> None:
+    from app.metrics import HTTP_REQUESTS, UNMATCHED_ROUTE
+
+    before = HTTP_REQUESTS.value("GET", UNMATCHED_ROUTE, "404")
+    await client.get("/no/such/path/12345")
+
+    assert HTTP_REQUESTS.value("GET", UNMATCHED_ROUTE, "404") == before + 1
@@ -102,3 +102,11 @@ async def test_put_default_provider(client: AsyncClient, tmp_path: Path) -> None
     assert response.status_code == 200
     data = response.json()
     assert data["name"] == "anthropic"
+
+
+async def test_get_rate_limits_returns_list(client: AsyncClient, tmp_path: Path) -> None:
+    _override_service(_make_service(tmp_path))
+
+    response = await client.get("/api/providers/limits")
+    assert response.status_code == 200
+    assert response.json() == []
@@ -0,0 +1,39 @@
+"""Tests for the full-text search endpoint."""
+
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.clone import VoiceClone
+from app.models.sample import WritingSample
+
+
+async def test_search_returns_hits_per_kind(client: AsyncClient, session: AsyncSession) -> None:
+    """GET /api/search?q=... should return ranked hits with snippets."""
+    clone = VoiceClone(name="Founder Voice", description="Essays on hiring")
+    session.add(clone)
+    await session.flush()
+    session.add(
+        WritingSample(
+            clone_id=clone.id,
+            content="Hiring slowly is a feature.",
+            content_type="blog_post",
+            word_count=5,
+            source_type="paste",
+        )
+    )
+    await session.commit()
+
+    response = await client.get("/api/search", params={"q": "hiring"})
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["content"] == []
+    assert data["samples"][0]["snippet"] == "<mark>Hiring</mark> slowly is a feature."
+    assert data["clones"][0]["id"] == clone.id
+
+
+async def test_search_requires_query(client: AsyncClient) -> None:
+    """GET /api/search without q should be rejected."""
+    response = await client.get("/api/search")
+
+    assert response.status_code == 422
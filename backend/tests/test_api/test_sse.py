@@ -0,0 +1,126 @@
+"""Tests for SSE framing, delta coalescing and heartbeats."""
+
+import asyncio
+import json
+from collections.abc import AsyncIterator
+
+import pytest
+
+from app.api.sse import DONE, HEARTBEAT, SSEEvent, frame, sse_frames, text_frame
+
+
+async def _source(*items: SSEEvent | float) -> AsyncIterator[SSEEvent]:
+    """Yield events, sleeping for any float in the sequence."""
+    for item in items:
+        if isinstance(item, float):
+            await asyncio.sleep(item)
+        else:
+            yield item
+
+
+async def _collect(
+    events: AsyncIterator[SSEEvent],
+    *,
+    flush_seconds: float = 0.05,
+    flush_bytes: int = 4096,
+    heartbeat_seconds: float = 0,
+) -> list[str]:
+    return [
+        chunk
+        async for chunk in sse_frames(
+            events,
+            flush_seconds=flush_seconds,
+            flush_bytes=flush_bytes,
+            heartbeat_seconds=heartbeat_seconds,
+        )
+    ]
+
+
+def test_frame_escapes_newlines_in_payload() -> None:
+    encoded = frame("delta", {"text": "line one\n\nline two"})
+
+    assert encoded == 'event: delta\ndata: {"text": "line one\\n\\nline two"}\n\n'
+
+
+def test_text_frame_splits_lines_into_data_lines() -> None:
+    assert text_frame(None, " world") == "data:  world\n\n"
+    assert text_frame("delta", "one\r\ntwo\n") == "event: delta\ndata: one\ndata: two\ndata: \n\n"
+
+
+async def test_plain_text_deltas_merge_into_a_text_frame() -> None:
+    events = _source(
+        SSEEvent({}, text="Hello ", text_field=None),
+        SSEEvent({}, text="world", text_field=None),
+        SSEEvent({"platform": "blog"}, event="delta", text="Hi", text_field="delta"),
+    )
+
+    chunks = await _collect(events)
+
+    assert chunks == [
+        "data: Hello world\n\n" + frame("delta", {"platform": "blog", "delta": "Hi"}),
+        DONE,
+    ]
+
+
+async def test_deltas_within_window_merge_per_tag_set() -> None:
+    a, b = {"platform": "blog"}, {"platform": "email"}
+    events = _source(
+        SSEEvent(a, event="delta", text="Hel"),
+        SSEEvent(b, event="delta", text="Dear"),
+        SSEEvent(a, event="delta", text="lo"),
+        SSEEvent(b, event="delta", text=" team"),
+    )
+
+    chunks = await _collect(events)
+
+    assert chunks == [
+        frame("delta", {"platform": "blog", "text": "Hello"})
+        + frame("delta", {"platform": "email", "text": "Dear team"}),
+        DONE,
+    ]
+
+
+async def test_other_events_flush_pending_deltas_first() -> None:
+    events = _source(
+        SSEEvent({}, text="draft"),
+        SSEEvent({"content_id": "abc"}, event="saved"),
+    )
+
+    chunks = await _collect(events, flush_seconds=10)
+
+    assert chunks == [
+        frame(None, {"text": "draft"}),
+        frame("saved", {"content_id": "abc"}),
+        DONE,
+    ]
+
+
+async def test_flushes_on_byte_and_time_windows() -> None:
+    by_bytes = await _collect(
+        _source(*(SSEEvent({}, text="abcd") for _ in range(4))), flush_seconds=10, flush_bytes=8
+    )
+    by_time = await _collect(
+        _source(SSEEvent({}, text="a"), 0.1, SSEEvent({}, text="b")), flush_seconds=0.02
+    )
+
+    assert by_bytes == [frame(None, {"text": "abcdabcd"})] * 2 + [DONE]
+    assert by_time == [frame(None, {"text": "a"}), frame(None, {"text": "b"}), DONE]
+
+
+async def test_sends_heartbeat_while_idle() -> None:
+    chunks = await _collect(_source(0.12, SSEEvent({}, event="done")), heartbeat_seconds=0.05)
+
+    assert chunks.count(HEARTBEAT) == 2
+    assert chunks[-2:] == [frame("done", {}), DONE]
+
+
+async def test_source_error_is_raised_after_pending_deltas() -> None:
+    async def failing() -> AsyncIterator[SSEEvent]:
+        yield SSEEvent({}, text="partial")
+        raise RuntimeError("upstream failed")
+
+    frames = sse_frames(failing(), flush_seconds=10, flush_bytes=4096, heartbeat_seconds=0)
+
+    assert json.loads((await anext(frames)).removeprefix("data: ")) == {"text": "partial"}
+    with pytest.raises(RuntimeError, match="upstream failed"):
+        await anext(frames)
@@ -0,0 +1,87 @@
+"""Tests for the benchmark harness statistics and baseline comparison."""
+
+from pathlib import Path
+
+import pytest
+
+from benchmarks.harness import (
+    Measurement,
+    compare,
+    load_results,
+    measure,
+    percentile,
+    write_results,
+)
+
+
+def _measurement(**overrides: float) -> Measurement:
+    values = {"p50_ms": 10.0, "p95_ms": 20.0, "p99_ms": 30.0, "throughput_rps": 100.0}
+    values.update(overrides)
+    return Measurement(
+        name="case",
+        iterations=10,
+        concurrency=1,
+        errors=0,
+        mean_ms=values["p50_ms"],
+        max_ms=values["p99_ms"],
+        **values,
+    )
+
+
+# --- statistics ---
+
+
+def test_percentile_interpolates_between_ranks() -> None:
+    samples = [float(n) for n in range(1, 101)]
+
+    assert percentile(samples, 50) == pytest.approx(50.5)
+    assert percentile(samples, 99) == pytest.approx(99.01)
+    assert percentile([], 95) == 0.0
+
+
+async def test_measure_counts_errors_and_uses_returned_samples() -> None:
+    calls = 0
+
+    async def call() -> float:
+        nonlocal calls
+        calls += 1
+        if calls % 5 == 0:
+            raise RuntimeError("boom")
+        return 0.002
+
+    result = await measure("case", call, iterations=20, concurrency=4, warmup=0)
+
+    assert (result.iterations, result.errors) == (20, 4)
+    assert result.p50_ms == pytest.approx(2.0)
+    assert result.throughput_rps > 0
+
+
+# --- baseline comparison ---
+
+
+def test_compare_flags_latency_growth_and_throughput_drop() -> None:
+    baseline = {"case": _measurement()}
+    current = [_measurement(p95_ms=30.0, throughput_rps=70.0)]
+
+    regressions = compare(current, baseline, threshold=0.2)
+
+    assert [(r.metric, round(r.change, 2)) for r in regressions] == [
+        ("p95_ms", 0.5),
+        ("throughput_rps", -0.3),
+    ]
+
+
+def test_compare_ignores_changes_within_threshold_and_new_scenarios() -> None:
+    baseline = {"case": _measurement()}
+
+    assert compare([_measurement(p99_ms=33.0)], baseline, threshold=0.2) == []
+    assert compare([_measurement()], {}, threshold=0.2) == []
+
+
+def test_results_round_trip_through_json(tmp_path: Path) -> None:
+    path = tmp_path / "bench.json"
+    measurement = _measurement()
+
+    write_results(path, [measurement], {"scale": "quick"})
+
+    assert load_results(path) == {"case": measurement}
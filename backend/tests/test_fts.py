@@ -0,0 +1,80 @@
+"""Tests for keeping the FTS5 search indexes in step with renumbered rowids."""
+
+from pathlib import Path
+
+from alembic.config import Config
+from sqlalchemy import Connection, create_engine
+from sqlalchemy import text as sql
+
+from alembic import command
+from app.fts import CLONES_FTS, rebuild_search_indexes
+
+BACKEND = Path(__file__).resolve().parent.parent
+
+
+def _insert_clone(connection: Connection, clone_id: str, name: str) -> None:
+    connection.execute(
+        sql(
+            "INSERT INTO voice_clones (id, name, tags, type, is_demo, is_hidden, created_at,"
+            " updated_at) VALUES (:id, :name, '[]', 'original', 0, 0, '2026-01-01', '2026-01-01')"
+        ),
+        {"id": clone_id, "name": name},
+    )
+
+
+def _renumber_rowids(connection: Connection) -> None:
+    """Shift every clone's rowid, as a VACUUM or table rebuild may do."""
+    connection.execute(sql("UPDATE voice_clones SET rowid = rowid + 100"))
+
+
+def _matching_ids(connection: Connection, word: str) -> list[str]:
+    rows = connection.execute(
+        sql(
+            f"SELECT voice_clones.id FROM voice_clones JOIN {CLONES_FTS.name}"
+            f" ON {CLONES_FTS.name}.rowid = voice_clones.rowid"
+            f" WHERE {CLONES_FTS.name} MATCH :word"
+        ),
+        {"word": word},
+    )
+    return [row.id for row in rows]
+
+
+def _alembic_config(db_path: Path) -> Config:
+    # No ini file, so env.py leaves the test run's logging configuration alone.
+    config = Config()
+    config.set_main_option("script_location", str(BACKEND / "alembic"))
+    config.set_main_option("sqlalchemy.url", f"sqlite+aiosqlite:///{db_path}")
+    return config
+
+
+def test_rebuild_repairs_renumbered_rowids(tmp_path: Path) -> None:
+    config = _alembic_config(tmp_path / "sona.db")
+    command.upgrade(config, "head")
+    engine = create_engine(f"sqlite:///{tmp_path / 'sona.db'}")
+
+    with engine.begin() as connection:
+        _insert_clone(connection, "clone-a", "Marketing Voice")
+        _renumber_rowids(connection)
+        assert _matching_ids(connection, "marketing") == []
+
+        rebuild_search_indexes(connection)
+
+        assert _matching_ids(connection, "marketing") == ["clone-a"]
+    engine.dispose()
+
+
+def test_migration_run_rebuilds_search_indexes(tmp_path: Path) -> None:
+    """Applying any revision re-derives the indexes from the source tables."""
+    config = _alembic_config(tmp_path / "sona.db")
+    command.upgrade(config, "head")
+    command.downgrade(config, "-1")
+    engine = create_engine(f"sqlite:///{tmp_path / 'sona.db'}")
+    with engine.begin() as connection:
+        _insert_clone(connection, "clone-a", "Marketing Voice")
+        _renumber_rowids(connection)
+
+    command.upgrade(config, "head")
+
+    with engine.connect() as connection:
+        assert _matching_ids(connection, "marketing") == ["clone-a"]
+    engine.dispose()
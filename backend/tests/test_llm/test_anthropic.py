@@ -3,11 +3,15 @@
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import anthropic
+import httpx
 import pytest
-from anthropic.types import TextBlock, TextDelta
+from anthropic.types import TextBlock, TextDelta, ToolUseBlock, Usage
+from pydantic import BaseModel
 
-from app.exceptions import LLMAuthError, LLMRateLimitError
+from app.exceptions import LLMAuthError, LLMNetworkError, LLMRateLimitError
 from app.llm.anthropic import AnthropicProvider
+from app.llm.base import CACHE_CONTROL
+from app.llm.usage import PromptCacheUsage, capture_usage
 
 
 @pytest.fixture
@@ -25,6 +29,22 @@ def _text_block(text: str) -> TextBlock:
     return TextBlock(type="text", text=text)
 
 
+def _status_error(error_type: type[anthropic.APIStatusError], status: int) -> Exception:
+    response = httpx.Response(
+        status, request=httpx.Request("POST", "https://api.anthropic.com/v1/messages")
+    )
+    return error_type(message="Server error", response=response, body=None)
+
+
+TRANSIENT_ERRORS = [
+    anthropic.APIConnectionError(request=MagicMock()),
+    anthropic.APITimeoutError(request=MagicMock()),
+    _status_error(anthropic.InternalServerError, 500),
+    _status_error(anthropic.InternalServerError, 503),
+    _status_error(anthropic.APIStatusError, 529),
+]
+
+
 class TestComplete:
     async def test_returns_response_text(self, provider: AnthropicProvider) -> None:
         """complete() calls messages.create and returns text content."""
@@ -108,6 +128,115 @@ class TestComplete:
         ):
             await provider.complete(MESSAGES)
 
+    @pytest.mark.parametrize("error", TRANSIENT_ERRORS)
+    async def test_transient_errors_map_to_llm_network_error(
+        self, provider: AnthropicProvider, error: Exception
+    ) -> None:
+        """Connection failures, timeouts, 5xx and 529 overloaded are retryable."""
+        with (
+            patch.object(
+                provider._client.messages, "create", new_callable=AsyncMock, side_effect=error
+            ),
+            pytest.raises(LLMNetworkError),
+        ):
+            await provider.complete(MESSAGES)
+
+    async def test_client_error_is_not_mapped(self, provider: AnthropicProvider) -> None:
+        """A 400 is the caller's fault and must not be retried as a network error."""
+        error = _status_error(anthropic.BadRequestError, 400)
+
+        with (
+            patch.object(
+                provider._client.messages, "create", new_callable=AsyncMock, side_effect=error
+            ),
+            pytest.raises(anthropic.BadRequestError),
+        ):
+            await provider.complete(MESSAGES)
+
+
+class TestCompleteJson:
+    async def test_forces_schema_tool_and_validates_input(
+        self, provider: AnthropicProvider
+    ) -> None:
+        """complete_json() forces a tool call shaped by the schema and validates its input."""
+
+        class Verdict(BaseModel):
+            label: str
+
+        mock_response = MagicMock()
+        mock_response.content = [
+            ToolUseBlock(type="tool_use", id="tu_1", name="respond", input={"label": "human"})
+        ]
+
+        with patch.object(
+            provider._client.messages,
+            "create",
+            new_callable=AsyncMock,
+            return_value=mock_response,
+        ) as mock_create:
+            result = await provider.complete_json(MESSAGES, schema=Verdict)
+
+        assert result == Verdict(label="human")
+        call_kwargs = mock_create.call_args.kwargs
+        assert call_kwargs["tools"][0]["input_schema"] == Verdict.model_json_schema()
+        assert call_kwargs["tool_choice"] == {"type": "tool", "name": "respond"}
+
+
+class TestPromptCaching:
+    async def test_cache_marked_system_message_gets_breakpoint(
+        self, provider: AnthropicProvider
+    ) -> None:
+        """Each system message becomes a block; the marked prefix is cache-controlled."""
+        mock_response = MagicMock()
+        mock_response.content = [_text_block("ok")]
+        messages = [
+            {"role": "system", "content": "Voice DNA", CACHE_CONTROL: "ephemeral"},
+            {"role": "system", "content": "Target platform: blog."},
+            *MESSAGES,
+        ]
+
+        with patch.object(
+            provider._client.messages,
+            "create",
+            new_callable=AsyncMock,
+            return_value=mock_response,
+        ) as mock_create:
+            await provider.complete(messages)
+
+        call_kwargs = mock_create.call_args.kwargs
+        assert call_kwargs["system"] == [
+            {"type": "text", "text": "Voice DNA", "cache_control": {"type": "ephemeral"}},
+            {"type": "text", "text": "Target platform: blog."},
+        ]
+        assert call_kwargs["messages"] == MESSAGES
+
+    async def test_records_cache_read_and_write_tokens(self) -> None:
+        """Cache reads and writes count toward the full prompt size."""
+        usage = PromptCacheUsage()
+        provider = AnthropicProvider(api_key="sk-ant-test-key", usage=usage)
+        mock_response = MagicMock()
+        mock_response.content = [_text_block("ok")]
+        mock_response.usage = Usage(
+            input_tokens=100,
+            output_tokens=5,
+            cache_read_input_tokens=1800,
+            cache_creation_input_tokens=100,
+        )
+
+        with patch.object(
+            provider._client.messages,
+            "create",
+            new_callable=AsyncMock,
+            return_value=mock_response,
+        ):
+            await provider.complete(MESSAGES)
+
+        [stats] = usage.stats()
+        assert stats.input_tokens == 2000
+        assert stats.cached_input_tokens == 1800
+        assert stats.cache_write_tokens == 100
+        assert stats.hit_rate == 0.9
+
 
 class TestStream:
     async def test_yields_chunks(self, provider: AnthropicProvider) -> None:
@@ -143,6 +272,50 @@ class TestStream:
 
         assert chunks == ["Hello ", "world"]
 
+    async def test_reports_usage_from_start_and_delta_events(
+        self, provider: AnthropicProvider
+    ) -> None:
+        """Input comes from message_start; the final output count from message_delta."""
+        start = MagicMock()
+        start.type = "message_start"
+        start.message.usage = Usage(input_tokens=40, output_tokens=1)
+        text = MagicMock()
+        text.type = "content_block_delta"
+        text.delta = TextDelta(type="text_delta", text="Hi")
+        delta = MagicMock()
+        delta.type = "message_delta"
+        delta.usage.output_tokens = 25
+
+        async def mock_stream_events():
+            for event in [start, text, delta]:
+                yield event
+
+        mock_stream = MagicMock()
+        mock_stream.__aiter__ = lambda self: mock_stream_events()
+        mock_stream.__aenter__ = AsyncMock(return_value=mock_stream)
+        mock_stream.__aexit__ = AsyncMock(return_value=False)
+
+        with (
+            patch.object(provider._client.messages, "stream", return_value=mock_stream),
+            capture_usage() as call_usage,
+        ):
+            chunks = [chunk async for chunk in provider.stream(MESSAGES)]
+
+        assert chunks == ["Hi"]
+        assert (call_usage.input_tokens, call_usage.output_tokens) == (40, 25)
+
+    @pytest.mark.parametrize("error", TRANSIENT_ERRORS)
+    async def test_transient_errors_map_to_llm_network_error(
+        self, provider: AnthropicProvider, error: Exception
+    ) -> None:
+        """stream() maps the same transient errors as complete()."""
+        with (
+            patch.object(provider._client.messages, "stream", side_effect=error),
+            pytest.raises(LLMNetworkError),
+        ):
+            async for _ in provider.stream(MESSAGES):
+                pass
+
 
 class TestTestConnection:
     async def test_returns_true_on_success(self, provider: AnthropicProvider) -> None:
@@ -174,8 +347,12 @@ class TestTestConnection:
 
 
 class TestCountTokens:
-    async def test_approximate_count(self, provider: AnthropicProvider) -> None:
-        """count_tokens() returns approximate count (1 token ~ 4 chars)."""
-        result = await provider.count_tokens("Hello world! This is a test.")
-        # 28 chars / 4 = 7
-        assert result == 7
+    async def test_uses_offline_tokenizer(self, provider: AnthropicProvider) -> None:
+        """count_tokens() delegates to the shared tokenizer for the default model."""
+        from app.llm.tokenizer import count_tokens
+
+        text = "Hello world! This is a test."
+        result = await provider.count_tokens(text)
+
+        assert result == count_tokens(text, "claude-sonnet-4-5-20250929")
+        assert result > 0
@@ -0,0 +1,193 @@
+"""Tests for the two-tier completion cache and CachedProvider wrapper."""
+
+from collections.abc import AsyncGenerator
+from pathlib import Path
+from unittest.mock import AsyncMock
+
+import pytest
+from pydantic import BaseModel
+
+from app.llm.cache import CachedProvider, CompletionCache, bypass_cache, cache_key
+from app.llm.singleflight import SingleFlightProvider
+
+_MESSAGES = [
+    {"role": "system", "content": "You are a scorer."},
+    {"role": "user", "content": "Score this."},
+]
+
+
+@pytest.fixture
+async def cache(tmp_path: Path) -> AsyncGenerator[CompletionCache]:
+    cache = CompletionCache(tmp_path / "cache.db", ttl_seconds=3600, max_entries=100)
+    yield cache
+    await cache.aclose()
+
+
+class _Score(BaseModel):
+    score: int
+
+
+def _make_provider(response: str = "cached result") -> AsyncMock:
+    provider = AsyncMock()
+    provider.complete.return_value = response
+    return provider
+
+
+# --- cache_key ---
+
+
+def test_cache_key_is_stable_across_whitespace() -> None:
+    padded = [{"role": m["role"], "content": f"  {m['content']}\n"} for m in _MESSAGES]
+    key_a = cache_key(
+        provider="openai", model="gpt-4o", temperature=0.3, max_tokens=4096, messages=_MESSAGES
+    )
+    key_b = cache_key(
+        provider="openai", model="gpt-4o", temperature=0.3, max_tokens=4096, messages=padded
+    )
+    assert key_a == key_b
+
+
+def test_cache_key_varies_by_model_and_temperature() -> None:
+    base = cache_key(
+        provider="openai", model="gpt-4o", temperature=0.3, max_tokens=4096, messages=_MESSAGES
+    )
+    other_model = cache_key(
+        provider="openai", model="gpt-4o-mini", temperature=0.3, max_tokens=4096, messages=_MESSAGES
+    )
+    other_temp = cache_key(
+        provider="openai", model="gpt-4o", temperature=0.0, max_tokens=4096, messages=_MESSAGES
+    )
+    assert len({base, other_model, other_temp}) == 3
+
+
+# --- CompletionCache ---
+
+
+async def test_cache_miss_then_hit(cache: CompletionCache) -> None:
+    assert await cache.get("k") is None
+    await cache.set("k", "value")
+    assert await cache.get("k") == "value"
+
+    stats = cache.stats()
+    assert stats.misses == 1
+    assert stats.hits == 1
+    assert stats.memory_hits == 1
+
+
+async def test_cache_persists_across_instances(tmp_path: Path) -> None:
+    first = CompletionCache(tmp_path / "cache.db", ttl_seconds=3600, max_entries=100)
+    await first.set("k", "persisted")
+    await first.aclose()
+
+    second = CompletionCache(tmp_path / "cache.db", ttl_seconds=3600, max_entries=100)
+    try:
+        assert await second.get("k") == "persisted"
+        assert second.stats().memory_hits == 0
+    finally:
+        await second.aclose()
+
+
+async def test_cache_expires_after_ttl(tmp_path: Path) -> None:
+    cache = CompletionCache(tmp_path / "cache.db", ttl_seconds=0, max_entries=100)
+    try:
+        await cache.set("k", "stale")
+        assert await cache.get("k") is None
+    finally:
+        await cache.aclose()
+
+
+async def test_cache_evicts_least_recently_used_rows(tmp_path: Path) -> None:
+    cache = CompletionCache(
+        tmp_path / "cache.db", ttl_seconds=3600, max_entries=2, memory_entries=1
+    )
+    try:
+        await cache.set("a", "1")
+        await cache.set("b", "2")
+        await cache.set("c", "3")
+
+        assert await cache.get("a") is None
+        assert await cache.get("b") == "2"
+        assert await cache.get("c") == "3"
+    finally:
+        await cache.aclose()
+
+
+# --- CachedProvider ---
+
+
+async def test_cached_provider_serves_repeat_calls_from_cache(cache: CompletionCache) -> None:
+    inner = _make_provider()
+    provider = CachedProvider(inner, cache, provider_name="openai", default_model="gpt-4o")
+
+    first = await provider.complete(_MESSAGES, temperature=0.3)
+    second = await provider.complete(_MESSAGES, temperature=0.3)
+
+    assert first == second == "cached result"
+    inner.complete.assert_awaited_once()
+
+
+async def test_cached_provider_skips_high_temperature_calls(cache: CompletionCache) -> None:
+    inner = _make_provider()
+    provider = CachedProvider(inner, cache, provider_name="openai", default_model="gpt-4o")
+
+    await provider.complete(_MESSAGES, temperature=0.7)
+    await provider.complete(_MESSAGES, temperature=0.7)
+
+    assert inner.complete.await_count == 2
+    assert cache.stats().misses == 0
+
+
+async def test_bypass_cache_skips_lookup_and_store(cache: CompletionCache) -> None:
+    inner = _make_provider()
+    inner.complete_json.return_value = _Score(score=7)
+    provider = CachedProvider(inner, cache, provider_name="openai", default_model="gpt-4o")
+
+    await provider.complete(_MESSAGES, temperature=0.3)
+    with bypass_cache():
+        await provider.complete(_MESSAGES, temperature=0.3)
+        await provider.complete_json(_MESSAGES, schema=_Score, temperature=0.3)
+    await provider.complete_json(_MESSAGES, schema=_Score, temperature=0.3)
+
+    assert inner.complete.await_count == 2
+    # The bypassed structured call stored nothing, so the next one misses.
+    assert inner.complete_json.await_count == 2
+
+
+async def test_bypass_cache_reaches_through_outer_wrappers(cache: CompletionCache) -> None:
+    inner = _make_provider()
+    provider = SingleFlightProvider(
+        CachedProvider(inner, cache, provider_name="openai", default_model="gpt-4o"),
+        provider_name="openai",
+        default_model="gpt-4o",
+    )
+
+    await provider.complete(_MESSAGES, temperature=0.3)
+    with bypass_cache():
+        await provider.complete(_MESSAGES, temperature=0.3)
+
+    assert inner.complete.await_count == 2
+
+
+async def test_cached_provider_default_model_shares_entry(cache: CompletionCache) -> None:
+    inner = _make_provider()
+    provider = CachedProvider(inner, cache, provider_name="openai", default_model="gpt-4o")
+
+    await provider.complete(_MESSAGES, temperature=0.3)
+    await provider.complete(_MESSAGES, model="gpt-4o", temperature=0.3)
+
+    inner.complete.assert_awaited_once()
+
+
+async def test_cached_provider_caches_structured_results(cache: CompletionCache) -> None:
+    inner = _make_provider()
+    inner.complete_json.return_value = _Score(score=7)
+    provider = CachedProvider(inner, cache, provider_name="openai", default_model="gpt-4o")
+
+    first = await provider.complete_json(_MESSAGES, schema=_Score, temperature=0.3)
+    second = await provider.complete_json(_MESSAGES, schema=_Score, temperature=0.3)
+    await provider.complete(_MESSAGES, temperature=0.3)
+
+    assert first == second == _Score(score=7)
+    inner.complete_json.assert_awaited_once()
+    # Plain and structured calls with the same prompt do not share an entry.
+    inner.complete.assert_awaited_once()
@@ -0,0 +1,192 @@
+"""Tests for the per-provider circuit breaker."""
+
+from collections.abc import AsyncIterator
+from unittest.mock import patch
+
+import pytest
+
+from app.exceptions import LLMAuthError, LLMNetworkError, ProviderUnavailableError
+from app.llm.circuit import CircuitBreaker, CircuitBreakerProvider, CircuitState
+
+_MESSAGES = [{"role": "user", "content": "Hi"}]
+
+
+class FlakyProvider:
+    """Fake provider that raises ``error`` while it is set."""
+
+    def __init__(self) -> None:
+        self.error: Exception | None = None
+        self.calls = 0
+
+    async def complete(
+        self,
+        messages: list[dict[str, str]],
+        *,
+        model: str | None = None,
+        temperature: float = 0.7,
+        max_tokens: int = 4096,
+    ) -> str:
+        self.calls += 1
+        if self.error is not None:
+            raise self.error
+        return "ok"
+
+    async def stream(
+        self,
+        messages: list[dict[str, str]],
+        *,
+        model: str | None = None,
+        temperature: float = 0.7,
+        max_tokens: int = 4096,
+    ) -> AsyncIterator[str]:
+        self.calls += 1
+        if self.error is not None:
+            raise self.error
+        yield "ok"
+
+    async def count_tokens(self, text: str) -> int:
+        return len(text) // 4
+
+    async def test_connection(self) -> bool:
+        return self.error is None
+
+
+def _breaker(**overrides: float) -> CircuitBreaker:
+    options: dict[str, float] = {
+        "failure_threshold": 3,
+        "error_rate": 0.5,
+        "window": 10,
+        "min_calls": 4,
+        "reset_seconds": 30.0,
+    }
+    options.update(overrides)
+    return CircuitBreaker("openai", **options)  # type: ignore[arg-type]
+
+
+async def _fail(provider: CircuitBreakerProvider, times: int) -> None:
+    for _ in range(times):
+        with pytest.raises(LLMNetworkError):
+            await provider.complete(_MESSAGES)
+
+
+# --- CircuitBreaker ---
+
+
+async def test_opens_after_consecutive_failures() -> None:
+    inner = FlakyProvider()
+    inner.error = LLMNetworkError(provider="openai")
+    breaker = _breaker()
+    provider = CircuitBreakerProvider(inner, breaker)
+
+    await _fail(provider, 3)
+
+    assert breaker.state is CircuitState.OPEN
+    with pytest.raises(ProviderUnavailableError):
+        await provider.complete(_MESSAGES)
+    assert inner.calls == 3
+
+
+def test_opens_on_error_rate_threshold() -> None:
+    breaker = _breaker(failure_threshold=100)
+
+    for _ in range(2):
+        breaker.record_success()
+        breaker.record_failure()
+
+    assert breaker.state is CircuitState.OPEN
+
+
+def test_success_resets_consecutive_failures() -> None:
+    breaker = _breaker(min_calls=100)
+
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+
+    assert breaker.state is CircuitState.CLOSED
+
+
+async def test_non_transient_errors_do_not_count() -> None:
+    inner = FlakyProvider()
+    inner.error = LLMAuthError(provider="openai")
+    breaker = _breaker()
+    provider = CircuitBreakerProvider(inner, breaker)
+
+    for _ in range(5):
+        with pytest.raises(LLMAuthError):
+            await provider.complete(_MESSAGES)
+
+    assert breaker.state is CircuitState.CLOSED
+
+
+async def test_half_open_probe_success_closes() -> None:
+    inner = FlakyProvider()
+    inner.error = LLMNetworkError(provider="openai")
+    breaker = _breaker()
+    provider = CircuitBreakerProvider(inner, breaker)
+    await _fail(provider, 3)
+
+    inner.error = None
+    with patch("app.llm.circuit.time.monotonic", return_value=10**9):
+        assert breaker.state is CircuitState.HALF_OPEN
+        assert await provider.complete(_MESSAGES) == "ok"
+
+    assert breaker.state is CircuitState.CLOSED
+
+
+async def test_half_open_probe_failure_reopens() -> None:
+    inner = FlakyProvider()
+    inner.error = LLMNetworkError(provider="openai")
+    breaker = _breaker()
+    provider = CircuitBreakerProvider(inner, breaker)
+    await _fail(provider, 3)
+
+    with patch("app.llm.circuit.time.monotonic", return_value=10**9):
+        await _fail(provider, 1)
+        assert breaker.state is CircuitState.OPEN
+
+
+def test_half_open_limits_concurrent_probes() -> None:
+    breaker = _breaker(failure_threshold=1, half_open_probes=1)
+    breaker.record_failure()
+
+    with patch("app.llm.circuit.time.monotonic", return_value=10**9):
+        assert breaker.acquire() is True
+        with pytest.raises(ProviderUnavailableError):
+            breaker.acquire()
+        breaker.release(probe=True)
+        assert breaker.acquire() is True
+
+
+async def test_stream_failures_count() -> None:
+    inner = FlakyProvider()
+    inner.error = LLMNetworkError(provider="openai")
+    breaker = _breaker(failure_threshold=1)
+    provider = CircuitBreakerProvider(inner, breaker)
+
+    with pytest.raises(LLMNetworkError):
+        _ = [chunk async for chunk in provider.stream(_MESSAGES)]
+
+    assert breaker.state is CircuitState.OPEN
+
+
+async def test_test_connection_bypasses_open_circuit() -> None:
+    inner = FlakyProvider()
+    breaker = _breaker(failure_threshold=1)
+    breaker.record_failure()
+    provider = CircuitBreakerProvider(inner, breaker)
+
+    assert await provider.test_connection() is True
+
+
+def test_snapshot_reports_retry_after_while_open() -> None:
+    breaker = _breaker(failure_threshold=1, reset_seconds=30.0)
+    breaker.record_failure()
+
+    snapshot = breaker.snapshot()
+
+    assert snapshot.state is CircuitState.OPEN
+    assert snapshot.consecutive_failures == 1
+    assert snapshot.retry_after is not None
+    assert 0 < snapshot.retry_after <= 30.0
@@ -0,0 +1,233 @@
+"""Tests for multi-provider failover and hedged requests."""
+
+import asyncio
+from collections.abc import AsyncIterator
+
+import pytest
+
+from app.exceptions import LLMAuthError, LLMNetworkError, LLMRateLimitError
+from app.llm.failover import FailoverProvider, FailoverTarget, LatencyTracker
+
+_MESSAGES = [{"role": "user", "content": "Write a post."}]
+
+
+class ScriptedProvider:
+    """Fake provider that answers after a delay, or raises a configured error."""
+
+    def __init__(self, name: str, *, delay: float = 0.0, error: Exception | None = None) -> None:
+        self.name = name
+        self.delay = delay
+        self.error = error
+        self.calls: list[str | None] = []
+        self.cancelled = False
+
+    async def complete(
+        self,
+        messages: list[dict[str, str]],
+        *,
+        model: str | None = None,
+        temperature: float = 0.7,
+        max_tokens: int = 4096,
+    ) -> str:
+        self.calls.append(model)
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        if self.error is not None:
+            raise self.error
+        return f"from {self.name}"
+
+    async def stream(
+        self,
+        messages: list[dict[str, str]],
+        *,
+        model: str | None = None,
+        temperature: float = 0.7,
+        max_tokens: int = 4096,
+    ) -> AsyncIterator[str]:
+        self.calls.append(model)
+        if self.error is not None:
+            raise self.error
+        yield f"from {self.name}"
+
+    async def count_tokens(self, text: str) -> int:
+        return len(text) // 4
+
+    async def test_connection(self) -> bool:
+        return True
+
+
+def _warm_tracker(latency: float, samples: int = 20) -> LatencyTracker:
+    tracker = LatencyTracker(min_samples=samples)
+    for _ in range(samples):
+        tracker.record(latency)
+    return tracker
+
+
+def _failover(*providers: ScriptedProvider, **kwargs: float | bool) -> FailoverProvider:
+    targets = [FailoverTarget(name=p.name, provider=p, latency=LatencyTracker()) for p in providers]
+    return FailoverProvider(targets, **kwargs)  # type: ignore[arg-type]
+
+
+# --- LatencyTracker ---
+
+
+def test_latency_tracker_needs_min_samples() -> None:
+    tracker = LatencyTracker(min_samples=3)
+    tracker.record(1.0)
+    tracker.record(2.0)
+
+    assert tracker.percentile(0.95) is None
+
+
+def test_latency_tracker_percentile() -> None:
+    tracker = LatencyTracker(min_samples=1)
+    for value in range(1, 101):
+        tracker.record(float(value))
+
+    assert tracker.percentile(0.5) == 50.0
+    assert tracker.percentile(0.95) == 95.0
+
+
+# --- failover ---
+
+
+async def test_primary_success_skips_backup() -> None:
+    primary, backup = ScriptedProvider("openai"), ScriptedProvider("anthropic")
+
+    result = await _failover(primary, backup).complete(_MESSAGES)
+
+    assert result == "from openai"
+    assert backup.calls == []
+
+
+@pytest.mark.parametrize(
+    "error", [LLMNetworkError(provider="openai"), LLMRateLimitError(provider="openai")]
+)
+async def test_fails_over_on_transient_errors(error: Exception) -> None:
+    primary = ScriptedProvider("openai", error=error)
+    backup = ScriptedProvider("anthropic")
+
+    result = await _failover(primary, backup).complete(_MESSAGES)
+
+    assert result == "from anthropic"
+
+
+async def test_does_not_fail_over_on_auth_error() -> None:
+    primary = ScriptedProvider("openai", error=LLMAuthError(provider="openai"))
+    backup = ScriptedProvider("anthropic")
+
+    with pytest.raises(LLMAuthError):
+        await _failover(primary, backup).complete(_MESSAGES)
+    assert backup.calls == []
+
+
+async def test_raises_last_error_when_all_targets_fail() -> None:
+    primary = ScriptedProvider("openai", error=LLMNetworkError(provider="openai"))
+    backup = ScriptedProvider("anthropic", error=LLMRateLimitError(provider="anthropic"))
+
+    with pytest.raises(LLMRateLimitError):
+        await _failover(primary, backup).complete(_MESSAGES)
+
+
+async def test_explicit_model_only_applies_to_primary() -> None:
+    primary = ScriptedProvider("openai", error=LLMNetworkError(provider="openai"))
+    backup = ScriptedProvider("anthropic")
+
+    await _failover(primary, backup).complete(_MESSAGES, model="gpt-4o-mini")
+
+    assert primary.calls == ["gpt-4o-mini"]
+    assert backup.calls == [None]
+
+
+async def test_fails_over_when_call_exceeds_latency_percentile() -> None:
+    primary = ScriptedProvider("openai", delay=1.0)
+    backup = ScriptedProvider("anthropic")
+    targets = [
+        FailoverTarget(name="openai", provider=primary, latency=_warm_tracker(0.01)),
+        FailoverTarget(name="anthropic", provider=backup, latency=LatencyTracker()),
+    ]
+
+    result = await FailoverProvider(targets, min_timeout=0.05).complete(_MESSAGES)
+
+    assert result == "from anthropic"
+    assert primary.cancelled
+
+
+async def test_successful_calls_record_latency() -> None:
+    primary = ScriptedProvider("openai")
+    tracker = LatencyTracker(min_samples=1)
+    provider = FailoverProvider([FailoverTarget(name="openai", provider=primary, latency=tracker)])
+
+    await provider.complete(_MESSAGES)
+
+    assert tracker.percentile(0.5) is not None
+
+
+async def test_stream_fails_over_before_first_chunk() -> None:
+    primary = ScriptedProvider("openai", error=LLMNetworkError(provider="openai"))
+    backup = ScriptedProvider("anthropic")
+
+    chunks = [c async for c in _failover(primary, backup).stream(_MESSAGES)]
+
+    assert chunks == ["from anthropic"]
+
+
+# --- hedging ---
+
+
+async def test_hedge_fires_after_percentile_delay_and_keeps_fastest() -> None:
+    primary = ScriptedProvider("openai", delay=1.0)
+    backup = ScriptedProvider("anthropic", delay=0.01)
+    targets = [
+        FailoverTarget(name="openai", provider=primary, latency=_warm_tracker(0.02)),
+        FailoverTarget(name="anthropic", provider=backup, latency=LatencyTracker()),
+    ]
+    provider = FailoverProvider(targets, min_timeout=5.0, hedge=True)
+
+    result = await provider.complete(_MESSAGES)
+    await asyncio.sleep(0)  # let the losing task observe its cancellation
+
+    assert result == "from anthropic"
+    assert primary.cancelled
+
+
+async def test_hedge_not_sent_when_primary_is_fast() -> None:
+    primary = ScriptedProvider("openai")
+    backup = ScriptedProvider("anthropic")
+    targets = [
+        FailoverTarget(name="openai", provider=primary, latency=_warm_tracker(0.5)),
+        FailoverTarget(name="anthropic", provider=backup, latency=LatencyTracker()),
+    ]
+
+    result = await FailoverProvider(targets, hedge=True).complete(_MESSAGES)
+
+    assert result == "from openai"
+    assert backup.calls == []
+
+
+async def test_hedge_falls_back_when_primary_fails_before_delay() -> None:
+    primary = ScriptedProvider("openai", error=LLMNetworkError(provider="openai"))
+    backup = ScriptedProvider("anthropic")
+
+    result = await _failover(primary, backup, hedge=True).complete(_MESSAGES)
+
+    assert result == "from anthropic"
+
+
+async def test_hedge_raises_non_failover_error_without_waiting_for_the_other_call() -> None:
+    primary = ScriptedProvider("openai", delay=1.0)
+    backup = ScriptedProvider("anthropic", delay=0.01, error=LLMAuthError(provider="anthropic"))
+    targets = [
+        FailoverTarget(name="openai", provider=primary, latency=_warm_tracker(0.02)),
+        FailoverTarget(name="anthropic", provider=backup, latency=LatencyTracker()),
+    ]
+    provider = FailoverProvider(targets, min_timeout=5.0, hedge=True)
+
+    with pytest.raises(LLMAuthError):
+        await asyncio.wait_for(provider.complete(_MESSAGES), timeout=0.5)
+    await asyncio.sleep(0)
+
+    assert primary.cancelled
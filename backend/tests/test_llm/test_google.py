@@ -4,6 +4,7 @@ from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from google.api_core import exceptions as google_exceptions
+from pydantic import BaseModel
 
 from app.exceptions import LLMAuthError, LLMNetworkError, LLMRateLimitError
 from app.llm.google import GoogleProvider
@@ -65,24 +66,68 @@ async def test_complete_passes_temperature_and_max_tokens(provider: GoogleProvid
 
 @pytest.mark.asyncio
 async def test_complete_converts_messages_to_contents(provider: GoogleProvider) -> None:
-    """complete() should convert role/content dicts to Google's format."""
-    mock_response = _make_response("response")
+    """complete() should send system text as system_instruction and tag turn roles."""
+    model = MagicMock()
+    model.generate_content_async = AsyncMock(return_value=_make_response("response"))
 
-    with patch.object(
-        provider._model, "generate_content_async", new_callable=AsyncMock
-    ) as mock_generate:
-        mock_generate.return_value = mock_response
+    with patch("app.llm.google.genai.GenerativeModel", return_value=model) as mock_cls:
         await provider.complete(
             [
                 {"role": "system", "content": "You are helpful."},
                 {"role": "user", "content": "Hello"},
+                {"role": "assistant", "content": "Hi!"},
+                {"role": "user", "content": "Again"},
             ]
         )
 
-    # Google SDK expects a list of content parts
-    call_args = mock_generate.call_args[0][0]
-    # System message should be prepended to user message or handled appropriately
-    assert isinstance(call_args, list)
+    mock_cls.assert_called_once_with("gemini-2.0-flash", system_instruction="You are helpful.")
+    assert model.generate_content_async.call_args[0][0] == [
+        {"role": "user", "parts": ["Hello"]},
+        {"role": "model", "parts": ["Hi!"]},
+        {"role": "user", "parts": ["Again"]},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_model_instances_are_cached_per_model_and_instruction(
+    provider: GoogleProvider,
+) -> None:
+    """Repeat calls should reuse one GenerativeModel per (model, system instruction)."""
+    model = MagicMock()
+    model.generate_content_async = AsyncMock(return_value=_make_response("response"))
+    system = [{"role": "system", "content": "Be brief."}, {"role": "user", "content": "Hi"}]
+
+    with patch("app.llm.google.genai.GenerativeModel", return_value=model) as mock_cls:
+        await provider.complete(system)
+        await provider.complete(system)
+        await provider.complete(system, model="gemini-1.5-pro")
+        await provider.complete([{"role": "user", "content": "Hi"}], model="gemini-1.5-pro")
+
+    assert [c.args[0] for c in mock_cls.call_args_list] == [
+        "gemini-2.0-flash",
+        "gemini-1.5-pro",
+        "gemini-1.5-pro",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_complete_json_requests_json_mime_type(provider: GoogleProvider) -> None:
+    """complete_json() should use Gemini's JSON mode and validate the reply."""
+
+    class Verdict(BaseModel):
+        label: str
+
+    with patch.object(
+        provider._model, "generate_content_async", new_callable=AsyncMock
+    ) as mock_generate:
+        mock_generate.return_value = _make_response('{"label": "human"}')
+        result = await provider.complete_json(
+            [{"role": "user", "content": "Judge"}], schema=Verdict
+        )
+
+    assert result == Verdict(label="human")
+    gen_config = mock_generate.call_args[1]["generation_config"]
+    assert gen_config["response_mime_type"] == "application/json"
 
 
 @pytest.mark.asyncio
@@ -191,6 +236,49 @@ async def test_service_unavailable_maps_to_llm_network_error(provider: GooglePro
         await provider.complete([{"role": "user", "content": "Hi"}])
 
 
+@pytest.mark.asyncio
+async def test_mid_stream_error_maps_to_llm_network_error(provider: GoogleProvider) -> None:
+    """Errors raised while iterating the stream are mapped like call errors."""
+
+    async def failing_stream():  # type: ignore[no-untyped-def]
+        yield _make_stream_chunk("Hello")
+        raise google_exceptions.ServiceUnavailable("Connection reset")
+
+    collected: list[str] = []
+    with (
+        patch.object(
+            provider._model, "generate_content_async", new_callable=AsyncMock
+        ) as mock_generate,
+        pytest.raises(LLMNetworkError),
+    ):
+        mock_generate.return_value = failing_stream()
+        async for text in provider.stream([{"role": "user", "content": "Hi"}]):
+            collected.append(text)
+
+    assert collected == ["Hello"]
+
+
+@pytest.mark.asyncio
+async def test_mid_stream_quota_error_maps_to_llm_rate_limit_error(
+    provider: GoogleProvider,
+) -> None:
+    """A quota error surfacing mid-stream should map to LLMRateLimitError."""
+
+    async def failing_stream():  # type: ignore[no-untyped-def]
+        raise google_exceptions.ResourceExhausted("Quota exceeded")
+        yield _make_stream_chunk("unreachable")
+
+    with (
+        patch.object(
+            provider._model, "generate_content_async", new_callable=AsyncMock
+        ) as mock_generate,
+        pytest.raises(LLMRateLimitError),
+    ):
+        mock_generate.return_value = failing_stream()
+        async for _ in provider.stream([{"role": "user", "content": "Hi"}]):
+            pass
+
+
 @pytest.mark.asyncio
 async def test_count_tokens_returns_estimate(provider: GoogleProvider) -> None:
     """count_tokens() should return a reasonable token estimate."""
@@ -198,3 +286,81 @@ async def test_count_tokens_returns_estimate(provider: GoogleProvider) -> None:
 
     assert isinstance(result, int)
     assert result > 0
+
+
+# --- Context caching ---
+
+
+_PREFIX = {"role": "system", "content": "Voice DNA " * 3000, "cache_control": "ephemeral"}
+_MESSAGES = [
+    _PREFIX,
+    {"role": "system", "content": "Write a tweet."},
+    {"role": "user", "content": "Go"},
+]
+
+
+@pytest.mark.asyncio
+async def test_context_cache_holds_marked_prefix() -> None:
+    """With a TTL, a large marked prefix is cached once and the rest leads the turns."""
+    provider = GoogleProvider(api_key="k", context_cache_ttl=600)
+    model = MagicMock()
+    model.generate_content_async = AsyncMock(return_value=_make_response("ok"))
+
+    with (
+        patch("app.llm.google.caching.CachedContent.create") as mock_create,
+        patch(
+            "app.llm.google.genai.GenerativeModel.from_cached_content", return_value=model
+        ) as mock_from_cache,
+    ):
+        await provider.complete(_MESSAGES)
+        await provider.complete(_MESSAGES)
+
+    mock_create.assert_called_once()
+    assert mock_create.call_args.kwargs["system_instruction"] == _PREFIX["content"]
+    mock_from_cache.assert_called_once_with(mock_create.return_value)
+    assert model.generate_content_async.call_args[0][0] == [
+        {"role": "user", "parts": ["Write a tweet."]},
+        {"role": "user", "parts": ["Go"]},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_context_cache_skips_small_prefixes() -> None:
+    """Prefixes below Gemini's minimum cache size go inline as system_instruction."""
+    provider = GoogleProvider(api_key="k", context_cache_ttl=600)
+    model = MagicMock()
+    model.generate_content_async = AsyncMock(return_value=_make_response("ok"))
+    small = [{**_PREFIX, "content": "Voice DNA"}, {"role": "user", "content": "Go"}]
+
+    with (
+        patch("app.llm.google.caching.CachedContent.create") as mock_create,
+        patch("app.llm.google.genai.GenerativeModel", return_value=model) as mock_cls,
+    ):
+        await provider.complete(small)
+
+    mock_create.assert_not_called()
+    assert mock_cls.call_args.kwargs["system_instruction"] == "Voice DNA"
+    # Nothing is kept for them, so distinct small prefixes cannot pile up.
+    assert provider._context_caches == {}
+
+
+@pytest.mark.asyncio
+async def test_context_cache_failure_falls_back_inline() -> None:
+    """A rejected cache creation should not fail the call, nor be retried per call."""
+    provider = GoogleProvider(api_key="k", context_cache_ttl=600)
+    model = MagicMock()
+    model.generate_content_async = AsyncMock(return_value=_make_response("ok"))
+
+    with (
+        patch(
+            "app.llm.google.caching.CachedContent.create",
+            side_effect=google_exceptions.InvalidArgument("too small"),
+        ) as mock_create,
+        patch("app.llm.google.genai.GenerativeModel", return_value=model) as mock_cls,
+    ):
+        assert await provider.complete(_MESSAGES) == "ok"
+        await provider.complete(_MESSAGES)
+
+    mock_create.assert_called_once()
+    instruction = mock_cls.call_args.kwargs["system_instruction"]
+    assert instruction == f"{_PREFIX['content']}\n\nWrite a tweet."
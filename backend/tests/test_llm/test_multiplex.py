@@ -0,0 +1,69 @@
+"""Tests for interleaving several LLM streams into one event stream."""
+
+import asyncio
+import time
+from collections.abc import AsyncIterator
+
+from app.exceptions import LLMAuthError
+from app.llm.multiplex import StreamEvent, multiplex
+
+
+def _slow_stream(ttft: float, chunks: list[str]) -> AsyncIterator[str]:
+    async def stream() -> AsyncIterator[str]:
+        await asyncio.sleep(ttft)
+        for chunk in chunks:
+            yield chunk
+            await asyncio.sleep(0.01)
+
+    return stream()
+
+
+async def test_first_chunks_arrive_within_one_ttft() -> None:
+    streams = {i: (lambda: _slow_stream(0.05, ["a", "b", "c"])) for i in range(5)}
+
+    started = time.perf_counter()
+    first_seen: dict[int, float] = {}
+    events: list[StreamEvent[int]] = []
+    async for event in multiplex(streams):
+        events.append(event)
+        first_seen.setdefault(event.key, time.perf_counter() - started)
+
+    assert max(first_seen.values()) < 0.1
+    for key in streams:
+        own = [e for e in events if e.key == key]
+        assert "".join(e.delta for e in own) == "abc"
+        assert own[-1].kind == "done"
+
+
+async def test_failed_stream_yields_error_and_others_finish() -> None:
+    async def failing() -> AsyncIterator[str]:
+        raise LLMAuthError(provider="openai")
+        yield ""
+
+    events = [
+        event
+        async for event in multiplex({"bad": failing, "good": lambda: _slow_stream(0.0, ["ok"])})
+    ]
+
+    [error] = [e for e in events if e.kind == "error"]
+    assert error.key == "bad"
+    assert isinstance(error.error, LLMAuthError)
+    assert [e.kind for e in events if e.key == "good"] == ["delta", "done"]
+
+
+async def test_closing_early_cancels_running_streams() -> None:
+    cancelled = asyncio.Event()
+
+    async def endless() -> AsyncIterator[str]:
+        try:
+            while True:
+                yield "x"
+                await asyncio.sleep(0.001)
+        finally:
+            cancelled.set()
+
+    events = multiplex({"a": endless})
+    assert (await anext(events)).delta == "x"
+    await events.aclose()
+
+    assert cancelled.is_set()
@@ -3,10 +3,18 @@
 from collections.abc import AsyncIterator
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import httpx
+import openai
 import pytest
+from openai import omit
+from openai.types import CompletionUsage
+from openai.types.completion_usage import PromptTokensDetails
+from pydantic import BaseModel
 
 from app.exceptions import LLMAuthError, LLMNetworkError, LLMRateLimitError
+from app.llm.base import CACHE_CONTROL
 from app.llm.openai import OpenAIProvider
+from app.llm.usage import PromptCacheUsage, capture_usage
 
 
 @pytest.fixture
@@ -75,6 +83,8 @@ async def test_complete_passes_model_and_temperature(provider: OpenAIProvider) -
         messages=[{"role": "user", "content": "Hi"}],
         temperature=0.5,
         max_tokens=2000,
+        response_format=omit,
+        prompt_cache_key=omit,
     )
 
 
@@ -93,6 +103,131 @@ async def test_complete_uses_default_model(provider: OpenAIProvider) -> None:
     assert call_kwargs["model"] == "gpt-4o"
 
 
+@pytest.mark.asyncio
+async def test_cache_marked_prefix_is_sent_byte_identical(provider: OpenAIProvider) -> None:
+    """The cache marker is stripped and the prefix keys the request's prompt cache."""
+    messages = [
+        {"role": "system", "content": "Voice DNA", CACHE_CONTROL: "ephemeral"},
+        {"role": "user", "content": "Hi"},
+    ]
+
+    with patch.object(
+        provider._client.chat.completions, "create", new_callable=AsyncMock
+    ) as mock_create:
+        mock_create.return_value = _make_completion("response")
+        await provider.complete(messages)
+        await provider.complete([*messages[:1], {"role": "user", "content": "Other"}])
+
+    first, second = (call.kwargs for call in mock_create.call_args_list)
+    assert first["messages"][0] == {"role": "system", "content": "Voice DNA"}
+    assert isinstance(first["prompt_cache_key"], str)
+    assert first["prompt_cache_key"] == second["prompt_cache_key"]
+
+
+@pytest.mark.asyncio
+async def test_records_cached_prompt_tokens() -> None:
+    """Cached prompt tokens reported by OpenAI should reach the usage tracker."""
+    usage = PromptCacheUsage()
+    provider = OpenAIProvider(api_key="sk-test-key", usage=usage)
+    completion = _make_completion("response")
+    completion.usage = CompletionUsage(
+        prompt_tokens=2000,
+        completion_tokens=10,
+        total_tokens=2010,
+        prompt_tokens_details=PromptTokensDetails(cached_tokens=1536),
+    )
+
+    with patch.object(
+        provider._client.chat.completions, "create", new_callable=AsyncMock
+    ) as mock_create:
+        mock_create.return_value = completion
+        await provider.complete([{"role": "user", "content": "Hi"}])
+
+    [stats] = usage.stats()
+    assert (stats.provider, stats.model) == ("openai", "gpt-4o")
+    assert stats.input_tokens == 2000
+    assert stats.cached_input_tokens == 1536
+    assert stats.hit_rate == 0.768
+
+
+@pytest.mark.asyncio
+async def test_reports_call_usage_including_completion_tokens(provider: OpenAIProvider) -> None:
+    """Per-call usage should carry prompt, cached and completion tokens."""
+    completion = _make_completion("response")
+    completion.usage = CompletionUsage(
+        prompt_tokens=2000,
+        completion_tokens=10,
+        total_tokens=2010,
+        prompt_tokens_details=PromptTokensDetails(cached_tokens=1536),
+    )
+
+    with (
+        patch.object(
+            provider._client.chat.completions, "create", new_callable=AsyncMock
+        ) as mock_create,
+        capture_usage() as call_usage,
+    ):
+        mock_create.return_value = completion
+        await provider.complete([{"role": "user", "content": "Hi"}])
+
+    assert (call_usage.input_tokens, call_usage.cached_input_tokens) == (2000, 1536)
+    assert call_usage.output_tokens == 10
+
+
+@pytest.mark.asyncio
+async def test_stream_records_usage_from_final_chunk() -> None:
+    """The usage-only final chunk has no choices; it is recorded, not yielded."""
+    usage = PromptCacheUsage()
+    provider = OpenAIProvider(api_key="sk-test-key", usage=usage)
+    text_chunk = _make_stream_chunk("Hello")
+    text_chunk.usage = None
+    usage_chunk = MagicMock()
+    usage_chunk.choices = []
+    usage_chunk.usage = CompletionUsage(
+        prompt_tokens=1200,
+        completion_tokens=1,
+        total_tokens=1201,
+        prompt_tokens_details=PromptTokensDetails(cached_tokens=1024),
+    )
+
+    async def fake_stream() -> AsyncIterator[MagicMock]:
+        for chunk in (text_chunk, usage_chunk):
+            yield chunk
+
+    with patch.object(
+        provider._client.chat.completions, "create", new_callable=AsyncMock
+    ) as mock_create:
+        mock_create.return_value = fake_stream()
+        collected = [text async for text in provider.stream([{"role": "user", "content": "Hi"}])]
+
+    assert collected == ["Hello"]
+    assert mock_create.call_args.kwargs["stream_options"] == {"include_usage": True}
+    assert usage.stats()[0].cached_input_tokens == 1024
+
+
+@pytest.mark.asyncio
+async def test_complete_json_uses_structured_output_mode(provider: OpenAIProvider) -> None:
+    """complete_json() should send the schema as response_format and validate the reply."""
+
+    class Verdict(BaseModel):
+        label: str
+        confidence: int
+
+    with patch.object(
+        provider._client.chat.completions, "create", new_callable=AsyncMock
+    ) as mock_create:
+        mock_create.return_value = _make_completion('{"label": "human", "confidence": 80}')
+        result = await provider.complete_json(
+            [{"role": "user", "content": "Judge"}], schema=Verdict, temperature=0.3
+        )
+
+    assert result == Verdict(label="human", confidence=80)
+    response_format = mock_create.call_args.kwargs["response_format"]
+    assert response_format["type"] == "json_schema"
+    assert response_format["json_schema"]["name"] == "Verdict"
+    assert response_format["json_schema"]["schema"] == Verdict.model_json_schema()
+
+
 @pytest.mark.asyncio
 async def test_stream_yields_chunks(provider: OpenAIProvider) -> None:
     """stream() should yield content strings from the streaming response."""
@@ -196,6 +331,29 @@ async def test_rate_limit_maps_to_llm_rate_limit_error(provider: OpenAIProvider)
         await provider.complete([{"role": "user", "content": "Hi"}])
 
 
+@pytest.mark.asyncio
+async def test_rate_limit_error_carries_retry_after(provider: OpenAIProvider) -> None:
+    """The Retry-After header should be exposed on LLMRateLimitError."""
+    import httpx
+    import openai
+
+    response = httpx.Response(
+        429,
+        headers={"retry-after": "12"},
+        request=httpx.Request("POST", "https://api.openai.com/v1/chat/completions"),
+    )
+    with patch.object(
+        provider._client.chat.completions, "create", new_callable=AsyncMock
+    ) as mock_create:
+        mock_create.side_effect = openai.RateLimitError(
+            message="Rate limit exceeded", response=response, body=None
+        )
+        with pytest.raises(LLMRateLimitError) as exc_info:
+            await provider.complete([{"role": "user", "content": "Hi"}])
+
+    assert exc_info.value.retry_after == 12.0
+
+
 @pytest.mark.asyncio
 async def test_network_error_maps_to_llm_network_error(provider: OpenAIProvider) -> None:
     """OpenAI APIConnectionError should map to LLMNetworkError."""
@@ -211,6 +369,70 @@ async def test_network_error_maps_to_llm_network_error(provider: OpenAIProvider)
         await provider.complete([{"role": "user", "content": "Hi"}])
 
 
+def _status_error(error_type: type[openai.APIStatusError], status: int) -> Exception:
+    response = httpx.Response(
+        status, request=httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+    )
+    return error_type(message="Server error", response=response, body=None)
+
+
+TRANSIENT_ERRORS = [
+    openai.APITimeoutError(request=MagicMock()),
+    _status_error(openai.InternalServerError, 500),
+    _status_error(openai.InternalServerError, 503),
+    _status_error(openai.APIStatusError, 599),
+]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("error", TRANSIENT_ERRORS)
+async def test_transient_errors_map_to_llm_network_error(
+    provider: OpenAIProvider, error: Exception
+) -> None:
+    """Timeouts and 5xx responses should map to LLMNetworkError so they are retried."""
+    with (
+        patch.object(
+            provider._client.chat.completions, "create", new_callable=AsyncMock, side_effect=error
+        ),
+        pytest.raises(LLMNetworkError),
+    ):
+        await provider.complete([{"role": "user", "content": "Hi"}])
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("error", TRANSIENT_ERRORS)
+async def test_stream_maps_transient_errors_to_llm_network_error(
+    provider: OpenAIProvider, error: Exception
+) -> None:
+    """stream() should map the same errors, including ones raised mid-stream."""
+
+    async def failing_stream() -> AsyncIterator[MagicMock]:
+        yield _make_stream_chunk("Hel")
+        raise error
+
+    with patch.object(
+        provider._client.chat.completions, "create", new_callable=AsyncMock
+    ) as mock_create:
+        mock_create.return_value = failing_stream()
+        with pytest.raises(LLMNetworkError):
+            async for _ in provider.stream([{"role": "user", "content": "Hi"}]):
+                pass
+
+
+@pytest.mark.asyncio
+async def test_client_error_is_not_mapped(provider: OpenAIProvider) -> None:
+    """A 4xx other than auth or rate limit is not transient and should propagate."""
+    error = _status_error(openai.BadRequestError, 400)
+
+    with (
+        patch.object(
+            provider._client.chat.completions, "create", new_callable=AsyncMock, side_effect=error
+        ),
+        pytest.raises(openai.BadRequestError),
+    ):
+        await provider.complete([{"role": "user", "content": "Hi"}])
+
+
 @pytest.mark.asyncio
 async def test_count_tokens_returns_estimate(provider: OpenAIProvider) -> None:
     """count_tokens() should return a reasonable token estimate."""
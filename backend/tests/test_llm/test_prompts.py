@@ -1,5 +1,6 @@
 """Tests for LLM prompt template functions."""
 
+from app.llm.base import CACHE_CONTROL
 from app.llm.prompts import (
     build_detection_prompt,
     build_dna_analysis_prompt,
@@ -56,6 +57,39 @@ def test_build_generation_prompt_includes_dna_and_platform() -> None:
     assert "Write about AI trends" in full_text
 
 
+_DNA = {"tone": "casual", "vocabulary": "simple"}
+
+
+class TestVoicePrefix:
+    def _prompts(self, methodology: str | None = None) -> list[list[dict[str, str]]]:
+        return [
+            build_generation_prompt(
+                _DNA, "twitter", "Write a tweet.", {"tone": "dry"}, methodology=methodology
+            ),
+            build_generation_prompt(_DNA, "blog", "Write a post.", methodology=methodology),
+            build_feedback_regen_prompt(
+                _DNA, "email", "Old text.", "Shorter.", methodology=methodology
+            ),
+            build_partial_regen_prompt(_DNA, "linkedin", "A.", "B.", "C.", methodology=methodology),
+        ]
+
+    def test_prefix_is_first_and_cache_marked(self) -> None:
+        for messages in self._prompts():
+            assert messages[0]["role"] == "system"
+            assert CACHE_CONTROL in messages[0]
+            assert all(CACHE_CONTROL not in msg for msg in messages[1:])
+
+    def test_prefix_is_identical_across_requests(self) -> None:
+        """Platform, input and properties must not leak into the cached prefix."""
+        prefixes = {messages[0]["content"] for messages in self._prompts("Be concise.")}
+        assert len(prefixes) == 1
+        prefix = prefixes.pop()
+        assert "casual" in prefix
+        assert "Methodology: Be concise." in prefix
+        assert "twitter" not in prefix
+        assert "dry" not in prefix
+
+
 class TestBuildFeedbackRegenPrompt:
     def test_includes_dna_current_text_and_feedback(self) -> None:
         """Feedback regen prompt should include DNA traits, current text, and feedback."""
@@ -0,0 +1,146 @@
+"""Tests for per-(provider, model) rate limiting and concurrency governor."""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+from app.config import Settings
+from app.llm.ratelimit import ModelLimiter, RateLimitedProvider, RateLimiter, TokenBucket
+
+
+def _make_settings(**overrides: object) -> Settings:
+    defaults: dict[str, object] = {
+        "database_url": "sqlite+aiosqlite://",
+        "llm_requests_per_minute": 600,
+        "llm_tokens_per_minute": 100_000,
+        "llm_max_in_flight": 2,
+    }
+    defaults.update(overrides)
+    return Settings(**defaults)  # type: ignore[arg-type]
+
+
+def _make_provider(response: str = "done") -> AsyncMock:
+    provider = AsyncMock()
+    provider.complete.return_value = response
+    provider.count_tokens.return_value = 10
+    return provider
+
+
+# --- TokenBucket ---
+
+
+async def test_token_bucket_waits_when_budget_exhausted() -> None:
+    bucket = TokenBucket(per_minute=60)  # 1 unit per second
+    await bucket.acquire(60)
+
+    with patch("app.llm.ratelimit.asyncio.sleep", new_callable=AsyncMock) as mock_sleep:
+        mock_sleep.side_effect = lambda _s: bucket.debit(-60)  # simulate refill
+        await bucket.acquire(1)
+
+    mock_sleep.assert_awaited_once()
+    assert mock_sleep.await_args is not None
+    assert 0 < mock_sleep.await_args.args[0] <= 1.0
+
+
+async def test_token_bucket_clamps_oversized_requests() -> None:
+    bucket = TokenBucket(per_minute=100)
+    # Larger than capacity but must not deadlock when the bucket is full.
+    await asyncio.wait_for(bucket.acquire(1_000), timeout=1)
+
+
+# --- ModelLimiter ---
+
+
+async def test_limiter_caps_in_flight_and_reports_queue() -> None:
+    limiter = ModelLimiter(requests_per_minute=0, tokens_per_minute=0, max_in_flight=1)
+    release = asyncio.Event()
+
+    async def hold() -> None:
+        async with limiter.slot(1):
+            await release.wait()
+
+    first = asyncio.create_task(hold())
+    second = asyncio.create_task(hold())
+    await asyncio.sleep(0.01)
+
+    assert limiter.in_flight == 1
+    assert limiter.queued == 1
+
+    release.set()
+    await asyncio.gather(first, second)
+
+    assert limiter.in_flight == 0
+    assert limiter.queued == 0
+    assert limiter.total_requests == 2
+
+
+# --- RateLimiter ---
+
+
+def test_rate_limiter_reuses_limiter_per_model() -> None:
+    rate_limiter = RateLimiter(_make_settings())
+
+    assert rate_limiter.limiter("openai", "gpt-4o") is rate_limiter.limiter("openai", "gpt-4o")
+    assert rate_limiter.limiter("openai", "gpt-4o") is not rate_limiter.limiter(
+        "openai", "gpt-4o-mini"
+    )
+
+
+def test_rate_limiter_applies_overrides() -> None:
+    settings = _make_settings(
+        llm_rate_limit_overrides={
+            "openai:gpt-4o": {"max_in_flight": 1},
+            "anthropic": {"max_in_flight": 5},
+        }
+    )
+    rate_limiter = RateLimiter(settings)
+
+    assert rate_limiter.limiter("openai", "gpt-4o")._semaphore._value == 1  # type: ignore[union-attr]
+    assert rate_limiter.limiter("openai", "gpt-4o-mini")._semaphore._value == 2  # type: ignore[union-attr]
+    assert rate_limiter.limiter("anthropic", "any")._semaphore._value == 5  # type: ignore[union-attr]
+
+
+# --- RateLimitedProvider ---
+
+
+async def test_rate_limited_provider_bounds_concurrency() -> None:
+    rate_limiter = RateLimiter(_make_settings(llm_max_in_flight=2))
+    inner = _make_provider()
+    active = 0
+    peak = 0
+
+    async def slow_complete(*_args: object, **_kwargs: object) -> str:
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        return "done"
+
+    inner.complete.side_effect = slow_complete
+    provider = RateLimitedProvider(
+        inner, rate_limiter, provider_name="openai", default_model="gpt-4o"
+    )
+
+    messages = [{"role": "user", "content": "hi"}]
+    results = await asyncio.gather(*(provider.complete(messages) for _ in range(6)))
+
+    assert results == ["done"] * 6
+    assert peak == 2
+    stats = rate_limiter.stats()
+    assert len(stats) == 1
+    assert stats[0].model == "gpt-4o"
+    assert stats[0].total_requests == 6
+
+
+async def test_rate_limited_provider_counts_prompt_and_output_tokens() -> None:
+    rate_limiter = RateLimiter(_make_settings())
+    inner = _make_provider(response="a long answer")
+    provider = RateLimitedProvider(
+        inner, rate_limiter, provider_name="openai", default_model="gpt-4o"
+    )
+
+    await provider.complete([{"role": "user", "content": "prompt"}], model="gpt-4o-mini")
+
+    counted = [call.args[0] for call in inner.count_tokens.await_args_list]
+    assert counted == ["prompt", "a long answer"]
+    assert rate_limiter.stats()[0].model == "gpt-4o-mini"
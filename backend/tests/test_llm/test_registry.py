@@ -1,6 +1,7 @@
 """Tests for LLM provider registry and retry logic."""
 
 from collections.abc import AsyncIterator
+from pathlib import Path
 from unittest.mock import AsyncMock, patch
 
 import pytest
@@ -12,8 +13,19 @@ from app.exceptions import (
     LLMRateLimitError,
     ProviderNotConfiguredError,
 )
-from app.llm.base import with_retry
-from app.llm.registry import ProviderRegistry
+from app.llm.base import (
+    INTERACTIVE_RETRY,
+    RetryPolicy,
+    retry_after_from_headers,
+    stream_with_retry,
+    with_retry,
+)
+from app.llm.cache import CachedProvider
+from app.llm.circuit import CircuitBreakerProvider
+from app.llm.failover import FailoverProvider
+from app.llm.ratelimit import RateLimitedProvider
+from app.llm.registry import ProviderRegistry, create_registry
+from app.llm.singleflight import SingleFlightProvider
 
 
 class FakeProvider:
@@ -46,6 +58,16 @@ class FakeProvider:
         return True
 
 
+class ClosableFakeProvider(FakeProvider):
+    """A fake provider that records when its client is closed."""
+
+    def __init__(self) -> None:
+        self.closed = False
+
+    async def aclose(self) -> None:
+        self.closed = True
+
+
 def _make_settings(**overrides: str) -> Settings:
     """Create a Settings instance with test defaults."""
     defaults = {
@@ -115,6 +137,206 @@ def test_registry_list_configured() -> None:
     assert "anthropic" not in configured
 
 
+def test_registry_reuses_pooled_instance() -> None:
+    """Repeated lookups should return the same long-lived provider instance."""
+    settings = _make_settings(openai_api_key="sk-test-key")
+    registry = ProviderRegistry(settings)
+    factory_calls: list[FakeProvider] = []
+
+    def factory() -> FakeProvider:
+        provider = FakeProvider()
+        factory_calls.append(provider)
+        return provider
+
+    registry.register("openai", factory)
+
+    first = registry.get_provider("openai")
+    second = registry.get_provider("openai")
+
+    assert first is second
+    assert len(factory_calls) == 1
+
+
+def test_registry_rebuilds_when_key_rotates() -> None:
+    """Changing the API key should build a fresh provider on the next lookup."""
+    settings = _make_settings(openai_api_key="sk-old")
+    registry = ProviderRegistry(settings)
+    registry.register("openai", lambda: FakeProvider())
+
+    old = registry.get_provider("openai")
+    settings.openai_api_key = "sk-new"
+    new = registry.get_provider("openai")
+
+    assert old is not new
+
+
+def test_registry_rebuilds_when_model_changes() -> None:
+    """Changing the default model should build a fresh provider on the next lookup."""
+    settings = _make_settings(openai_api_key="sk-test")
+    registry = ProviderRegistry(settings)
+    registry.register("openai", lambda: FakeProvider())
+
+    old = registry.get_provider("openai")
+    settings.default_openai_model = "gpt-4o-mini"
+
+    assert registry.get_provider("openai") is not old
+
+
+def test_registry_invalidate_forces_rebuild() -> None:
+    """invalidate() should drop the pooled instance for that provider."""
+    settings = _make_settings(openai_api_key="sk-test")
+    registry = ProviderRegistry(settings)
+    registry.register("openai", lambda: FakeProvider())
+
+    old = registry.get_provider("openai")
+    registry.invalidate("openai")
+
+    assert registry.get_provider("openai") is not old
+
+
+async def test_registry_aclose_closes_pooled_and_retired() -> None:
+    """aclose() should close both the live and the retired provider clients."""
+    settings = _make_settings(openai_api_key="sk-old")
+    registry = ProviderRegistry(settings)
+    registry.register("openai", ClosableFakeProvider)
+
+    retired = registry.get_provider("openai")
+    settings.openai_api_key = "sk-new"
+    live = registry.get_provider("openai")
+
+    assert isinstance(retired, ClosableFakeProvider)
+    assert isinstance(live, ClosableFakeProvider)
+    assert retired.closed is False
+
+    await registry.aclose()
+
+    assert retired.closed is True
+    assert live.closed is True
+
+
+def test_create_registry_registers_builtin_providers() -> None:
+    """create_registry should wire pooled OpenAI, Anthropic and Google factories."""
+    from app.llm.anthropic import AnthropicProvider
+    from app.llm.openai import OpenAIProvider
+
+    settings = _make_settings(openai_api_key="sk-test", anthropic_api_key="sk-ant-test")
+    registry = create_registry(settings)
+
+    assert isinstance(registry._factories["openai"](), OpenAIProvider)
+    assert isinstance(registry._factories["anthropic"](), AnthropicProvider)
+    assert registry.get_provider("openai") is registry.get_provider("openai")
+
+
+def test_create_registry_wraps_providers_in_rate_limiter() -> None:
+    """Pooled providers should spend the shared (provider, model) budgets."""
+    settings = _make_settings(
+        openai_api_key="sk-test",
+        llm_cache_enabled="false",
+        llm_single_flight_enabled="false",
+        llm_breaker_enabled="false",
+    )
+    registry = create_registry(settings)
+
+    assert registry.rate_limiter is not None
+    assert isinstance(registry.get_provider("openai"), RateLimitedProvider)
+
+
+async def test_create_registry_wraps_providers_in_completion_cache(tmp_path: Path) -> None:
+    """With caching enabled, pooled providers should be wrapped in CachedProvider."""
+    settings = _make_settings(
+        openai_api_key="sk-test",
+        llm_cache_path=str(tmp_path / "cache.db"),
+        llm_single_flight_enabled="false",
+    )
+    registry = create_registry(settings)
+
+    assert registry.cache is not None
+    assert isinstance(registry.get_provider("openai"), CachedProvider)
+    await registry.aclose()
+
+
+def test_create_registry_wraps_providers_in_single_flight() -> None:
+    """With single-flight enabled, the outermost wrapper should coalesce calls."""
+    settings = _make_settings(openai_api_key="sk-test", llm_cache_enabled="false")
+    registry = create_registry(settings)
+
+    assert isinstance(registry.get_provider("openai"), SingleFlightProvider)
+
+
+def test_failover_provider_is_default_when_only_one_configured() -> None:
+    """With a single configured provider there is nothing to fail over to."""
+    settings = _make_settings(openai_api_key="sk-test")
+    registry = ProviderRegistry(settings)
+    registry.register("openai", FakeProvider)
+
+    assert isinstance(registry.get_failover_provider(), FakeProvider)
+
+
+def test_failover_provider_orders_default_first() -> None:
+    """The default provider leads, followed by the other configured providers."""
+    settings = _make_settings(
+        openai_api_key="sk-test",
+        anthropic_api_key="sk-ant",
+        default_llm_provider="anthropic",
+        llm_failover_enabled="true",
+    )
+    registry = ProviderRegistry(settings)
+    registry.register("openai", FakeProvider)
+    registry.register("anthropic", FakeProvider)
+
+    provider = registry.get_failover_provider()
+
+    assert isinstance(provider, FailoverProvider)
+    assert [t.name for t in provider.targets] == ["anthropic", "openai"]
+    assert provider.targets[0].latency is registry.latency_tracker("anthropic")
+
+
+def test_failover_provider_is_off_by_default() -> None:
+    """Another vendor's model is only substituted when failover is opted into."""
+    settings = _make_settings(openai_api_key="sk-test", anthropic_api_key="sk-ant")
+    registry = ProviderRegistry(settings)
+    registry.register("openai", FakeProvider)
+    registry.register("anthropic", FakeProvider)
+
+    assert isinstance(registry.get_failover_provider(), FakeProvider)
+
+
+def test_simulated_default_provider_has_no_vendor_backups() -> None:
+    """Injected simulated failures must not fail over to a paid upstream."""
+    settings = _make_settings(
+        openai_api_key="sk-test",
+        anthropic_api_key="sk-ant",
+        default_llm_provider="simulated",
+        llm_failover_enabled="true",
+    )
+    registry = ProviderRegistry(settings)
+    registry.register("simulated", FakeProvider)
+    registry.register("openai", FakeProvider)
+    registry.register("anthropic", FakeProvider)
+
+    assert isinstance(registry.get_failover_provider(), FakeProvider)
+
+
+def test_create_registry_wraps_providers_in_circuit_breaker() -> None:
+    """Breakers are per provider name and survive pooled instance rebuilds."""
+    settings = _make_settings(
+        openai_api_key="sk-test", llm_cache_enabled="false", llm_single_flight_enabled="false"
+    )
+    registry = create_registry(settings)
+
+    assert isinstance(registry.get_provider("openai"), CircuitBreakerProvider)
+    breaker = registry.circuit_breaker("openai")
+    registry.invalidate("openai")
+    registry.get_provider("openai")
+    assert registry.circuit_breaker("openai") is breaker
+
+
+def test_registry_without_breakers_returns_none() -> None:
+    registry = ProviderRegistry(_make_settings(openai_api_key="sk-test"))
+
+    assert registry.circuit_breaker("openai") is None
+
+
 @pytest.mark.asyncio
 async def test_retry_on_rate_limit_succeeds_after_retry() -> None:
     """with_retry should retry on LLMRateLimitError and return the result."""
@@ -163,3 +385,136 @@ async def test_retry_exhausted_raises_original_error() -> None:
 
     # 1 initial + 2 retries = 3 total attempts
     assert mock_fn.call_count == 3
+
+
+@pytest.mark.asyncio
+async def test_retry_honors_retry_after_as_floor() -> None:
+    """A retry_after hint should be the minimum sleep, with jitter added on top."""
+    mock_fn = AsyncMock(
+        side_effect=[LLMRateLimitError(provider="openai", retry_after=4.0), "success"]
+    )
+    policy = RetryPolicy(max_retries=1, base_delay=1.0, max_delay=1.0, deadline=None)
+
+    with patch("app.llm.base.asyncio.sleep", new_callable=AsyncMock) as mock_sleep:
+        assert await with_retry(mock_fn, policy)() == "success"
+
+    (delay,) = mock_sleep.await_args.args
+    assert 4.0 <= delay <= 5.0
+
+
+def test_retry_policy_backoff_uses_full_jitter() -> None:
+    """Backoff should be spread over [0, cap] rather than a fixed delay."""
+    policy = RetryPolicy(base_delay=1.0, max_delay=3.0)
+    error = LLMNetworkError(provider="openai")
+
+    delays = {policy.backoff(5, error) for _ in range(50)}
+
+    assert all(0.0 <= d <= 3.0 for d in delays)
+    assert len(delays) > 1
+
+
+@pytest.mark.asyncio
+async def test_retry_stops_when_backoff_would_pass_deadline() -> None:
+    """with_retry should give up rather than sleep past the policy deadline."""
+    mock_fn = AsyncMock(side_effect=LLMRateLimitError(provider="openai", retry_after=30.0))
+    policy = RetryPolicy(max_retries=5, deadline=10.0)
+
+    with (
+        pytest.raises(LLMRateLimitError),
+        patch("app.llm.base.asyncio.sleep", new_callable=AsyncMock) as mock_sleep,
+    ):
+        await with_retry(mock_fn, policy)()
+
+    assert mock_fn.call_count == 1
+    mock_sleep.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_stream_with_retry_retries_before_first_chunk() -> None:
+    """A stream failing before any output should be reopened."""
+    attempts = 0
+
+    async def flaky_stream() -> AsyncIterator[str]:
+        nonlocal attempts
+        attempts += 1
+        if attempts == 1:
+            raise LLMNetworkError(provider="openai")
+        yield "hello"
+
+    with patch("app.llm.base.asyncio.sleep", new_callable=AsyncMock):
+        chunks = [c async for c in stream_with_retry(flaky_stream, INTERACTIVE_RETRY)]
+
+    assert chunks == ["hello"]
+    assert attempts == 2
+
+
+@pytest.mark.asyncio
+async def test_stream_with_retry_does_not_replay_after_first_chunk() -> None:
+    """Errors after output has been yielded should propagate immediately."""
+    attempts = 0
+
+    async def broken_stream() -> AsyncIterator[str]:
+        nonlocal attempts
+        attempts += 1
+        yield "partial"
+        raise LLMNetworkError(provider="openai")
+
+    chunks: list[str] = []
+    with (
+        pytest.raises(LLMNetworkError),
+        patch("app.llm.base.asyncio.sleep", new_callable=AsyncMock),
+    ):
+        async for chunk in stream_with_retry(broken_stream, INTERACTIVE_RETRY):
+            chunks.append(chunk)
+
+    assert chunks == ["partial"]
+    assert attempts == 1
+
+
+# --- retry_after_from_headers ---
+
+
+def test_retry_after_from_headers_prefers_retry_after() -> None:
+    headers = {"retry-after": "7", "x-ratelimit-reset-requests": "1m0s"}
+    assert retry_after_from_headers(headers) == 7.0
+
+
+def test_retry_after_from_headers_reads_milliseconds() -> None:
+    assert retry_after_from_headers({"retry-after-ms": "250"}) == 0.25
+
+
+def test_retry_after_from_headers_parses_openai_reset_durations() -> None:
+    headers = {"x-ratelimit-reset-requests": "1s", "x-ratelimit-reset-tokens": "6m0s"}
+    assert retry_after_from_headers(headers) == 360.0
+
+
+def test_retry_after_from_headers_parses_anthropic_reset_timestamp() -> None:
+    from datetime import UTC, datetime, timedelta
+
+    reset = (datetime.now(UTC) + timedelta(seconds=20)).isoformat().replace("+00:00", "Z")
+    seconds = retry_after_from_headers({"anthropic-ratelimit-requests-reset": reset})
+
+    assert seconds is not None
+    assert 18.0 <= seconds <= 20.0
+
+
+def test_retry_after_from_headers_returns_none_without_hints() -> None:
+    assert retry_after_from_headers({"content-type": "application/json"}) is None
+
+
+def test_create_registry_registers_simulated_provider_when_enabled() -> None:
+    """The simulated provider needs no API key and takes its profile from settings."""
+    from app.llm.simulated import SimulatedProvider
+
+    disabled = create_registry(_make_settings())
+    settings = _make_settings(
+        llm_simulated_enabled="true", llm_simulated_profile="degraded"
+    ).model_copy(update={"llm_simulated_overrides": {"rate_limit_rate": 0.5}})
+    registry = create_registry(settings)
+
+    assert "simulated" not in disabled._factories
+    provider = registry._factories["simulated"]()
+    assert isinstance(provider, SimulatedProvider)
+    assert provider._profile.rate_limit_rate == 0.5
+    assert provider._profile.ttft_seconds == 3.0
+    assert registry.get_provider("simulated") is registry.get_provider("simulated")
@@ -0,0 +1,136 @@
+"""Tests for the offline simulated LLM provider."""
+
+import time
+
+import pytest
+from pydantic import BaseModel
+
+from app.exceptions import LLMNetworkError, LLMRateLimitError, LLMResponseFormatError
+from app.llm.simulated import PROFILES, LatencyProfile, SimulatedProvider
+from app.llm.usage import capture_usage
+from app.schemas.content import MultiPlatformDraft
+from app.schemas.detection import DetectionResponse
+from app.schemas.dna import DNAAnalysisResult
+from app.schemas.scoring import ScoringResult
+
+_MESSAGES = [
+    {"role": "system", "content": "You are a ghostwriter."},
+    {"role": "user", "content": "Write a post about shipping small changes."},
+]
+
+
+# --- complete / stream ---
+
+
+async def test_complete_is_deterministic_per_request() -> None:
+    provider = SimulatedProvider(seed=7)
+
+    first = await provider.complete(_MESSAGES)
+    again = await provider.complete(_MESSAGES)
+    other = await provider.complete(_MESSAGES, temperature=0.2)
+
+    assert first == again
+    assert first != other
+    assert first.endswith(".")
+
+
+async def test_complete_reports_usage() -> None:
+    provider = SimulatedProvider()
+
+    with capture_usage() as usage:
+        text = await provider.complete(_MESSAGES)
+
+    assert usage.input_tokens > 0
+    assert usage.output_tokens == await provider.count_tokens(text)
+
+
+async def test_stream_reassembles_to_the_completion_text() -> None:
+    provider = SimulatedProvider()
+
+    chunks = [chunk async for chunk in provider.stream(_MESSAGES)]
+
+    assert len(chunks) > 1
+    assert "".join(chunks) == await provider.complete(_MESSAGES)
+
+
+async def test_stream_waits_for_first_token_then_paces_tokens() -> None:
+    profile = LatencyProfile(median_seconds=0.0, ttft_seconds=0.05, tokens_per_second=2000)
+    provider = SimulatedProvider(profile)
+
+    started = time.perf_counter()
+    stream = provider.stream(_MESSAGES)
+    await anext(stream)
+    ttft = time.perf_counter() - started
+    rest = [chunk async for chunk in stream]
+    total = time.perf_counter() - started
+
+    assert ttft >= 0.05
+    assert total >= ttft + len(rest) / 2000
+
+
+# --- complete_json ---
+
+
+@pytest.mark.parametrize(
+    "schema", [DNAAnalysisResult, ScoringResult, DetectionResponse, MultiPlatformDraft]
+)
+async def test_complete_json_returns_schema_valid_replies(schema: type[BaseModel]) -> None:
+    provider = SimulatedProvider()
+
+    result = await provider.complete_json(_MESSAGES, schema=schema)
+
+    assert isinstance(result, schema)
+
+
+async def test_scoring_reply_covers_every_dimension() -> None:
+    result = await SimulatedProvider().complete_json(_MESSAGES, schema=ScoringResult)
+
+    assert len(result.dimensions) == 8
+    assert all(0 <= d.score <= 100 for d in result.dimensions)
+
+
+async def test_complete_json_rejects_unknown_schemas() -> None:
+    class Unknown(BaseModel):
+        value: int
+
+    with pytest.raises(LLMResponseFormatError):
+        await SimulatedProvider().complete_json(_MESSAGES, schema=Unknown)
+
+
+# --- injected failures ---
+
+
+async def test_injects_rate_limit_and_network_errors() -> None:
+    rate_limited = SimulatedProvider(LatencyProfile(median_seconds=0.0, rate_limit_rate=1.0))
+    flaky = SimulatedProvider(LatencyProfile(median_seconds=0.0, network_error_rate=1.0))
+
+    with pytest.raises(LLMRateLimitError):
+        await rate_limited.complete(_MESSAGES)
+    with pytest.raises(LLMNetworkError):
+        await anext(flaky.stream(_MESSAGES))
+
+
+async def test_error_rates_are_reproducible_for_a_seed() -> None:
+    profile = LatencyProfile(median_seconds=0.0, rate_limit_rate=0.3, network_error_rate=0.2)
+
+    async def outcomes(seed: int) -> list[str]:
+        provider = SimulatedProvider(profile, seed=seed)
+        results: list[str] = []
+        for _ in range(200):
+            try:
+                await provider.complete(_MESSAGES)
+                results.append("ok")
+            except LLMRateLimitError:
+                results.append("429")
+            except LLMNetworkError:
+                results.append("network")
+        return results
+
+    first = await outcomes(3)
+    assert first == await outcomes(3)
+    assert 40 <= first.count("429") <= 80
+    assert 20 <= first.count("network") <= 60
+
+
+def test_named_profiles_exist() -> None:
+    assert {"instant", "fast", "realistic", "degraded"} <= PROFILES.keys()
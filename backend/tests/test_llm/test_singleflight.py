@@ -0,0 +1,171 @@
+"""Tests for single-flight coalescing of identical in-flight LLM calls."""
+
+import asyncio
+from collections.abc import AsyncIterator
+
+import pytest
+
+from app.exceptions import LLMRateLimitError
+from app.llm.singleflight import SingleFlightProvider
+
+_MESSAGES = [{"role": "user", "content": "Score this."}]
+
+
+class GatedProvider:
+    """Fake provider whose calls block until the test releases a gate."""
+
+    def __init__(self) -> None:
+        self.gate = asyncio.Event()
+        self.complete_calls = 0
+        self.stream_calls = 0
+        self.error: Exception | None = None
+
+    async def complete(
+        self,
+        messages: list[dict[str, str]],
+        *,
+        model: str | None = None,
+        temperature: float = 0.7,
+        max_tokens: int = 4096,
+    ) -> str:
+        self.complete_calls += 1
+        await self.gate.wait()
+        if self.error is not None:
+            raise self.error
+        return f"result at {temperature}"
+
+    async def stream(
+        self,
+        messages: list[dict[str, str]],
+        *,
+        model: str | None = None,
+        temperature: float = 0.7,
+        max_tokens: int = 4096,
+    ) -> AsyncIterator[str]:
+        self.stream_calls += 1
+        yield "Hello"
+        await self.gate.wait()
+        yield ", world"
+
+    async def count_tokens(self, text: str) -> int:
+        return len(text) // 4
+
+    async def test_connection(self) -> bool:
+        return True
+
+
+@pytest.fixture
+def inner() -> GatedProvider:
+    return GatedProvider()
+
+
+@pytest.fixture
+def provider(inner: GatedProvider) -> SingleFlightProvider:
+    return SingleFlightProvider(inner, provider_name="openai", default_model="gpt-4o")
+
+
+async def _collect(stream: AsyncIterator[str]) -> list[str]:
+    return [chunk async for chunk in stream]
+
+
+async def test_concurrent_identical_calls_share_one_upstream_call(
+    inner: GatedProvider, provider: SingleFlightProvider
+) -> None:
+    tasks = [asyncio.create_task(provider.complete(_MESSAGES, temperature=0.3)) for _ in range(5)]
+    await asyncio.sleep(0)
+    inner.gate.set()
+    results = await asyncio.gather(*tasks)
+
+    assert results == ["result at 0.3"] * 5
+    assert inner.complete_calls == 1
+    assert provider.inflight_count == 0
+
+
+async def test_different_payloads_are_not_coalesced(
+    inner: GatedProvider, provider: SingleFlightProvider
+) -> None:
+    inner.gate.set()
+    await asyncio.gather(
+        provider.complete(_MESSAGES, temperature=0.2),
+        provider.complete(_MESSAGES, temperature=0.3),
+    )
+    assert inner.complete_calls == 2
+
+
+async def test_calls_above_max_temperature_are_not_coalesced(
+    inner: GatedProvider, provider: SingleFlightProvider
+) -> None:
+    tasks = [asyncio.create_task(provider.complete(_MESSAGES, temperature=0.9)) for _ in range(3)]
+    await asyncio.sleep(0)
+    inner.gate.set()
+    results = await asyncio.gather(*tasks)
+
+    assert results == ["result at 0.9"] * 3
+    assert inner.complete_calls == 3
+    assert provider.inflight_count == 0
+
+
+async def test_streams_above_max_temperature_are_not_fanned_out(
+    inner: GatedProvider, provider: SingleFlightProvider
+) -> None:
+    first = asyncio.create_task(_collect(provider.stream(_MESSAGES, temperature=0.9)))
+    second = asyncio.create_task(_collect(provider.stream(_MESSAGES, temperature=0.9)))
+    await asyncio.sleep(0.01)
+    inner.gate.set()
+
+    assert await first == ["Hello", ", world"]
+    assert await second == ["Hello", ", world"]
+    assert inner.stream_calls == 2
+    assert provider.inflight_count == 0
+
+
+async def test_errors_propagate_to_every_waiter(
+    inner: GatedProvider, provider: SingleFlightProvider
+) -> None:
+    inner.error = LLMRateLimitError(provider="openai")
+    tasks = [asyncio.create_task(provider.complete(_MESSAGES, temperature=0.3)) for _ in range(3)]
+    await asyncio.sleep(0)
+    inner.gate.set()
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+
+    assert all(isinstance(r, LLMRateLimitError) for r in results)
+    assert inner.complete_calls == 1
+
+
+async def test_cancelled_waiter_does_not_abort_shared_call(
+    inner: GatedProvider, provider: SingleFlightProvider
+) -> None:
+    first = asyncio.create_task(provider.complete(_MESSAGES, temperature=0.3))
+    second = asyncio.create_task(provider.complete(_MESSAGES, temperature=0.3))
+    await asyncio.sleep(0)
+    first.cancel()
+    inner.gate.set()
+
+    assert await second == "result at 0.3"
+    assert inner.complete_calls == 1
+
+
+async def test_stream_fans_out_one_upstream_to_subscribers(
+    inner: GatedProvider, provider: SingleFlightProvider
+) -> None:
+    first = asyncio.create_task(_collect(provider.stream(_MESSAGES, temperature=0.3)))
+    await asyncio.sleep(0.01)
+    # Late subscriber joins after the first chunk and replays it.
+    second = asyncio.create_task(_collect(provider.stream(_MESSAGES, temperature=0.3)))
+    await asyncio.sleep(0.01)
+    inner.gate.set()
+
+    assert await first == ["Hello", ", world"]
+    assert await second == ["Hello", ", world"]
+    assert inner.stream_calls == 1
+    assert provider.inflight_count == 0
+
+
+async def test_stream_restarts_after_previous_stream_finished(
+    inner: GatedProvider, provider: SingleFlightProvider
+) -> None:
+    inner.gate.set()
+    await _collect(provider.stream(_MESSAGES, temperature=0.3))
+    await _collect(provider.stream(_MESSAGES, temperature=0.3))
+
+    assert inner.stream_calls == 2
@@ -0,0 +1,96 @@
+"""Tests for schema-validated JSON completions with local repair and re-ask."""
+
+import pytest
+from pydantic import BaseModel, ValidationError
+
+from app.exceptions import LLMResponseFormatError
+from app.llm.structured import complete_structured, parse_json_response
+from app.schemas.dna import DNAAnalysisResult
+
+
+class Verdict(BaseModel):
+    label: str
+    score: int
+    tags: list[str] = []
+
+
+_MESSAGES = [{"role": "user", "content": "Judge this."}]
+
+
+class ScriptedSend:
+    """Fake vendor JSON-mode call that returns scripted replies in order."""
+
+    def __init__(self, *replies: str) -> None:
+        self.replies = list(replies)
+        self.calls: list[list[dict[str, str]]] = []
+
+    async def __call__(self, messages: list[dict[str, str]]) -> str:
+        self.calls.append(messages)
+        return self.replies.pop(0)
+
+
+# --- parse_json_response ---
+
+
+@pytest.mark.parametrize(
+    "raw",
+    [
+        '{"label": "ok", "score": 3}',
+        '```json\n{"label": "ok", "score": 3}\n```',
+        'Here you go: {"label": "ok", "score": 3} Let me know!',
+        '{"label": "ok", "score": 3, "tags": ["a", "b",],}',
+        '{"label": "ok", "score": 3, "tags": ["a", "b',
+    ],
+)
+def test_repairs_common_json_damage(raw: str) -> None:
+    result = parse_json_response(raw, Verdict)
+    assert (result.label, result.score) == ("ok", 3)
+
+
+def test_schema_mismatch_is_not_repaired() -> None:
+    with pytest.raises(ValidationError):
+        parse_json_response('{"label": "ok", "score": "high"}', Verdict)
+
+
+def test_dna_result_accepts_bare_profile() -> None:
+    result = parse_json_response(
+        '{"tone": "dry", "prominence_scores": {"tone": 80}, "consistency_score": 90}',
+        DNAAnalysisResult,
+    )
+    assert result.dna["tone"] == "dry"
+    assert result.prominence_scores == {"tone": 80}
+    assert result.consistency_score == 90
+
+
+# --- complete_structured ---
+
+
+async def test_repairable_reply_needs_no_reask() -> None:
+    send = ScriptedSend('```json\n{"label": "ok", "score": 1,}\n```')
+
+    result = await complete_structured(send, _MESSAGES, Verdict, provider="openai")
+
+    assert result.score == 1
+    assert len(send.calls) == 1
+
+
+async def test_reasks_with_validation_errors() -> None:
+    send = ScriptedSend('{"label": "ok"}', '{"label": "ok", "score": 2}')
+
+    result = await complete_structured(send, _MESSAGES, Verdict, provider="openai")
+
+    assert result.score == 2
+    reask = send.calls[1]
+    assert reask[: len(_MESSAGES)] == _MESSAGES
+    assert reask[-2] == {"role": "assistant", "content": '{"label": "ok"}'}
+    assert "score" in reask[-1]["content"]
+
+
+async def test_gives_up_after_max_reasks() -> None:
+    send = ScriptedSend("not json", "still not json")
+
+    with pytest.raises(LLMResponseFormatError) as exc_info:
+        await complete_structured(send, _MESSAGES, Verdict, provider="openai", max_reasks=1)
+
+    assert exc_info.value.code == "LLM_INVALID_RESPONSE"
+    assert len(send.calls) == 2
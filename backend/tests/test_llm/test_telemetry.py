@@ -0,0 +1,290 @@
+"""Tests for per-call LLM telemetry and the batched call ledger."""
+
+import asyncio
+import time
+from collections.abc import AsyncIterator
+from pathlib import Path
+
+import pytest
+from pydantic import BaseModel
+
+from app.exceptions import LLMNetworkError
+from app.llm.base import RetryPolicy, stream_with_retry, with_retry
+from app.llm.telemetry import (
+    CallLedger,
+    LLMCallRecord,
+    TelemetryProvider,
+    call_cost,
+    llm_operation,
+)
+from app.llm.usage import report_usage
+
+_MESSAGES = [{"role": "user", "content": "Hi"}]
+_NO_WAIT = RetryPolicy(max_retries=2, base_delay=0.0, max_delay=0.0)
+
+
+class MeteredProvider:
+    """Fake provider that reports fixed usage and fails the first ``failures`` calls."""
+
+    def __init__(self, failures: int = 0) -> None:
+        self.failures = failures
+
+    async def complete(
+        self,
+        messages: list[dict[str, str]],
+        *,
+        model: str | None = None,
+        temperature: float = 0.7,
+        max_tokens: int = 4096,
+    ) -> str:
+        if self.failures:
+            self.failures -= 1
+            raise LLMNetworkError(provider="openai", detail="reset")
+        report_usage(input_tokens=1000, output_tokens=200, cached_input_tokens=800)
+        return "ok"
+
+    async def complete_json[T: BaseModel](
+        self,
+        messages: list[dict[str, str]],
+        *,
+        schema: type[T],
+        model: str | None = None,
+        temperature: float = 0.7,
+        max_tokens: int = 4096,
+    ) -> T:
+        # Two upstream requests, as with a re-ask.
+        report_usage(input_tokens=100, output_tokens=10)
+        report_usage(input_tokens=150, output_tokens=20)
+        return schema.model_validate({})
+
+    async def stream(
+        self,
+        messages: list[dict[str, str]],
+        *,
+        model: str | None = None,
+        temperature: float = 0.7,
+        max_tokens: int = 4096,
+    ) -> AsyncIterator[str]:
+        if self.failures:
+            self.failures -= 1
+            raise LLMNetworkError(provider="openai", detail="reset")
+        report_usage(input_tokens=50)
+        yield "a"
+        yield "b"
+        report_usage(output_tokens=2)
+
+    async def count_tokens(self, text: str) -> int:
+        return len(text) // 4
+
+    async def test_connection(self) -> bool:
+        return True
+
+
+class RecordingLedger(CallLedger):
+    """Ledger that keeps records in memory instead of writing them."""
+
+    def __init__(self) -> None:
+        super().__init__(Path("unused.db"))
+        self.records: list[LLMCallRecord] = []
+
+    def record(self, record: LLMCallRecord) -> None:
+        self.records.append(record)
+
+
+def _telemetry(inner: MeteredProvider) -> tuple[TelemetryProvider, RecordingLedger]:
+    ledger = RecordingLedger()
+    provider = TelemetryProvider(
+        inner,  # type: ignore[arg-type]
+        ledger,
+        provider_name="openai",
+        default_model="gpt-4o",
+    )
+    return provider, ledger
+
+
+def _record(**overrides: object) -> LLMCallRecord:
+    values: dict[str, object] = {
+        "created_at": time.time(),
+        "operation": "generation",
+        "clone_id": "c1",
+        "provider": "openai",
+        "model": "gpt-4o",
+        "method": "complete",
+        "input_tokens": 100,
+        "output_tokens": 50,
+        "cached_input_tokens": 0,
+        "ttft_seconds": None,
+        "latency_seconds": 1.0,
+        "retries": 0,
+        "cost_usd": 0.001,
+        "error": None,
+    }
+    values.update(overrides)
+    return LLMCallRecord(**values)  # type: ignore[arg-type]
+
+
+# --- call_cost ---
+
+
+def test_call_cost_bills_cached_tokens_at_cached_rate() -> None:
+    # gpt-4o: $2.50 input, $1.25 cached input, $10 output per 1M tokens.
+    cost = call_cost(
+        "gpt-4o", input_tokens=1_000_000, output_tokens=100_000, cached_input_tokens=400_000
+    )
+    assert cost == pytest.approx(0.6 * 2.50 + 0.4 * 1.25 + 0.1 * 10.00)
+
+
+def test_call_cost_is_zero_for_unpriced_models() -> None:
+    assert call_cost("unknown-model", input_tokens=1000, output_tokens=1000) == 0.0
+
+
+# --- TelemetryProvider ---
+
+
+async def test_records_operation_tokens_and_cost() -> None:
+    provider, ledger = _telemetry(MeteredProvider())
+
+    with llm_operation("generation", clone_id="clone-1"):
+        await provider.complete(_MESSAGES)
+
+    [record] = ledger.records
+    assert (record.operation, record.clone_id) == ("generation", "clone-1")
+    assert (record.provider, record.model, record.method) == ("openai", "gpt-4o", "complete")
+    assert (record.input_tokens, record.output_tokens, record.cached_input_tokens) == (
+        1000,
+        200,
+        800,
+    )
+    assert record.cost_usd == call_cost(
+        "gpt-4o", input_tokens=1000, output_tokens=200, cached_input_tokens=800
+    )
+    assert record.ttft_seconds is None
+    assert record.error is None
+
+
+async def test_records_each_attempt_with_its_retry_number() -> None:
+    provider, ledger = _telemetry(MeteredProvider(failures=1))
+
+    await with_retry(provider.complete, _NO_WAIT)(_MESSAGES)
+
+    assert [(r.retries, r.error) for r in ledger.records] == [
+        (0, "LLM_NETWORK_ERROR"),
+        (1, None),
+    ]
+
+
+async def test_json_reasks_accumulate_into_one_record() -> None:
+    class Empty(BaseModel):
+        pass
+
+    provider, ledger = _telemetry(MeteredProvider())
+
+    await provider.complete_json(_MESSAGES, schema=Empty, model="gpt-4o-mini")
+
+    [record] = ledger.records
+    assert (record.model, record.method) == ("gpt-4o-mini", "complete_json")
+    assert (record.input_tokens, record.output_tokens) == (250, 30)
+
+
+async def test_stream_records_ttft_and_usage_after_last_chunk() -> None:
+    provider, ledger = _telemetry(MeteredProvider(failures=1))
+
+    with llm_operation("generation_stream"):
+        chunks = [c async for c in stream_with_retry(lambda: provider.stream(_MESSAGES), _NO_WAIT)]
+
+    assert chunks == ["a", "b"]
+    failed, succeeded = ledger.records
+    assert failed.error == "LLM_NETWORK_ERROR"
+    assert failed.ttft_seconds is None
+    assert succeeded.operation == "generation_stream"
+    assert succeeded.retries == 1
+    assert succeeded.ttft_seconds is not None
+    assert succeeded.ttft_seconds <= succeeded.latency_seconds
+    assert (succeeded.input_tokens, succeeded.output_tokens) == (50, 2)
+
+
+async def test_untagged_calls_have_no_operation() -> None:
+    provider, ledger = _telemetry(MeteredProvider())
+
+    await provider.complete(_MESSAGES)
+
+    assert (ledger.records[0].operation, ledger.records[0].clone_id) == (None, None)
+
+
+# --- CallLedger ---
+
+
+async def test_ledger_batches_and_summarizes(tmp_path: Path) -> None:
+    ledger = CallLedger(tmp_path / "telemetry.db", batch_size=100, flush_interval=60)
+    ledger.record(_record(latency_seconds=1.0, cost_usd=0.01))
+    ledger.record(_record(latency_seconds=3.0, cost_usd=0.02, retries=1, error="LLM_RATE_LIMIT"))
+    ledger.record(_record(operation="scoring", clone_id="c2", cost_usd=0.5))
+
+    # Nothing is written until a flush (here, triggered by the query).
+    assert not (tmp_path / "telemetry.db").exists()
+    summaries = await ledger.summary()
+    await ledger.aclose()
+
+    scoring, generation = summaries
+    assert scoring.operation == "scoring"
+    assert (generation.calls, generation.errors, generation.retries) == (2, 1, 1)
+    assert generation.input_tokens == 200
+    assert generation.avg_latency_seconds == 2.0
+    assert generation.max_latency_seconds == 3.0
+    assert generation.cost_usd == pytest.approx(0.03)
+
+
+async def test_ledger_summary_filters(tmp_path: Path) -> None:
+    ledger = CallLedger(tmp_path / "telemetry.db")
+    ledger.record(_record(created_at=time.time() - 3600))
+    ledger.record(_record(clone_id="c2"))
+
+    recent = await ledger.summary(since=time.time() - 60)
+    by_clone = await ledger.summary(clone_id="c2")
+    await ledger.aclose()
+
+    assert [s.calls for s in recent] == [1]
+    assert [s.calls for s in by_clone] == [1]
+
+
+async def test_ledger_flushes_full_batches_in_background(tmp_path: Path) -> None:
+    ledger = CallLedger(tmp_path / "telemetry.db", batch_size=2, flush_interval=60)
+    ledger.record(_record())
+    ledger.record(_record())
+
+    for _ in range(50):
+        if (tmp_path / "telemetry.db").exists() and not ledger._pending:
+            break
+        await asyncio.sleep(0.01)
+    assert not ledger._pending
+    await ledger.aclose()
+
+
+async def test_ledger_aclose_writes_pending_records(tmp_path: Path) -> None:
+    path = tmp_path / "telemetry.db"
+    ledger = CallLedger(path, flush_interval=60)
+    ledger.record(_record())
+    await ledger.aclose()
+
+    reopened = CallLedger(path)
+    [summary] = await reopened.summary()
+    await reopened.aclose()
+    assert summary.calls == 1
+
+
+async def test_feeds_prometheus_llm_metrics() -> None:
+    from app.metrics import LLM_LATENCY, LLM_STREAMS_IN_FLIGHT, LLM_TTFT
+
+    provider, _ = _telemetry(MeteredProvider())
+    before = LLM_LATENCY.count("openai", "gpt-4o", "stream", "ok")
+    ttft_before = LLM_TTFT.count("openai", "gpt-4o")
+
+    stream = provider.stream(_MESSAGES)
+    await anext(stream)
+    assert LLM_STREAMS_IN_FLIGHT.value("openai") == 1
+    async for _ in stream:
+        pass
+
+    assert LLM_STREAMS_IN_FLIGHT.value("openai") == 0
+    assert LLM_LATENCY.count("openai", "gpt-4o", "stream", "ok") == before + 1
+    assert LLM_TTFT.count("openai", "gpt-4o") == ttft_before + 1
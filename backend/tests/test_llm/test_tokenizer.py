@@ -0,0 +1,141 @@
+"""Tests for offline, memoized token counting."""
+
+import base64
+import logging
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from app.llm.tokenizer import (
+    TokenCounter,
+    context_window,
+    fits_context_window,
+    model_family,
+)
+
+
+class FakeEncoding:
+    """Stands in for a tiktoken Encoding: one token per whitespace-separated word."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def encode_ordinary(self, text: str) -> list[int]:
+        self.calls += 1
+        return [0] * len(text.split())
+
+
+# --- model_family ---
+
+
+def test_model_family_routes_by_prefix() -> None:
+    assert model_family("gpt-4o-mini") == ("openai", "o200k_base")
+    assert model_family("gpt-4-turbo") == ("openai", "cl100k_base")
+    assert model_family("claude-haiku-4-5-20251001") == ("anthropic", "o200k_base")
+    assert model_family("gemini-2.0-flash") == ("google", "o200k_base")
+
+
+def test_context_window_reads_model_pricing() -> None:
+    assert context_window("gpt-4o") == 128_000
+    assert context_window("unknown-model") is None
+
+
+def test_fits_context_window() -> None:
+    assert fits_context_window(120_000, "gpt-4o", max_output_tokens=8_000)
+    assert not fits_context_window(125_000, "gpt-4o", max_output_tokens=8_000)
+    assert fits_context_window(10**9, "unknown-model", max_output_tokens=0)
+
+
+# --- TokenCounter ---
+
+
+def test_fallback_without_vendored_files(tmp_path: Path) -> None:
+    """Without tiktoken files the count falls back to a per-family density."""
+    counter = TokenCounter(tmp_path)
+    text = "x" * 70
+
+    assert counter.count(text, "gpt-4o") == 18  # ceil(70 / 4)
+    assert counter.count(text, "claude-sonnet-4-5-20250929") == 20  # 70 / 3.5
+
+
+def test_fallback_is_logged_once_per_encoding(
+    tmp_path: Path, caplog: pytest.LogCaptureFixture
+) -> None:
+    counter = TokenCounter(tmp_path)
+
+    with caplog.at_level(logging.WARNING, logger="app.llm.tokenizer"):
+        counter.count("first", "gpt-4o")
+        counter.count("second", "claude-sonnet-4-5-20250929")
+        counter.count("third", "gpt-4-turbo")
+
+    assert [record.getMessage().split(";")[0] for record in caplog.records] == [
+        f"No vendored o200k_base tokenizer at {tmp_path / 'o200k_base.tiktoken'}",
+        f"No vendored cl100k_base tokenizer at {tmp_path / 'cl100k_base.tiktoken'}",
+    ]
+
+
+def test_loads_vendored_bpe_without_touching_the_environment(tmp_path: Path) -> None:
+    """A vendored file is read directly; tiktoken's cache directory is never set."""
+    pytest.importorskip("tiktoken")
+    # A byte-level BPE with no merges: every byte is one token.
+    (tmp_path / "o200k_base.tiktoken").write_bytes(
+        b"".join(base64.b64encode(bytes([byte])) + b" %d\n" % byte for byte in range(256))
+    )
+    counter = TokenCounter(tmp_path)
+
+    with patch.dict("os.environ", clear=False) as environ:
+        environ.pop("TIKTOKEN_CACHE_DIR", None)
+        assert counter.count("hello world", "gpt-4o") == 11
+        assert "TIKTOKEN_CACHE_DIR" not in environ
+
+
+def test_empty_text_is_zero_tokens(tmp_path: Path) -> None:
+    assert TokenCounter(tmp_path).count("", "gpt-4o") == 0
+
+
+def test_uses_encoding_when_available(tmp_path: Path) -> None:
+    counter = TokenCounter(tmp_path)
+    encoding = FakeEncoding()
+
+    with patch.object(counter, "_load_encoding", return_value=encoding):
+        assert counter.count("one two three", "gpt-4o") == 3
+        # Anthropic is counted with the o200k proxy, scaled up.
+        assert counter.count("one two three four five six seven eight nine ten", "claude-x") == 11
+
+
+def test_counts_are_memoized_by_text_hash(tmp_path: Path) -> None:
+    counter = TokenCounter(tmp_path)
+    encoding = FakeEncoding()
+
+    with patch.object(counter, "_load_encoding", return_value=encoding):
+        counter.count("same text", "gpt-4o")
+        counter.count("same text", "gpt-4o")
+
+    assert encoding.calls == 1
+
+
+def test_memo_is_bounded(tmp_path: Path) -> None:
+    counter = TokenCounter(tmp_path, cache_entries=2)
+    encoding = FakeEncoding()
+
+    with patch.object(counter, "_load_encoding", return_value=encoding):
+        for text in ("a", "b", "c", "a"):
+            counter.count(text, "gpt-4o")
+
+    # "a" was evicted by "c", so it is encoded twice.
+    assert encoding.calls == 4
+
+
+def test_missing_vendored_file_never_loads_tiktoken(tmp_path: Path) -> None:
+    counter = TokenCounter(tmp_path)
+
+    with patch.dict("sys.modules", {"tiktoken": None}):
+        assert counter._load_encoding("o200k_base") is None
+
+
+def test_count_messages_adds_framing(tmp_path: Path) -> None:
+    counter = TokenCounter(tmp_path)
+    messages = [{"role": "system", "content": "abcd"}, {"role": "user", "content": "abcd"}]
+
+    assert counter.count_messages(messages, "gpt-4o") == 2 * (1 + 4)
@@ -0,0 +1,123 @@
+"""Tests for the Prometheus-style metrics registry and instrumentation."""
+
+import asyncio
+from contextlib import suppress
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.metrics import (
+    _REQUEST_QUERIES,
+    DB_QUERY_LATENCY,
+    EVENT_LOOP_LAG,
+    Counter,
+    Gauge,
+    Histogram,
+    MetricsRegistry,
+    _RequestQueries,
+    instrument_engine,
+    monitor_event_loop,
+)
+
+# --- Registry rendering ---
+
+
+def test_counter_and_gauge_render_text_format() -> None:
+    registry = MetricsRegistry()
+    requests = registry.register(Counter("reqs_total", "Requests.", ("route",)))
+    in_flight = registry.register(Gauge("in_flight", "Open streams."))
+    requests.inc("/a")
+    requests.inc("/a", amount=2)
+    requests.inc('/b"x')
+    in_flight.inc()
+    in_flight.inc()
+    in_flight.dec()
+
+    assert registry.render() == (
+        "# HELP reqs_total Requests.\n"
+        "# TYPE reqs_total counter\n"
+        'reqs_total{route="/a"} 3\n'
+        'reqs_total{route="/b\\"x"} 1\n'
+        "# HELP in_flight Open streams.\n"
+        "# TYPE in_flight gauge\n"
+        "in_flight 1\n"
+    )
+
+
+def test_histogram_buckets_are_cumulative() -> None:
+    histogram = Histogram("latency_seconds", "Latency.", ("route",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value, "/a")
+
+    assert list(histogram.samples()) == [
+        'latency_seconds_bucket{route="/a",le="0.1"} 2',
+        'latency_seconds_bucket{route="/a",le="1"} 3',
+        'latency_seconds_bucket{route="/a",le="+Inf"} 4',
+        'latency_seconds_sum{route="/a"} 3.65',
+        'latency_seconds_count{route="/a"} 4',
+    ]
+
+
+def test_label_count_is_checked() -> None:
+    counter = Counter("c_total", "C.", ("a", "b"))
+    with pytest.raises(ValueError, match="expects labels"):
+        counter.inc("only-one")
+
+
+def test_duplicate_registration_is_rejected() -> None:
+    registry = MetricsRegistry()
+    registry.register(Counter("c_total", "C."))
+    with pytest.raises(ValueError, match="already registered"):
+        registry.register(Counter("c_total", "C."))
+
+
+# --- SQL instrumentation ---
+
+
+async def test_engine_events_time_queries_and_count_them_per_request() -> None:
+    engine = create_async_engine("sqlite+aiosqlite://")
+    instrument_engine(engine)
+    before = DB_QUERY_LATENCY.count("SELECT")
+    queries = _RequestQueries()
+    token = _REQUEST_QUERIES.set(queries)
+    try:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+            await conn.execute(text("SELECT 2"))
+    finally:
+        _REQUEST_QUERIES.reset(token)
+        await engine.dispose()
+
+    assert DB_QUERY_LATENCY.count("SELECT") == before + 2
+    assert queries.count == 2
+    assert queries.seconds > 0
+
+
+async def test_failed_statement_leaves_no_start_time_on_connection() -> None:
+    engine = create_async_engine("sqlite+aiosqlite://")
+    instrument_engine(engine)
+    try:
+        async with engine.connect() as conn:
+            with pytest.raises(OperationalError):
+                await conn.execute(text("SELECT * FROM missing_table"))
+            await conn.execute(text("SELECT 1"))
+
+            assert conn.info["query_started"] == []
+    finally:
+        await engine.dispose()
+
+
+# --- Event loop lag ---
+
+
+async def test_event_loop_monitor_observes_lag() -> None:
+    before = EVENT_LOOP_LAG.count()
+    monitor = asyncio.create_task(monitor_event_loop(0.001))
+    await asyncio.sleep(0.05)
+    monitor.cancel()
+    with suppress(asyncio.CancelledError):
+        await monitor
+
+    assert EVENT_LOOP_LAG.count() > before
@@ -5,7 +5,12 @@ from datetime import UTC, datetime, timedelta
 import pytest
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.exceptions import CloneNotFoundError, CloneSoftDeletedError, DemoCloneReadonlyError
+from app.exceptions import (
+    CloneNotFoundError,
+    CloneSoftDeletedError,
+    DemoCloneReadonlyError,
+    InvalidCursorError,
+)
 from app.models.clone import VoiceClone
 from app.schemas.clone import CloneCreate, CloneUpdate
 from app.services.clone_service import CloneService
@@ -97,6 +102,58 @@ async def test_list_clones_searches_by_name(service: CloneService, session: Asyn
     assert items[0].name == "Marketing Voice"
 
 
+async def test_list_clones_search_ranks_name_and_description(
+    service: CloneService, session: AsyncSession
+) -> None:
+    """list(search=...) should also match descriptions, best matches first."""
+    described = await _create_clone(session, name="Sales Voice")
+    described.description = "Used for marketing emails"
+    named = await _create_clone(session, name="Marketing Marketing Voice")
+    await session.flush()
+
+    items, total = await service.list(search="market")
+
+    assert total == 2
+    assert [c.id for c in items] == [named.id, described.id]
+
+
+async def test_list_clones_pages_with_cursor(service: CloneService, session: AsyncSession) -> None:
+    """list(limit=..., cursor=...) should seek past the previous page, newest first."""
+    created = [await _create_clone(session, name=f"Clone {i}") for i in range(3)]
+
+    first, total = await service.list(limit=2)
+    cursor = CloneService.next_cursor(first, 2)
+    assert cursor is not None
+    second, _total = await service.list(limit=2, cursor=cursor)
+
+    assert total == 3
+    assert CloneService.next_cursor(second, 2) is None
+    assert sorted(c.id for c in first + second) == sorted(c.id for c in created)
+
+
+async def test_list_clones_can_skip_count(service: CloneService, session: AsyncSession) -> None:
+    """list(count=False) should return the page with no total."""
+    await _create_clone(session, name="Clone A")
+
+    items, total = await service.list(count=False)
+
+    assert total is None
+    assert len(items) == 1
+
+
+async def test_list_clones_rejects_cursor_with_search(
+    service: CloneService, session: AsyncSession
+) -> None:
+    """list(search=..., cursor=...) should raise: ranked results have no cursor."""
+    await _create_clone(session, name="Marketing Voice")
+    items, _total = await service.list(limit=1)
+    cursor = CloneService.next_cursor(items, 1)
+    assert cursor is not None
+
+    with pytest.raises(InvalidCursorError):
+        await service.list(search="marketing", cursor=cursor)
+
+
 async def test_update_clone_name(service: CloneService, session: AsyncSession) -> None:
     """update() should modify the specified fields."""
     clone = await _create_clone(session, name="Old Name")
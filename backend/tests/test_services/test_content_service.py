@@ -5,16 +5,25 @@ from unittest.mock import AsyncMock
 
 import nanoid
 import pytest
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.exceptions import CloneNotFoundError, ContentNotFoundError
+from app.constants import CONTENT_SNAPSHOT_INTERVAL
+from app.exceptions import (
+    CloneNotFoundError,
+    ContentNotFoundError,
+    InvalidCursorError,
+    LLMResponseFormatError,
+)
 from app.models.clone import VoiceClone
-from app.models.content import Content
+from app.models.content import Content, ContentVersion
 from app.models.dna import VoiceDNAVersion
 from app.models.methodology import MethodologySettings
-from app.schemas.content import ContentUpdate
+from app.schemas.content import ContentUpdate, MultiPlatformDraft
 from app.services.content_service import ContentService
 
+LONG_POST = " ".join(f"Sentence {i} explains one part of the launch plan." for i in range(60))
+
 
 async def _create_content_item(
     session: AsyncSession,
@@ -136,6 +145,98 @@ class TestGenerateSinglePlatform:
         assert platforms == {"twitter", "linkedin"}
 
 
+class TestGenerateSingleCall:
+    async def test_single_call_covers_every_platform(self, session: AsyncSession) -> None:
+        """One structured completion should yield one Content row per platform."""
+        clone = await _create_clone(session)
+        await _create_dna(session, clone.id)
+
+        mock_provider = AsyncMock()
+        mock_provider.complete_json = AsyncMock(
+            return_value=MultiPlatformDraft(
+                posts={"twitter": "Short take.", "linkedin": "Longer take.", "blog": "Essay."}
+            )
+        )
+
+        service = ContentService(session, mock_provider)
+        results = await service.generate(
+            clone_id=clone.id,
+            platforms=["twitter", "linkedin", "blog"],
+            input_text="Write about testing.",
+            single_call=True,
+        )
+
+        assert [(c.platform, c.content_current) for c in results] == [
+            ("twitter", "Short take."),
+            ("linkedin", "Longer take."),
+            ("blog", "Essay."),
+        ]
+        mock_provider.complete.assert_not_called()
+        messages = mock_provider.complete_json.call_args.args[0]
+        assert "twitter, linkedin, blog" in messages[1]["content"]
+
+    async def test_missing_or_blank_platforms_fall_back(self, session: AsyncSession) -> None:
+        """Platforms absent or blank in the reply should get their own calls."""
+        clone = await _create_clone(session)
+        await _create_dna(session, clone.id)
+
+        mock_provider = AsyncMock()
+        mock_provider.complete_json = AsyncMock(
+            return_value=MultiPlatformDraft(posts={"twitter": "Short take.", "linkedin": " "})
+        )
+        mock_provider.complete = AsyncMock(return_value="Fallback text.")
+
+        service = ContentService(session, mock_provider)
+        results = await service.generate(
+            clone_id=clone.id,
+            platforms=["twitter", "linkedin", "blog"],
+            input_text="Write about testing.",
+            single_call=True,
+        )
+
+        assert [c.content_current for c in results] == [
+            "Short take.",
+            "Fallback text.",
+            "Fallback text.",
+        ]
+        assert mock_provider.complete.await_count == 2
+
+    async def test_unparseable_reply_falls_back_entirely(self, session: AsyncSession) -> None:
+        clone = await _create_clone(session)
+        await _create_dna(session, clone.id)
+
+        mock_provider = AsyncMock()
+        mock_provider.complete_json = AsyncMock(
+            side_effect=LLMResponseFormatError(provider="openai", detail="bad json")
+        )
+        mock_provider.complete = AsyncMock(return_value="Fallback text.")
+
+        service = ContentService(session, mock_provider)
+        results = await service.generate(
+            clone_id=clone.id,
+            platforms=["twitter", "blog"],
+            input_text="Write about testing.",
+            single_call=True,
+        )
+
+        assert len(results) == 2
+        assert mock_provider.complete.await_count == 2
+
+    async def test_single_platform_skips_structured_call(self, session: AsyncSession) -> None:
+        clone = await _create_clone(session)
+        await _create_dna(session, clone.id)
+
+        mock_provider = AsyncMock()
+        mock_provider.complete = AsyncMock(return_value="Only text.")
+
+        service = ContentService(session, mock_provider)
+        await service.generate(
+            clone_id=clone.id, platforms=["blog"], input_text="Write.", single_call=True
+        )
+
+        mock_provider.complete_json.assert_not_called()
+
+
 class TestPromptConstruction:
     async def test_prompt_includes_voice_dna(self, session: AsyncSession) -> None:
         """The generation prompt should include voice DNA traits."""
@@ -283,6 +384,21 @@ class TestErrorHandling:
         assert results[0].input_text == "Test."
 
 
+async def _stored_versions(
+    session: AsyncSession, content_id: str
+) -> dict[int, tuple[str | None, int | None, bool]]:
+    """Map version number to its stored (content_text, base_version, has_delta) columns."""
+    result = await session.execute(
+        select(
+            ContentVersion.version_number,
+            ContentVersion.content_text,
+            ContentVersion.base_version,
+            ContentVersion.delta.is_not(None),
+        ).where(ContentVersion.content_id == content_id)
+    )
+    return {number: (text, base, has_delta) for number, text, base, has_delta in result}
+
+
 async def _create_clone_with_dna(session: AsyncSession) -> VoiceClone:
     """Create a clone with DNA for CRUD tests."""
     clone = await _create_clone(session)
@@ -423,6 +539,65 @@ class TestContentVersions:
         assert versions[0].version_number > versions[1].version_number
         assert versions[1].version_number > versions[2].version_number
 
+    async def test_versions_are_numbered_from_the_counter(self, session: AsyncSession) -> None:
+        """Each new version should take the next latest_version of its content item."""
+        clone = await _create_clone_with_dna(session)
+        content = await _generate_content(session, clone)
+        assert content.latest_version == 1
+
+        service = ContentService(session)
+        await service.update(content.id, ContentUpdate(content_current="Edit one."))
+        await service.restore_version(content.id, version_number=1)
+
+        versions = await service.list_versions(content.id)
+        assert [v.version_number for v in versions] == [3, 2, 1]
+        assert content.latest_version == 3
+
+    async def test_edits_store_deltas_and_rebuild_on_read(self, session: AsyncSession) -> None:
+        """Later versions should store a delta, not the text, and read back in full."""
+        clone = await _create_clone_with_dna(session)
+        service = ContentService(session)
+        content = await service.import_content(clone.id, "blog", LONG_POST)
+        edited = LONG_POST.replace("Sentence 3 ", "Sentence three ")
+        await service.update(content.id, ContentUpdate(content_current=edited))
+
+        stored = await _stored_versions(session, content.id)
+        assert stored[1] == (LONG_POST, None, False)
+        assert stored[2] == (None, 1, True)
+
+        content_id = content.id
+        session.expire_all()
+        versions = await service.list_versions(content_id)
+        assert [v.content_text for v in versions] == [edited, LONG_POST]
+
+    async def test_restore_references_identical_version(self, session: AsyncSession) -> None:
+        """Restoring unchanged text should store a reference to the matching version."""
+        clone = await _create_clone_with_dna(session)
+        service = ContentService(session)
+        content = await service.import_content(clone.id, "blog", LONG_POST)
+        await service.update(content.id, ContentUpdate(content_current="Short rewrite."))
+        content_id = content.id
+        session.expire_all()
+
+        restored = await service.restore_version(content_id, version_number=1)
+
+        assert restored.content_current == LONG_POST
+        stored = await _stored_versions(session, content_id)
+        assert stored[3] == (None, 1, False)
+
+    async def test_snapshot_every_interval(self, session: AsyncSession) -> None:
+        """A full snapshot should be stored after CONTENT_SNAPSHOT_INTERVAL - 1 deltas."""
+        clone = await _create_clone_with_dna(session)
+        service = ContentService(session)
+        content = await service.import_content(clone.id, "blog", LONG_POST)
+        for i in range(CONTENT_SNAPSHOT_INTERVAL):
+            text = LONG_POST.replace("Sentence 1 ", f"Sentence {i}b ")
+            await service.update(content.id, ContentUpdate(content_current=text))
+
+        stored = await _stored_versions(session, content.id)
+        snapshots = [number for number, (text, _, _) in stored.items() if text is not None]
+        assert snapshots == [1, CONTENT_SNAPSHOT_INTERVAL + 1]
+
     async def test_restore_version(self, session: AsyncSession) -> None:
         """restore_version should set content_current to the target version's text."""
         clone = await _create_clone_with_dna(session)
@@ -533,6 +708,21 @@ class TestListContent:
         assert total == 1
         assert "machine" in items[0].content_current.lower()
 
+    async def test_search_ranks_by_relevance_with_snippets(self, session: AsyncSession) -> None:
+        """list with search orders by bm25 and can project a highlighted snippet."""
+        clone = await _create_clone_with_dna(session)
+        await _create_content_item(session, clone.id, content_text="Pricing notes and a launch")
+        best = await _create_content_item(
+            session, clone.id, content_text="Launch checklist for the launch"
+        )
+
+        service = ContentService(session)
+        items, total = await service.list(search="launch", fields=["snippet"])
+
+        assert total == 2
+        assert items[0].id == best.id
+        assert items[0].snippet == "<mark>Launch</mark> checklist for the <mark>launch</mark>"
+
     async def test_sort_by_score(self, session: AsyncSession) -> None:
         """list_content sorted by authenticity_score desc returns highest first."""
         clone = await _create_clone_with_dna(session)
@@ -562,6 +752,74 @@ class TestListContent:
         assert items[0].platform == "linkedin"
         assert items[0].status == "draft"
 
+    async def test_list_projects_columns_without_versions(self, session: AsyncSession) -> None:
+        """list with fields should select only those columns and never load versions."""
+        clone = await _create_clone_with_dna(session)
+        await _create_content_item(session, clone.id, content_text="Hello there world")
+
+        service = ContentService(session)
+        items, total = await service.list(fields=["status", "preview"], preview_chars=5)
+
+        assert total == 1
+        assert items[0]._fields == ("id", "status", "preview", "created_at")
+        assert items[0].preview == "Hello"
+
+    async def test_list_rejects_unknown_fields(self, session: AsyncSession) -> None:
+        """list with an unknown field should raise ValueError."""
+        service = ContentService(session)
+
+        with pytest.raises(ValueError, match="versions"):
+            await service.list(fields=["versions"])
+
+    async def test_cursor_pages_through_ties_without_gaps(self, session: AsyncSession) -> None:
+        """Cursor pages over a sort with ties should return every row exactly once."""
+        clone = await _create_clone_with_dna(session)
+        created = [
+            await _create_content_item(session, clone.id, authenticity_score=score)
+            for score in (70, None, 70, 90, None)
+        ]
+
+        service = ContentService(session)
+        seen: list[str] = []
+        cursor: str | None = None
+        for _ in range(3):
+            rows, _total = await service.list(
+                sort="authenticity_score", order="desc", limit=2, cursor=cursor, count=False
+            )
+            seen.extend(row.id for row in rows)
+            cursor = ContentService.next_cursor(rows, 2, sort="authenticity_score", order="desc")
+            if cursor is None:
+                break
+
+        assert sorted(seen) == sorted(c.id for c in created)
+        assert len(seen) == len(set(seen))
+        scores = {c.id: c.authenticity_score for c in created}
+        assert [scores[i] for i in seen] == [90, 70, 70, None, None]
+
+    async def test_list_without_count_returns_none_total(self, session: AsyncSession) -> None:
+        """list(count=False) should skip the count query."""
+        clone = await _create_clone_with_dna(session)
+        await _create_content_item(session, clone.id)
+
+        service = ContentService(session)
+        items, total = await service.list(count=False)
+
+        assert len(items) == 1
+        assert total is None
+
+    async def test_cursor_for_another_sort_is_rejected(self, session: AsyncSession) -> None:
+        """A cursor issued for one sort should be refused under another."""
+        clone = await _create_clone_with_dna(session)
+        await _create_content_item(session, clone.id)
+
+        service = ContentService(session)
+        rows, _total = await service.list(limit=1)
+        cursor = ContentService.next_cursor(rows, 1)
+        assert cursor is not None
+
+        with pytest.raises(InvalidCursorError):
+            await service.list(sort="word_count", cursor=cursor)
+
 
 class TestBulkOperations:
     async def test_bulk_status_update(self, session: AsyncSession) -> None:
@@ -1,6 +1,7 @@
 """Tests for token cost estimator service."""
 
-from app.constants import MODEL_PRICING, PROVIDER_MODELS
+from app.constants import MODEL_PRICING, PROVIDER_MODELS, SINGLE_CALL_MAX_TOKENS
+from app.llm.tokenizer import count_tokens
 from app.services.cost_estimator import (
     CostEstimate,
     estimate_dna_analysis,
@@ -43,6 +44,13 @@ class TestEstimateDnaAnalysisTokens:
         )
         assert with_meth.input_tokens > without.input_tokens
 
+    def test_flags_prompts_over_context_window(self) -> None:
+        """Samples that cannot fit the model's context window should be flagged."""
+        small = estimate_dna_analysis(["Short sample."], model="gpt-4o")
+        huge = estimate_dna_analysis(["word " * 200_000], model="gpt-4o")
+        assert small.fits_context_window is True
+        assert huge.fits_context_window is False
+
 
 class TestEstimateGenerationCost:
     def test_returns_cost_estimate(self) -> None:
@@ -91,6 +99,83 @@ class TestEstimateGenerationCost:
         )
         assert expensive.cost_usd > cheap.cost_usd
 
+    def test_single_call_sends_the_prompt_once(self) -> None:
+        """Single-call mode counts the shared prompt once, not per platform."""
+        platforms = ["linkedin", "twitter", "email"]
+        one = estimate_generation(
+            input_text="Write about AI " * 50,
+            dna_summary="Professional tone",
+            platforms=["linkedin"],
+            model="gpt-4o",
+        )
+        separate = estimate_generation(
+            input_text="Write about AI " * 50,
+            dna_summary="Professional tone",
+            platforms=platforms,
+            model="gpt-4o",
+        )
+        combined = estimate_generation(
+            input_text="Write about AI " * 50,
+            dna_summary="Professional tone",
+            platforms=platforms,
+            model="gpt-4o",
+            single_call=True,
+        )
+        assert combined.input_tokens == one.input_tokens
+        assert combined.output_tokens == separate.output_tokens
+        assert combined.cost_usd < separate.cost_usd
+
+    def test_single_call_output_is_capped_by_one_budget(self) -> None:
+        """All drafts share one request's output budget."""
+        platforms = [f"platform-{i}" for i in range(20)]
+        result = estimate_generation(
+            input_text="Write about AI",
+            dna_summary="Professional tone",
+            platforms=platforms,
+            model="gpt-4o",
+            single_call=True,
+        )
+        assert result.output_tokens == SINGLE_CALL_MAX_TOKENS
+
+    def test_single_call_checks_the_combined_request_against_the_window(self) -> None:
+        """The one request must fit its prompt plus the whole single-call budget."""
+        window = int(MODEL_PRICING["gpt-4o"]["context_window"])
+        # Fits alongside one platform's budget, but not the single-call budget.
+        chunk = "word " * 1000
+        input_text = chunk * (
+            (window - SINGLE_CALL_MAX_TOKENS // 2) // count_tokens(chunk, "gpt-4o")
+        )
+        platforms = ["linkedin", "twitter"]
+        separate = estimate_generation(
+            input_text=input_text, dna_summary="", platforms=platforms, model="gpt-4o"
+        )
+        combined = estimate_generation(
+            input_text=input_text,
+            dna_summary="",
+            platforms=platforms,
+            model="gpt-4o",
+            single_call=True,
+        )
+        assert separate.fits_context_window is True
+        assert combined.fits_context_window is False
+
+    def test_single_call_ignored_for_one_platform(self) -> None:
+        """A lone platform is generated with its own call either way."""
+        plain = estimate_generation(
+            input_text="Write about AI",
+            dna_summary="Professional tone",
+            platforms=["linkedin"],
+            model="gpt-4o",
+        )
+        single = estimate_generation(
+            input_text="Write about AI",
+            dna_summary="Professional tone",
+            platforms=["linkedin"],
+            model="gpt-4o",
+            single_call=True,
+        )
+        assert single == plain
+
 
 class TestFormatCost:
     def test_format_small_cost(self) -> None:
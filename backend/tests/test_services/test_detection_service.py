@@ -6,14 +6,27 @@ from unittest.mock import AsyncMock
 
 import nanoid
 import pytest
+from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.exceptions import ContentNotFoundError
+from app.llm.structured import parse_json_response
 from app.models.clone import VoiceClone
 from app.models.content import Content
 from app.services.detection_service import DetectionService
 
 
+def _json_reply(raw: str) -> Any:
+    """side_effect for a mocked complete_json that validates ``raw`` like a real provider."""
+
+    async def complete_json(
+        messages: list[dict[str, str]], *, schema: type[BaseModel], **kwargs: Any
+    ) -> BaseModel:
+        return parse_json_response(raw, schema)
+
+    return complete_json
+
+
 def _make_detection_response(
     *,
     risk_level: str = "medium",
@@ -71,7 +84,9 @@ class TestDetectionService:
         content = await _create_content(session, clone.id)
 
         mock_provider = AsyncMock()
-        mock_provider.complete = AsyncMock(return_value=_make_detection_response(risk_level="high"))
+        mock_provider.complete_json = AsyncMock(
+            side_effect=_json_reply(_make_detection_response(risk_level="high"))
+        )
 
         service = DetectionService(session, mock_provider)
         result = await service.detect(content.id)
@@ -84,7 +99,9 @@ class TestDetectionService:
         content = await _create_content(session, clone.id)
 
         mock_provider = AsyncMock()
-        mock_provider.complete = AsyncMock(return_value=_make_detection_response(confidence=85))
+        mock_provider.complete_json = AsyncMock(
+            side_effect=_json_reply(_make_detection_response(confidence=85))
+        )
 
         service = DetectionService(session, mock_provider)
         result = await service.detect(content.id)
@@ -109,7 +126,9 @@ class TestDetectionService:
             },
         ]
         mock_provider = AsyncMock()
-        mock_provider.complete = AsyncMock(return_value=_make_detection_response(flagged=flagged))
+        mock_provider.complete_json = AsyncMock(
+            side_effect=_json_reply(_make_detection_response(flagged=flagged))
+        )
 
         service = DetectionService(session, mock_provider)
         result = await service.detect(content.id)
@@ -122,7 +141,7 @@ class TestDetectionService:
         content = await _create_content(session, clone.id)
 
         mock_provider = AsyncMock()
-        mock_provider.complete = AsyncMock(return_value=_make_detection_response())
+        mock_provider.complete_json = AsyncMock(side_effect=_json_reply(_make_detection_response()))
 
         service = DetectionService(session, mock_provider)
         result = await service.detect(content.id)
@@ -147,12 +166,14 @@ class TestDetectionService:
 
         captured_messages: list[list[dict[str, str]]] = []
 
-        async def capture_complete(messages: list[dict[str, str]], **kwargs: Any) -> str:
+        async def capture_complete(
+            messages: list[dict[str, str]], *, schema: type[BaseModel], **kwargs: Any
+        ) -> BaseModel:
             captured_messages.append(messages)
-            return _make_detection_response()
+            return parse_json_response(_make_detection_response(), schema)
 
         mock_provider = AsyncMock()
-        mock_provider.complete = AsyncMock(side_effect=capture_complete)
+        mock_provider.complete_json = AsyncMock(side_effect=capture_complete)
 
         service = DetectionService(session, mock_provider)
         await service.detect(content.id)
@@ -167,8 +188,10 @@ class TestDetectionService:
         content = await _create_content(session, clone.id)
 
         mock_provider = AsyncMock()
-        mock_provider.complete = AsyncMock(
-            return_value=_make_detection_response(summary="Text appears mostly human-written.")
+        mock_provider.complete_json = AsyncMock(
+            side_effect=_json_reply(
+                _make_detection_response(summary="Text appears mostly human-written.")
+            )
         )
 
         service = DetectionService(session, mock_provider)
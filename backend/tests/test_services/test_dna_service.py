@@ -1,18 +1,34 @@
 """Tests for DNA analysis service."""
 
 import json
+import logging
+from typing import Any
 from unittest.mock import AsyncMock
 
 import pytest
+from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.exceptions import AnalysisFailedError, CloneNotFoundError
+from app.llm.structured import parse_json_response
 from app.models.clone import VoiceClone
 from app.models.dna import VoiceDNAVersion
 from app.models.methodology import MethodologySettings, MethodologyVersion
 from app.models.sample import WritingSample
 from app.services.dna_service import DNAService
 
+
+def _json_reply(raw: str) -> Any:
+    """side_effect for a mocked complete_json that validates ``raw`` like a real provider."""
+
+    async def complete_json(
+        messages: list[dict[str, str]], *, schema: type[BaseModel], **kwargs: Any
+    ) -> BaseModel:
+        return parse_json_response(raw, schema)
+
+    return complete_json
+
+
 MOCK_DNA_RESPONSE = json.dumps(
     {
         "dna": {
@@ -67,6 +83,7 @@ async def _seed_methodology(session: AsyncSession) -> None:
     settings = MethodologySettings(
         section_key="voice_cloning",
         current_content="Analyze voice patterns across 9 dimensions.",
+        latest_version=1,
     )
     session.add(settings)
     await session.flush()
@@ -87,7 +104,7 @@ class TestAnalyze:
         await _seed_methodology(session)
 
         mock_provider = AsyncMock()
-        mock_provider.complete = AsyncMock(return_value=MOCK_DNA_RESPONSE)
+        mock_provider.complete_json = AsyncMock(side_effect=_json_reply(MOCK_DNA_RESPONSE))
 
         svc = DNAService(session)
         dna = await svc.analyze(clone.id, mock_provider, model="gpt-4o")
@@ -105,7 +122,7 @@ class TestAnalyze:
         await _seed_methodology(session)
 
         mock_provider = AsyncMock()
-        mock_provider.complete = AsyncMock(return_value=MOCK_DNA_RESPONSE)
+        mock_provider.complete_json = AsyncMock(side_effect=_json_reply(MOCK_DNA_RESPONSE))
 
         svc = DNAService(session)
         await svc.analyze(clone.id, mock_provider, model="gpt-4o")
@@ -148,30 +165,71 @@ class TestAnalyze:
         await _seed_methodology(session)
 
         mock_provider = AsyncMock()
-        mock_provider.complete = AsyncMock(return_value=MOCK_DNA_RESPONSE)
+        mock_provider.complete_json = AsyncMock(side_effect=_json_reply(MOCK_DNA_RESPONSE))
 
         svc = DNAService(session)
         await svc.analyze(clone.id, mock_provider, model="gpt-4o")
 
         # Verify LLM was called with messages containing both samples
-        call_args = mock_provider.complete.call_args
+        call_args = mock_provider.complete_json.call_args
         messages = call_args.args[0] if call_args.args else call_args.kwargs["messages"]
         user_msg = next(m for m in messages if m["role"] == "user")
         assert "Sample 1" in user_msg["content"]
         assert "Sample 2" in user_msg["content"]
 
+    async def test_drops_samples_beyond_context_window(
+        self, session: AsyncSession, caplog: pytest.LogCaptureFixture
+    ) -> None:
+        """analyze keeps only the leading samples that fit and records how many it skipped."""
+        clone = await _create_clone(session)
+        oversized = WritingSample(
+            clone_id=clone.id,
+            content="word " * 200_000,
+            content_type="blog_post",
+            word_count=200_000,
+            source_type="paste",
+        )
+        session.add(oversized)
+        await session.flush()
+        await _seed_methodology(session)
+
+        mock_provider = AsyncMock()
+        mock_provider.complete_json = AsyncMock(side_effect=_json_reply(MOCK_DNA_RESPONSE))
+
+        svc = DNAService(session)
+        with caplog.at_level(logging.WARNING, logger="app.services.dna_service"):
+            dna = await svc.analyze(clone.id, mock_provider, model="gpt-4o")
+
+        messages = mock_provider.complete_json.call_args.args[0]
+        user_msg = next(m for m in messages if m["role"] == "user")
+        assert "Sample 1" in user_msg["content"]
+        assert "Sample 2" not in user_msg["content"]
+        assert dna.data["skipped_samples"] == 1
+        assert "1 of 2 samples" in caplog.text
+
+    async def test_no_skipped_samples_key_when_all_fit(self, session: AsyncSession) -> None:
+        clone = await _create_clone(session)
+        await _seed_methodology(session)
+
+        mock_provider = AsyncMock()
+        mock_provider.complete_json = AsyncMock(side_effect=_json_reply(MOCK_DNA_RESPONSE))
+
+        dna = await DNAService(session).analyze(clone.id, mock_provider, model="gpt-4o")
+
+        assert "skipped_samples" not in dna.data
+
     async def test_includes_methodology_in_prompt(self, session: AsyncSession) -> None:
         """analyze includes methodology instructions in the LLM prompt."""
         clone = await _create_clone(session)
         await _seed_methodology(session)
 
         mock_provider = AsyncMock()
-        mock_provider.complete = AsyncMock(return_value=MOCK_DNA_RESPONSE)
+        mock_provider.complete_json = AsyncMock(side_effect=_json_reply(MOCK_DNA_RESPONSE))
 
         svc = DNAService(session)
         await svc.analyze(clone.id, mock_provider, model="gpt-4o")
 
-        call_args = mock_provider.complete.call_args
+        call_args = mock_provider.complete_json.call_args
         messages = call_args.args[0] if call_args.args else call_args.kwargs["messages"]
         system_msg = next(m for m in messages if m["role"] == "system")
         assert "9 dimensions" in system_msg["content"]
@@ -182,7 +240,7 @@ class TestAnalyze:
         await _seed_methodology(session)
 
         mock_provider = AsyncMock()
-        mock_provider.complete = AsyncMock(side_effect=Exception("LLM down"))
+        mock_provider.complete_json = AsyncMock(side_effect=Exception("LLM down"))
 
         svc = DNAService(session)
 
@@ -195,7 +253,7 @@ class TestAnalyze:
         await _seed_methodology(session)
 
         mock_provider = AsyncMock()
-        mock_provider.complete = AsyncMock(return_value=MOCK_DNA_RESPONSE)
+        mock_provider.complete_json = AsyncMock(side_effect=_json_reply(MOCK_DNA_RESPONSE))
 
         svc = DNAService(session)
         dna = await svc.analyze(clone.id, mock_provider, model="gpt-4o")
@@ -210,7 +268,7 @@ class TestAnalyze:
         await _seed_methodology(session)
 
         mock_provider = AsyncMock()
-        mock_provider.complete = AsyncMock(return_value=MOCK_DNA_RESPONSE)
+        mock_provider.complete_json = AsyncMock(side_effect=_json_reply(MOCK_DNA_RESPONSE))
 
         svc = DNAService(session)
         dna = await svc.analyze(clone.id, mock_provider, model="gpt-4o")
@@ -269,6 +327,7 @@ class TestManualEdit:
             model_used="gpt-4o",
         )
         session.add(v1)
+        clone.latest_version = 1
         await session.flush()
 
         svc = DNAService(session)
@@ -312,6 +371,7 @@ class TestRevert:
             model_used="gpt-4o",
         )
         session.add_all([v1, v2])
+        clone.latest_version = 2
         await session.flush()
 
         svc = DNAService(session)
@@ -352,6 +412,7 @@ class TestRevert:
                 model_used="gpt-4o",
             )
             session.add(v)
+        clone.latest_version = 2
         await session.flush()
 
         svc = DNAService(session)
@@ -417,10 +478,11 @@ class TestPruning:
                 model_used="gpt-4o",
             )
             session.add(v)
+        clone.latest_version = 10
         await session.flush()
 
         mock_provider = AsyncMock()
-        mock_provider.complete = AsyncMock(return_value=MOCK_DNA_RESPONSE)
+        mock_provider.complete_json = AsyncMock(side_effect=_json_reply(MOCK_DNA_RESPONSE))
 
         svc = DNAService(session)
         dna = await svc.analyze(clone.id, mock_provider, model="gpt-4o")
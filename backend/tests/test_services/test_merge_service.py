@@ -1,13 +1,16 @@
 """Tests for merge service."""
 
 import json
+from typing import Any
 from unittest.mock import AsyncMock
 
 import pytest
+from pydantic import BaseModel
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.exceptions import CloneNotFoundError, MergeFailedError
+from app.llm.structured import parse_json_response
 from app.models.clone import MergedCloneSource, VoiceClone
 from app.models.dna import VoiceDNAVersion
 from app.models.sample import WritingSample
@@ -15,6 +18,18 @@ from app.schemas.sample import SampleCreate
 from app.services.merge_service import MergeService
 from app.services.sample_service import SampleService
 
+
+def _json_reply(raw: str) -> Any:
+    """side_effect for a mocked complete_json that validates ``raw`` like a real provider."""
+
+    async def complete_json(
+        messages: list[dict[str, str]], *, schema: type[BaseModel], **kwargs: Any
+    ) -> BaseModel:
+        return parse_json_response(raw, schema)
+
+    return complete_json
+
+
 MOCK_MERGE_RESPONSE = json.dumps(
     {
         "dna": {
@@ -83,7 +98,7 @@ class TestMerge:
         """merge returns a clone with type='merged' and correct name."""
         clones = await _setup_source_clones(session, count=2)
         provider = AsyncMock()
-        provider.complete = AsyncMock(return_value=MOCK_MERGE_RESPONSE)
+        provider.complete_json = AsyncMock(side_effect=_json_reply(MOCK_MERGE_RESPONSE))
 
         svc = MergeService(session)
         result = await svc.merge(
@@ -103,7 +118,7 @@ class TestMerge:
         """MergedCloneSource records are created with correct weights."""
         clones = await _setup_source_clones(session, count=2)
         provider = AsyncMock()
-        provider.complete = AsyncMock(return_value=MOCK_MERGE_RESPONSE)
+        provider.complete_json = AsyncMock(side_effect=_json_reply(MOCK_MERGE_RESPONSE))
 
         svc = MergeService(session)
         result = await svc.merge(
@@ -131,7 +146,7 @@ class TestMerge:
         """provider.complete() call contains all source DNAs and weight info."""
         clones = await _setup_source_clones(session, count=2)
         provider = AsyncMock()
-        provider.complete = AsyncMock(return_value=MOCK_MERGE_RESPONSE)
+        provider.complete_json = AsyncMock(side_effect=_json_reply(MOCK_MERGE_RESPONSE))
 
         svc = MergeService(session)
         await svc.merge(
@@ -144,8 +159,8 @@ class TestMerge:
             model="gpt-4o",
         )
 
-        provider.complete.assert_called_once()
-        call_args = provider.complete.call_args
+        provider.complete_json.assert_called_once()
+        call_args = provider.complete_json.call_args
         messages = call_args.args[0] if call_args.args else call_args.kwargs["messages"]
         user_msg = next(m for m in messages if m["role"] == "user")
 
@@ -159,7 +174,7 @@ class TestMerge:
         """The created clone has type == 'merged'."""
         clones = await _setup_source_clones(session, count=2)
         provider = AsyncMock()
-        provider.complete = AsyncMock(return_value=MOCK_MERGE_RESPONSE)
+        provider.complete_json = AsyncMock(side_effect=_json_reply(MOCK_MERGE_RESPONSE))
 
         svc = MergeService(session)
         result = await svc.merge(
@@ -184,7 +199,7 @@ class TestMerge:
         """SampleService.create() raises ValueError for merged clone."""
         clones = await _setup_source_clones(session, count=2)
         provider = AsyncMock()
-        provider.complete = AsyncMock(return_value=MOCK_MERGE_RESPONSE)
+        provider.complete_json = AsyncMock(side_effect=_json_reply(MOCK_MERGE_RESPONSE))
 
         svc = MergeService(session)
         merged = await svc.merge(
@@ -206,7 +221,7 @@ class TestMerge:
         """After deleting a source clone, MergedCloneSource still exists but source is gone."""
         clones = await _setup_source_clones(session, count=2)
         provider = AsyncMock()
-        provider.complete = AsyncMock(return_value=MOCK_MERGE_RESPONSE)
+        provider.complete_json = AsyncMock(side_effect=_json_reply(MOCK_MERGE_RESPONSE))
 
         svc = MergeService(session)
         merged = await svc.merge(
@@ -237,7 +252,7 @@ class TestMerge:
         """LLM raises exception — no clone or DNA records should exist."""
         clones = await _setup_source_clones(session, count=2)
         provider = AsyncMock()
-        provider.complete = AsyncMock(side_effect=Exception("LLM down"))
+        provider.complete_json = AsyncMock(side_effect=Exception("LLM down"))
 
         svc = MergeService(session)
         with pytest.raises(MergeFailedError):
@@ -260,7 +275,7 @@ class TestMerge:
         """merge raises CloneNotFoundError when a source clone doesn't exist."""
         clones = await _setup_source_clones(session, count=1)
         provider = AsyncMock()
-        provider.complete = AsyncMock(return_value=MOCK_MERGE_RESPONSE)
+        provider.complete_json = AsyncMock(side_effect=_json_reply(MOCK_MERGE_RESPONSE))
 
         svc = MergeService(session)
         with pytest.raises(CloneNotFoundError):
@@ -284,7 +299,7 @@ class TestMerge:
         await session.flush()
 
         provider = AsyncMock()
-        provider.complete = AsyncMock(return_value=MOCK_MERGE_RESPONSE)
+        provider.complete_json = AsyncMock(side_effect=_json_reply(MOCK_MERGE_RESPONSE))
 
         svc = MergeService(session)
         with pytest.raises(ValueError, match="no DNA"):
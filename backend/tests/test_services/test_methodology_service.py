@@ -18,6 +18,7 @@ async def _seed_section(
     settings = MethodologySettings(
         section_key=section_key,
         current_content=content,
+        latest_version=1,
     )
     session.add(settings)
     await session.flush()
@@ -181,6 +182,7 @@ class TestPrune:
                 trigger="manual_edit",
             )
             session.add(v)
+        seed.latest_version = 11
         await session.flush()
 
         svc = MethodologyService(session)
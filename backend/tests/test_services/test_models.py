@@ -189,6 +189,36 @@ async def test_content_has_version_history(session: AsyncSession) -> None:
     assert fetched.content_current == "Current text"
 
 
+async def test_content_version_number_unique_per_content(session: AsyncSession) -> None:
+    """Two versions of one content item should not share a version_number."""
+    clone = VoiceClone(id=nanoid.generate(), name="Version Clone")
+    content = Content(
+        clone=clone,
+        platform="blog",
+        status="draft",
+        content_current="Text",
+        content_original="Text",
+        input_text="Input",
+        word_count=1,
+        char_count=4,
+    )
+    session.add(content)
+    await session.flush()
+
+    for _ in range(2):
+        session.add(
+            ContentVersion(
+                content_id=content.id,
+                version_number=1,
+                content_text="Text",
+                trigger="generation",
+                word_count=1,
+            )
+        )
+    with pytest.raises(IntegrityError):
+        await session.flush()
+
+
 async def test_content_has_all_fields(session: AsyncSession) -> None:
     """Content should support all fields including optional ones."""
     clone = VoiceClone(id=nanoid.generate(), name="Full Content Clone")
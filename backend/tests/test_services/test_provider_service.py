@@ -198,6 +198,59 @@ async def test_test_connection_unconfigured(tmp_path: Path) -> None:
     assert "not configured" in result.message
 
 
+async def test_test_connection_uses_pooled_registry_provider(tmp_path: Path) -> None:
+    from app.llm.registry import ProviderRegistry
+
+    settings = _make_settings(openai_api_key="sk-valid-key")
+    registry = ProviderRegistry(settings)
+    mock_provider = AsyncMock()
+    mock_provider.test_connection.return_value = True
+    registry.register("openai", lambda: mock_provider)
+    service = ProviderService(settings=settings, env_path=tmp_path / ".env", registry=registry)
+
+    result = await service.test_connection("openai")
+
+    assert result.success is True
+    mock_provider.test_connection.assert_awaited_once()
+
+
+async def test_test_connection_reports_circuit_state(tmp_path: Path) -> None:
+    from app.llm.registry import ProviderRegistry
+
+    settings = _make_settings(openai_api_key="sk-valid-key")
+    registry = ProviderRegistry(settings, circuit_breaker=True)
+    mock_provider = AsyncMock()
+    mock_provider.test_connection.return_value = True
+    registry.register("openai", lambda: mock_provider)
+    service = ProviderService(settings=settings, env_path=tmp_path / ".env", registry=registry)
+    breaker = registry.circuit_breaker("openai")
+    assert breaker is not None
+    for _ in range(settings.llm_breaker_failure_threshold):
+        breaker.record_failure()
+
+    result = await service.test_connection("openai")
+
+    assert result.success is True
+    assert result.circuit_state == "open"
+    assert result.circuit_consecutive_failures == settings.llm_breaker_failure_threshold
+    assert result.circuit_retry_after_seconds is not None
+
+
+def test_save_provider_invalidates_pooled_provider(tmp_path: Path) -> None:
+    from app.llm.registry import ProviderRegistry
+    from app.schemas.provider import ProviderUpdate
+
+    settings = _make_settings(openai_api_key="sk-old")
+    registry = ProviderRegistry(settings)
+    registry.register("openai", AsyncMock)
+    service = ProviderService(settings=settings, env_path=tmp_path / ".env", registry=registry)
+
+    old = registry.get_provider("openai")
+    service.save_provider("openai", ProviderUpdate(api_key="sk-rotated"))
+
+    assert registry.get_provider("openai") is not old
+
+
 # --- ProviderService.set_default_provider ---
 
 
@@ -220,3 +273,102 @@ def test_set_default_provider_requires_configured(tmp_path: Path) -> None:
 
     with pytest.raises(ProviderNotConfiguredError):
         service.set_default_provider("openai")
+
+
+# --- ProviderService.rate_limit_stats ---
+
+
+async def test_rate_limit_stats_reports_active_limiters(tmp_path: Path) -> None:
+    from app.llm.ratelimit import RateLimiter
+    from app.llm.registry import ProviderRegistry
+
+    settings = _make_settings(openai_api_key="sk-test")
+    rate_limiter = RateLimiter(settings)
+    registry = ProviderRegistry(settings, rate_limiter=rate_limiter)
+    service = ProviderService(settings=settings, env_path=tmp_path / ".env", registry=registry)
+
+    async with rate_limiter.limiter("openai", "gpt-4o").slot(10):
+        stats = service.rate_limit_stats()
+
+    assert len(stats) == 1
+    assert stats[0].provider == "openai"
+    assert stats[0].in_flight == 1
+
+
+def test_rate_limit_stats_empty_without_registry(tmp_path: Path) -> None:
+    service = ProviderService(settings=_make_settings(), env_path=tmp_path / ".env")
+    assert service.rate_limit_stats() == []
+
+
+# --- ProviderService.prompt_cache_stats ---
+
+
+def test_prompt_cache_stats_reports_recorded_usage(tmp_path: Path) -> None:
+    from app.llm.registry import ProviderRegistry
+    from app.llm.usage import PromptCacheUsage
+
+    settings = _make_settings(anthropic_api_key="sk-ant-test")
+    usage = PromptCacheUsage()
+    registry = ProviderRegistry(settings, prompt_cache_usage=usage)
+    service = ProviderService(settings=settings, env_path=tmp_path / ".env", registry=registry)
+
+    usage.record("anthropic", "claude-sonnet-4-5-20250929", input_tokens=1000)
+    usage.record(
+        "anthropic", "claude-sonnet-4-5-20250929", input_tokens=1000, cached_input_tokens=900
+    )
+    stats = service.prompt_cache_stats()
+
+    assert len(stats) == 1
+    assert stats[0].requests == 2
+    assert stats[0].cached_input_tokens == 900
+    assert stats[0].hit_rate == 0.45
+
+
+def test_prompt_cache_stats_empty_without_registry(tmp_path: Path) -> None:
+    service = ProviderService(settings=_make_settings(), env_path=tmp_path / ".env")
+    assert service.prompt_cache_stats() == []
+
+
+# --- ProviderService.llm_call_summary ---
+
+
+async def test_llm_call_summary_reads_the_ledger(tmp_path: Path) -> None:
+    from datetime import UTC, datetime, timedelta
+
+    from app.llm.registry import ProviderRegistry
+    from app.llm.telemetry import CallLedger, LLMCallRecord
+
+    settings = _make_settings(openai_api_key="sk-test")
+    ledger = CallLedger(tmp_path / "telemetry.db")
+    registry = ProviderRegistry(settings, ledger=ledger)
+    service = ProviderService(settings=settings, env_path=tmp_path / ".env", registry=registry)
+
+    ledger.record(
+        LLMCallRecord(
+            created_at=datetime.now(UTC).timestamp(),
+            operation="dna_analysis",
+            clone_id="c1",
+            provider="openai",
+            model="gpt-4o",
+            method="complete_json",
+            input_tokens=1200,
+            output_tokens=300,
+            cached_input_tokens=0,
+            ttft_seconds=None,
+            latency_seconds=4.0,
+            retries=0,
+            cost_usd=0.006,
+            error=None,
+        )
+    )
+    summaries = await service.llm_call_summary(since=datetime.now(UTC) - timedelta(minutes=5))
+    await ledger.aclose()
+
+    [summary] = summaries
+    assert (summary.operation, summary.calls, summary.input_tokens) == ("dna_analysis", 1, 1200)
+    assert summary.cost_usd == 0.006
+
+
+async def test_llm_call_summary_empty_without_ledger(tmp_path: Path) -> None:
+    service = ProviderService(settings=_make_settings(), env_path=tmp_path / ".env")
+    assert await service.llm_call_summary() == []
@@ -7,14 +7,28 @@ from unittest.mock import AsyncMock
 
 import nanoid
 import pytest
+from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.exceptions import ContentNotFoundError
+from app.llm.structured import parse_json_response
 from app.models.clone import VoiceClone
 from app.models.content import Content
 from app.models.dna import VoiceDNAVersion
 from app.services.scoring_service import ScoringService, calculate_confidence
 
+
+def _json_reply(raw: str) -> Any:
+    """side_effect for a mocked complete_json that validates ``raw`` like a real provider."""
+
+    async def complete_json(
+        messages: list[dict[str, str]], *, schema: type[BaseModel], **kwargs: Any
+    ) -> BaseModel:
+        return parse_json_response(raw, schema)
+
+    return complete_json
+
+
 # ── Confidence scoring helpers ─────────────────────────────────────
 
 
@@ -336,7 +350,7 @@ class TestScoringService:
         content = await _create_content(session, clone.id)
 
         mock_provider = AsyncMock()
-        mock_provider.complete = AsyncMock(return_value=_make_llm_response())
+        mock_provider.complete_json = AsyncMock(side_effect=_json_reply(_make_llm_response()))
 
         service = ScoringService(session, mock_provider)
         scored = await service.score(content.id)
@@ -357,7 +371,7 @@ class TestScoringService:
         expected = round(sum(scores) / len(scores))
 
         mock_provider = AsyncMock()
-        mock_provider.complete = AsyncMock(return_value=_make_llm_response(scores))
+        mock_provider.complete_json = AsyncMock(side_effect=_json_reply(_make_llm_response(scores)))
 
         service = ScoringService(session, mock_provider)
         scored = await service.score(content.id)
@@ -372,7 +386,7 @@ class TestScoringService:
 
         scores = [85, 90, 50, 92, 88, 40, 80, 86]
         mock_provider = AsyncMock()
-        mock_provider.complete = AsyncMock(return_value=_make_llm_response(scores))
+        mock_provider.complete_json = AsyncMock(side_effect=_json_reply(_make_llm_response(scores)))
 
         service = ScoringService(session, mock_provider)
         scored = await service.score(content.id)
@@ -390,12 +404,14 @@ class TestScoringService:
 
         captured_messages: list[list[dict[str, str]]] = []
 
-        async def capture_complete(messages: list[dict[str, str]], **kwargs: Any) -> str:
+        async def capture_complete(
+            messages: list[dict[str, str]], *, schema: type[BaseModel], **kwargs: Any
+        ) -> BaseModel:
             captured_messages.append(messages)
-            return _make_llm_response()
+            return parse_json_response(_make_llm_response(), schema)
 
         mock_provider = AsyncMock()
-        mock_provider.complete = AsyncMock(side_effect=capture_complete)
+        mock_provider.complete_json = AsyncMock(side_effect=capture_complete)
 
         service = ScoringService(session, mock_provider)
         await service.score(content.id)
@@ -413,12 +429,14 @@ class TestScoringService:
 
         captured_messages: list[list[dict[str, str]]] = []
 
-        async def capture_complete(messages: list[dict[str, str]], **kwargs: Any) -> str:
+        async def capture_complete(
+            messages: list[dict[str, str]], *, schema: type[BaseModel], **kwargs: Any
+        ) -> BaseModel:
             captured_messages.append(messages)
-            return _make_llm_response()
+            return parse_json_response(_make_llm_response(), schema)
 
         mock_provider = AsyncMock()
-        mock_provider.complete = AsyncMock(side_effect=capture_complete)
+        mock_provider.complete_json = AsyncMock(side_effect=capture_complete)
 
         service = ScoringService(session, mock_provider)
         await service.score(content.id)
@@ -441,7 +459,7 @@ class TestScoringService:
         await _create_dna(session, clone.id)
 
         mock_provider = AsyncMock()
-        mock_provider.complete = AsyncMock(return_value=_make_llm_response())
+        mock_provider.complete_json = AsyncMock(side_effect=_json_reply(_make_llm_response()))
 
         service = ScoringService(session, mock_provider)
         result = await service.score_preview(clone.id, "Some content to score.")
@@ -469,7 +487,7 @@ class TestScoringService:
 
         scores = [85, 90, 78, 92, 88, 75, 80, 86]
         mock_provider = AsyncMock()
-        mock_provider.complete = AsyncMock(return_value=_make_llm_response(scores))
+        mock_provider.complete_json = AsyncMock(side_effect=_json_reply(_make_llm_response(scores)))
 
         service = ScoringService(session, mock_provider)
         await service.score(content.id)
@@ -0,0 +1,127 @@
+"""Tests for FTS5-backed search across content, samples and clones."""
+
+from datetime import UTC, datetime
+
+import nanoid
+from sqlalchemy import delete, text, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.fts import create_search_indexes, drop_search_indexes, match_query
+from app.models.clone import VoiceClone
+from app.models.content import Content
+from app.models.sample import WritingSample
+from app.services.search_service import SearchService
+from tests.conftest import engine_test
+
+
+async def _create_clone(
+    session: AsyncSession, name: str = "Test Clone", description: str | None = None
+) -> VoiceClone:
+    clone = VoiceClone(id=nanoid.generate(), name=name, description=description)
+    session.add(clone)
+    await session.flush()
+    return clone
+
+
+async def _create_content(session: AsyncSession, clone_id: str, text: str) -> Content:
+    content = Content(
+        clone_id=clone_id,
+        platform="blog",
+        status="draft",
+        content_current=text,
+        content_original=text,
+        input_text="test input",
+        word_count=len(text.split()),
+        char_count=len(text),
+    )
+    session.add(content)
+    await session.flush()
+    return content
+
+
+async def _create_sample(session: AsyncSession, clone_id: str, text: str) -> WritingSample:
+    sample = WritingSample(
+        clone_id=clone_id,
+        content=text,
+        content_type="blog_post",
+        word_count=len(text.split()),
+        source_type="paste",
+    )
+    session.add(sample)
+    await session.flush()
+    return sample
+
+
+def test_match_query_quotes_words_and_prefix_matches() -> None:
+    assert match_query('launch "AND" NEAR(') == '"launch"* """AND"""* "NEAR("*'
+    assert match_query("   ") is None
+
+
+async def test_search_ranks_and_highlights_each_kind(session: AsyncSession) -> None:
+    clone = await _create_clone(session, "Launch Voice", description="Product launches")
+    strong = await _create_content(session, clone.id, "Launch day: launching the launch plan.")
+    weak = await _create_content(session, clone.id, "A long note that mentions a launch once.")
+    await _create_content(session, clone.id, "Nothing relevant here.")
+    sample = await _create_sample(session, clone.id, "We launched quietly on Tuesday.")
+
+    result = await SearchService(session).search("launch")
+
+    assert [hit.id for hit in result.content] == [strong.id, weak.id]
+    assert result.content[0].rank < result.content[1].rank
+    assert "<mark>Launch</mark>" in result.content[0].snippet
+    assert [hit.id for hit in result.samples] == [sample.id]
+    assert "<mark>launched</mark>" in result.samples[0].snippet
+    assert [hit.id for hit in result.clones] == [clone.id]
+
+
+async def test_search_filters_by_clone_and_skips_deleted_clones(session: AsyncSession) -> None:
+    mine = await _create_clone(session)
+    other = await _create_clone(session)
+    gone = await _create_clone(session)
+    gone.deleted_at = datetime.now(UTC)
+    for clone in (mine, other, gone):
+        await _create_content(session, clone.id, "Quarterly roadmap review")
+
+    scoped = await SearchService(session).search("roadmap", clone_id=mine.id)
+    everything = await SearchService(session).search("roadmap")
+
+    assert [hit.clone_id for hit in scoped.content] == [mine.id]
+    assert {hit.clone_id for hit in everything.content} == {mine.id, other.id}
+
+
+async def test_index_follows_updates_and_deletes(session: AsyncSession) -> None:
+    clone = await _create_clone(session)
+    content = await _create_content(session, clone.id, "Original draft about pricing")
+    service = SearchService(session)
+
+    await session.execute(
+        update(Content).where(Content.id == content.id).values(topic="Onboarding")
+    )
+    assert [hit.id for hit in (await service.search("onboarding")).content] == [content.id]
+
+    await session.execute(
+        update(Content)
+        .where(Content.id == content.id)
+        .values(content_current="Rewritten about hiring", topic=None)
+    )
+    assert (await service.search("pricing")).content == []
+    assert [hit.id for hit in (await service.search("hiring")).content] == [content.id]
+
+    await session.execute(delete(Content).where(Content.id == content.id))
+    assert (await service.search("hiring")).content == []
+
+
+async def test_new_index_is_backfilled_from_existing_rows(session: AsyncSession) -> None:
+    clone = await _create_clone(session)
+    content = await _create_content(session, clone.id, "Written before the index existed")
+    await session.commit()
+
+    async with engine_test.begin() as conn:
+        await conn.run_sync(lambda c: drop_search_indexes(None, c))
+        await conn.run_sync(lambda c: create_search_indexes(None, c))
+        count = await conn.scalar(text("SELECT count(*) FROM content_fts"))
+
+    assert count == 1
+    assert [hit.id for hit in (await SearchService(session).search("existed")).content] == [
+        content.id
+    ]
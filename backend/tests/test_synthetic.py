@@ -0,0 +1,97 @@
+"""Tests for the bulk synthetic data generator."""
+
+from typing import Any, cast
+
+from sqlalchemy import Row, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.constants import CONTENT_SNAPSHOT_INTERVAL, MAX_SAMPLE_WORDS
+from app.models.clone import VoiceClone
+from app.models.content import Content, ContentVersion
+from app.models.dna import VoiceDNAVersion
+from app.models.sample import WritingSample
+from app.services.content_service import ContentService
+from app.synthetic import SyntheticSpec, generate, generate_clones, generate_content
+from app.text_delta import text_hash
+from tests.conftest import engine_test
+
+
+async def test_generate_writes_every_table_in_chunks(session: AsyncSession) -> None:
+    spec = SyntheticSpec(clones=3, samples_per_clone=4, content_rows=25, chunk_size=10)
+
+    counts = await generate(engine_test, spec)
+
+    assert (counts.clones, counts.samples, counts.content) == (3, 12, 25)
+    assert await session.scalar(select(func.count()).select_from(VoiceClone)) == 3
+    assert await session.scalar(select(func.count()).select_from(WritingSample)) == 12
+    assert (
+        await session.scalar(select(func.count()).select_from(VoiceDNAVersion))
+        == counts.dna_versions
+    )
+    assert await session.scalar(select(func.count()).select_from(Content)) == 25
+    assert (
+        await session.scalar(select(func.count()).select_from(ContentVersion))
+        == counts.content_versions
+    )
+
+
+async def test_samples_follow_length_distribution(session: AsyncSession) -> None:
+    await generate_clones(engine_test, 2, samples_per_clone=20, median_sample_words=400)
+
+    samples = (await session.execute(select(WritingSample))).scalars().all()
+
+    for sample in samples:
+        assert sample.word_count == len(sample.content.split())
+        assert 1 <= sample.word_count <= MAX_SAMPLE_WORDS
+    assert {s.length_category for s in samples} >= {"short", "medium"}
+
+
+async def test_content_has_consistent_version_chains(session: AsyncSession) -> None:
+    [clone_id] = await generate_clones(engine_test, 1, samples_per_clone=1)
+    ids = await generate_content(engine_test, [clone_id], 40, mean_versions=4.0, seed=3)
+
+    assert len(ids) == 40
+    versions = (await session.execute(select(ContentVersion))).scalars().all()
+    assert len(versions) > 40
+    service = ContentService(session)
+    for content in (await session.execute(select(Content))).scalars().all():
+        chain = list(reversed(await service.list_versions(content.id)))
+        assert [v.version_number for v in chain] == list(range(1, len(chain) + 1))
+        assert chain[0].trigger in {"generation", "import"}
+        assert chain[0].content_text == content.content_original
+        assert chain[-1].content_text == content.content_current
+        assert all(v.content_hash == text_hash(cast(str, v.content_text)) for v in chain)
+        assert content.word_count == len(content.content_current.split())
+
+
+async def test_content_versions_are_stored_as_snapshots_and_deltas(
+    session: AsyncSession,
+) -> None:
+    [clone_id] = await generate_clones(engine_test, 1, samples_per_clone=1)
+    await generate_content(engine_test, [clone_id], 40, mean_versions=12.0, seed=5)
+
+    rows = (
+        await session.execute(
+            select(
+                ContentVersion.content_id,
+                ContentVersion.version_number,
+                ContentVersion.content_text,
+                ContentVersion.base_version,
+                ContentVersion.delta,
+            )
+        )
+    ).all()
+    by_key = {(row.content_id, row.version_number): row for row in rows}
+
+    def depth(row: Row[Any]) -> int:
+        """Deltas applied to rebuild ``row`` from its snapshot."""
+        deltas = 0
+        while row.base_version is not None:
+            deltas += row.delta is not None
+            row = by_key[(row.content_id, row.base_version)]
+        return deltas
+
+    assert all(row.content_text is not None for row in rows if row.version_number == 1)
+    assert all((row.content_text is None) == (row.base_version is not None) for row in rows)
+    assert any(row.delta is not None for row in rows)
+    assert max(depth(row) for row in rows) == CONTENT_SNAPSHOT_INTERVAL - 1
@@ -0,0 +1,40 @@
+"""Tests for word-level text deltas."""
+
+import pytest
+
+from app.text_delta import diff, patch, text_hash
+
+POST = " ".join(f"Sentence {i} talks about launches.\n" for i in range(50))
+
+
+@pytest.mark.parametrize(
+    ("base", "text"),
+    [
+        ("", ""),
+        ("", "New text."),
+        ("Old text.", ""),
+        ("Same words.", "Same words."),
+        ("  leading space", "trailing space  "),
+        ("One.\n\nTwo.", "One.\nTwo!"),
+        ("Hello world.", "Hello there, world!"),
+        (POST, POST.replace("Sentence 7 ", "Sentence seven ")),
+        (POST, "A complete rewrite."),
+    ],
+)
+def test_patch_inverts_diff(base: str, text: str) -> None:
+    assert patch(base, diff(base, text)) == text
+
+
+def test_small_edit_to_long_text_is_small() -> None:
+    edited = POST.replace("Sentence 20 talks", "Sentence 20 writes")
+
+    delta = diff(POST, edited)
+
+    assert "writes " in delta
+    assert sum(len(op) for op in delta if isinstance(op, str)) < 20
+
+
+def test_text_hash_is_stable_and_distinguishes_texts() -> None:
+    assert text_hash("draft") == text_hash("draft")
+    assert text_hash("draft") != text_hash("draft ")
+    assert len(text_hash("")) == 64